@@ -1,17 +1,46 @@
+const os = require('os');
+
+// 워커 수 (기본: CPU 코어 수). 앱은 API_INSTANCES 로 워커당 DB 풀/이미지 처리 동시성을 나눈다.
+const instances = Number(process.env.API_INSTANCES) || os.cpus().length;
+
 module.exports = {
     apps: [
         {
             name: 'salon-api',
             script: 'dist/main.js', // NestJS 빌드 결과물
-            instances: 1, // CPU 코어 수에 맞춰 'max'로 변경 가능
+            instances,
+            exec_mode: 'cluster', // 워커들이 3000 포트를 공유
             autorestart: true, // 프로세스 다운 시 자동 재시작
             watch: false, // 프로덕션에서는 파일 감시 비활성화
             max_memory_restart: '1G', // 메모리 누수 방지 (1GB 초과 시 재시작)
+            wait_ready: true, // 워커가 리슨을 시작하고 ready 를 보낸 뒤 다음 워커를 교체 (pm2 reload 무중단)
+            listen_timeout: 15000,
+            kill_timeout: 15000, // SHUTDOWN_TIMEOUT_MS(10초) 보다 길어야 처리 중인 요청이 끝난다
             env: {
                 NODE_ENV: 'production',
+                API_INSTANCES: instances,
+                // API 전체 DB 커넥션 수 (워커당 floor(60 / instances)). MySQL max_connections 보다 충분히 작게 둔다.
+                DB_CONNECTION_BUDGET: 60,
+                // METRICS_TOKEN: API 포트의 /metrics 에 필요한 Bearer 토큰. production 에서 없으면 /metrics 는 403 으로 닫힌다.
+                // 비밀값이므로 여기에 적지 않고 서버의 .env 에 둔다 (워커별 지표 포트는 127.0.0.1 전용이라 토큰 불필요)
+                // 워커 N 의 지표 포트 = 9300 + N (127.0.0.1 전용, Prometheus 가 워커별로 scrape)
+                METRICS_PORT: 9300,
                 // .env 파일의 변수는 서버 실행 전 로드되거나, 여기에 직접 명시 가능
                 // 하지만 보안상 서버의 .env 파일을 읽도록 하는 것이 일반적임
             },
         },
+        {
+            // 선불권 유효기간 만료 배치 (매일 03:30, 한 번 실행하고 종료). 잔액 단위로 커밋하므로 중단돼도 다음 실행에서 이어진다.
+            name: 'salon-prepaid-expiry',
+            script: 'dist/scripts/expire_prepaid.js',
+            instances: 1,
+            exec_mode: 'fork',
+            cron_restart: '30 3 * * *',
+            autorestart: false,
+            watch: false,
+            env: {
+                NODE_ENV: 'production',
+            },
+        },
     ],
 };
@@ -0,0 +1,172 @@
+"""
+시나리오 기반 부하 생성기 (로컬 API + MySQL 대상)
+
+사용법:
+  pip install -r loadtest/requirements.txt
+  python loadtest/loadgen.py --email owner@example.com --password password123 \
+      --users 20 --duration 60 --mix auth=1,menus=2,reservations=3,sales=4
+
+- 가상 사용자(스레드)마다 세션 1개로 로그인한 뒤, --mix 가중치에 따라 시나리오를 반복한다.
+- 예약은 --days-ahead 일 뒤부터 디자이너별로 겹치지 않는 슬롯을 잡는다.
+- 종료 후 엔드포인트별 처리량 / 오류율 / p50·p95·p99 를 출력하고, 만든 예약은 삭제한다 (--keep-data 로 유지).
+- 오류율이 --max-error-rate 를 넘으면 exit code 1.
+"""
+
+import argparse
+import json
+import os
+import random
+import sys
+import threading
+import time
+
+from scenarios import SCENARIOS, ApiClient, ShopContext, Stats
+
+
+def parse_mix(value):
+    weights = {}
+    for part in value.split(","):
+        name, _, weight = part.partition("=")
+        name = name.strip()
+        if name not in SCENARIOS:
+            raise argparse.ArgumentTypeError(f"unknown scenario '{name}' (available: {', '.join(SCENARIOS)})")
+        weights[name] = float(weight or 1)
+    return weights
+
+
+def percentile(sorted_values, q):
+    if not sorted_values:
+        return 0.0
+    return sorted_values[min(len(sorted_values) - 1, int(q * len(sorted_values)))]
+
+
+def virtual_user(index, args, stats, ctx, deadline, errors):
+    rng = random.Random(args.seed + index if args.seed is not None else None)
+    names = list(args.mix)
+    weights = [args.mix[n] for n in names]
+    client = ApiClient(args.base_url, stats)
+    try:
+        client.login(args.email, args.password)
+        while time.monotonic() < deadline:
+            name = rng.choices(names, weights)[0]
+            SCENARIOS[name](client, ctx, rng)
+            if args.think_time:
+                time.sleep(rng.uniform(0, args.think_time))
+    except Exception as e:  # 가상 사용자 하나가 죽어도 나머지는 계속
+        errors.append(f"user {index}: {e}")
+    finally:
+        client.close()
+
+
+def report(stats, elapsed):
+    rows = []
+    total = {"count": 0, "error": 0, "conflict": 0}
+    for name in sorted(stats.endpoints):
+        entry = stats.endpoints[name]
+        latencies = sorted(entry["latencies"])
+        count = len(latencies)
+        total["count"] += count
+        total["error"] += entry["error"]
+        total["conflict"] += entry["conflict"]
+        rows.append({
+            "endpoint": name,
+            "count": count,
+            "rps": count / elapsed,
+            "error_rate": entry["error"] / count,
+            "conflicts": entry["conflict"],
+            "p50": percentile(latencies, 0.50),
+            "p95": percentile(latencies, 0.95),
+            "p99": percentile(latencies, 0.99),
+            "max": latencies[-1],
+        })
+
+    print(f"{'endpoint':<52}{'count':>8}{'rps':>9}{'err%':>7}{'confl':>7}{'p50':>9}{'p95':>9}{'p99':>9}{'max':>9}")
+    for r in rows:
+        print(
+            f"{r['endpoint']:<52}{r['count']:>8}{r['rps']:>9.1f}{r['error_rate'] * 100:>6.1f}%{r['conflicts']:>7}"
+            f"{r['p50']:>9.1f}{r['p95']:>9.1f}{r['p99']:>9.1f}{r['max']:>9.1f}"
+        )
+    error_rate = total["error"] / total["count"] if total["count"] else 0.0
+    print(
+        f"\ntotal requests={total['count']} rps={total['count'] / elapsed:.1f} "
+        f"errors={total['error']} ({error_rate * 100:.2f}%) conflicts={total['conflict']} elapsed={elapsed:.1f}s"
+    )
+    return rows, error_rate
+
+
+def cleanup(args, stats, ctx):
+    if not ctx.created_reservations:
+        return
+    client = ApiClient(args.base_url, stats)
+    try:
+        client.login(args.email, args.password)
+        for reservation_id in ctx.created_reservations:
+            client.request("DELETE", f"/shops/{ctx.shop_id}/reservations/{reservation_id}", "/shops/:shopId/reservations/:id (cleanup)")
+    finally:
+        client.close()
+    print(f"cleaned up {len(ctx.created_reservations)} reservations")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Scenario-based load generator for the admin API")
+    parser.add_argument("--base-url", default=os.environ.get("LOADTEST_BASE_URL", "http://localhost:3000"))
+    parser.add_argument("--email", default=os.environ.get("LOADTEST_EMAIL", "owner@example.com"))
+    parser.add_argument("--password", default=os.environ.get("LOADTEST_PASSWORD", "password123"))
+    parser.add_argument("--shop-id", type=int, default=None, help="defaults to the account's own shop")
+    parser.add_argument("--users", type=int, default=10, help="concurrent virtual users")
+    parser.add_argument("--duration", type=float, default=30, help="seconds")
+    parser.add_argument("--ramp-up", type=float, default=0, help="seconds to spread user start-up over")
+    parser.add_argument("--think-time", type=float, default=0, help="max random pause between scenarios (seconds)")
+    parser.add_argument("--mix", type=parse_mix, default=parse_mix("auth=1,menus=2,reservations=3,sales=4"))
+    parser.add_argument("--days-ahead", type=int, default=365, help="book reservations starting this many days ahead")
+    parser.add_argument("--seed", type=int, default=None)
+    parser.add_argument("--max-error-rate", type=float, default=0.01)
+    parser.add_argument("--keep-data", action="store_true", help="do not delete reservations created by the run")
+    parser.add_argument("--json-out", default=None, help="write per-endpoint results to this file")
+    args = parser.parse_args()
+
+    setup_stats = Stats()
+    setup = ApiClient(args.base_url, setup_stats)
+    try:
+        setup.login(args.email, args.password)
+        ctx = ShopContext.load(setup, args.shop_id, args.days_ahead)
+    finally:
+        setup.close()
+    print(
+        f"shop={ctx.shop_id} designers={len(ctx.designers)} menus={len(ctx.menus)} "
+        f"customers={len(ctx.customer_ids)} users={args.users} duration={args.duration}s mix={args.mix}"
+    )
+    if "reservations" in args.mix and (not ctx.designers or not ctx.customer_ids):
+        print("warning: no active designer or customer, the reservations scenario will be skipped", file=sys.stderr)
+
+    stats = Stats()
+    errors = []
+    started = time.monotonic()
+    deadline = started + args.ramp_up + args.duration
+    threads = []
+    for i in range(args.users):
+        t = threading.Thread(target=virtual_user, args=(i, args, stats, ctx, deadline, errors), daemon=True)
+        t.start()
+        threads.append(t)
+        if args.ramp_up and args.users > 1:
+            time.sleep(args.ramp_up / args.users)
+    for t in threads:
+        t.join()
+    elapsed = time.monotonic() - started
+
+    for message in errors:
+        print(message, file=sys.stderr)
+    rows, error_rate = report(stats, elapsed)
+
+    if args.json_out:
+        with open(args.json_out, "w", encoding="utf-8") as f:
+            json.dump({"elapsed": elapsed, "users": args.users, "mix": args.mix, "endpoints": rows}, f, indent=2)
+
+    if not args.keep_data:
+        cleanup(args, Stats(), ctx)
+
+    sys.exit(1 if error_rate > args.max_error_rate or errors else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,246 @@
+"""
+부하 시나리오 (testsprite_tests TC001~TC010 의 흐름을 실제 API 경로/DTO 에 맞춘 것)
+
+- auth:         POST /auth/refresh (쿠키 회전, TC003)
+- menus:        메뉴 목록 → 생성 → 수정 → 삭제 (TC004~TC007)
+- reservations: 예약 생성 → 결제 완료 (TC006, TC008/TC009)
+- sales:        일별 매출 조회 (TC010)
+
+각 가상 사용자는 requests.Session 하나(keep-alive)를 갖고, 로그인은 시작 시 1회만 한다.
+"""
+
+import datetime
+import threading
+import time
+import uuid
+
+import requests
+
+KST = datetime.timezone(datetime.timedelta(hours=9))
+SLOT_MINUTES = 30
+DEFAULT_WORK_HOURS = ("10:00", "20:00")
+WEEKDAYS = ["Mon", "Tue", "Wed", "Thu", "Fri", "Sat", "Sun"]
+
+
+class Stats:
+    """엔드포인트별 지연 시간 / 결과 집계 (스레드 안전)"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.endpoints = {}
+
+    def record(self, name, elapsed_ms, outcome):
+        with self._lock:
+            entry = self.endpoints.setdefault(name, {"latencies": [], "ok": 0, "error": 0, "conflict": 0})
+            entry["latencies"].append(elapsed_ms)
+            entry[outcome] += 1
+
+
+class ApiClient:
+    """가상 사용자 1명의 세션. 모든 요청을 이름(경로 템플릿) 단위로 Stats 에 기록한다."""
+
+    def __init__(self, base_url, stats, timeout=30):
+        self.base_url = base_url.rstrip("/")
+        self.stats = stats
+        self.timeout = timeout
+        self.session = requests.Session()
+        self.session.headers.update({"Content-Type": "application/json"})
+
+    def request(self, method, path, name, expect=None, **kwargs):
+        started = time.perf_counter()
+        try:
+            response = self.session.request(method, self.base_url + path, timeout=self.timeout, **kwargs)
+        except requests.RequestException:
+            self.stats.record(f"{method} {name}", (time.perf_counter() - started) * 1000, "error")
+            return None
+        elapsed_ms = (time.perf_counter() - started) * 1000
+
+        body = None
+        if response.content:
+            try:
+                body = response.json()
+            except ValueError:
+                body = None
+
+        if not response.ok or (expect and not expect(body)):
+            outcome = "error"
+        elif isinstance(body, dict) and body.get("status") == "CONFLICT":
+            # 예약 겹침/근무시간 충돌은 200 + CONFLICT 본문으로 온다
+            outcome = "conflict"
+        else:
+            outcome = "ok"
+        self.stats.record(f"{method} {name}", elapsed_ms, outcome)
+        return body if outcome == "ok" else None
+
+    def login(self, email, password):
+        body = self.request("POST", "/auth/login", "/auth/login", json={"email": email, "password": password})
+        if not body or not body.get("accessToken"):
+            raise RuntimeError(f"login failed for {email}")
+        self.session.headers["Authorization"] = f"Bearer {body['accessToken']}"
+
+    def close(self):
+        self.session.close()
+
+
+class SlotAllocator:
+    """
+    디자이너별로 겹치지 않는 예약 슬롯을 순서대로 나눠준다 (모든 가상 사용자 공유).
+    매장 휴무일 / 디자이너 휴무일 / 근무시간 / 점심시간을 피하므로 CONFLICT 는 기존 예약과 겹칠 때만 나온다.
+    """
+
+    def __init__(self, shop, designers, start_date):
+        self._lock = threading.Lock()
+        self.shop = shop
+        self.designers = designers
+        self.start_date = start_date
+        self._cursor = {d["designer_id"]: (start_date, None) for d in designers}
+        self._turn = 0
+
+    def next(self):
+        with self._lock:
+            designer = self.designers[self._turn % len(self.designers)]
+            self._turn += 1
+            day, last = self._cursor[designer["designer_id"]]
+            day, start = self._next_slot(designer, day, last)
+            self._cursor[designer["designer_id"]] = (day, start)
+        end = start + datetime.timedelta(minutes=SLOT_MINUTES)
+        return int(designer["designer_id"]), start, end
+
+    def _next_slot(self, designer, day, last):
+        work_start, work_end = self._work_hours(designer)
+        lunch = (designer.get("lunch_start"), designer.get("lunch_end"))
+        for _ in range(366):
+            if self._is_open(designer, day):
+                start = last + datetime.timedelta(minutes=SLOT_MINUTES) if last else _at(day, work_start)
+                while (start + datetime.timedelta(minutes=SLOT_MINUTES)).strftime("%H:%M") <= work_end \
+                        and start.date() == day:
+                    end_str = (start + datetime.timedelta(minutes=SLOT_MINUTES)).strftime("%H:%M")
+                    if not (lunch[0] and lunch[1] and start.strftime("%H:%M") < lunch[1] and end_str > lunch[0]):
+                        return day, start
+                    start += datetime.timedelta(minutes=SLOT_MINUTES)
+            day += datetime.timedelta(days=1)
+            last = None
+        raise RuntimeError(f"no bookable slot for designer {designer['designer_id']}")
+
+    def _work_hours(self, designer):
+        # 디자이너 근무시간과 매장 운영시간이 모두 있으면 겹치는 구간
+        start = max(filter(None, [designer.get("work_start"), self.shop.get("open_time")]), default=DEFAULT_WORK_HOURS[0])
+        end = min(filter(None, [designer.get("work_end"), self.shop.get("close_time")]), default=DEFAULT_WORK_HOURS[1])
+        return start, end
+
+    def _is_open(self, designer, day):
+        weekday = WEEKDAYS[day.weekday()]
+        return weekday not in (self.shop.get("closed_days") or "") and weekday not in (designer.get("day_off") or "")
+
+
+def _at(day, hhmm):
+    hour, minute = (int(v) for v in hhmm.split(":"))
+    return datetime.datetime(day.year, day.month, day.day, hour, minute, tzinfo=KST)
+
+
+class ShopContext:
+    """시나리오가 공유하는 매장 데이터 (시작 시 1회 조회)"""
+
+    def __init__(self, shop_id, shop, designers, menus, customer_ids, slots):
+        self.shop_id = shop_id
+        self.shop = shop
+        self.designers = designers
+        self.menus = menus
+        self.customer_ids = customer_ids
+        self.slots = slots
+        self.created_reservations = []
+        self._lock = threading.Lock()
+
+    def remember_reservation(self, reservation_id):
+        with self._lock:
+            self.created_reservations.append(reservation_id)
+
+    @classmethod
+    def load(cls, client, shop_id, days_ahead):
+        if shop_id is None:
+            shop = client.request("GET", "/shops/my-shop", "/shops/my-shop")
+            if not shop:
+                raise RuntimeError("this account has no shop; pass --shop-id")
+            shop_id = int(shop["shop_id"])
+        else:
+            shop = client.request("GET", f"/shops/{shop_id}", "/shops/:id") or {}
+
+        designers = client.request("GET", f"/shops/{shop_id}/designers", "/shops/:shopId/designers") or []
+        designers = [d for d in designers if d.get("is_active", True)]
+        menus = client.request("GET", f"/shops/{shop_id}/menus", "/shops/:shopId/menus") or []
+        menus = [m for m in menus if m.get("type", "MENU") == "MENU"]
+        customers = client.request("GET", f"/shops/{shop_id}/customers?limit=50", "/shops/:shopId/customers") or {}
+        customer_ids = [c["id"] for c in customers.get("items", [])]
+
+        start_date = datetime.datetime.now(KST).date() + datetime.timedelta(days=days_ahead)
+        slots = SlotAllocator(shop, designers, start_date) if designers else None
+        return cls(shop_id, shop, designers, menus, customer_ids, slots)
+
+
+def scenario_auth(client, ctx, rng):
+    # 갱신 실패도 200 + accessToken null 로 온다
+    body = client.request("POST", "/auth/refresh", "/auth/refresh", expect=lambda b: bool(b and b.get("accessToken")))
+    if body:
+        client.session.headers["Authorization"] = f"Bearer {body['accessToken']}"
+
+
+def scenario_menus(client, ctx, rng):
+    base = f"/shops/{ctx.shop_id}/menus"
+    client.request("GET", base, "/shops/:shopId/menus")
+    created = client.request("POST", base, "/shops/:shopId/menus", json={
+        "category": "loadtest",
+        "name": f"loadtest-{uuid.uuid4().hex[:8]}",
+        "price": rng.randrange(10000, 100000, 1000),
+        "duration": 30,
+        "type": "MENU",
+    })
+    if not created:
+        return
+    menu_id = created["menu_id"]
+    client.request("PATCH", f"{base}/{menu_id}", "/shops/:shopId/menus/:id", json={"price": rng.randrange(10000, 100000, 1000)})
+    client.request("DELETE", f"{base}/{menu_id}", "/shops/:shopId/menus/:id")
+
+
+def scenario_reservations(client, ctx, rng):
+    if not ctx.slots or not ctx.customer_ids:
+        return
+    base = f"/shops/{ctx.shop_id}/reservations"
+    designer_id, start, end = ctx.slots.next()
+    menu = rng.choice(ctx.menus) if ctx.menus else None
+    price = (menu or {}).get("price") or 30000
+
+    payload = {
+        "shop_id": ctx.shop_id,
+        "customer_id": rng.choice(ctx.customer_ids),
+        "designer_id": designer_id,
+        "start_time": start.isoformat(),
+        "end_time": end.isoformat(),
+        "status": "CONFIRMED",
+        "request_memo": "loadtest",
+        "price": price,
+    }
+    if menu:
+        payload["treatment_id"] = int(menu["menu_id"])
+    created = client.request("POST", base, "/shops/:shopId/reservations", json=payload)
+    if not created:
+        return
+    reservation_id = created["reservation_id"]
+    ctx.remember_reservation(reservation_id)
+
+    client.request("POST", f"{base}/{reservation_id}/complete", "/shops/:shopId/reservations/:id/complete", json={
+        "payments": [{"paymentType": rng.choice(["SITE_CARD", "SITE_CASH"]), "amount": price}],
+        "totalPrice": price,
+    })
+
+
+def scenario_sales(client, ctx, rng):
+    today = datetime.datetime.now(KST).date().isoformat()
+    client.request("GET", f"/shops/{ctx.shop_id}/sales/daily?date={today}", "/shops/:shopId/sales/daily")
+
+
+SCENARIOS = {
+    "auth": scenario_auth,
+    "menus": scenario_menus,
+    "reservations": scenario_reservations,
+    "sales": scenario_sales,
+}
@@ -0,0 +1,28 @@
+-- CreateTable
+CREATE TABLE `SALES_DAILY_ROLLUPS` (
+    `shop_id` BIGINT NOT NULL,
+    `sales_date` DATE NOT NULL,
+    `designer_id` BIGINT NOT NULL DEFAULT 0,
+    `category` VARCHAR(100) NOT NULL DEFAULT '',
+    `completed_count` INTEGER NOT NULL DEFAULT 0,
+    `cancel_count` INTEGER NOT NULL DEFAULT 0,
+    `noshow_count` INTEGER NOT NULL DEFAULT 0,
+    `new_customer_count` INTEGER NOT NULL DEFAULT 0,
+    `week_new_customer_count` INTEGER NOT NULL DEFAULT 0,
+    `revenue_total` INTEGER NOT NULL DEFAULT 0,
+    `revenue_card` INTEGER NOT NULL DEFAULT 0,
+    `revenue_cash` INTEGER NOT NULL DEFAULT 0,
+    `revenue_prepaid` INTEGER NOT NULL DEFAULT 0,
+    `revenue_app` INTEGER NOT NULL DEFAULT 0,
+    `item_sales` INTEGER NOT NULL DEFAULT 0,
+    `item_count` INTEGER NOT NULL DEFAULT 0,
+    `cash_site_card` INTEGER NOT NULL DEFAULT 0,
+    `cash_site_cash` INTEGER NOT NULL DEFAULT 0,
+    `prepaid_charge_card` INTEGER NOT NULL DEFAULT 0,
+    `prepaid_charge_cash` INTEGER NOT NULL DEFAULT 0,
+    `prepaid_used` INTEGER NOT NULL DEFAULT 0,
+
+    PRIMARY KEY (`shop_id`, `sales_date`, `designer_id`, `category`)
+) DEFAULT CHARACTER SET utf8mb4 COLLATE utf8mb4_unicode_ci;
+
+-- 기존 데이터 적재: npm run sales:rebuild-rollup -- --from <YYYY-MM-DD> --to <YYYY-MM-DD>
@@ -0,0 +1,45 @@
+-- CreateTable
+CREATE TABLE `CUSTOMER_SHOP_STATS` (
+    `shop_id` BIGINT NOT NULL,
+    `user_id` BIGINT NOT NULL,
+    `reservation_count` INTEGER NOT NULL DEFAULT 0,
+    `visit_count` INTEGER NOT NULL DEFAULT 0,
+    `noshow_count` INTEGER NOT NULL DEFAULT 0,
+    `total_pay` INTEGER NOT NULL DEFAULT 0,
+    `last_visit_at` DATETIME(0) NULL,
+    `grade` VARCHAR(10) NOT NULL DEFAULT 'NEW',
+
+    INDEX `CUSTOMER_SHOP_STATS_user_id_fkey`(`user_id`),
+    INDEX `CUSTOMER_SHOP_STATS_last_visit_idx`(`shop_id`, `last_visit_at`, `user_id`),
+    INDEX `CUSTOMER_SHOP_STATS_total_pay_idx`(`shop_id`, `total_pay`, `user_id`),
+    INDEX `CUSTOMER_SHOP_STATS_visit_count_idx`(`shop_id`, `visit_count`, `user_id`),
+    PRIMARY KEY (`shop_id`, `user_id`)
+) DEFAULT CHARACTER SET utf8mb4 COLLATE utf8mb4_unicode_ci;
+
+-- AddForeignKey
+ALTER TABLE `CUSTOMER_SHOP_STATS` ADD CONSTRAINT `CUSTOMER_SHOP_STATS_shop_id_fkey` FOREIGN KEY (`shop_id`) REFERENCES `SHOPS`(`shop_id`) ON DELETE CASCADE ON UPDATE RESTRICT;
+
+-- AddForeignKey
+ALTER TABLE `CUSTOMER_SHOP_STATS` ADD CONSTRAINT `CUSTOMER_SHOP_STATS_user_id_fkey` FOREIGN KEY (`user_id`) REFERENCES `USERS`(`user_id`) ON DELETE CASCADE ON UPDATE RESTRICT;
+
+-- Backfill (CustomerStatsService.refreshCustomer 와 같은 집계)
+INSERT INTO `CUSTOMER_SHOP_STATS` (`shop_id`, `user_id`, `reservation_count`, `visit_count`, `noshow_count`, `total_pay`, `last_visit_at`, `grade`)
+SELECT agg.shop_id, agg.user_id, agg.reservation_count, agg.visit_count, agg.noshow_count, agg.total_pay, agg.last_visit_at,
+    CASE
+        WHEN agg.noshow_count >= 2 THEN 'CAUTION'
+        WHEN agg.visit_count >= 10 OR agg.total_pay >= 1000000 THEN 'VIP'
+        WHEN agg.visit_count <= 1 THEN 'NEW'
+        ELSE 'NORMAL'
+    END
+FROM (
+    SELECT r.shop_id, r.customer_id AS user_id,
+        COUNT(*) AS reservation_count,
+        SUM(r.status = 'COMPLETED') AS visit_count,
+        SUM(r.status = 'NOSHOW') AS noshow_count,
+        COALESCE(SUM(IF(r.status = 'COMPLETED', (SELECT SUM(i.price) FROM `RESERVATION_ITEMS` i WHERE i.reservation_id = r.reservation_id), 0)), 0) AS total_pay,
+        MAX(IF(r.status = 'COMPLETED', r.start_time, NULL)) AS last_visit_at
+    FROM `RESERVATIONS` r
+    JOIN `USERS` u ON u.user_id = r.customer_id
+    WHERE u.role = 'CUSTOMER'
+    GROUP BY r.shop_id, r.customer_id
+) agg;
@@ -0,0 +1,18 @@
+-- AlterTable
+ALTER TABLE `RESERVATIONS` ADD COLUMN `updated_at` DATETIME(3) NOT NULL DEFAULT CURRENT_TIMESTAMP(3);
+
+-- 기존 예약은 생성 시각을 최종 변경 시각으로 사용 (애플리케이션이 쓰는 값과 같은 UTC 기준)
+UPDATE `RESERVATIONS` SET `updated_at` = COALESCE(`created_at`, `start_time`);
+
+-- CreateIndex
+CREATE INDEX `RESERVATIONS_shop_updated_idx` ON `RESERVATIONS`(`shop_id`, `updated_at`);
+
+-- CreateTable
+CREATE TABLE `RESERVATION_TOMBSTONES` (
+    `reservation_id` BIGINT NOT NULL,
+    `shop_id` BIGINT NOT NULL,
+    `deleted_at` DATETIME(3) NOT NULL DEFAULT CURRENT_TIMESTAMP(3),
+
+    INDEX `RESERVATION_TOMBSTONES_shop_deleted_idx`(`shop_id`, `deleted_at`),
+    PRIMARY KEY (`reservation_id`)
+) DEFAULT CHARACTER SET utf8mb4 COLLATE utf8mb4_unicode_ci;
@@ -0,0 +1,39 @@
+-- CreateTable
+CREATE TABLE `VISIT_LOG_PHOTOS` (
+    `photo_id` BIGINT NOT NULL AUTO_INCREMENT,
+    `log_id` BIGINT NOT NULL,
+    `shop_id` BIGINT NOT NULL,
+    `category` VARCHAR(100) NULL,
+    `menu_name` VARCHAR(100) NULL,
+    `url` VARCHAR(255) NOT NULL,
+    `sort_order` INTEGER NOT NULL DEFAULT 0,
+    `visited_at` DATETIME(0) NOT NULL,
+
+    INDEX `VISIT_LOG_PHOTOS_log_id_fkey`(`log_id`),
+    INDEX `VISIT_LOG_PHOTOS_feed_idx`(`visited_at`, `photo_id`),
+    INDEX `VISIT_LOG_PHOTOS_shop_feed_idx`(`shop_id`, `visited_at`, `photo_id`),
+    INDEX `VISIT_LOG_PHOTOS_category_feed_idx`(`category`, `visited_at`, `photo_id`),
+    PRIMARY KEY (`photo_id`)
+) DEFAULT CHARACTER SET utf8mb4 COLLATE utf8mb4_unicode_ci;
+
+-- AddForeignKey
+ALTER TABLE `VISIT_LOG_PHOTOS` ADD CONSTRAINT `VISIT_LOG_PHOTOS_log_id_fkey` FOREIGN KEY (`log_id`) REFERENCES `VISIT_LOGS`(`log_id`) ON DELETE CASCADE ON UPDATE RESTRICT;
+
+-- AddForeignKey
+ALTER TABLE `VISIT_LOG_PHOTOS` ADD CONSTRAINT `VISIT_LOG_PHOTOS_shop_id_fkey` FOREIGN KEY (`shop_id`) REFERENCES `SHOPS`(`shop_id`) ON DELETE CASCADE ON UPDATE RESTRICT;
+
+-- Backfill: photo_urls(JSON 배열)를 사진별 행으로 펼친다 (VisitLogsService.replacePhotos 와 같은 기준)
+INSERT INTO `VISIT_LOG_PHOTOS` (`log_id`, `shop_id`, `category`, `menu_name`, `url`, `sort_order`, `visited_at`)
+SELECT v.log_id, r.shop_id,
+    (SELECT COALESCE(NULLIF(pm.name, ''), NULLIF(m.category, ''))
+        FROM RESERVATION_ITEMS i
+        LEFT JOIN MENUS m ON m.menu_id = i.menu_id
+        LEFT JOIN MENUS pm ON pm.menu_id = m.category_id
+        WHERE i.reservation_id = r.reservation_id
+        ORDER BY i.item_id LIMIT 1),
+    (SELECT i.menu_name FROM RESERVATION_ITEMS i WHERE i.reservation_id = r.reservation_id ORDER BY i.item_id LIMIT 1),
+    j.url, j.ord - 1, COALESCE(v.visited_at, r.start_time)
+FROM VISIT_LOGS v
+JOIN RESERVATIONS r ON r.reservation_id = v.reservation_id
+JOIN JSON_TABLE(IF(JSON_VALID(v.photo_urls), v.photo_urls, '[]'), '$[*]' COLUMNS (ord FOR ORDINALITY, url VARCHAR(255) PATH '$')) j
+WHERE j.url IS NOT NULL AND j.url <> '';
@@ -0,0 +1,21 @@
+-- CreateTable
+CREATE TABLE `REFRESH_TOKENS` (
+    `jti` VARCHAR(36) NOT NULL,
+    `user_id` BIGINT NOT NULL,
+    `family_id` VARCHAR(36) NOT NULL,
+    `token_hash` CHAR(64) NOT NULL,
+    `expires_at` DATETIME(0) NOT NULL,
+    `used_at` DATETIME(3) NULL,
+    `revoked_at` DATETIME(0) NULL,
+    `created_at` DATETIME(0) NOT NULL DEFAULT CURRENT_TIMESTAMP(0),
+
+    INDEX `REFRESH_TOKENS_user_idx`(`user_id`, `expires_at`),
+    INDEX `REFRESH_TOKENS_family_idx`(`family_id`),
+    PRIMARY KEY (`jti`)
+) DEFAULT CHARACTER SET utf8mb4 COLLATE utf8mb4_unicode_ci;
+
+-- AddForeignKey
+ALTER TABLE `REFRESH_TOKENS` ADD CONSTRAINT `REFRESH_TOKENS_user_id_fkey` FOREIGN KEY (`user_id`) REFERENCES `USERS`(`user_id`) ON DELETE CASCADE ON UPDATE RESTRICT;
+
+-- 기존 단일 토큰(bcrypt)은 더 이상 사용하지 않는다. 기존 세션은 다음 로그인 때 새 토큰으로 교체된다.
+UPDATE `USERS` SET `current_hashed_refresh_token` = NULL WHERE `current_hashed_refresh_token` IS NOT NULL;
@@ -0,0 +1,25 @@
+-- 조회 경로에 맞춘 복합 인덱스. FK 가 쓰던 단일 컬럼 인덱스는 같은 컬럼으로 시작하는 복합 인덱스를 만든 뒤 제거한다.
+-- 검증: npm run db:check-plans (scripts/check_query_plans.ts)
+
+-- RESERVATIONS
+-- 매장 구간 조회 (캘린더/목록/일별 매출): shop_id = ? AND start_time 범위 ORDER BY start_time
+CREATE INDEX `RESERVATIONS_shop_start_idx` ON `RESERVATIONS`(`shop_id`, `start_time`);
+-- 디자이너 겹침 조회 (가용 슬롯/예약 겹침 검사): designer_id = ? AND end_time > ? AND start_time < ? AND status NOT IN (...)
+-- end_time 을 앞에 두어 범위가 조회 시작 시각 이후(대부분 미래 예약)로 좁혀지고, start_time/status 는 인덱스에서 걸러진다.
+CREATE INDEX `RESERVATIONS_designer_time_idx` ON `RESERVATIONS`(`designer_id`, `end_time`, `start_time`, `status`);
+-- 고객 상세 / 고객 통계 재계산: customer_id = ? AND shop_id = ? ORDER BY start_time DESC
+CREATE INDEX `RESERVATIONS_customer_shop_idx` ON `RESERVATIONS`(`customer_id`, `shop_id`, `start_time`);
+
+DROP INDEX `RESERVATIONS_shop_id_fkey` ON `RESERVATIONS`;
+DROP INDEX `RESERVATIONS_designer_id_fkey` ON `RESERVATIONS`;
+DROP INDEX `RESERVATIONS_customer_id_fkey` ON `RESERVATIONS`;
+
+-- PAYMENTS: 결제일 기준 현장 결제 집계 (paid_at 범위 AND type IN (...))
+CREATE INDEX `PAYMENTS_paid_type_idx` ON `PAYMENTS`(`paid_at`, `type`);
+
+-- PREPAID_TRANSACTIONS: 거래일 기준 선불권 집계 (created_at 범위 AND type IN (...))
+CREATE INDEX `PREPAID_TRANSACTIONS_created_type_idx` ON `PREPAID_TRANSACTIONS`(`created_at`, `type`);
+
+-- VISIT_LOGS: 고객별 시술 기록 (customer_id = ? ORDER BY visited_at DESC)
+CREATE INDEX `VISIT_LOGS_customer_visited_idx` ON `VISIT_LOGS`(`customer_id`, `visited_at`);
+DROP INDEX `VISIT_LOGS_customer_id_fkey` ON `VISIT_LOGS`;
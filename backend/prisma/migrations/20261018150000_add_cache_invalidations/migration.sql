@@ -0,0 +1,13 @@
+-- CreateTable
+-- 워커 간 캐시 무효화 이벤트. 애플리케이션이 created_at 을 UTC 로 넣고 10분 지난 행은 주기적으로 지운다.
+CREATE TABLE `CACHE_INVALIDATIONS` (
+    `id` BIGINT NOT NULL AUTO_INCREMENT,
+    `channel` VARCHAR(32) NOT NULL,
+    `shop_id` BIGINT NOT NULL,
+    `dates` TEXT NULL,
+    `origin` VARCHAR(128) NOT NULL,
+    `created_at` DATETIME(3) NOT NULL,
+
+    INDEX `CACHE_INVALIDATIONS_created_idx`(`created_at`),
+    PRIMARY KEY (`id`)
+) DEFAULT CHARACTER SET utf8mb4 COLLATE utf8mb4_unicode_ci;
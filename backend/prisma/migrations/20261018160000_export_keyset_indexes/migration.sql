@@ -0,0 +1,13 @@
+-- 내보내기(exports) keyset 순회용 인덱스.
+-- InnoDB 보조 인덱스는 PK 를 뒤에 포함하므로 (paid_at) 인덱스의 순서는 (paid_at, payment_id) 이다.
+-- 기존 (paid_at, type) 인덱스는 같은 시각 안에서 type 순으로 정렬되어 (paid_at, payment_id) keyset 정렬에 쓸 수 없고,
+-- 집계 쿼리(시각 범위 AND type IN (...))는 시각 범위만으로 충분히 좁혀지므로 교체한다.
+-- 검증: npm run db:check-plans (scripts/check_query_plans.ts)
+
+-- PAYMENTS: 결제일 범위 집계 + 결제 내보내기 (paid_at, payment_id) keyset
+CREATE INDEX `PAYMENTS_paid_at_idx` ON `PAYMENTS`(`paid_at`);
+DROP INDEX `PAYMENTS_paid_type_idx` ON `PAYMENTS`;
+
+-- PREPAID_TRANSACTIONS: 거래일 범위 집계 + 선불권 원장 내보내기 (created_at, transaction_id) keyset
+CREATE INDEX `PREPAID_TRANSACTIONS_created_at_idx` ON `PREPAID_TRANSACTIONS`(`created_at`);
+DROP INDEX `PREPAID_TRANSACTIONS_created_type_idx` ON `PREPAID_TRANSACTIONS`;
@@ -0,0 +1,11 @@
+-- 선불권 유효기간 만료.
+-- 충전(CHARGE) 거래가 하나의 적립 단위(lot)이며, 유효기간이 있는 선불권으로 충전하면 expires_at 을 기록한다.
+-- 만료 배치(scripts/expire_prepaid.ts)가 처리한 lot 에는 expired_at 을 기록한다 (NULL = 미처리).
+-- 기존 충전 거래는 어떤 선불권으로 충전했는지 남아 있지 않으므로 expires_at 이 NULL (만료 없음) 이다.
+ALTER TABLE `PREPAID_TRANSACTIONS`
+    ADD COLUMN `expires_at` DATETIME(0) NULL,
+    ADD COLUMN `expired_at` DATETIME(0) NULL;
+
+-- 만료 대상 조회: expired_at IS NULL AND expires_at <= NOW() 를 (expires_at, transaction_id) 순으로 keyset 순회.
+-- 처리한 lot 은 expired_at 이 채워져 범위에서 빠지므로 배치가 중간에 멈춰도 다시 실행하면 남은 것부터 이어진다.
+CREATE INDEX `PREPAID_TRANSACTIONS_expiry_idx` ON `PREPAID_TRANSACTIONS`(`expired_at`, `expires_at`);
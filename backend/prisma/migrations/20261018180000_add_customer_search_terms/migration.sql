@@ -0,0 +1,21 @@
+-- 고객 검색(typeahead) 색인: 매장별 (검색어 조각 → 고객).
+-- term 은 'p:' 전화번호 / 'n:' 이름 / 'c:' 이름 초성 의 접미 문자열이다 (CustomerSearchIndexService.termsFor).
+-- 모든 접미를 저장하므로 부분 일치 검색이 (shop_id, term) 범위 스캔(term LIKE '조각%')이 된다.
+-- 초성/완성형을 구분하고 접두 비교를 바이트 단위로 하도록 term 은 utf8mb4_bin.
+-- 기존 고객 색인: npm run customers:rebuild-search (초성 분해는 애플리케이션에서 하므로 SQL 백필 없음)
+
+-- CreateTable
+CREATE TABLE `CUSTOMER_SEARCH_TERMS` (
+    `shop_id` BIGINT NOT NULL,
+    `term` VARCHAR(64) CHARACTER SET utf8mb4 COLLATE utf8mb4_bin NOT NULL,
+    `user_id` BIGINT NOT NULL,
+
+    INDEX `CUSTOMER_SEARCH_TERMS_user_shop_idx`(`user_id`, `shop_id`),
+    PRIMARY KEY (`shop_id`, `term`, `user_id`)
+) DEFAULT CHARACTER SET utf8mb4 COLLATE utf8mb4_unicode_ci;
+
+-- AddForeignKey
+ALTER TABLE `CUSTOMER_SEARCH_TERMS` ADD CONSTRAINT `CUSTOMER_SEARCH_TERMS_shop_id_fkey` FOREIGN KEY (`shop_id`) REFERENCES `SHOPS`(`shop_id`) ON DELETE CASCADE ON UPDATE RESTRICT;
+
+-- AddForeignKey
+ALTER TABLE `CUSTOMER_SEARCH_TERMS` ADD CONSTRAINT `CUSTOMER_SEARCH_TERMS_user_id_fkey` FOREIGN KEY (`user_id`) REFERENCES `USERS`(`user_id`) ON DELETE CASCADE ON UPDATE RESTRICT;
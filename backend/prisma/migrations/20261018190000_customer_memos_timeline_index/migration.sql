@@ -0,0 +1,7 @@
+-- 고객 상세 메모 타임라인 keyset 페이지 (CustomersService.findTimeline)
+-- (user_id, shop_id, created_at) 인덱스는 PK 를 뒤에 포함하므로 (created_at, memo_id) 내림차순으로 바로 읽는다.
+-- 기존 (user_id) 인덱스(FK 용)는 새 인덱스의 앞부분과 같아 제거한다.
+-- 검증: npm run db:check-plans (scripts/check_query_plans.ts)
+
+CREATE INDEX `CUSTOMER_MEMOS_user_shop_created_idx` ON `CUSTOMER_MEMOS`(`user_id`, `shop_id`, `created_at`);
+DROP INDEX `user_id` ON `CUSTOMER_MEMOS`;
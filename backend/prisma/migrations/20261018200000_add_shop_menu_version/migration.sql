@@ -0,0 +1,3 @@
+-- 매장 메뉴 버전: 메뉴 생성/수정/삭제마다 +1 (MenusService)
+-- 메뉴 트리 캐시와 GET /shops/:shopId/menus(/tree) ETag 가 이 값을 쓴다. 워커/재시작과 무관하게 같은 메뉴 구성이면 같은 ETag.
+ALTER TABLE `SHOPS` ADD COLUMN `menu_version` INTEGER NOT NULL DEFAULT 0;
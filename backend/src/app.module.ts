@@ -13,11 +13,15 @@ import { AuthModule } from './auth/auth.module';
 import { UploadsModule } from './uploads/uploads.module';
 import { VisitLogsModule } from './visit-logs/visit-logs.module';
 import { PrepaidModule } from './prepaid/prepaid.module';
+import { ExportsModule } from './exports/exports.module';
 import { ServeStaticModule } from '@nestjs/serve-static';
 
 import { UPLOAD_ROOT } from './config/upload.config';
 
 import { TimeModule } from './common/time/time.module';
+import { CacheModule } from './common/cache/cache.module';
+import { MetricsModule } from './common/metrics/metrics.module';
+import { HealthModule } from './common/health/health.module';
 
 import { MobileAppModule } from './mobile-app/mobile-app.module';
 import { RouterModule } from '@nestjs/core';
@@ -29,6 +33,9 @@ import { RouterModule } from '@nestjs/core';
             load: [databaseConfig],
         }),
         TimeModule,
+        CacheModule,
+        MetricsModule,
+        HealthModule,
         PrismaModule,
         UsersModule,
         ShopsModule,
@@ -41,6 +48,7 @@ import { RouterModule } from '@nestjs/core';
         UploadsModule,
         VisitLogsModule,
         PrepaidModule,
+        ExportsModule,
         MobileAppModule,
         RouterModule.register([
             {
@@ -44,8 +44,12 @@ export class AuthController {
     }
 
     @Post('logout')
-    async logout(@Body() body, @Res({ passthrough: true }) res: Response) {
-        if (body.userId) {
+    async logout(@Request() req, @Body() body, @Res({ passthrough: true }) res: Response) {
+        const refreshToken = req.cookies?.['refresh_token'];
+        if (refreshToken) {
+            // 현재 기기(토큰 family)만 로그아웃
+            await this.authService.logoutToken(refreshToken);
+        } else if (body.userId) {
             await this.authService.logout(body.userId);
         }
 
@@ -6,6 +6,7 @@ import { JwtModule } from '@nestjs/jwt';
 import { AuthController } from './auth.controller';
 import { JwtStrategy } from './strategies/jwt.strategy';
 import { JwtRefreshStrategy } from './strategies/jwt-refresh.strategy';
+import { RefreshTokenService } from './refresh-token.service';
 
 @Module({
     imports: [
@@ -17,7 +18,7 @@ import { JwtRefreshStrategy } from './strategies/jwt-refresh.strategy';
         // However, Strategies need secret.
         // We will leave it empty here and handle secrets in Strategy/Service via process.env
     ],
-    providers: [AuthService, JwtStrategy, JwtRefreshStrategy],
+    providers: [AuthService, RefreshTokenService, JwtStrategy, JwtRefreshStrategy],
     controllers: [AuthController],
     exports: [AuthService],
 })
@@ -3,12 +3,14 @@ import { UsersService } from '../users/users.service';
 import { JwtService } from '@nestjs/jwt';
 import * as bcrypt from 'bcrypt';
 import { USERS_role } from '@prisma/client';
+import { RefreshTokenService } from './refresh-token.service';
 
 @Injectable()
 export class AuthService {
     constructor(
         private usersService: UsersService,
         private jwtService: JwtService,
+        private refreshTokens: RefreshTokenService,
     ) { }
 
     async validateUser(email: string, pass: string): Promise<any> {
@@ -41,9 +43,8 @@ export class AuthService {
         const payload = { email: user.email, sub: Number(user.user_id), role: user.role };
 
         const accessToken = this.jwtService.sign(payload, { expiresIn: '15m', secret: process.env.JWT_SECRET });
-        const refreshToken = this.jwtService.sign(payload, { expiresIn: '7d', secret: process.env.JWT_REFRESH_SECRET });
-
-        await this.usersService.setCurrentRefreshToken(refreshToken, Number(user.user_id));
+        // 로그인(기기)마다 새 토큰 family
+        const refreshToken = await this.refreshTokens.issue(payload);
 
         return {
             accessToken,
@@ -52,15 +53,29 @@ export class AuthService {
         };
     }
 
+    // 해당 사용자의 모든 기기 로그아웃
     async logout(userId: number) {
-        return this.usersService.removeRefreshToken(userId);
+        return this.refreshTokens.revokeAllForUser(userId);
+    }
+
+    // 리프레시 토큰이 속한 기기(family)만 로그아웃 (만료된 토큰도 허용)
+    async logoutToken(refreshToken: string) {
+        try {
+            const claims = this.jwtService.verify(refreshToken, { secret: process.env.JWT_REFRESH_SECRET, ignoreExpiration: true });
+            if (claims.fam) await this.refreshTokens.revokeFamily(claims.fam);
+        } catch (e) {
+            // 서명이 맞지 않는 토큰은 무시
+        }
     }
 
     async refresh(refreshToken: string) {
         try {
-            const payload = this.jwtService.verify(refreshToken, { secret: process.env.JWT_REFRESH_SECRET });
+            const claims = this.refreshTokens.verify(refreshToken);
 
-            const user = await this.usersService.getUserIfRefreshTokenMatching(refreshToken, payload.sub);
+            // 토큰 소비 (조건부 UPDATE 1회, 이미 사용된 토큰이면 family 폐기 후 401)
+            await this.refreshTokens.consume(refreshToken, claims);
+
+            const user = await this.usersService.findById(claims.sub);
 
             if (!user) {
                 throw new UnauthorizedException();
@@ -71,12 +86,10 @@ export class AuthService {
                 throw new UnauthorizedException('Access denied');
             }
 
-            // Rotate tokens
+            // Rotate tokens (같은 family 로 이어서 발급)
             const newPayload = { email: user.email, sub: Number(user.user_id), role: user.role };
             const accessToken = this.jwtService.sign(newPayload, { expiresIn: '15m', secret: process.env.JWT_SECRET });
-            const newRefreshToken = this.jwtService.sign(newPayload, { expiresIn: '7d', secret: process.env.JWT_REFRESH_SECRET });
-
-            await this.usersService.setCurrentRefreshToken(newRefreshToken, Number(user.user_id));
+            const newRefreshToken = await this.refreshTokens.issue(newPayload, claims.fam);
 
             return {
                 accessToken,
@@ -0,0 +1,108 @@
+import { Injectable, UnauthorizedException } from '@nestjs/common';
+import { JwtService } from '@nestjs/jwt';
+import { createHmac, randomUUID } from 'crypto';
+import { PrismaService } from '../prisma/prisma.service';
+
+const REFRESH_TOKEN_TTL = '7d';
+const REFRESH_TOKEN_TTL_MS = 7 * 24 * 60 * 60 * 1000;
+// 여러 탭이 같은 토큰으로 동시에 재발급하는 경우는 재사용(탈취)으로 보지 않는다
+const REUSE_GRACE_MS = 10 * 1000;
+
+export interface RefreshTokenPayload {
+    email: string;
+    sub: number;
+    role: string;
+}
+
+export interface RefreshTokenClaims extends RefreshTokenPayload {
+    jti: string;
+    fam: string;
+}
+
+/**
+ * 리프레시 토큰 저장소 (REFRESH_TOKENS, jti 단위).
+ * - 토큰은 HMAC-SHA256 으로만 저장 (bcrypt 없이 DB 유출 시에도 원문 복원 불가)
+ * - 로그인(기기)마다 family 를 만들고, 재발급은 조건부 UPDATE 1회로 기존 토큰을 소비한다
+ * - 이미 소비된 토큰이 다시 오면 family 전체를 폐기한다
+ */
+@Injectable()
+export class RefreshTokenService {
+    constructor(
+        private readonly prisma: PrismaService,
+        private readonly jwtService: JwtService,
+    ) { }
+
+    // 새 토큰 발급. familyId 가 없으면 새 family (로그인)
+    async issue(payload: RefreshTokenPayload, familyId?: string): Promise<string> {
+        const now = new Date();
+        const jti = randomUUID();
+        const family = familyId || randomUUID();
+        const token = this.jwtService.sign({ ...payload, jti, fam: family }, { expiresIn: REFRESH_TOKEN_TTL, secret: process.env.JWT_REFRESH_SECRET });
+
+        if (!familyId) {
+            // 로그인 시 만료된 토큰 정리
+            await this.prisma.rEFRESH_TOKENS.deleteMany({
+                where: { user_id: BigInt(payload.sub), expires_at: { lt: now } },
+            });
+        }
+        await this.prisma.rEFRESH_TOKENS.create({
+            data: {
+                jti,
+                user_id: BigInt(payload.sub),
+                family_id: family,
+                token_hash: this.hash(token),
+                expires_at: new Date(now.getTime() + REFRESH_TOKEN_TTL_MS),
+            },
+        });
+        return token;
+    }
+
+    // 서명/만료 검사 후 claim 반환 (jti 가 없는 이전 형식 토큰은 거부)
+    verify(token: string): RefreshTokenClaims {
+        const claims = this.jwtService.verify(token, { secret: process.env.JWT_REFRESH_SECRET });
+        if (!claims.jti || !claims.fam) throw new UnauthorizedException();
+        return claims;
+    }
+
+    /**
+     * 토큰 소비 (재발급 직전). 사용 가능한 토큰이면 used_at 을 기록하는 UPDATE 1회로 끝난다.
+     */
+    async consume(token: string, claims: RefreshTokenClaims): Promise<void> {
+        const now = new Date();
+        const tokenHash = this.hash(token);
+        const updated = await this.prisma.$executeRaw`
+            UPDATE REFRESH_TOKENS SET used_at = ${now}
+            WHERE jti = ${claims.jti} AND token_hash = ${tokenHash}
+                AND used_at IS NULL AND revoked_at IS NULL AND expires_at > ${now}`;
+        if (updated === 1) return;
+
+        const row = await this.prisma.rEFRESH_TOKENS.findUnique({
+            where: { jti: claims.jti },
+            select: { token_hash: true, family_id: true, used_at: true },
+        });
+        if (row && row.token_hash === tokenHash && row.used_at && now.getTime() - row.used_at.getTime() > REUSE_GRACE_MS) {
+            console.warn(`[RefreshToken] reuse detected, revoking family ${row.family_id} (user ${claims.sub})`);
+            await this.revokeFamily(row.family_id);
+        }
+        throw new UnauthorizedException();
+    }
+
+    async revokeFamily(familyId: string) {
+        await this.prisma.rEFRESH_TOKENS.updateMany({
+            where: { family_id: familyId, revoked_at: null },
+            data: { revoked_at: new Date() },
+        });
+    }
+
+    async revokeAllForUser(userId: number) {
+        await this.prisma.rEFRESH_TOKENS.updateMany({
+            where: { user_id: BigInt(userId), revoked_at: null },
+            data: { revoked_at: new Date() },
+        });
+    }
+
+    private hash(token: string): string {
+        const secret = process.env.REFRESH_TOKEN_HASH_SECRET || process.env.JWT_REFRESH_SECRET;
+        return createHmac('sha256', secret).update(token).digest('hex');
+    }
+}
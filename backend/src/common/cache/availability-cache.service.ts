@@ -0,0 +1,85 @@
+import { Injectable } from '@nestjs/common';
+import { TimeService } from '../time/time.service';
+import { LruCache } from './lru-cache';
+import { CacheInvalidationBus } from './cache-invalidation-bus.service';
+import type { DaySchedule } from '../../reservations/availability.service';
+
+const MAX_ENTRIES = 5000; // 매장 x 일자
+const TTL_MS = 5 * 60 * 1000; // 쓰기 경로 밖의 변경(SCHEDULE_BLOCKS 직접 수정 등)에 대한 안전장치
+
+/**
+ * 매장/일자 단위 가용 스케줄 캐시.
+ * 예약 쓰기 시에는 해당 일자만, 근무시간/휴무 변경 시에는 매장 전체를 무효화한다.
+ * 무효화는 CacheInvalidationBus 로 다른 워커에도 전달된다.
+ */
+@Injectable()
+export class AvailabilityCacheService {
+    private readonly cache = new LruCache<string, DaySchedule>(MAX_ENTRIES, TTL_MS);
+    // 매장별 세대 번호: 조회 중 무효화가 일어나면 오래된 결과를 저장하지 않도록 한다.
+    private readonly generations = new Map<string, number>();
+
+    constructor(
+        private readonly timeService: TimeService,
+        private readonly bus: CacheInvalidationBus,
+    ) {
+        bus.subscribe('availability', (event) => {
+            if (event.dates) this.dropDays(event.shopId, event.dates);
+            else this.dropShop(event.shopId);
+        });
+    }
+
+    get(shopId: number | bigint, date: string): DaySchedule | undefined {
+        return this.cache.get(this.key(shopId, date));
+    }
+
+    generation(shopId: number | bigint): number {
+        return this.generations.get(shopId.toString()) || 0;
+    }
+
+    set(shopId: number | bigint, schedule: DaySchedule, generation: number): void {
+        if (generation !== this.generation(shopId)) return;
+        this.cache.set(this.key(shopId, schedule.date), schedule);
+    }
+
+    invalidateDays(shopId: number | bigint, dates: string[]): void {
+        this.dropDays(shopId, dates);
+        this.bus.publish({ channel: 'availability', shopId, dates });
+    }
+
+    // 예약 시간 범위가 걸치는 모든 일자(KST) 무효화
+    invalidateRange(shopId: number | bigint, start: Date, end: Date): void {
+        const dates: string[] = [];
+        const last = this.timeService.parse(end).startOf('day');
+        let current = this.timeService.parse(start).startOf('day');
+        while (!current.isAfter(last) && dates.length < 31) {
+            dates.push(current.format('YYYY-MM-DD'));
+            current = current.add(1, 'day');
+        }
+        this.invalidateDays(shopId, dates);
+    }
+
+    invalidateShop(shopId: number | bigint): void {
+        this.dropShop(shopId);
+        this.bus.publish({ channel: 'availability', shopId });
+    }
+
+    private dropDays(shopId: number | bigint | string, dates: string[]): void {
+        this.bump(shopId);
+        dates.forEach(date => this.cache.delete(this.key(shopId, date)));
+    }
+
+    private dropShop(shopId: number | bigint | string): void {
+        this.bump(shopId);
+        const prefix = `${shopId.toString()}:`;
+        this.cache.deleteWhere(key => key.startsWith(prefix));
+    }
+
+    private bump(shopId: number | bigint | string): void {
+        const key = shopId.toString();
+        this.generations.set(key, (this.generations.get(key) || 0) + 1);
+    }
+
+    private key(shopId: number | bigint | string, date: string): string {
+        return `${shopId.toString()}:${date}`;
+    }
+}
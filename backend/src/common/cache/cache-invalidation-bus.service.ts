@@ -0,0 +1,146 @@
+import { Injectable, OnApplicationBootstrap, OnModuleDestroy } from '@nestjs/common';
+import { PrismaService } from '../../prisma/prisma.service';
+import { API_INSTANCES, IS_PRIMARY_WORKER, WORKER_ID } from '../../config/cluster.config';
+
+export type CacheChannel = 'availability' | 'shop-ownership' | 'gallery-feed' | 'menu-tree';
+
+export interface CacheInvalidation {
+    channel: CacheChannel;
+    shopId: number | bigint | string;
+    // 일자 단위 무효화 (없으면 매장 전체)
+    dates?: string[];
+}
+
+export interface CacheInvalidationStats {
+    enabled: boolean;
+    published: number;
+    received: number;
+    publishErrors: number;
+}
+
+const POLL_INTERVAL_MS = Number(process.env.CACHE_SYNC_INTERVAL_MS) || 1000;
+// 커밋 순서가 id 순서와 다를 수 있어 직전 조회 구간을 겹쳐 읽는다 (이미 적용한 id 는 건너뜀)
+const LOOKBACK_MS = 5000;
+const RETENTION_MS = 10 * 60 * 1000;
+const PRUNE_INTERVAL_MS = 60 * 1000;
+
+/**
+ * 워커 간 인프로세스 캐시 무효화 채널 (CACHE_INVALIDATIONS 테이블 폴링).
+ * 캐시 서비스가 로컬 캐시를 지운 뒤 publish 하면, 다른 워커가 POLL_INTERVAL_MS 이내에 같은 무효화를 적용한다.
+ * 워커가 하나면(API_INSTANCES = 1) 비활성화되며, CACHE_SYNC=true/false 로 강제할 수 있다.
+ * 놓친 이벤트는 각 캐시의 TTL 이 최종 안전장치다.
+ */
+@Injectable()
+export class CacheInvalidationBus implements OnApplicationBootstrap, OnModuleDestroy {
+    private readonly handlers = new Map<CacheChannel, ((event: CacheInvalidation) => void)[]>();
+    // 적용한 이벤트 id → 처음 본 시각
+    private readonly applied = new Map<string, number>();
+    private enabled = false;
+    private since = 0;
+    private polling = false;
+    private lastPrunedAt = 0;
+    private timer: NodeJS.Timeout;
+
+    private published = 0;
+    private received = 0;
+    private publishErrors = 0;
+
+    constructor(private readonly prisma: PrismaService) { }
+
+    onApplicationBootstrap() {
+        const setting = process.env.CACHE_SYNC;
+        this.enabled = setting ? setting === 'true' : API_INSTANCES > 1;
+        if (!this.enabled) return;
+
+        this.since = Date.now();
+        this.timer = setInterval(() => this.poll(), POLL_INTERVAL_MS);
+        this.timer.unref();
+        console.log(`[CacheSync] enabled (worker ${WORKER_ID}, every ${POLL_INTERVAL_MS}ms)`);
+    }
+
+    onModuleDestroy() {
+        clearInterval(this.timer);
+        this.enabled = false;
+    }
+
+    subscribe(channel: CacheChannel, handler: (event: CacheInvalidation) => void): void {
+        const list = this.handlers.get(channel) || [];
+        list.push(handler);
+        this.handlers.set(channel, list);
+    }
+
+    /**
+     * 다른 워커에 무효화를 알린다. 호출한 워커의 로컬 캐시는 호출한 쪽이 이미 지웠다고 가정한다.
+     * 쓰기 응답을 늦추지 않도록 기다리지 않는다.
+     */
+    publish(event: CacheInvalidation): void {
+        if (!this.enabled) return;
+        this.published++;
+        this.prisma.cACHE_INVALIDATIONS.create({
+            data: {
+                channel: event.channel,
+                shop_id: BigInt(event.shopId),
+                dates: event.dates ? event.dates.join(',') : null,
+                origin: WORKER_ID,
+                created_at: new Date(),
+            },
+        }).catch((error) => {
+            this.publishErrors++;
+            console.error(`[CacheSync] publish ${event.channel} shop=${event.shopId} failed:`, error.message);
+        });
+    }
+
+    stats(): CacheInvalidationStats {
+        return { enabled: this.enabled, published: this.published, received: this.received, publishErrors: this.publishErrors };
+    }
+
+    private async poll() {
+        if (this.polling || !this.enabled) return;
+        this.polling = true;
+        const started = Date.now();
+        try {
+            const rows = await this.prisma.cACHE_INVALIDATIONS.findMany({
+                where: { created_at: { gte: new Date(this.since - LOOKBACK_MS) } },
+                orderBy: { id: 'asc' },
+            });
+            for (const row of rows) {
+                const key = row.id.toString();
+                if (this.applied.has(key)) continue;
+                this.applied.set(key, started);
+                if (row.origin === WORKER_ID) continue;
+
+                this.received++;
+                this.dispatch({
+                    channel: row.channel as CacheChannel,
+                    shopId: row.shop_id,
+                    dates: row.dates ? row.dates.split(',') : undefined,
+                });
+            }
+            this.since = started;
+
+            for (const [key, seenAt] of this.applied) {
+                if (seenAt < started - 2 * LOOKBACK_MS) this.applied.delete(key);
+            }
+            if (IS_PRIMARY_WORKER && started - this.lastPrunedAt >= PRUNE_INTERVAL_MS) {
+                this.lastPrunedAt = started;
+                await this.prisma.cACHE_INVALIDATIONS.deleteMany({
+                    where: { created_at: { lt: new Date(started - RETENTION_MS) } },
+                });
+            }
+        } catch (error) {
+            console.error('[CacheSync] poll failed:', error.message);
+        } finally {
+            this.polling = false;
+        }
+    }
+
+    private dispatch(event: CacheInvalidation) {
+        for (const handler of this.handlers.get(event.channel) || []) {
+            try {
+                handler(event);
+            } catch (error) {
+                console.error(`[CacheSync] ${event.channel} handler failed:`, error.message);
+            }
+        }
+    }
+}
@@ -0,0 +1,13 @@
+import { Global, Module } from '@nestjs/common';
+import { AvailabilityCacheService } from './availability-cache.service';
+import { ShopOwnershipCacheService } from './shop-ownership-cache.service';
+import { GalleryFeedCacheService } from './gallery-feed-cache.service';
+import { MenuTreeCacheService } from './menu-tree-cache.service';
+import { CacheInvalidationBus } from './cache-invalidation-bus.service';
+
+@Global()
+@Module({
+    providers: [CacheInvalidationBus, AvailabilityCacheService, ShopOwnershipCacheService, GalleryFeedCacheService, MenuTreeCacheService],
+    exports: [CacheInvalidationBus, AvailabilityCacheService, ShopOwnershipCacheService, GalleryFeedCacheService, MenuTreeCacheService],
+})
+export class CacheModule { }
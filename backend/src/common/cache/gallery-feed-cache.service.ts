@@ -0,0 +1,49 @@
+import { Injectable } from '@nestjs/common';
+import { LruCache } from './lru-cache';
+import { CacheInvalidationBus } from './cache-invalidation-bus.service';
+
+const MAX_ENTRIES = 500; // (매장 | 전체) x 카테고리 x 페이지 크기
+const TTL_MS = 60 * 1000;
+
+/**
+ * 갤러리 피드 첫 페이지 캐시 (cursor 없는 요청만).
+ * 시술 기록이 저장되면 전체 피드와 해당 매장 피드를 무효화한다.
+ */
+@Injectable()
+export class GalleryFeedCacheService {
+    private readonly cache = new LruCache<string, unknown>(MAX_ENTRIES, TTL_MS);
+    // 조회 중 무효화가 일어나면 오래된 결과를 저장하지 않도록 한다.
+    private generation = 0;
+
+    constructor(private readonly bus: CacheInvalidationBus) {
+        bus.subscribe('gallery-feed', (event) => this.drop(event.shopId));
+    }
+
+    get<T>(key: string): T | undefined {
+        return this.cache.get(key) as T | undefined;
+    }
+
+    currentGeneration(): number {
+        return this.generation;
+    }
+
+    set(key: string, value: unknown, generation: number): void {
+        if (generation !== this.generation) return;
+        this.cache.set(key, value);
+    }
+
+    key(shopId: number | undefined, category: string | undefined, limit: number): string {
+        return `${shopId ?? '*'}:${category ?? '*'}:${limit}`;
+    }
+
+    invalidateShop(shopId: number | bigint): void {
+        this.drop(shopId);
+        this.bus.publish({ channel: 'gallery-feed', shopId });
+    }
+
+    private drop(shopId: number | bigint | string): void {
+        this.generation++;
+        const prefix = `${shopId.toString()}:`;
+        this.cache.deleteWhere(key => key.startsWith('*:') || key.startsWith(prefix));
+    }
+}
@@ -0,0 +1,65 @@
+interface LruEntry<V> {
+    value: V;
+    expiresAt: number;
+}
+
+/**
+ * 크기 제한 + TTL 을 갖는 인프로세스 LRU 캐시.
+ * Map 의 삽입 순서를 이용해 가장 오래 사용되지 않은 항목부터 제거한다.
+ */
+export class LruCache<K, V> {
+    private readonly entries = new Map<K, LruEntry<V>>();
+
+    constructor(
+        private readonly maxEntries: number,
+        private readonly ttlMs: number,
+    ) { }
+
+    get(key: K): V | undefined {
+        const entry = this.entries.get(key);
+        if (!entry) return undefined;
+
+        if (entry.expiresAt <= Date.now()) {
+            this.entries.delete(key);
+            return undefined;
+        }
+
+        // 최근 사용으로 갱신
+        this.entries.delete(key);
+        this.entries.set(key, entry);
+        return entry.value;
+    }
+
+    set(key: K, value: V, ttlMs: number = this.ttlMs): void {
+        this.entries.delete(key);
+        this.entries.set(key, { value, expiresAt: Date.now() + ttlMs });
+
+        while (this.entries.size > this.maxEntries) {
+            const oldestKey = this.entries.keys().next().value;
+            this.entries.delete(oldestKey);
+        }
+    }
+
+    delete(key: K): boolean {
+        return this.entries.delete(key);
+    }
+
+    deleteWhere(predicate: (key: K) => boolean): number {
+        let removed = 0;
+        for (const key of Array.from(this.entries.keys())) {
+            if (predicate(key)) {
+                this.entries.delete(key);
+                removed++;
+            }
+        }
+        return removed;
+    }
+
+    clear(): void {
+        this.entries.clear();
+    }
+
+    get size(): number {
+        return this.entries.size;
+    }
+}
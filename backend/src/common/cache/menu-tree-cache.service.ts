@@ -0,0 +1,49 @@
+import { Injectable } from '@nestjs/common';
+import { LruCache } from './lru-cache';
+import { CacheInvalidationBus } from './cache-invalidation-bus.service';
+import type { MenuSnapshot } from '../../menus/menu-tree';
+
+const MAX_ENTRIES = 2000; // 매장 수
+// 메뉴는 MenusService 쓰기마다 무효화되므로 TTL 은 메모리 회수용으로 길게 둔다.
+// ETag 는 SHOPS.menu_version 으로 만들기 때문에, 버전을 올리지 않고 DB 에서 직접 고친 메뉴는
+// TTL 이 지나 다시 읽을 때까지 이전 본문이 나가고, 그 뒤에도 같은 ETag 라 304 를 받은 클라이언트는 갱신되지 않는다.
+const TTL_MS = 10 * 60 * 1000;
+
+/**
+ * 매장별 메뉴 스냅샷(평면 목록 + 카테고리 트리 + 버전) 캐시.
+ * 메뉴 생성/수정/삭제 시 해당 매장만 무효화하며, 무효화는 CacheInvalidationBus 로 다른 워커에도 전달된다.
+ */
+@Injectable()
+export class MenuTreeCacheService {
+    private readonly cache = new LruCache<string, MenuSnapshot>(MAX_ENTRIES, TTL_MS);
+    // 매장별 세대 번호: 조회 중 무효화가 일어나면 오래된 결과를 저장하지 않도록 한다.
+    private readonly generations = new Map<string, number>();
+
+    constructor(private readonly bus: CacheInvalidationBus) {
+        bus.subscribe('menu-tree', (event) => this.drop(event.shopId));
+    }
+
+    get(shopId: number | bigint): MenuSnapshot | undefined {
+        return this.cache.get(shopId.toString());
+    }
+
+    generation(shopId: number | bigint): number {
+        return this.generations.get(shopId.toString()) || 0;
+    }
+
+    set(shopId: number | bigint, snapshot: MenuSnapshot, generation: number): void {
+        if (generation !== this.generation(shopId)) return;
+        this.cache.set(shopId.toString(), snapshot);
+    }
+
+    invalidateShop(shopId: number | bigint): void {
+        this.drop(shopId);
+        this.bus.publish({ channel: 'menu-tree', shopId });
+    }
+
+    private drop(shopId: number | bigint | string): void {
+        const key = shopId.toString();
+        this.generations.set(key, (this.generations.get(key) || 0) + 1);
+        this.cache.delete(key);
+    }
+}
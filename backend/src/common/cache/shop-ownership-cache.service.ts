@@ -0,0 +1,76 @@
+import { Injectable } from '@nestjs/common';
+import { LruCache } from './lru-cache';
+import { CacheInvalidationBus } from './cache-invalidation-bus.service';
+
+const MAX_ENTRIES = 10000; // 매장 수
+const TTL_MS = 5 * 60 * 1000; // 쓰기 경로 밖의 변경(DB 직접 수정 등)에 대한 안전장치
+
+export interface ShopOwnershipStats {
+    hits: number;
+    misses: number;
+    savedQueries: number;
+    hitRate: number;
+    size: number;
+}
+
+/**
+ * 매장 → 소유자 캐시 (ShopAuthGuard 용).
+ * 존재하지 않는 매장도 null 로 캐시하며, 매장 생성/양도/삭제 시 해당 매장만 무효화한다.
+ * 다른 워커는 CacheInvalidationBus 로 무효화되고, 재시작한 워커는 빈 캐시에서 DB 로 다시 읽는다.
+ */
+@Injectable()
+export class ShopOwnershipCacheService {
+    private readonly cache = new LruCache<string, string | null>(MAX_ENTRIES, TTL_MS);
+    // 조회 중 무효화가 일어나면 오래된 결과를 저장하지 않도록 한다.
+    private generation = 0;
+
+    private hits = 0;
+    private misses = 0;
+
+    constructor(private readonly bus: CacheInvalidationBus) {
+        bus.subscribe('shop-ownership', (event) => this.drop(event.shopId));
+    }
+
+    /**
+     * 캐시된 소유자 user_id. undefined = 미스, null = 매장 없음
+     */
+    getOwner(shopId: number | bigint | string): string | null | undefined {
+        const owner = this.cache.get(shopId.toString());
+        if (owner === undefined) this.misses++;
+        else this.hits++;
+        return owner;
+    }
+
+    currentGeneration(): number {
+        return this.generation;
+    }
+
+    /**
+     * @param generation 조회를 시작할 때의 currentGeneration(). 그 사이 무효화가 있었다면 저장하지 않는다.
+     */
+    setOwner(shopId: number | bigint | string, ownerId: number | bigint | null, generation: number): void {
+        if (generation !== this.generation) return;
+        this.cache.set(shopId.toString(), ownerId === null ? null : ownerId.toString());
+    }
+
+    invalidateShop(shopId: number | bigint | string): void {
+        this.drop(shopId);
+        this.bus.publish({ channel: 'shop-ownership', shopId });
+    }
+
+    private drop(shopId: number | bigint | string): void {
+        this.generation++;
+        this.cache.delete(shopId.toString());
+    }
+
+    stats(): ShopOwnershipStats {
+        const total = this.hits + this.misses;
+        return {
+            hits: this.hits,
+            misses: this.misses,
+            savedQueries: this.hits,
+            hitRate: total > 0 ? Number((this.hits / total).toFixed(4)) : 0,
+            size: this.cache.size,
+        };
+    }
+}
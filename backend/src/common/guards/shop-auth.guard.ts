@@ -1,10 +1,13 @@
-
 import { Injectable, CanActivate, ExecutionContext, ForbiddenException } from '@nestjs/common';
 import { PrismaService } from '../../prisma/prisma.service';
+import { ShopOwnershipCacheService } from '../cache/shop-ownership-cache.service';
 
 @Injectable()
 export class ShopAuthGuard implements CanActivate {
-    constructor(private prisma: PrismaService) { }
+    constructor(
+        private prisma: PrismaService,
+        private ownershipCache: ShopOwnershipCacheService,
+    ) { }
 
     async canActivate(context: ExecutionContext): Promise<boolean> {
         const request = context.switchToHttp().getRequest();
@@ -23,16 +26,20 @@ export class ShopAuthGuard implements CanActivate {
             return false;
         }
 
-        // 2. Check Shop Ownership
-        // Find shop by ID and Owner ID
-        const shop = await this.prisma.sHOPS.findFirst({
-            where: {
-                shop_id: BigInt(shopId),
-                owner_id: BigInt(user.userId),
-            },
-        });
+        // 2. Check Shop Ownership (캐시 미스 시에만 조회)
+        // 토큰에 담긴 소유 매장은 양도 후에도 만료까지 남으므로 쓰지 않는다.
+        let ownerId = this.ownershipCache.getOwner(shopId);
+        if (ownerId === undefined) {
+            const generation = this.ownershipCache.currentGeneration();
+            const shop = await this.prisma.sHOPS.findUnique({
+                where: { shop_id: BigInt(shopId) },
+                select: { owner_id: true },
+            });
+            this.ownershipCache.setOwner(shopId, shop ? shop.owner_id : null, generation);
+            ownerId = shop ? shop.owner_id.toString() : null;
+        }
 
-        if (!shop) {
+        if (ownerId === null || ownerId !== String(user.userId)) {
             throw new ForbiddenException('You do not have access to this shop.');
         }
 
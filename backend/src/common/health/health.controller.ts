@@ -0,0 +1,45 @@
+import { Controller, Get, Header, ServiceUnavailableException } from '@nestjs/common';
+import { HealthService } from './health.service';
+import { PrismaService } from '../../prisma/prisma.service';
+import { WORKER_ID } from '../../config/cluster.config';
+
+const READINESS_DB_TIMEOUT_MS = 1000;
+
+@Controller('health')
+export class HealthController {
+    constructor(
+        private readonly health: HealthService,
+        private readonly prisma: PrismaService,
+    ) { }
+
+    // liveness: 이벤트 루프가 응답하는지만 본다 (DB 장애로 재시작되지 않도록 DB 는 확인하지 않음)
+    @Get('live')
+    @Header('Cache-Control', 'no-store')
+    live() {
+        return { status: 'ok', worker: WORKER_ID, uptime: Math.round(process.uptime()) };
+    }
+
+    // readiness: 종료 대기 중이거나 DB 에 닿지 않으면 503
+    @Get('ready')
+    @Header('Cache-Control', 'no-store')
+    async ready() {
+        if (this.health.isDraining()) {
+            throw new ServiceUnavailableException({ status: 'draining', worker: WORKER_ID });
+        }
+
+        let timer: NodeJS.Timeout;
+        try {
+            await Promise.race([
+                this.prisma.$queryRaw`SELECT 1`,
+                new Promise((_, reject) => {
+                    timer = setTimeout(() => reject(new Error('database check timed out')), READINESS_DB_TIMEOUT_MS);
+                }),
+            ]);
+        } catch (error) {
+            throw new ServiceUnavailableException({ status: 'unavailable', worker: WORKER_ID, reason: error.message });
+        } finally {
+            clearTimeout(timer);
+        }
+        return { status: 'ok', worker: WORKER_ID };
+    }
+}
@@ -0,0 +1,17 @@
+import { Injectable } from '@nestjs/common';
+
+/**
+ * 프로세스 상태 (종료 대기 중이면 readiness 실패로 응답해 새 요청을 받지 않게 한다).
+ */
+@Injectable()
+export class HealthService {
+    private draining = false;
+
+    startDraining(): void {
+        this.draining = true;
+    }
+
+    isDraining(): boolean {
+        return this.draining;
+    }
+}
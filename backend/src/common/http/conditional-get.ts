@@ -0,0 +1,14 @@
+import { HttpStatus } from '@nestjs/common';
+import { Response } from 'express';
+
+/**
+ * ETag 조건부 GET. ETag/Cache-Control 을 설정하고, If-None-Match 가 일치하면 304 로 바꾼 뒤 true.
+ * (컨트롤러는 @Res({ passthrough: true }) 로 받은 res 를 넘기고, true 면 본문 없이 반환한다)
+ */
+export function notModified(res: Response, etag: string, ifNoneMatch: string | undefined): boolean {
+    res.setHeader('ETag', etag);
+    res.setHeader('Cache-Control', 'private, no-cache');
+    if (!ifNoneMatch || !ifNoneMatch.split(',').some(tag => tag.trim() === etag)) return false;
+    res.status(HttpStatus.NOT_MODIFIED);
+    return true;
+}
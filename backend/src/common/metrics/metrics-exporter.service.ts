@@ -0,0 +1,80 @@
+import { Injectable, OnApplicationBootstrap, OnModuleDestroy } from '@nestjs/common';
+import { createServer, Server } from 'http';
+import { MetricSample, MetricsService } from './metrics.service';
+import { PrismaService } from '../../prisma/prisma.service';
+import { ShopOwnershipCacheService } from '../cache/shop-ownership-cache.service';
+import { ImagePipelineService } from '../../uploads/image-pipeline.service';
+import { CacheInvalidationBus } from '../cache/cache-invalidation-bus.service';
+import { METRICS_PORT, WORKER_INDEX } from '../../config/cluster.config';
+
+export const METRICS_CONTENT_TYPE = 'text/plain; version=0.0.4; charset=utf-8';
+
+/**
+ * 이 워커의 지표 전체를 Prometheus text format 으로 만든다.
+ * cluster 모드에서는 API 포트(3000)로 들어온 scrape 가 임의의 워커로 분배되므로,
+ * 워커마다 127.0.0.1:(METRICS_PORT + 워커 번호) 에 전용 포트를 열어 Prometheus 가 워커별로 수집하게 한다.
+ */
+@Injectable()
+export class MetricsExporter implements OnApplicationBootstrap, OnModuleDestroy {
+    private server: Server;
+
+    constructor(
+        private readonly metrics: MetricsService,
+        private readonly prisma: PrismaService,
+        private readonly ownershipCache: ShopOwnershipCacheService,
+        private readonly imagePipeline: ImagePipelineService,
+        private readonly cacheBus: CacheInvalidationBus,
+    ) { }
+
+    onApplicationBootstrap() {
+        if (!METRICS_PORT) return;
+
+        const port = METRICS_PORT + WORKER_INDEX;
+        this.server = createServer((req, res) => {
+            if (req.method !== 'GET' || req.url?.split('?')[0] !== '/metrics') {
+                res.writeHead(404).end();
+                return;
+            }
+            this.collect().then(
+                body => res.writeHead(200, { 'Content-Type': METRICS_CONTENT_TYPE, 'Cache-Control': 'no-store' }).end(body),
+                e => {
+                    console.error('[Metrics] scrape failed:', e.message);
+                    res.writeHead(500).end();
+                },
+            );
+        });
+        // 지표 포트 때문에 종료가 늦어지지 않게 한다
+        this.server.unref();
+        this.server.on('error', e => console.error(`[Metrics] cannot listen on 127.0.0.1:${port}:`, e.message));
+        this.server.listen(port, '127.0.0.1', () => console.log(`[Metrics] worker ${WORKER_INDEX} exporting on 127.0.0.1:${port}`));
+    }
+
+    onModuleDestroy() {
+        this.server?.close();
+    }
+
+    async collect(): Promise<string> {
+        const ownership = this.ownershipCache.stats();
+        const pipeline = this.imagePipeline.stats();
+        const cacheSync = this.cacheBus.stats();
+        const samples: MetricSample[] = [
+            { name: 'shop_ownership_cache_hits_total', help: 'Shop ownership lookups served from cache', type: 'counter', value: ownership.hits },
+            { name: 'shop_ownership_cache_misses_total', help: 'Shop ownership lookups that queried the database', type: 'counter', value: ownership.misses },
+            { name: 'shop_ownership_cache_entries', help: 'Shop ownership cache size', type: 'gauge', value: ownership.size },
+            { name: 'image_pipeline_active_jobs', help: 'Images being processed', type: 'gauge', value: pipeline.active },
+            { name: 'image_pipeline_queued_jobs', help: 'Images waiting for a pipeline slot', type: 'gauge', value: pipeline.queued },
+            { name: 'cache_invalidations_published_total', help: 'Cache invalidations sent to other workers', type: 'counter', value: cacheSync.published },
+            { name: 'cache_invalidations_received_total', help: 'Cache invalidations applied from other workers', type: 'counter', value: cacheSync.received },
+            { name: 'cache_invalidations_publish_errors_total', help: 'Cache invalidations that failed to publish', type: 'counter', value: cacheSync.publishErrors },
+        ];
+
+        // 커넥션 풀 지표 (schema.prisma previewFeatures = ["metrics"])
+        let prismaMetrics = '';
+        try {
+            prismaMetrics = await this.prisma.$metrics.prometheus({ globalLabels: { worker: String(WORKER_INDEX) } });
+        } catch (e) {
+            console.warn('[Metrics] Prisma metrics unavailable:', e.message);
+        }
+        return this.metrics.render(samples) + prismaMetrics;
+    }
+}
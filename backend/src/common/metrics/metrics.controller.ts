@@ -0,0 +1,22 @@
+import { Controller, ForbiddenException, Get, Header, Headers, UnauthorizedException } from '@nestjs/common';
+import { METRICS_CONTENT_TYPE, MetricsExporter } from './metrics-exporter.service';
+
+@Controller('metrics')
+export class MetricsController {
+    constructor(private readonly exporter: MetricsExporter) { }
+
+    // 응답한 워커 하나의 지표 (워커 전체는 MetricsExporter 의 워커별 포트로 수집).
+    // API 포트로 외부에 노출되므로 Bearer METRICS_TOKEN 필요. production 에서 토큰이 없으면 닫아 둔다 (개발 환경은 토큰 없이 허용)
+    @Get()
+    @Header('Content-Type', METRICS_CONTENT_TYPE)
+    @Header('Cache-Control', 'no-store')
+    async scrape(@Headers('authorization') authorization?: string) {
+        const token = process.env.METRICS_TOKEN;
+        if (!token) {
+            if (process.env.NODE_ENV === 'production') throw new ForbiddenException('METRICS_TOKEN is not configured');
+        } else if (authorization !== `Bearer ${token}`) {
+            throw new UnauthorizedException();
+        }
+        return this.exporter.collect();
+    }
+}
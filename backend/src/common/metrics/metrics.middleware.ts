@@ -0,0 +1,53 @@
+import { Injectable, NestMiddleware } from '@nestjs/common';
+import { NextFunction, Request, Response } from 'express';
+import { performance } from 'perf_hooks';
+import { MetricsService } from './metrics.service';
+import { createRequestDbStats, requestContext } from './request-context';
+
+// 요청당 쿼리 수가 이 값 이상이면 경고 로그 (N+1 탐지)
+const QUERY_WARN_THRESHOLD = Number(process.env.METRICS_QUERY_WARN || 20);
+
+/**
+ * 요청마다 DB 쿼리 집계 컨텍스트를 열고, 응답 시 Server-Timing 헤더와 지표를 남긴다.
+ */
+@Injectable()
+export class MetricsMiddleware implements NestMiddleware {
+    constructor(private readonly metrics: MetricsService) { }
+
+    use(req: Request, res: Response, next: NextFunction) {
+        const started = performance.now();
+        const db = createRequestDbStats();
+        this.metrics.requestStarted();
+
+        // 헤더가 나가기 직전에 Server-Timing 을 붙인다
+        const writeHead = res.writeHead;
+        res.writeHead = function (this: Response, ...args: any[]) {
+            if (!res.headersSent) {
+                const total = performance.now() - started;
+                const slowest = db.slowestQuery ? `, db-slowest;dur=${db.slowestMs.toFixed(1)};desc="${db.slowestQuery}"` : '';
+                res.setHeader('Server-Timing', `db;dur=${db.durationMs.toFixed(1)};desc="${db.queries} queries"${slowest}, total;dur=${total.toFixed(1)}`);
+            }
+            return writeHead.apply(this, args);
+        } as typeof res.writeHead;
+
+        let recorded = false;
+        const record = () => {
+            if (recorded) return;
+            recorded = true;
+            // 라우트가 매칭되지 않은 요청(404 등)은 한 라벨로 묶는다
+            const route = req.route ? `${req.baseUrl}${req.route.path}` : 'unmatched';
+            this.metrics.requestFinished(req.method, route, res.statusCode, performance.now() - started, db);
+
+            if (db.queries >= QUERY_WARN_THRESHOLD) {
+                console.warn(
+                    `[Metrics] ${req.method} ${route} ran ${db.queries} queries in ${db.durationMs.toFixed(1)}ms ` +
+                    `(slowest ${db.slowestQuery} ${db.slowestMs.toFixed(1)}ms)`
+                );
+            }
+        };
+        res.on('finish', record);
+        res.on('close', record);
+
+        requestContext.run(db, () => next());
+    }
+}
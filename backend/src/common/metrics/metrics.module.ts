@@ -0,0 +1,19 @@
+import { Global, MiddlewareConsumer, Module, NestModule } from '@nestjs/common';
+import { MetricsService } from './metrics.service';
+import { MetricsController } from './metrics.controller';
+import { MetricsExporter } from './metrics-exporter.service';
+import { MetricsMiddleware } from './metrics.middleware';
+import { UploadsModule } from '../../uploads/uploads.module';
+
+@Global()
+@Module({
+    imports: [UploadsModule],
+    controllers: [MetricsController],
+    providers: [MetricsService, MetricsExporter],
+    exports: [MetricsService],
+})
+export class MetricsModule implements NestModule {
+    configure(consumer: MiddlewareConsumer) {
+        consumer.apply(MetricsMiddleware).forRoutes('*');
+    }
+}
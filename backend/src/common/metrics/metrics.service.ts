@@ -0,0 +1,125 @@
+import { Injectable } from '@nestjs/common';
+import { RequestDbStats } from './request-context';
+import { WORKER_INDEX } from '../../config/cluster.config';
+
+const DURATION_BUCKETS = [0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10];
+const QUERY_COUNT_BUCKETS = [0, 1, 2, 3, 5, 8, 13, 21, 34, 55, 89];
+
+function escapeLabel(value: string): string {
+    return value.replace(/\\/g, '\\\\').replace(/"/g, '\\"').replace(/\n/g, '\\n');
+}
+
+// 모든 시계열에 붙는 워커 라벨. cluster 모드에서 워커별 카운터가 섞여 리셋처럼 보이지 않게 한다
+const WORKER_LABEL = `worker="${WORKER_INDEX}"`;
+
+function formatLabels(names: string[], values: string[], ...extra: string[]): string {
+    const pairs = names.map((name, i) => `${name}="${escapeLabel(values[i])}"`);
+    pairs.push(...extra, WORKER_LABEL);
+    return `{${pairs.join(',')}}`;
+}
+
+interface HistogramSeries {
+    labels: string[];
+    buckets: number[];
+    sum: number;
+    count: number;
+}
+
+// Prometheus histogram (라벨 조합별 누적 버킷)
+class Histogram {
+    private readonly series = new Map<string, HistogramSeries>();
+
+    constructor(
+        private readonly name: string,
+        private readonly help: string,
+        private readonly labelNames: string[],
+        private readonly bounds: number[],
+    ) { }
+
+    observe(labels: string[], value: number): void {
+        const key = labels.join('\u0000');
+        let series = this.series.get(key);
+        if (!series) {
+            series = { labels, buckets: new Array(this.bounds.length).fill(0), sum: 0, count: 0 };
+            this.series.set(key, series);
+        }
+        for (let i = 0; i < this.bounds.length; i++) {
+            if (value <= this.bounds[i]) series.buckets[i]++;
+        }
+        series.sum += value;
+        series.count++;
+    }
+
+    render(): string[] {
+        const lines = [`# HELP ${this.name} ${this.help}`, `# TYPE ${this.name} histogram`];
+        for (const series of this.series.values()) {
+            this.bounds.forEach((bound, i) => {
+                lines.push(`${this.name}_bucket${formatLabels(this.labelNames, series.labels, `le="${bound}"`)} ${series.buckets[i]}`);
+            });
+            lines.push(`${this.name}_bucket${formatLabels(this.labelNames, series.labels, 'le="+Inf"')} ${series.count}`);
+            lines.push(`${this.name}_sum${formatLabels(this.labelNames, series.labels)} ${series.sum}`);
+            lines.push(`${this.name}_count${formatLabels(this.labelNames, series.labels)} ${series.count}`);
+        }
+        return lines;
+    }
+}
+
+export interface MetricSample {
+    name: string;
+    help: string;
+    type: 'gauge' | 'counter';
+    value: number;
+}
+
+/**
+ * HTTP 요청 / 요청당 DB 쿼리 지표 (Prometheus text format).
+ * route 라벨은 경로 템플릿(/shops/:shopId/...)이라 라벨 수가 라우트 수로 제한된다.
+ */
+@Injectable()
+export class MetricsService {
+    private readonly requestDuration = new Histogram(
+        'http_request_duration_seconds', 'HTTP request latency', ['method', 'route', 'status'], DURATION_BUCKETS,
+    );
+    private readonly dbQueries = new Histogram(
+        'http_request_db_queries', 'Database queries executed per HTTP request', ['method', 'route'], QUERY_COUNT_BUCKETS,
+    );
+    private readonly dbDuration = new Histogram(
+        'http_request_db_duration_seconds', 'Total database time per HTTP request', ['method', 'route'], DURATION_BUCKETS,
+    );
+    private readonly dbSlowest = new Histogram(
+        'http_request_db_slowest_query_seconds', 'Slowest database query per HTTP request', ['method', 'route'], DURATION_BUCKETS,
+    );
+    private inFlight = 0;
+
+    requestStarted(): void {
+        this.inFlight++;
+    }
+
+    requestFinished(method: string, route: string, status: number, durationMs: number, db: RequestDbStats): void {
+        this.inFlight--;
+        this.requestDuration.observe([method, route, String(status)], durationMs / 1000);
+        this.dbQueries.observe([method, route], db.queries);
+        this.dbDuration.observe([method, route], db.durationMs / 1000);
+        this.dbSlowest.observe([method, route], db.slowestMs / 1000);
+    }
+
+    inFlightRequests(): number {
+        return this.inFlight;
+    }
+
+    render(samples: MetricSample[] = []): string {
+        const lines = [
+            ...this.requestDuration.render(),
+            ...this.dbQueries.render(),
+            ...this.dbDuration.render(),
+            ...this.dbSlowest.render(),
+            '# HELP http_requests_in_flight HTTP requests currently being served',
+            '# TYPE http_requests_in_flight gauge',
+            `http_requests_in_flight{${WORKER_LABEL}} ${this.inFlight}`,
+        ];
+        for (const sample of samples) {
+            lines.push(`# HELP ${sample.name} ${sample.help}`, `# TYPE ${sample.name} ${sample.type}`, `${sample.name}{${WORKER_LABEL}} ${sample.value}`);
+        }
+        return lines.join('\n') + '\n';
+    }
+}
@@ -0,0 +1,28 @@
+import { AsyncLocalStorage } from 'async_hooks';
+
+// 요청 1건 동안 실행된 DB 쿼리 집계
+export interface RequestDbStats {
+    queries: number;
+    durationMs: number;
+    slowestMs: number;
+    slowestQuery: string | null;
+}
+
+export const requestContext = new AsyncLocalStorage<RequestDbStats>();
+
+export function createRequestDbStats(): RequestDbStats {
+    return { queries: 0, durationMs: 0, slowestMs: 0, slowestQuery: null };
+}
+
+// 현재 요청에 쿼리 1건을 더한다 (요청 밖에서 실행된 쿼리는 무시)
+export function recordQuery(query: string, durationMs: number): void {
+    const stats = requestContext.getStore();
+    if (!stats) return;
+
+    stats.queries++;
+    stats.durationMs += durationMs;
+    if (durationMs > stats.slowestMs) {
+        stats.slowestMs = durationMs;
+        stats.slowestQuery = query;
+    }
+}
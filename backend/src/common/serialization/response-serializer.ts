@@ -0,0 +1,164 @@
+/**
+ * 스키마 기반 응답 직렬화.
+ * 응답 DTO 스키마마다 한 번, Prisma 행에서 선언한 필드만 JSON 값으로 옮겨 담는 함수를 생성(new Function)해 두고
+ * 결과를 JSON.stringify 한 번으로 직렬화한다.
+ *  - 스프레드 복사 + 필드 덮어쓰기 대신 고정된 모양의 객체 리터럴 하나만 만든다
+ *  - BigInt/Date 는 여기서 변환해 JSON.stringify 가 toJSON 을 호출하지 않는다 (네이티브 경로)
+ *  - 문자열 이어붙이기로 JSON 을 직접 쓰는 방식은 V8 의 JSON.stringify 보다 느렸다 (scripts/bench_serializer.ts)
+ *
+ * 값 규칙은 JSON.stringify(+ main.ts 의 BigInt.prototype.toJSON)와 같다.
+ *  - undefined 필드는 생략, 배열 안의 undefined 는 null
+ *  - 스키마에 없는 필드는 출력하지 않는다 (스키마가 응답 계약)
+ *  - 선언한 타입과 다른 값은 변환하지 않고 그대로 JSON.stringify 에 맡긴다
+ */
+
+type ScalarKind = 'id' | 'idString' | 'number' | 'string' | 'boolean' | 'date' | 'time' | 'any';
+
+export type FieldSchema =
+    | { kind: ScalarKind }
+    | { kind: 'object'; fields: Record<string, FieldSchema> }
+    | { kind: 'array'; items: FieldSchema }
+    | { kind: 'from'; get: (parent: any) => unknown; type: FieldSchema };
+
+export type Serializer = (value: unknown) => string;
+
+export const t = {
+    // BigInt → 숫자 (BigInt.prototype.toJSON 과 같은 표현)
+    id: { kind: 'id' } as FieldSchema,
+    // BigInt → 문자열 ("123")
+    idString: { kind: 'idString' } as FieldSchema,
+    number: { kind: 'number' } as FieldSchema,
+    string: { kind: 'string' } as FieldSchema,
+    boolean: { kind: 'boolean' } as FieldSchema,
+    // Date → ISO 8601 (toISOString)
+    date: { kind: 'date' } as FieldSchema,
+    // TIME 컬럼 → 'HH:mm' (UTC 벽시계, TimeService.toUtcTimeStr 과 동일)
+    time: { kind: 'time' } as FieldSchema,
+    // 구조를 고정하지 않는 값 (JSON.stringify 에 그대로 전달)
+    any: { kind: 'any' } as FieldSchema,
+    object: (fields: Record<string, FieldSchema>): FieldSchema => ({ kind: 'object', fields }),
+    array: (items: FieldSchema): FieldSchema => ({ kind: 'array', items }),
+    // 다른 필드(관계 포함)에서 꺼낸 값
+    from: (get: (parent: any) => unknown, type: FieldSchema): FieldSchema => ({ kind: 'from', get, type }),
+};
+
+const DAY_MS = 24 * 60 * 60 * 1000;
+const MAX_ISO_MS = 253402300800000; // 10000-01-01T00:00:00Z (이후는 toISOString 이 확장 연도 표기)
+const MAX_CACHED_DAYS = 4096;
+
+const pad = (n: number, width: number) => String(n).padStart(width, '0');
+const MILLIS = Array.from({ length: 1000 }, (_, i) => `.${pad(i, 3)}Z`);
+const MINUTES = Array.from({ length: 24 * 60 }, (_, i) => `${pad(Math.floor(i / 60), 2)}:${pad(i % 60, 2)}`);
+const SECONDS = Array.from({ length: 24 * 60 * 60 }, (_, i) => `T${MINUTES[Math.floor(i / 60)]}:${pad(i % 60, 2)}`);
+// 일 번호 → 'YYYY-MM-DD' (목록 응답은 같은 날짜가 반복된다)
+const dayPrefixes = new Map<number, string>();
+
+// 생성된 코드가 쓰는 보조 함수
+const helpers = {
+    // Date.prototype.toISOString 과 같은 결과를 날짜 부분 캐시 + 시각 테이블로 만든다
+    date(value: Date): string | null {
+        const ms = value.getTime();
+        if (!(ms >= 0 && ms < MAX_ISO_MS)) return isNaN(ms) ? null : value.toISOString();
+
+        const day = Math.floor(ms / DAY_MS);
+        let prefix = dayPrefixes.get(day);
+        if (prefix === undefined) {
+            if (dayPrefixes.size >= MAX_CACHED_DAYS) dayPrefixes.clear();
+            prefix = value.toISOString().slice(0, 10);
+            dayPrefixes.set(day, prefix);
+        }
+        const rest = ms - day * DAY_MS;
+        const second = Math.floor(rest / 1000);
+        return prefix + SECONDS[second] + MILLIS[rest - second * 1000];
+    },
+    time(value: Date): string | null {
+        const ms = value.getTime();
+        if (isNaN(ms)) return null;
+        return MINUTES[Math.floor((((ms % DAY_MS) + DAY_MS) % DAY_MS) / 60000)];
+    },
+};
+
+class ProjectionCompiler {
+    // 중첩 객체/배열 변환 함수와 from getter
+    private readonly fns: Function[] = [];
+
+    compile(schema: FieldSchema): (value: unknown) => unknown {
+        return this.fns[this.fn(schema)] as (value: unknown) => unknown;
+    }
+
+    // schema 값을 변환하는 함수를 등록하고 f 배열 인덱스를 돌려준다
+    private fn(schema: FieldSchema): number {
+        const index = this.fns.length;
+        this.fns.push(null);
+
+        let body: string;
+        if (schema.kind === 'object') {
+            const reads: string[] = [];
+            const props: string[] = [];
+            Object.entries(schema.fields).forEach(([name, field], i) => {
+                const type = field.kind === 'from' ? field.type : field;
+                reads.push(`x${i} = ${field.kind === 'from' ? `f[${this.register(field.get)}](v)` : `v[${JSON.stringify(name)}]`}`);
+                props.push(`${JSON.stringify(name)}: ${this.value(type, `x${i}`)}`);
+            });
+            body = [
+                'if (v === null || v === undefined) return v;',
+                reads.length ? `var ${reads.join(', ')};` : '',
+                `return { ${props.join(', ')} };`,
+            ].join('\n');
+        } else if (schema.kind === 'array') {
+            body = [
+                'if (v === null || v === undefined) return v;',
+                'var n = v.length, out = new Array(n), x;',
+                `for (var i = 0; i < n; i++) { x = v[i]; out[i] = x === undefined ? null : ${this.value(schema.items, 'x')}; }`,
+                'return out;',
+            ].join('\n');
+        } else {
+            body = `return ${this.value(schema, 'v')};`;
+        }
+
+        this.fns[index] = new Function('h', 'f', `return function (v) {\n${body}\n};`)(helpers, this.fns);
+        return index;
+    }
+
+    private register(get: (parent: any) => unknown): number {
+        this.fns.push(get);
+        return this.fns.length - 1;
+    }
+
+    // 변수 x 의 JSON 값을 만드는 식 (null/undefined 는 그대로 둔다)
+    private value(schema: FieldSchema, x: string): string {
+        switch (schema.kind) {
+            case 'id':
+                return `(typeof ${x} === 'bigint' ? Number(${x}) : ${x})`;
+            case 'idString':
+                return `(typeof ${x} === 'bigint' || typeof ${x} === 'number' ? '' + ${x} : ${x})`;
+            case 'date':
+                return `(${x} instanceof Date ? h.date(${x}) : ${x})`;
+            case 'time':
+                return `(${x} instanceof Date ? h.time(${x}) : ${x})`;
+            case 'object':
+            case 'array':
+                return `f[${this.fn(schema)}](${x})`;
+            case 'from':
+                throw new Error('t.from() can only be used as an object field');
+            default:
+                // number / string / boolean / any: JSON.stringify 가 그대로 처리
+                return x;
+        }
+    }
+}
+
+const compiled = new WeakMap<FieldSchema, Serializer>();
+
+/**
+ * 스키마별 직렬화 함수 (스키마 객체당 한 번만 생성)
+ */
+export function compileSerializer(schema: FieldSchema): Serializer {
+    let serializer = compiled.get(schema);
+    if (!serializer) {
+        const project = new ProjectionCompiler().compile(schema);
+        serializer = (value: unknown) => JSON.stringify(project(value));
+        compiled.set(schema, serializer);
+    }
+    return serializer;
+}
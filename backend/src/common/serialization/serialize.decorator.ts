@@ -0,0 +1,10 @@
+import { SetMetadata } from '@nestjs/common';
+import { FieldSchema, compileSerializer } from './response-serializer';
+
+export const RESPONSE_SERIALIZER = 'response:serializer';
+
+/**
+ * 응답 본문을 스키마로 직렬화 (SerializerInterceptor).
+ * 직렬화 함수는 데코레이터가 평가될 때(앱 시작 시) 한 번 만든다.
+ */
+export const Serialize = (schema: FieldSchema) => SetMetadata(RESPONSE_SERIALIZER, compileSerializer(schema));
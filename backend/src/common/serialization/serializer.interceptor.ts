@@ -0,0 +1,29 @@
+import { CallHandler, ExecutionContext, Injectable, NestInterceptor } from '@nestjs/common';
+import { Reflector } from '@nestjs/core';
+import { Response } from 'express';
+import { Observable } from 'rxjs';
+import { map } from 'rxjs/operators';
+import { Serializer } from './response-serializer';
+import { RESPONSE_SERIALIZER } from './serialize.decorator';
+
+/**
+ * @Serialize 가 붙은 핸들러의 반환값을 JSON 문자열로 직렬화해 보낸다.
+ * 없는 핸들러는 그대로 (Nest 기본 JSON 응답).
+ */
+@Injectable()
+export class SerializerInterceptor implements NestInterceptor {
+    constructor(private readonly reflector: Reflector) { }
+
+    intercept(context: ExecutionContext, next: CallHandler): Observable<unknown> {
+        const serializer = this.reflector.get<Serializer>(RESPONSE_SERIALIZER, context.getHandler());
+        if (!serializer || context.getType() !== 'http') return next.handle();
+
+        const res = context.switchToHttp().getResponse<Response>();
+        return next.handle().pipe(map((data) => {
+            // 본문 없는 응답(304 등)과 null 은 기본 처리에 맡긴다
+            if (data === undefined || data === null || res.headersSent) return data;
+            res.setHeader('Content-Type', 'application/json; charset=utf-8');
+            return serializer(data);
+        }));
+    }
+}
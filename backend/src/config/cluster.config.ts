@@ -0,0 +1,32 @@
+import { hostname } from 'os';
+
+// PM2 cluster 모드의 워커 수 (ecosystem.config.js 가 설정, 단일 프로세스 실행 시 1)
+export const API_INSTANCES = Math.max(1, Number(process.env.API_INSTANCES) || 1);
+
+// PM2 워커 번호 (0 ~ API_INSTANCES-1, 재시작해도 유지된다)
+export const WORKER_INDEX = Number(process.env.NODE_APP_INSTANCE) || 0;
+
+// 워커 식별자 (캐시 무효화 이벤트의 발신자 구분용, 재시작해도 pid 가 바뀌므로 겹치지 않는다)
+export const WORKER_ID = `${hostname()}:${WORKER_INDEX}:${process.pid}`;
+
+// 워커 하나만 맡는 주기 작업(오래된 무효화 이벤트 정리 등)
+export const IS_PRIMARY_WORKER = WORKER_INDEX === 0;
+
+// API 전체(모든 워커 합산)가 쓸 수 있는 DB 커넥션 수. MySQL max_connections 에서 배치/관리용 여유를 뺀 값으로 둔다.
+export const DB_CONNECTION_BUDGET = Math.max(1, Number(process.env.DB_CONNECTION_BUDGET) || 60);
+
+// 워커별 지표 포트의 시작 번호 (워커 N 은 METRICS_PORT + N 을 127.0.0.1 에서 연다, 0 이면 끔)
+export const METRICS_PORT = Number(process.env.METRICS_PORT ?? 9300) || 0;
+
+// 종료 신호 후 처리 중인 요청을 기다리는 최대 시간 (PM2 kill_timeout 보다 짧아야 한다)
+export const SHUTDOWN_TIMEOUT_MS = Number(process.env.SHUTDOWN_TIMEOUT_MS) || 10000;
+
+/**
+ * DATABASE_URL 에 워커당 커넥션 풀 크기를 붙인다.
+ * URL 에 connection_limit 이 이미 있으면 그대로 둔다.
+ */
+export function workerDatabaseUrl(url: string | undefined): string | undefined {
+    if (!url || /[?&]connection_limit=/.test(url)) return url;
+    const limit = Math.max(2, Math.floor(DB_CONNECTION_BUDGET / API_INSTANCES));
+    return `${url}${url.includes('?') ? '&' : '?'}connection_limit=${limit}`;
+}
@@ -1,4 +1,28 @@
 import { join } from 'path';
+import { tmpdir } from 'os';
 
 export const UPLOAD_ROOT = join(process.cwd(), 'uploads');
 export const UPLOAD_CATEGORIES = ['designers', 'visit-logs', 'menus', 'shops', 'others'];
+
+// 업로드 원본을 잠시 보관하는 디렉터리 (정적 서빙 경로 밖, 처리 후 삭제)
+export const UPLOAD_TMP_DIR = join(tmpdir(), 'uploads-incoming');
+
+// 업로드 1건당 생성하는 이미지 변형 (최대 너비, 원본보다 크게 늘리지 않음)
+export const IMAGE_VARIANTS = [
+    { name: 'thumb', width: 320 },
+    { name: 'medium', width: 800 },
+    { name: 'large', width: 1920 },
+] as const;
+export type ImageVariantName = typeof IMAGE_VARIANTS[number]['name'];
+export type ImageFormat = 'jpg' | 'webp';
+
+const VARIANT_URL_PATTERN = /^(.*\/[0-9a-f]+)_(thumb|medium|large)\.(jpg|webp)$/;
+
+/**
+ * 저장된 이미지 URL 의 다른 변형 URL.
+ * 변형 없이 저장된 기존 업로드(단일 1920px JPEG)는 그대로 반환한다.
+ */
+export function variantUrl(url: string, variant: ImageVariantName, format: ImageFormat = 'jpg'): string {
+    const match = typeof url === 'string' ? VARIANT_URL_PATTERN.exec(url) : null;
+    return match ? `${match[1]}_${variant}.${format}` : url;
+}
@@ -0,0 +1,112 @@
+import { Injectable } from '@nestjs/common';
+import { Prisma, RESERVATIONS_status } from '@prisma/client';
+import type { RollupClient } from '../sales/sales-rollup.service';
+import { CustomerSearchIndexService } from '../users/customer-search-index.service';
+
+// 등급 규칙 (CustomersService.findOne 과 동일)
+const gradeSql = (noshow: string, visit: string, pay: string) => Prisma.raw(`
+    CASE
+        WHEN ${noshow} >= 2 THEN 'CAUTION'
+        WHEN ${visit} >= 10 OR ${pay} >= 1000000 THEN 'VIP'
+        WHEN ${visit} <= 1 THEN 'NEW'
+        ELSE 'NORMAL'
+    END`);
+
+// 예약 1건의 시술 금액 합
+const ITEM_TOTAL_SQL = Prisma.raw(
+    `COALESCE((SELECT SUM(i.price) FROM RESERVATION_ITEMS i WHERE i.reservation_id = r.reservation_id), 0)`
+);
+
+/**
+ * 매장별 고객 통계(CUSTOMER_SHOP_STATS) 유지.
+ * 예약 생성/완료는 해당 행만 가산하고, 그 외 변경(상태/금액 수정, 삭제)은 고객 1명 단위로 재계산한다.
+ * 통계 행이 새로 생기면(매장 고객이 되면) 고객 검색 색인(CustomerSearchIndexService)에도 추가한다.
+ */
+@Injectable()
+export class CustomerStatsService {
+    constructor(private readonly searchIndex: CustomerSearchIndexService) { }
+
+    // 예약 생성: 예약 수 +1 (행이 없으면 생성, 새로 매장 고객이 되면 검색 색인)
+    async applyReservationCreated(db: RollupClient, reservationId: bigint) {
+        const affected = await db.$executeRaw`
+            INSERT INTO CUSTOMER_SHOP_STATS (shop_id, user_id, reservation_count)
+            SELECT r.shop_id, r.customer_id, 1
+            FROM RESERVATIONS r
+            JOIN USERS u ON u.user_id = r.customer_id
+            WHERE r.reservation_id = ${reservationId} AND u.role = 'CUSTOMER'
+            ON DUPLICATE KEY UPDATE reservation_count = reservation_count + 1`;
+
+        // ON DUPLICATE KEY UPDATE: 새 행이면 1, 갱신이면 2
+        if (affected === 1) {
+            const reservation = await db.rESERVATIONS.findUnique({
+                where: { reservation_id: reservationId },
+                select: { shop_id: true, customer_id: true },
+            });
+            await this.searchIndex.indexMissing(db, reservation.shop_id, [reservation.customer_id]);
+        }
+    }
+
+    /**
+     * 예약 완료: 방문 수 / 결제 금액 / 마지막 방문일 가산.
+     * 이전 상태가 이미 통계에 반영된 상태(COMPLETED, NOSHOW)라면 재계산한다.
+     */
+    async applyCompletion(db: RollupClient, shopId: number | bigint, customerId: bigint, reservationId: bigint, previousStatus?: RESERVATIONS_status) {
+        if (previousStatus === 'COMPLETED' || previousStatus === 'NOSHOW') {
+            await this.refreshCustomer(db, shopId, customerId);
+            return;
+        }
+
+        // ON DUPLICATE KEY UPDATE 의 대입은 왼쪽부터 적용되므로 grade 는 갱신된 값으로 계산된다
+        const affected = await db.$executeRaw`
+            INSERT INTO CUSTOMER_SHOP_STATS (shop_id, user_id, reservation_count, visit_count, total_pay, last_visit_at, grade)
+            SELECT r.shop_id, r.customer_id, 1, 1, ${ITEM_TOTAL_SQL}, r.start_time,
+                IF(${ITEM_TOTAL_SQL} >= 1000000, 'VIP', 'NEW')
+            FROM RESERVATIONS r
+            JOIN USERS u ON u.user_id = r.customer_id
+            WHERE r.reservation_id = ${reservationId} AND u.role = 'CUSTOMER'
+            ON DUPLICATE KEY UPDATE
+                visit_count = visit_count + 1,
+                total_pay = total_pay + VALUES(total_pay),
+                last_visit_at = IF(last_visit_at IS NULL OR last_visit_at < VALUES(last_visit_at), VALUES(last_visit_at), last_visit_at),
+                grade = ${gradeSql('noshow_count', 'visit_count', 'total_pay')}`;
+
+        if (affected === 1) {
+            await this.searchIndex.indexMissing(db, shopId, [customerId]);
+        }
+    }
+
+    // 고객 1명의 매장 통계를 원천 테이블에서 다시 만든다 (예약이 없으면 행 삭제)
+    async refreshCustomer(db: RollupClient, shopId: number | bigint, customerId: bigint) {
+        const shop = BigInt(shopId);
+        await db.$executeRaw`DELETE FROM CUSTOMER_SHOP_STATS WHERE shop_id = ${shop} AND user_id = ${customerId}`;
+        await db.$executeRaw(this.aggregateSql(Prisma.sql`r.shop_id = ${shop} AND r.customer_id = ${customerId}`));
+        await this.searchIndex.indexMissing(db, shop, [customerId]);
+    }
+
+    // 매장 전체 재계산 (대량 적재/백필 후)
+    async refreshShop(db: RollupClient, shopId: number | bigint) {
+        const shop = BigInt(shopId);
+        await db.$executeRaw`DELETE FROM CUSTOMER_SHOP_STATS WHERE shop_id = ${shop}`;
+        await db.$executeRaw(this.aggregateSql(Prisma.sql`r.shop_id = ${shop}`));
+        await this.searchIndex.indexMissing(db, shop);
+    }
+
+    private aggregateSql(where: Prisma.Sql): Prisma.Sql {
+        return Prisma.sql`
+            INSERT INTO CUSTOMER_SHOP_STATS (shop_id, user_id, reservation_count, visit_count, noshow_count, total_pay, last_visit_at, grade)
+            SELECT agg.shop_id, agg.user_id, agg.reservation_count, agg.visit_count, agg.noshow_count, agg.total_pay, agg.last_visit_at,
+                ${gradeSql('agg.noshow_count', 'agg.visit_count', 'agg.total_pay')}
+            FROM (
+                SELECT r.shop_id, r.customer_id AS user_id,
+                    COUNT(*) AS reservation_count,
+                    SUM(r.status = 'COMPLETED') AS visit_count,
+                    SUM(r.status = 'NOSHOW') AS noshow_count,
+                    COALESCE(SUM(IF(r.status = 'COMPLETED', ${ITEM_TOTAL_SQL}, 0)), 0) AS total_pay,
+                    MAX(IF(r.status = 'COMPLETED', r.start_time, NULL)) AS last_visit_at
+                FROM RESERVATIONS r
+                JOIN USERS u ON u.user_id = r.customer_id
+                WHERE ${where} AND u.role = 'CUSTOMER'
+                GROUP BY r.shop_id, r.customer_id
+            ) agg`;
+    }
+}
@@ -1,10 +1,13 @@
 import { Controller, Get, Post, Body, Param, Query, ParseIntPipe, UseGuards } from '@nestjs/common';
-import { CustomersService } from './customers.service';
+import { CustomersService, CustomerSort } from './customers.service';
 import { UsersService } from '../users/users.service';
+import { CustomerSearchIndexService } from '../users/customer-search-index.service';
 import { CreateUserDto } from '../users/dto/create-user.dto';
 import { JwtAuthGuard } from '../auth/guards/jwt-auth.guard';
 import { ShopAuthGuard } from '../common/guards/shop-auth.guard';
 import { User } from '../common/decorators/user.decorator';
+import { Serialize } from '../common/serialization/serialize.decorator';
+import { CUSTOMER_LIST_RESPONSE } from './dto/customer-response.dto';
 
 @Controller('shops/:shopId/customers')
 @UseGuards(JwtAuthGuard, ShopAuthGuard)
@@ -12,14 +15,34 @@ export class CustomersController {
     constructor(
         private readonly customersService: CustomersService,
         private readonly usersService: UsersService,
+        private readonly searchIndex: CustomerSearchIndexService,
     ) { }
 
     @Get()
+    @Serialize(CUSTOMER_LIST_RESPONSE)
     async findAll(
         @Param('shopId', ParseIntPipe) shopId: number,
-        @Query('search') search?: string
+        @Query('search') search?: string,
+        @Query('sort') sort?: CustomerSort,
+        @Query('cursor') cursor?: string,
+        @Query('limit') limit?: string
     ) {
-        return this.customersService.findAll(shopId, search);
+        return this.customersService.findAll(shopId, {
+            search,
+            sort,
+            cursor,
+            limit: limit ? Number(limit) || undefined : undefined,
+        });
+    }
+
+    // 예약 모달 고객 검색 (전화번호 일부 / 이름 일부 / 초성, 최근 방문 순 상위 limit 명)
+    @Get('search')
+    async search(
+        @Param('shopId', ParseIntPipe) shopId: number,
+        @Query('q') q?: string,
+        @Query('limit') limit?: string
+    ) {
+        return this.searchIndex.search(shopId, q, limit ? Number(limit) || undefined : undefined);
     }
 
     @Get(':id')
@@ -30,6 +53,37 @@ export class CustomersController {
         return this.customersService.findOne(shopId, id);
     }
 
+    // 고객 요약 (등급, 방문/노쇼/예약 수, 누적 결제, 마지막 방문)
+    @Get(':id/summary')
+    async findSummary(
+        @Param('shopId', ParseIntPipe) shopId: number,
+        @Param('id', ParseIntPipe) id: number
+    ) {
+        return this.customersService.findSummary(shopId, id);
+    }
+
+    // 시술 이력 다음 페이지 (최근 예약 순)
+    @Get(':id/history')
+    async findHistory(
+        @Param('shopId', ParseIntPipe) shopId: number,
+        @Param('id', ParseIntPipe) id: number,
+        @Query('cursor') cursor?: string,
+        @Query('limit') limit?: string
+    ) {
+        return this.customersService.findHistory(shopId, id, cursor, limit ? Number(limit) || undefined : undefined);
+    }
+
+    // 메모 타임라인 다음 페이지 (예약 요청 메모 + 일반 메모, 최근 순)
+    @Get(':id/timeline')
+    async findTimeline(
+        @Param('shopId', ParseIntPipe) shopId: number,
+        @Param('id', ParseIntPipe) id: number,
+        @Query('cursor') cursor?: string,
+        @Query('limit') limit?: string
+    ) {
+        return this.customersService.findTimeline(shopId, id, cursor, limit ? Number(limit) || undefined : undefined);
+    }
+
     @Post()
     async create(
         @Param('shopId', ParseIntPipe) shopId: number,
@@ -1,5 +1,6 @@
 import { Module } from '@nestjs/common';
 import { CustomersService } from './customers.service';
+import { CustomerStatsService } from './customer-stats.service';
 import { CustomersController } from './customers.controller';
 import { PrismaModule } from '../prisma/prisma.module';
 import { UsersModule } from '../users/users.module';
@@ -7,6 +8,7 @@ import { UsersModule } from '../users/users.module';
 @Module({
     imports: [PrismaModule, UsersModule],
     controllers: [CustomersController],
-    providers: [CustomersService],
+    providers: [CustomersService, CustomerStatsService],
+    exports: [CustomerStatsService],
 })
 export class CustomersModule { }
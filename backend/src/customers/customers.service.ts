@@ -1,7 +1,39 @@
-import { Injectable, NotFoundException } from '@nestjs/common';
+import { BadRequestException, Injectable, NotFoundException } from '@nestjs/common';
+import { Prisma } from '@prisma/client';
 import { PrismaService } from '../prisma/prisma.service';
 import { TimeService } from '../common/time/time.service';
 
+export const CUSTOMER_SORT_COLUMNS = {
+    lastVisit: 'last_visit_at',
+    totalPay: 'total_pay',
+    visitCount: 'visit_count',
+} as const;
+export type CustomerSort = keyof typeof CUSTOMER_SORT_COLUMNS;
+type CustomerSortColumn = typeof CUSTOMER_SORT_COLUMNS[CustomerSort];
+
+export const DEFAULT_CUSTOMER_PAGE_SIZE = 50;
+export const MAX_CUSTOMER_PAGE_SIZE = 200;
+
+export const DEFAULT_TIMELINE_PAGE_SIZE = 20;
+export const MAX_TIMELINE_PAGE_SIZE = 100;
+
+// 타임라인 항목 종류 (정렬에서 같은 시각이면 RESERVATION 이 먼저)
+const TIMELINE_TYPES = ['RESERVATION', 'GENERAL'] as const;
+type TimelineType = typeof TIMELINE_TYPES[number];
+
+interface TimelineCursor {
+    at: Date;
+    type: TimelineType;
+    id: bigint;
+}
+
+export interface CustomerListQuery {
+    search?: string;
+    sort?: CustomerSort;
+    cursor?: string;
+    limit?: number;
+}
+
 @Injectable()
 export class CustomersService {
     constructor(
@@ -9,181 +41,274 @@ export class CustomersService {
         private readonly timeService: TimeService // Inject TimeService
     ) { }
 
-    async findAll(shopId: number, search?: string) {
-        const whereClause: any = {
-            role: 'CUSTOMER',
-            RESERVATIONS: {
-                some: {
-                    shop_id: BigInt(shopId)
-                }
-            }
-        };
+    /**
+     * 고객 목록 (CUSTOMER_SHOP_STATS 기반 keyset 페이지네이션)
+     * 정렬: lastVisit | totalPay | visitCount (내림차순, 동률은 user_id 내림차순)
+     */
+    async findAll(shopId: number, query: CustomerListQuery = {}) {
+        const sort = query.sort || 'lastVisit';
+        if (!Object.prototype.hasOwnProperty.call(CUSTOMER_SORT_COLUMNS, sort)) {
+            throw new BadRequestException(`sort 는 ${Object.keys(CUSTOMER_SORT_COLUMNS).join('|')} 중 하나여야 합니다.`);
+        }
+        const column = CUSTOMER_SORT_COLUMNS[sort];
+        const limit = Math.min(Math.max(query.limit || DEFAULT_CUSTOMER_PAGE_SIZE, 1), MAX_CUSTOMER_PAGE_SIZE);
 
-        if (search) {
-            whereClause.OR = [
-                { name: { contains: search } },
-                { phone: { contains: search } },
-            ];
+        const where: Prisma.CUSTOMER_SHOP_STATSWhereInput = { shop_id: BigInt(shopId) };
+        if (query.search) {
+            where.USERS = {
+                OR: [
+                    { name: { contains: query.search } },
+                    { phone: { contains: query.search } },
+                ],
+            };
+        }
+        if (query.cursor) {
+            where.AND = [this.cursorCondition(column, this.decodeCursor(query.cursor, column))];
         }
 
-        const users = await this.prisma.uSERS.findMany({
-            where: whereClause,
+        const rows = await this.prisma.cUSTOMER_SHOP_STATS.findMany({
+            where,
+            // MySQL 은 DESC 정렬 시 NULL 이 마지막 (방문 이력 없는 고객은 뒤로)
+            orderBy: [{ [column]: 'desc' } as Prisma.CUSTOMER_SHOP_STATSOrderByWithRelationInput, { user_id: 'desc' }],
+            take: limit + 1,
             include: {
-                RESERVATIONS: {
-                    where: { shop_id: BigInt(shopId) }, // Only consider this shop's reservations
-                    orderBy: { start_time: 'desc' },
-                    include: {
-                        RESERVATION_ITEMS: {
-                            select: { price: true }
-                        }
-                    }
-                },
-                target_user_memos: { // Keep original memo include for now, though new code doesn't use it in findAll return
-                    orderBy: {
-                        memo_id: 'desc'
-                    },
-                    take: 1
-                }
+                USERS: { select: { name: true, phone: true, gender: true, created_at: true } },
             },
-            orderBy: { created_at: 'desc' },
         });
 
-        // Map to Stats DTO
-        return users.map(user => {
-            // The new code assumes payment_amount and ticket_name are directly on RESERVATIONS.
-            // If RESERVATION_ITEMS are still needed for total_pay, the include for RESERVATIONS needs to be adjusted.
-            // For now, I'll adapt to the new structure assuming payment_amount is directly on RESERVATIONS.
-            const totalPay = user.RESERVATIONS.reduce((sum, r) => {
-                const reservationTotal = (r as any).RESERVATION_ITEMS?.reduce((iSum, item) => iSum + item.price, 0) || 0;
-                return sum + reservationTotal;
-            }, 0);
-            const visitCount = user.RESERVATIONS.filter(r => r.status === 'COMPLETED').length;
-            const lastVisit = user.RESERVATIONS[0]?.start_time || null;
-            const latestMemo = user.target_user_memos?.[0]?.content || ''; // Re-added memo from original findAll
-
-            return {
-                id: Number(user.user_id),
-                name: user.name,
-                phone: user.phone,
-                gender: user.gender,
-                grade: this.calculateGrade(visitCount, totalPay, user.RESERVATIONS.filter(r => r.status === 'NOSHOW').length), // Pass noshowCount for grade calculation
-                created_at: user.created_at.toISOString(),
-                visit_count: visitCount,
-                last_visit: lastVisit ? lastVisit.toISOString() : null,
-                total_pay: totalPay,
-                memo: latestMemo, // Use latestMemo
-            };
-        });
+        const page = rows.slice(0, limit);
+        const last = page[page.length - 1];
+        const nextCursor = rows.length > limit && last ? this.encodeCursor(last[column], last.user_id) : null;
+
+        // 페이지 고객들의 최신 메모를 한 번에 조회
+        const memoMap = new Map<string, string>();
+        if (page.length > 0) {
+            const memos = await this.prisma.$queryRaw<{ user_id: bigint; content: string }[]>`
+                SELECT m.user_id, m.content
+                FROM CUSTOMER_MEMOS m
+                JOIN (
+                    SELECT user_id, MAX(memo_id) AS memo_id
+                    FROM CUSTOMER_MEMOS
+                    WHERE shop_id = ${BigInt(shopId)} AND user_id IN (${Prisma.join(page.map(r => r.user_id))})
+                    GROUP BY user_id
+                ) latest ON latest.memo_id = m.memo_id`;
+            memos.forEach(m => memoMap.set(m.user_id.toString(), m.content));
+        }
+
+        // 응답 변환은 CUSTOMER_LIST_RESPONSE (컨트롤러 @Serialize)
+        return {
+            items: page.map(row => Object.assign(row, { memo: memoMap.get(row.user_id.toString()) || '' })),
+            nextCursor,
+        };
     }
-    async findOne(shopId: number, id: number) {
-        const user = await this.prisma.uSERS.findUnique({
-            where: { user_id: BigInt(id) }, // Ensure BigInt for user_id
-            include: {
-                RESERVATIONS: {
-                    where: { shop_id: BigInt(shopId) },
-                    orderBy: { start_time: 'desc' },
-                    include: {
-                        DESIGNERS: { // Changed from DESIGNER to DESIGNERS to match original schema
-                            select: {
-                                USERS: {
-                                    select: {
-                                        name: true
-                                    }
-                                }
-                            }
-                        },
-                        RESERVATION_ITEMS: { // Re-added RESERVATION_ITEMS for menu_name and price
-                            select: {
-                                menu_name: true,
-                                price: true
-                            }
-                        }
-                    }
-                },
-                target_user_memos: {
-                    where: { shop_id: BigInt(shopId) },
-                    orderBy: { created_at: 'desc' },
-                }
-            }
-        });
 
-        if (!user) throw new NotFoundException('Customer not found');
+    // 커서: base64url(JSON [정렬값, user_id])
+    private encodeCursor(value: Date | number | null, userId: bigint): string {
+        const v = value instanceof Date ? value.toISOString() : value;
+        return Buffer.from(JSON.stringify([v, userId.toString()])).toString('base64url');
+    }
+
+    private decodeCursor(cursor: string, column: CustomerSortColumn): { value: Date | number | null; userId: bigint } {
+        try {
+            const [v, id] = JSON.parse(Buffer.from(cursor, 'base64url').toString('utf8'));
+            const value = v === null ? null : column === 'last_visit_at' ? new Date(v) : Number(v);
+            if ((value instanceof Date && isNaN(value.getTime())) || (typeof value === 'number' && isNaN(value))) {
+                throw new Error('invalid value');
+            }
+            return { value, userId: BigInt(id) };
+        } catch (e) {
+            throw new BadRequestException('잘못된 cursor 입니다.');
+        }
+    }
 
-        // Reuse Aggregation Logic
-        const reservations = user.RESERVATIONS;
-
-        // Use BigInt safe stats
-        const completedReservations = reservations.filter((r: any) => r.status === 'COMPLETED');
-        const visitCount = completedReservations.length;
-        const noshowCount = reservations.filter((r: any) => r.status === 'NOSHOW').length;
-
-        // Last visit
-        const lastVisit = completedReservations.length > 0
-            ? completedReservations.sort((a: any, b: any) => this.timeService.parse(b.start_time).valueOf() - this.timeService.parse(a.start_time).valueOf())[0].start_time
-            : null;
-
-        // Total Pay
-        const totalPay = completedReservations.reduce((sum: number, r: any) => {
-            // Using price directly from RESERVATION_ITEMS if included, or payment_amount if simplified
-            // The query includes RESERVATION_ITEMS
-            const itemPrice = r.RESERVATION_ITEMS?.reduce((iSum: number, item: any) => iSum + item.price, 0) || 0;
-            return sum + itemPrice;
-        }, 0);
-
-        // Grade Logic
-        let calculatedGrade = 'NORMAL';
-        if (noshowCount >= 2) {
-            calculatedGrade = 'CAUTION';
-        } else if (visitCount >= 10 || totalPay >= 1000000) {
-            calculatedGrade = 'VIP';
-        } else if (visitCount <= 1) {
-            calculatedGrade = 'NEW';
+    // (column, user_id) 내림차순에서 커서 다음 행들. NULL 은 가장 뒤에 온다.
+    private cursorCondition(column: CustomerSortColumn, cursor: { value: Date | number | null; userId: bigint }): Prisma.CUSTOMER_SHOP_STATSWhereInput {
+        if (cursor.value === null) {
+            return { [column]: null, user_id: { lt: cursor.userId } } as Prisma.CUSTOMER_SHOP_STATSWhereInput;
         }
+        const conditions = [
+            { [column]: { lt: cursor.value } },
+            { [column]: cursor.value, user_id: { lt: cursor.userId } },
+        ] as Prisma.CUSTOMER_SHOP_STATSWhereInput[];
+        if (column === 'last_visit_at') conditions.push({ last_visit_at: null });
+        return { OR: conditions };
+    }
+
+    /**
+     * 고객 상세 (첫 화면): 요약 + 시술 이력/메모 타임라인 첫 페이지.
+     * 다음 페이지는 nextHistoryCursor / nextMemoCursor 로 findHistory / findTimeline 을 호출한다.
+     */
+    async findOne(shopId: number, id: number) {
+        const [summary, history, timeline] = await Promise.all([
+            this.findSummary(shopId, id),
+            this.findHistory(shopId, id),
+            this.findTimeline(shopId, id),
+        ]);
+        return {
+            ...summary,
+            history: history.items,
+            nextHistoryCursor: history.nextCursor,
+            memos: timeline.items,
+            nextMemoCursor: timeline.nextCursor,
+        };
+    }
 
-        // Merge Memos
-        const reservationMemos = reservations
-            .filter((r: any) => r.request_memo && r.request_memo.trim() !== '')
-            .map((r: any) => ({
-                id: Number(r.reservation_id), // Use reservation_id as mixed ID
-                content: r.request_memo,
-                created_at: r.start_time, // Use reservation time as memo time
-                type: 'RESERVATION',
-                source_id: Number(r.reservation_id)
-            }));
-
-        const generalMemos = (user as any).target_user_memos?.map((m: any) => ({
-            id: Number(m.memo_id),
-            content: m.content,
-            created_at: m.created_at,
-            type: 'GENERAL',
-            source_id: null
-        })) || [];
-
-        const joinedMemos = [...reservationMemos, ...generalMemos].sort((a: any, b: any) =>
-            this.timeService.parse(b.created_at).valueOf() - this.timeService.parse(a.created_at).valueOf()
-        );
+    // 고객 요약: 카운터는 CUSTOMER_SHOP_STATS 의 미리 집계된 값 (예약이 없는 고객은 0 / NEW)
+    async findSummary(shopId: number, id: number) {
+        const [user, stats] = await Promise.all([
+            this.prisma.uSERS.findUnique({
+                where: { user_id: BigInt(id) },
+                select: { user_id: true, name: true, phone: true, gender: true, created_at: true },
+            }),
+            this.prisma.cUSTOMER_SHOP_STATS.findUnique({
+                where: { shop_id_user_id: { shop_id: BigInt(shopId), user_id: BigInt(id) } },
+            }),
+        ]);
+        if (!user) throw new NotFoundException('Customer not found');
 
         return {
             id: Number(user.user_id),
             name: user.name,
             phone: user.phone,
             gender: user.gender,
-            grade: calculatedGrade,
-            visit_count: visitCount,
-            total_pay: totalPay,
+            grade: stats?.grade || 'NEW',
+            visit_count: stats?.visit_count || 0,
+            noshow_count: stats?.noshow_count || 0,
+            reservation_count: stats?.reservation_count || 0,
+            total_pay: stats?.total_pay || 0,
+            last_visit: stats?.last_visit_at ? stats.last_visit_at.toISOString() : null,
             created_at: user.created_at.toISOString(),
-            history: reservations.map((r: any) => ({
+        };
+    }
+
+    /**
+     * 시술 이력 (start_time, reservation_id) 내림차순 keyset 페이지.
+     * RESERVATIONS_customer_shop_idx 를 순서대로 읽으므로 이력 길이와 무관하게 페이지 크기만큼만 읽는다.
+     */
+    async findHistory(shopId: number, id: number, cursor?: string, limit?: number) {
+        const take = this.timelineLimit(limit);
+        const where: Prisma.RESERVATIONSWhereInput = { customer_id: BigInt(id), shop_id: BigInt(shopId) };
+        if (cursor) {
+            const [at, reservationId] = this.decodeTimelineCursor(cursor, 2);
+            where.OR = [
+                { start_time: { lt: at } },
+                { start_time: at, reservation_id: { lt: reservationId } },
+            ];
+        }
+
+        const rows = await this.prisma.rESERVATIONS.findMany({
+            where,
+            orderBy: [{ start_time: 'desc' }, { reservation_id: 'desc' }],
+            take: take + 1,
+            select: {
+                reservation_id: true,
+                start_time: true,
+                status: true,
+                DESIGNERS: { select: { USERS: { select: { name: true } } } },
+                RESERVATION_ITEMS: { select: { menu_name: true, price: true } },
+            },
+        });
+
+        const page = rows.slice(0, take);
+        const last = page[page.length - 1];
+        return {
+            items: page.map(r => ({
                 id: Number(r.reservation_id),
                 date: r.start_time.toISOString(),
                 status: r.status,
-                menus: r.RESERVATION_ITEMS?.map((i: any) => i.menu_name).join(', ') || '',
-                price: r.RESERVATION_ITEMS?.reduce((sum: number, i: any) => sum + i.price, 0) || 0,
-                designer: r.DESIGNERS?.USERS?.name || '미지정'
+                menus: r.RESERVATION_ITEMS.map(i => i.menu_name).join(', '),
+                price: r.RESERVATION_ITEMS.reduce((sum, i) => sum + i.price, 0),
+                designer: r.DESIGNERS?.USERS?.name || '미지정',
+            })),
+            nextCursor: rows.length > take && last ? this.encodeTimelineCursor([last.start_time, last.reservation_id]) : null,
+        };
+    }
+
+    /**
+     * 메모 타임라인: 예약 요청 메모(예약 시각 기준)와 일반 메모(작성 시각 기준)를 DB 에서 합쳐 keyset 페이지로 읽는다.
+     * 정렬은 (시각, type, id) 내림차순이며, 각 소스는 인덱스 순서로 커서 다음 take + 1 건만 읽은 뒤 UNION ALL 로 합친다.
+     */
+    async findTimeline(shopId: number, id: number, cursor?: string, limit?: number) {
+        const take = this.timelineLimit(limit);
+        const shop = BigInt(shopId);
+        const user = BigInt(id);
+
+        let after: TimelineCursor | null = null;
+        if (cursor) {
+            const [at, type, sourceId] = this.decodeTimelineCursor(cursor, 3);
+            after = { at, type, id: sourceId };
+        }
+
+        // CUSTOMER_MEMOS.created_at 은 기본값(now())으로 채워진다. NULL 은 시각 keyset 으로 이어 읽을 수 없어 제외
+        const rows = await this.prisma.$queryRaw<{ id: bigint; content: string; created_at: Date; type: TimelineType }[]>`
+            (SELECT reservation_id AS id, request_memo AS content, start_time AS created_at, 'RESERVATION' AS type
+                FROM RESERVATIONS
+                WHERE customer_id = ${user} AND shop_id = ${shop}
+                    AND request_memo IS NOT NULL AND TRIM(request_memo) <> ''
+                    ${this.timelineAfter('RESERVATION', Prisma.raw('start_time'), Prisma.raw('reservation_id'), after)}
+                ORDER BY start_time DESC, reservation_id DESC
+                LIMIT ${take + 1})
+            UNION ALL
+            (SELECT memo_id AS id, content, created_at, 'GENERAL' AS type
+                FROM CUSTOMER_MEMOS
+                WHERE user_id = ${user} AND shop_id = ${shop} AND created_at IS NOT NULL
+                    ${this.timelineAfter('GENERAL', Prisma.raw('created_at'), Prisma.raw('memo_id'), after)}
+                ORDER BY created_at DESC, memo_id DESC
+                LIMIT ${take + 1})
+            ORDER BY created_at DESC, type DESC, id DESC
+            LIMIT ${take + 1}`;
+
+        const page = rows.slice(0, take);
+        const last = page[page.length - 1];
+        return {
+            items: page.map(row => ({
+                id: Number(row.id),
+                content: row.content,
+                created_at: row.created_at,
+                type: row.type,
+                source_id: row.type === 'RESERVATION' ? Number(row.id) : null,
             })),
-            memos: joinedMemos
+            nextCursor: rows.length > take && last ? this.encodeTimelineCursor([last.created_at, last.type, last.id]) : null,
         };
     }
 
+    private timelineLimit(limit?: number) {
+        return Math.min(Math.max(limit || DEFAULT_TIMELINE_PAGE_SIZE, 1), MAX_TIMELINE_PAGE_SIZE);
+    }
+
+    /**
+     * 한 소스(type 고정)에서 커서 다음 행의 조건. 전체 정렬이 (시각, type, id) 내림차순이므로
+     * 커서보다 type 이 앞서는 소스는 같은 시각을 제외하고, 뒤에 오는 소스는 같은 시각을 포함한다.
+     */
+    private timelineAfter(type: TimelineType, timeColumn: Prisma.Sql, idColumn: Prisma.Sql, cursor: TimelineCursor | null): Prisma.Sql {
+        if (!cursor) return Prisma.empty;
+        if (type > cursor.type) return Prisma.sql`AND ${timeColumn} < ${cursor.at}`;
+        if (type < cursor.type) return Prisma.sql`AND ${timeColumn} <= ${cursor.at}`;
+        return Prisma.sql`AND (${timeColumn} < ${cursor.at} OR (${timeColumn} = ${cursor.at} AND ${idColumn} < ${cursor.id}))`;
+    }
+
+    // 커서: base64url(JSON [시각, (type,) id])
+    private encodeTimelineCursor(values: (Date | string | bigint)[]): string {
+        const json = values.map(v => (v instanceof Date ? v.toISOString() : typeof v === 'bigint' ? v.toString() : v));
+        return Buffer.from(JSON.stringify(json)).toString('base64url');
+    }
+
+    private decodeTimelineCursor(cursor: string, length: 2): [Date, bigint];
+    private decodeTimelineCursor(cursor: string, length: 3): [Date, TimelineType, bigint];
+    private decodeTimelineCursor(cursor: string, length: number): any[] {
+        try {
+            const values = JSON.parse(Buffer.from(cursor, 'base64url').toString('utf8'));
+            if (!Array.isArray(values) || values.length !== length) throw new Error('invalid length');
+            const at = new Date(values[0]);
+            if (isNaN(at.getTime())) throw new Error('invalid time');
+            if (length === 2) return [at, BigInt(values[1])];
+            if (!TIMELINE_TYPES.includes(values[1])) throw new Error('invalid type');
+            return [at, values[1], BigInt(values[2])];
+        } catch (e) {
+            throw new BadRequestException('잘못된 cursor 입니다.');
+        }
+    }
+
     async createMemo(shopId: number, customerId: number, content: string, writerId: number) {
         return this.prisma.cUSTOMER_MEMOS.create({
             data: {
@@ -195,11 +320,4 @@ export class CustomersService {
             }
         });
     }
-
-    private calculateGrade(visitCount: number, totalPay: number, noshowCount: number = 0): string {
-        if (noshowCount >= 2) return 'CAUTION';
-        if (visitCount >= 10 || totalPay >= 1000000) return 'VIP';
-        if (visitCount <= 1) return 'NEW';
-        return 'NORMAL';
-    }
 }
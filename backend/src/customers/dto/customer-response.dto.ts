@@ -0,0 +1,18 @@
+import { t } from '../../common/serialization/response-serializer';
+
+// GET /shops/:shopId/customers (CUSTOMER_SHOP_STATS 행 + USERS, memo 는 서비스가 붙인다)
+export const CUSTOMER_LIST_RESPONSE = t.object({
+    items: t.array(t.object({
+        id: t.from(row => row.user_id, t.id),
+        name: t.from(row => row.USERS.name, t.string),
+        phone: t.from(row => row.USERS.phone, t.string),
+        gender: t.from(row => row.USERS.gender, t.string),
+        grade: t.string,
+        created_at: t.from(row => row.USERS.created_at, t.date),
+        visit_count: t.number,
+        last_visit: t.from(row => row.last_visit_at, t.date),
+        total_pay: t.number,
+        memo: t.string,
+    })),
+    nextCursor: t.string,
+});
@@ -4,6 +4,8 @@ import { CreateDesignerDto } from './dto/create-designer.dto';
 import { UpdateDesignerDto } from './dto/update-designer.dto';
 import { JwtAuthGuard } from '../auth/guards/jwt-auth.guard';
 import { ShopAuthGuard } from '../common/guards/shop-auth.guard';
+import { Serialize } from '../common/serialization/serialize.decorator';
+import { DESIGNER_LIST_RESPONSE } from './dto/designer-response.dto';
 
 @Controller('shops/:shopId/designers')
 @UseGuards(JwtAuthGuard, ShopAuthGuard)
@@ -19,6 +21,7 @@ export class DesignersController {
     }
 
     @Get()
+    @Serialize(DESIGNER_LIST_RESPONSE)
     async findAll(@Param('shopId', ParseIntPipe) shopId: number) {
         return this.designersService.findAll(shopId);
     }
@@ -1,16 +1,19 @@
 import { Injectable } from '@nestjs/common';
 import { PrismaService } from '../prisma/prisma.service';
 import { TimeService } from '../common/time/time.service';
+import { AvailabilityCacheService } from '../common/cache/availability-cache.service';
 
 @Injectable()
 export class DesignersService {
     constructor(
         private prisma: PrismaService,
-        private timeService: TimeService // Inject TimeService
+        private timeService: TimeService, // Inject TimeService
+        private availabilityCache: AvailabilityCacheService
     ) { }
 
+    // 응답 변환은 DESIGNER_LIST_RESPONSE (컨트롤러 @Serialize)
     async findAll(shopId: number) {
-        const designers = await this.prisma.dESIGNERS.findMany({
+        return this.prisma.dESIGNERS.findMany({
             where: {
                 shop_id: BigInt(shopId), // Ensure BigInt
                 // removed is_active: true to show all in settings
@@ -24,19 +27,6 @@ export class DesignersService {
                 },
             },
         });
-
-        return designers.map(d => ({
-            ...d,
-            designer_id: d.designer_id.toString(),
-            user_id: d.user_id.toString(),
-            shop_id: d.shop_id.toString(),
-            work_start: this.timeService.toUtcTimeStr(d.work_start),
-            work_end: this.timeService.toUtcTimeStr(d.work_end),
-            lunch_start: this.timeService.toUtcTimeStr(d.lunch_start),
-            lunch_end: this.timeService.toUtcTimeStr(d.lunch_end),
-            userName: d.USERS?.name,
-            userPhone: d.USERS?.phone,
-        }));
     }
 
     async update(id: number, data: any) {
@@ -80,6 +70,9 @@ export class DesignersService {
             include: { USERS: { select: { name: true, phone: true } } }
         });
 
+        // 근무시간/휴무/활성 여부는 모든 일자의 가용 시간에 영향
+        this.availabilityCache.invalidateShop(designer.shop_id);
+
         return {
             ...designer,
             designer_id: designer.designer_id.toString(),
@@ -132,6 +125,7 @@ export class DesignersService {
             data: designerData,
             include: { USERS: true }
         });
+        this.availabilityCache.invalidateShop(designer.shop_id);
 
         return {
             ...designer,
@@ -0,0 +1,19 @@
+import { t } from '../../common/serialization/response-serializer';
+
+// GET /shops/:shopId/designers (ID 는 문자열, 근무시간은 'HH:mm')
+export const DESIGNER_LIST_RESPONSE = t.array(t.object({
+    designer_id: t.idString,
+    user_id: t.idString,
+    shop_id: t.idString,
+    intro_text: t.string,
+    profile_img: t.string,
+    work_start: t.time,
+    work_end: t.time,
+    lunch_start: t.time,
+    lunch_end: t.time,
+    day_off: t.string,
+    is_active: t.boolean,
+    USERS: t.object({ name: t.string, phone: t.string }),
+    userName: t.from(designer => designer.USERS?.name, t.string),
+    userPhone: t.from(designer => designer.USERS?.phone, t.string),
+}));
@@ -0,0 +1,35 @@
+/**
+ * CSV 출력 (RFC 4180, 엑셀에서 바로 여는 것을 전제로 한다)
+ */
+
+export interface CsvColumn<T> {
+    header: string;
+    value: (row: T) => string | number | bigint | null | undefined;
+}
+
+// 엑셀이 UTF-8 로 읽도록 파일 맨 앞에 붙인다
+export const CSV_BOM = '\uFEFF';
+
+const NEEDS_QUOTES = /[",\r\n]/;
+// 엑셀이 수식으로 실행하는 시작 문자 (고객명/메모 등 사용자 입력 문자열에만 적용)
+const FORMULA_PREFIX = /^[=+\-@\t\r]/;
+
+export function csvValue(value: string | number | bigint | null | undefined): string {
+    if (value === null || value === undefined) return '';
+    if (typeof value !== 'string') return String(value);
+
+    const text = FORMULA_PREFIX.test(value) ? `'${value}` : value;
+    return NEEDS_QUOTES.test(text) ? `"${text.replace(/"/g, '""')}"` : text;
+}
+
+export function csvHeader<T>(columns: CsvColumn<T>[]): string {
+    return columns.map(column => csvValue(column.header)).join(',') + '\r\n';
+}
+
+export function csvRows<T>(columns: CsvColumn<T>[], rows: T[]): string {
+    let out = '';
+    for (const row of rows) {
+        out += columns.map(column => csvValue(column.value(row))).join(',') + '\r\n';
+    }
+    return out;
+}
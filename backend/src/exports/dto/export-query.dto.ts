@@ -0,0 +1,17 @@
+import { IsBoolean, IsOptional, Matches } from 'class-validator';
+import { Transform } from 'class-transformer';
+
+export class ExportQueryDto {
+    // KST 일자, 양끝 포함 (기간 제한 없음)
+    @Matches(/^\d{4}-\d{2}-\d{2}$/, { message: 'from 은 YYYY-MM-DD 형식이어야 합니다.' })
+    from: string;
+
+    @Matches(/^\d{4}-\d{2}-\d{2}$/, { message: 'to 는 YYYY-MM-DD 형식이어야 합니다.' })
+    to: string;
+
+    // true 면 gzip 으로 압축해 .csv.gz 로 내려준다
+    @IsOptional()
+    @Transform(({ value }) => value === true || value === 'true')
+    @IsBoolean()
+    gzip?: boolean;
+}
@@ -0,0 +1,74 @@
+import { Controller, Get, Param, ParseIntPipe, Query, Res, UseGuards } from '@nestjs/common';
+import { Response } from 'express';
+import { Readable } from 'stream';
+import { pipeline } from 'stream/promises';
+import { createGzip } from 'zlib';
+import { JwtAuthGuard } from '../auth/guards/jwt-auth.guard';
+import { ShopAuthGuard } from '../common/guards/shop-auth.guard';
+import { ExportsService } from './exports.service';
+import { ExportQueryDto } from './dto/export-query.dto';
+
+@Controller('shops/:shopId/exports')
+@UseGuards(JwtAuthGuard, ShopAuthGuard)
+export class ExportsController {
+    constructor(private readonly exportsService: ExportsService) { }
+
+    @Get('reservations')
+    exportReservations(
+        @Param('shopId', ParseIntPipe) shopId: number,
+        @Query() query: ExportQueryDto,
+        @Res() res: Response,
+    ) {
+        const range = this.exportsService.parseRange(query.from, query.to);
+        return this.send(res, query, `reservations_${range.fromDate}_${range.toDate}`, this.exportsService.reservations(shopId, range));
+    }
+
+    @Get('payments')
+    exportPayments(
+        @Param('shopId', ParseIntPipe) shopId: number,
+        @Query() query: ExportQueryDto,
+        @Res() res: Response,
+    ) {
+        const range = this.exportsService.parseRange(query.from, query.to);
+        return this.send(res, query, `payments_${range.fromDate}_${range.toDate}`, this.exportsService.payments(shopId, range));
+    }
+
+    @Get('prepaid-ledger')
+    exportPrepaidLedger(
+        @Param('shopId', ParseIntPipe) shopId: number,
+        @Query() query: ExportQueryDto,
+        @Res() res: Response,
+    ) {
+        const range = this.exportsService.parseRange(query.from, query.to);
+        return this.send(res, query, `prepaid-ledger_${range.fromDate}_${range.toDate}`, this.exportsService.prepaidLedger(shopId, range));
+    }
+
+    /**
+     * CSV 조각을 응답으로 흘려보낸다 (pipeline 이 backpressure 를 처리하므로 느린 클라이언트면 다음 페이지 조회도 늦춰진다).
+     * 첫 조각까지는 일반 예외 응답으로 처리하고, 전송이 시작된 뒤의 오류는 연결을 끊어 잘린 파일임을 알린다.
+     */
+    private async send(res: Response, query: ExportQueryDto, name: string, chunks: AsyncGenerator<string>) {
+        const first = await chunks.next();
+
+        res.setHeader('Content-Type', query.gzip ? 'application/gzip' : 'text/csv; charset=utf-8');
+        res.setHeader('Content-Disposition', `attachment; filename="${name}.csv${query.gzip ? '.gz' : ''}"`);
+        res.setHeader('Cache-Control', 'no-store');
+
+        async function* body() {
+            if (!first.done) yield first.value;
+            yield* chunks;
+        }
+        try {
+            const source = Readable.from(body());
+            await (query.gzip ? pipeline(source, createGzip(), res) : pipeline(source, res));
+        } catch (error) {
+            // 클라이언트가 다운로드를 취소한 경우는 정상 종료
+            if (error.code !== 'ERR_STREAM_PREMATURE_CLOSE') {
+                console.error(`[Exports] ${name} failed:`, error.message);
+            }
+            res.destroy();
+        } finally {
+            await chunks.return(undefined);
+        }
+    }
+}
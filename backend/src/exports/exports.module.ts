@@ -0,0 +1,12 @@
+import { Module } from '@nestjs/common';
+import { PrismaModule } from '../prisma/prisma.module';
+import { TimeModule } from '../common/time/time.module';
+import { ExportsController } from './exports.controller';
+import { ExportsService } from './exports.service';
+
+@Module({
+    imports: [PrismaModule, TimeModule],
+    controllers: [ExportsController],
+    providers: [ExportsService],
+})
+export class ExportsModule { }
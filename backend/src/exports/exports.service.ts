@@ -0,0 +1,259 @@
+import { BadRequestException, Injectable } from '@nestjs/common';
+import { PAYMENTS_type, Prisma, PREPAID_TRANSACTIONS_type, RESERVATIONS_status } from '@prisma/client';
+import { PrismaService } from '../prisma/prisma.service';
+import { TimeService } from '../common/time/time.service';
+import { CASH_FLOW_PAYMENT_TYPES } from '../sales/sales-rollup.service';
+import { CSV_BOM, CsvColumn, csvHeader, csvRows } from './csv';
+
+// keyset 한 페이지 (쿼리 1회당 행 수, 메모리에는 한 페이지만 둔다)
+const EXPORT_PAGE_SIZE = 1000;
+
+// DATETIME 컬럼은 UTC 로 저장된다. KST 는 서머타임이 없어 +9시간 고정 (SalesRollupService 의 INTERVAL 9 HOUR 와 같다)
+const KST_OFFSET_MS = 9 * 60 * 60 * 1000;
+const kstDateTime = (date: Date | null) =>
+    date ? new Date(date.getTime() + KST_OFFSET_MS).toISOString().slice(0, 19).replace('T', ' ') : null;
+const kstDate = (date: Date | null) =>
+    date ? new Date(date.getTime() + KST_OFFSET_MS).toISOString().slice(0, 10) : null;
+
+// 엑셀이 앞자리 0 을 지우지 않도록 하이픈을 넣는다 (01012345678 → 010-1234-5678)
+const formatPhone = (phone: string | null | undefined) => {
+    if (!phone || !/^\d+$/.test(phone)) return phone;
+    if (phone.length === 11) return `${phone.slice(0, 3)}-${phone.slice(3, 7)}-${phone.slice(7)}`;
+    if (phone.length === 10) {
+        return phone.startsWith('02')
+            ? `${phone.slice(0, 2)}-${phone.slice(2, 6)}-${phone.slice(6)}`
+            : `${phone.slice(0, 3)}-${phone.slice(3, 6)}-${phone.slice(6)}`;
+    }
+    return phone;
+};
+
+const RESERVATION_EXPORT_SELECT = {
+    reservation_id: true,
+    customer_id: true,
+    start_time: true,
+    end_time: true,
+    status: true,
+    source: true,
+    request_memo: true,
+    USERS: { select: { name: true, phone: true } },
+    DESIGNERS: { select: { USERS: { select: { name: true } } } },
+    RESERVATION_ITEMS: { select: { menu_name: true, price: true } },
+    PAYMENTS: { select: { type: true, amount: true } },
+} as const;
+
+type ReservationExportRow = Prisma.RESERVATIONSGetPayload<{ select: typeof RESERVATION_EXPORT_SELECT }>;
+
+interface PaymentExportRow {
+    payment_id: bigint;
+    paid_at: Date;
+    type: PAYMENTS_type;
+    amount: number;
+    status: string;
+    reservation_id: bigint;
+    start_time: Date;
+    reservation_status: RESERVATIONS_status;
+    customer_name: string;
+    customer_phone: string;
+    designer_name: string | null;
+}
+
+interface PrepaidLedgerRow {
+    transaction_id: bigint;
+    created_at: Date;
+    type: PREPAID_TRANSACTIONS_type;
+    amount: number;
+    bonus_amount: number | null;
+    balance_after: number;
+    payment_method: string | null;
+    ref_payment_id: bigint | null;
+    reservation_id: bigint | null;
+    user_id: bigint;
+    customer_name: string;
+    customer_phone: string;
+}
+
+// 매출(revenue): 완료 예약의 결제 금액, 예약 시작일 기준 (SalesRollupService.reservationRowsSql 과 같은 기준)
+const revenue = (row: ReservationExportRow, type?: PAYMENTS_type) =>
+    row.status !== 'COMPLETED' ? 0 : row.PAYMENTS.reduce((sum, p) => sum + (!type || p.type === type ? p.amount : 0), 0);
+
+const RESERVATION_COLUMNS: CsvColumn<ReservationExportRow>[] = [
+    { header: '예약번호', value: r => r.reservation_id },
+    { header: '예약일', value: r => kstDate(r.start_time) },
+    { header: '시작시간', value: r => kstDateTime(r.start_time) },
+    { header: '종료시간', value: r => kstDateTime(r.end_time) },
+    { header: '상태', value: r => r.status },
+    { header: '예약경로', value: r => r.source },
+    { header: '고객번호', value: r => r.customer_id },
+    { header: '고객명', value: r => r.USERS?.name },
+    { header: '연락처', value: r => formatPhone(r.USERS?.phone) },
+    { header: '디자이너', value: r => r.DESIGNERS?.USERS?.name },
+    { header: '시술', value: r => r.RESERVATION_ITEMS.map(i => i.menu_name).join('|') },
+    { header: '시술금액', value: r => r.RESERVATION_ITEMS.reduce((sum, i) => sum + i.price, 0) },
+    { header: '결제금액', value: r => r.PAYMENTS.reduce((sum, p) => sum + p.amount, 0) },
+    { header: '매출', value: r => revenue(r) },
+    { header: '매출_카드', value: r => revenue(r, 'SITE_CARD') },
+    { header: '매출_현금', value: r => revenue(r, 'SITE_CASH') },
+    { header: '매출_선불권', value: r => revenue(r, 'PREPAID') },
+    { header: '매출_앱예약금', value: r => revenue(r, 'APP_DEPOSIT') },
+    { header: '요청사항', value: r => r.request_memo },
+];
+
+// 결제 1건이 매출(예약 시작일, 완료 예약)과 현금 흐름(결제일, 현장 카드/현금)에 각각 얼마로 잡히는지 함께 쓴다
+const PAYMENT_COLUMNS: CsvColumn<PaymentExportRow>[] = [
+    { header: '결제번호', value: p => p.payment_id },
+    { header: '결제일시', value: p => kstDateTime(p.paid_at) },
+    { header: '결제수단', value: p => p.type },
+    { header: '결제상태', value: p => p.status },
+    { header: '금액', value: p => p.amount },
+    { header: '현금흐름', value: p => (CASH_FLOW_PAYMENT_TYPES.includes(p.type) ? p.amount : 0) },
+    { header: '매출', value: p => (p.reservation_status === 'COMPLETED' ? p.amount : 0) },
+    { header: '매출일', value: p => kstDate(p.start_time) },
+    { header: '예약번호', value: p => p.reservation_id },
+    { header: '예약상태', value: p => p.reservation_status },
+    { header: '고객명', value: p => p.customer_name },
+    { header: '연락처', value: p => formatPhone(p.customer_phone) },
+    { header: '디자이너', value: p => p.designer_name },
+];
+
+// 선불권 충전은 결제수단(CARD, 그 외 CASH)별 현금 흐름, 사용은 선불권 사용액 (SalesRollupService.prepaidRowsSql 과 같은 기준)
+const isCardCharge = (t: PrepaidLedgerRow) => t.type === 'CHARGE' && t.payment_method === 'CARD';
+const isCashCharge = (t: PrepaidLedgerRow) => t.type === 'CHARGE' && (t.payment_method || 'CASH') !== 'CARD';
+
+const PREPAID_LEDGER_COLUMNS: CsvColumn<PrepaidLedgerRow>[] = [
+    { header: '거래번호', value: t => t.transaction_id },
+    { header: '거래일시', value: t => kstDateTime(t.created_at) },
+    { header: '구분', value: t => t.type },
+    { header: '금액', value: t => t.amount },
+    { header: '보너스', value: t => t.bonus_amount || 0 },
+    { header: '거래후잔액', value: t => t.balance_after },
+    { header: '결제수단', value: t => t.payment_method },
+    { header: '현금흐름_카드', value: t => (isCardCharge(t) ? t.amount : 0) },
+    { header: '현금흐름_현금', value: t => (isCashCharge(t) ? t.amount : 0) },
+    { header: '선불권사용', value: t => (t.type === 'USE' ? t.amount : 0) },
+    { header: '고객번호', value: t => t.user_id },
+    { header: '고객명', value: t => t.customer_name },
+    { header: '연락처', value: t => formatPhone(t.customer_phone) },
+    { header: '결제번호', value: t => t.ref_payment_id },
+    { header: '예약번호', value: t => t.reservation_id },
+];
+
+export interface ExportRange {
+    // [from, to) UTC 시각
+    from: Date;
+    to: Date;
+    // 파일명용 KST 일자 (양끝 포함)
+    fromDate: string;
+    toDate: string;
+}
+
+/**
+ * 회계용 CSV 내보내기 (예약 / 결제 / 선불권 원장).
+ * 기간 제한 없이 (시각, PK) keyset 으로 EXPORT_PAGE_SIZE 건씩 읽어 CSV 조각을 내보내므로
+ * 메모리에는 한 페이지만 남고, 각 쿼리는 인덱스 순서대로 읽다가 LIMIT 에서 멈춘다.
+ * 반환하는 AsyncGenerator 는 소비하는 쪽이 읽을 때만 다음 페이지를 조회한다 (응답 스트림 backpressure).
+ */
+@Injectable()
+export class ExportsService {
+    constructor(
+        private readonly prisma: PrismaService,
+        private readonly timeService: TimeService,
+    ) { }
+
+    parseRange(from: string, to: string): ExportRange {
+        const invalid = () => new BadRequestException('from/to 는 YYYY-MM-DD 형식이며 from <= to 여야 합니다.');
+        let start: ReturnType<TimeService['parse']>;
+        let end: ReturnType<TimeService['parse']>;
+        try {
+            // 존재하지 않는 날짜(2024-13-01 등)는 tz 변환에서 RangeError 를 던진다
+            start = this.timeService.parse(from).startOf('day');
+            end = this.timeService.parse(to).startOf('day');
+        } catch (error) {
+            throw invalid();
+        }
+        if (!start.isValid() || !end.isValid() || end.isBefore(start)) throw invalid();
+        return {
+            from: start.toDate(),
+            to: end.add(1, 'day').toDate(),
+            fromDate: start.format('YYYY-MM-DD'),
+            toDate: end.format('YYYY-MM-DD'),
+        };
+    }
+
+    // 예약 (시작 시각 기준): RESERVATIONS_shop_start_idx 순서 (shop_id, start_time, reservation_id)
+    reservations(shopId: number, range: ExportRange): AsyncGenerator<string> {
+        const shop = BigInt(shopId);
+        return this.csv(RESERVATION_COLUMNS, this.pages<ReservationExportRow>((after) =>
+            this.prisma.rESERVATIONS.findMany({
+                where: {
+                    shop_id: shop,
+                    start_time: { gte: after ? after.start_time : range.from, lt: range.to },
+                    ...(after && {
+                        OR: [{ start_time: { gt: after.start_time } }, { reservation_id: { gt: after.reservation_id } }],
+                    }),
+                },
+                select: RESERVATION_EXPORT_SELECT,
+                orderBy: [{ start_time: 'asc' }, { reservation_id: 'asc' }],
+                take: EXPORT_PAGE_SIZE,
+            })
+        ));
+    }
+
+    // 결제 (결제일 기준, 미결제 paid_at NULL 제외): PAYMENTS_paid_at_idx 순서 (paid_at, payment_id)
+    payments(shopId: number, range: ExportRange): AsyncGenerator<string> {
+        const shop = BigInt(shopId);
+        return this.csv(PAYMENT_COLUMNS, this.pages<PaymentExportRow>((after) => this.prisma.$queryRaw<PaymentExportRow[]>`
+            SELECT p.payment_id, p.paid_at, p.type, p.amount, p.status,
+                r.reservation_id, r.start_time, r.status AS reservation_status,
+                u.name AS customer_name, u.phone AS customer_phone, du.name AS designer_name
+            FROM PAYMENTS p
+            JOIN RESERVATIONS r ON r.reservation_id = p.reservation_id
+            JOIN USERS u ON u.user_id = r.customer_id
+            LEFT JOIN DESIGNERS d ON d.designer_id = r.designer_id
+            LEFT JOIN USERS du ON du.user_id = d.user_id
+            WHERE r.shop_id = ${shop}
+                AND p.paid_at >= ${after ? after.paid_at : range.from} AND p.paid_at < ${range.to}
+                ${after ? Prisma.sql`AND (p.paid_at > ${after.paid_at} OR p.payment_id > ${after.payment_id})` : Prisma.empty}
+            ORDER BY p.paid_at, p.payment_id
+            LIMIT ${EXPORT_PAGE_SIZE}`
+        ));
+    }
+
+    // 선불권 원장 (거래일 기준, 전체 거래 유형): PREPAID_TRANSACTIONS_created_at_idx 순서 (created_at, transaction_id)
+    prepaidLedger(shopId: number, range: ExportRange): AsyncGenerator<string> {
+        const shop = BigInt(shopId);
+        return this.csv(PREPAID_LEDGER_COLUMNS, this.pages<PrepaidLedgerRow>((after) => this.prisma.$queryRaw<PrepaidLedgerRow[]>`
+            SELECT t.transaction_id, t.created_at, t.type, t.amount, t.bonus_amount, t.balance_after, t.payment_method,
+                t.ref_payment_id, p.reservation_id, b.user_id, u.name AS customer_name, u.phone AS customer_phone
+            FROM PREPAID_TRANSACTIONS t
+            JOIN CUSTOMER_PREPAID_BALANCES b ON b.balance_id = t.balance_id
+            JOIN USERS u ON u.user_id = b.user_id
+            LEFT JOIN PAYMENTS p ON p.payment_id = t.ref_payment_id
+            WHERE b.shop_id = ${shop}
+                AND t.created_at >= ${after ? after.created_at : range.from} AND t.created_at < ${range.to}
+                ${after ? Prisma.sql`AND (t.created_at > ${after.created_at} OR t.transaction_id > ${after.transaction_id})` : Prisma.empty}
+            ORDER BY t.created_at, t.transaction_id
+            LIMIT ${EXPORT_PAGE_SIZE}`
+        ));
+    }
+
+    // 마지막 행 다음부터 한 페이지씩 (페이지가 덜 차면 끝)
+    private async *pages<T>(fetchPage: (after: T | null) => Promise<T[]>): AsyncGenerator<T[]> {
+        let after: T | null = null;
+        while (true) {
+            const rows = await fetchPage(after);
+            if (rows.length > 0) yield rows;
+            if (rows.length < EXPORT_PAGE_SIZE) return;
+            after = rows[rows.length - 1];
+        }
+    }
+
+    // 첫 조각(BOM + 헤더 + 첫 페이지)은 첫 쿼리가 끝난 뒤에 나온다 (첫 쿼리 실패는 응답 헤더 전송 전에 드러난다)
+    private async *csv<T>(columns: CsvColumn<T>[], pages: AsyncIterable<T[]>): AsyncGenerator<string> {
+        let header = CSV_BOM + csvHeader(columns);
+        for await (const rows of pages) {
+            yield header + csvRows(columns, rows);
+            header = '';
+        }
+        if (header) yield header;
+    }
+}
@@ -1,8 +1,14 @@
-import { NestFactory } from '@nestjs/core';
+import { NestFactory, Reflector } from '@nestjs/core';
 import { AppModule } from './app.module';
-import { ValidationPipe } from '@nestjs/common';
+import { INestApplication, ValidationPipe } from '@nestjs/common';
+import { Server } from 'http';
+import { HealthService } from './common/health/health.service';
+import { MetricsService } from './common/metrics/metrics.service';
+import { SHUTDOWN_TIMEOUT_MS, WORKER_ID } from './config/cluster.config';
+import { SerializerInterceptor } from './common/serialization/serializer.interceptor';
 
 // BigInt serialization issue solution
+// (@Serialize 스키마가 있는 응답은 SerializerInterceptor 가 직접 변환하므로 이 경로를 타지 않는다)
 (BigInt.prototype as any).toJSON = function () {
     return Number(this);
 };
@@ -15,6 +21,13 @@ async function bootstrap() {
 
     app.use(cookieParser());
 
+    // 종료 대기 중에는 keep-alive 연결을 재사용하지 않게 해 요청이 다른 워커로 가도록 한다
+    const health = app.get(HealthService);
+    app.use((req, res, next) => {
+        if (health.isDraining()) res.setHeader('Connection', 'close');
+        next();
+    });
+
     // Initialize Firebase Admin (Safe check)
     if (!admin.apps.length) {
         try {
@@ -34,13 +47,20 @@ async function bootstrap() {
         forbidNonWhitelisted: true, // Throw error if extra properties are sent
     }));
 
+    // @Serialize(schema) 핸들러 응답을 컴파일된 직렬화 함수로 변환
+    app.useGlobalInterceptors(new SerializerInterceptor(app.get(Reflector)));
+
     // CORS enable (Frontend is running on different port)
     app.enableCors({
         origin: true, // Allow all for dev, or specify frontend URL
         credentials: true, // Allow cookies
     });
     await app.listen(3000, '0.0.0.0');
-    console.log(`Application is running on: ${await app.getUrl()}`);
+    console.log(`Application is running on: ${await app.getUrl()} (worker ${WORKER_ID})`);
+
+    registerGracefulShutdown(app);
+    // PM2 wait_ready: 리슨을 시작한 뒤 알려야 reload 시 이전 워커가 먼저 내려가지 않는다
+    if (process.send) process.send('ready');
 
     const dbUrl = process.env.DATABASE_URL;
     if (dbUrl) {
@@ -48,4 +68,48 @@ async function bootstrap() {
         console.log(`[DEBUG] Connecting to DB Host: ${dbUrl.split('@')[1]?.split(':')[0]}`);
     }
 }
+/**
+ * 종료 신호 처리 (PM2 reload/stop 은 SIGINT, systemd/docker 는 SIGTERM).
+ * readiness 를 먼저 실패시키고 새 연결을 막은 뒤, 처리 중인 요청이 끝나면(최대 SHUTDOWN_TIMEOUT_MS) 모듈을 정리한다.
+ * Nest 의 enableShutdownHooks 는 HTTP 서버를 닫기 전에 onModuleDestroy(Prisma 연결 해제)를 부르므로 쓰지 않는다.
+ */
+function registerGracefulShutdown(app: INestApplication) {
+    let shuttingDown = false;
+
+    const shutdown = async (signal: string) => {
+        if (shuttingDown) return;
+        shuttingDown = true;
+
+        const metrics = app.get(MetricsService);
+        console.log(`[main] ${signal} received, draining ${metrics.inFlightRequests()} in-flight request(s)`);
+        app.get(HealthService).startDraining();
+
+        const server: Server = app.getHttpServer();
+        const closed = new Promise<void>(resolve => server.close(() => resolve()));
+        // 응답을 마친 keep-alive 연결은 유휴 상태가 되는 대로 끊는다
+        const idleSweep = setInterval(() => server.closeIdleConnections(), 500);
+        server.closeIdleConnections();
+
+        const drained = await Promise.race([
+            closed.then(() => true),
+            new Promise<boolean>(resolve => setTimeout(() => resolve(false), SHUTDOWN_TIMEOUT_MS)),
+        ]);
+        clearInterval(idleSweep);
+        if (!drained) {
+            console.warn(`[main] shutdown timeout, closing ${metrics.inFlightRequests()} request(s) still in flight`);
+            server.closeAllConnections();
+        }
+
+        try {
+            await app.close(); // 캐시 동기화 중지, Prisma 연결 해제
+        } catch (error) {
+            console.error('[main] shutdown error:', error);
+        }
+        process.exit(0);
+    };
+
+    process.on('SIGINT', () => shutdown('SIGINT'));
+    process.on('SIGTERM', () => shutdown('SIGTERM'));
+}
+
 bootstrap();
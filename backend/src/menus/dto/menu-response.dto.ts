@@ -0,0 +1,17 @@
+import { t } from '../../common/serialization/response-serializer';
+
+// GET /shops/:shopId/menus (menu_id/shop_id 는 문자열, category_id 는 숫자)
+export const MENU_LIST_RESPONSE = t.array(t.object({
+    menu_id: t.idString,
+    shop_id: t.idString,
+    category: t.string,
+    category_id: t.id,
+    name: t.string,
+    price: t.number,
+    duration: t.number,
+    description: t.string,
+    thumbnail_url: t.string,
+    is_deleted: t.boolean,
+    type: t.string,
+    sort_order: t.number,
+}));
@@ -0,0 +1,78 @@
+import { MENUS } from '@prisma/client';
+
+export interface MenuTreeItem {
+    menu_id: string;
+    name: string;
+    price: number;
+    // 슬롯 조회(available-slots duration)와 예약 종료 시각 계산에 쓰는 시술 시간(분)
+    duration: number;
+    description: string | null;
+    thumbnail_url: string | null;
+    sort_order: number;
+}
+
+export interface MenuTreeCategory {
+    menu_id: string;
+    name: string;
+    description: string | null;
+    thumbnail_url: string | null;
+    sort_order: number;
+    menus: MenuTreeItem[];
+}
+
+export interface MenuTree {
+    version: number;
+    categories: MenuTreeCategory[];
+    // 카테고리에 속하지 않은 메뉴
+    uncategorized: MenuTreeItem[];
+}
+
+// 매장 메뉴 한 버전의 스냅샷 (캐시 단위)
+export interface MenuSnapshot {
+    version: number;
+    // GET /menus 평면 목록 (MENU_LIST_RESPONSE 로 직렬화)
+    rows: MENUS[];
+    tree: MenuTree;
+}
+
+const toItem = (menu: MENUS): MenuTreeItem => ({
+    menu_id: menu.menu_id.toString(),
+    name: menu.name,
+    price: menu.price,
+    duration: menu.duration,
+    description: menu.description,
+    thumbnail_url: menu.thumbnail_url,
+    sort_order: menu.sort_order,
+});
+
+/**
+ * CATEGORY → MENU 트리. rows 는 (sort_order, price) 순으로 정렬된 삭제되지 않은 메뉴.
+ * 메뉴는 category_id 로 카테고리에 붙이고, category_id 가 없거나 삭제된 카테고리면 기존 category(이름) 값으로 찾는다.
+ */
+export function buildMenuTree(rows: MENUS[], version: number): MenuTree {
+    const categories: MenuTreeCategory[] = [];
+    const byId = new Map<string, MenuTreeCategory>();
+    const byName = new Map<string, MenuTreeCategory>();
+    for (const row of rows) {
+        if (row.type !== 'CATEGORY') continue;
+        const category: MenuTreeCategory = {
+            menu_id: row.menu_id.toString(),
+            name: row.name,
+            description: row.description,
+            thumbnail_url: row.thumbnail_url,
+            sort_order: row.sort_order,
+            menus: [],
+        };
+        categories.push(category);
+        byId.set(category.menu_id, category);
+        if (!byName.has(row.name)) byName.set(row.name, category);
+    }
+
+    const uncategorized: MenuTreeItem[] = [];
+    for (const row of rows) {
+        if (row.type === 'CATEGORY') continue;
+        const category = (row.category_id !== null && byId.get(row.category_id.toString())) || (row.category && byName.get(row.category));
+        (category ? category.menus : uncategorized).push(toItem(row));
+    }
+    return { version, categories, uncategorized };
+}
@@ -1,18 +1,43 @@
-import { Body, Controller, Delete, Get, Param, ParseIntPipe, Patch, Post, Query, UseGuards } from '@nestjs/common';
+import { Body, Controller, Delete, Get, Headers, Param, ParseIntPipe, Patch, Post, Res, UseGuards } from '@nestjs/common';
+import { Response } from 'express';
 import { MenusService } from './menus.service';
 import { CreateMenuDto } from './dto/create-menu.dto';
 import { UpdateMenuDto } from './dto/update-menu.dto';
 import { JwtAuthGuard } from '../auth/guards/jwt-auth.guard';
 import { ShopAuthGuard } from '../common/guards/shop-auth.guard';
+import { Serialize } from '../common/serialization/serialize.decorator';
+import { MENU_LIST_RESPONSE } from './dto/menu-response.dto';
+import { notModified } from '../common/http/conditional-get';
 
 @Controller('shops/:shopId/menus')
 @UseGuards(JwtAuthGuard, ShopAuthGuard)
 export class MenusController {
     constructor(private readonly menusService: MenusService) { }
 
+    // 메뉴 목록 (평면). ETag 가 같으면 304
     @Get()
-    async findAll(@Param('shopId', ParseIntPipe) shopId: number) {
-        return this.menusService.findAll(shopId);
+    @Serialize(MENU_LIST_RESPONSE)
+    async findAll(
+        @Param('shopId', ParseIntPipe) shopId: number,
+        @Headers('if-none-match') ifNoneMatch: string | undefined,
+        @Res({ passthrough: true }) res: Response
+    ) {
+        const { snapshot, etag } = await this.menusService.findWithEtag(shopId, 'list');
+        if (notModified(res, etag, ifNoneMatch)) return;
+        return snapshot.rows;
+    }
+
+    // CATEGORY → MENU 트리 (시술 시간 포함, 관리자 예약 모달용). ETag 가 같으면 304
+    // 고객 앱은 GET /api/app/shops/:id/menus/tree (AppShopsController)
+    @Get('tree')
+    async findTree(
+        @Param('shopId', ParseIntPipe) shopId: number,
+        @Headers('if-none-match') ifNoneMatch: string | undefined,
+        @Res({ passthrough: true }) res: Response
+    ) {
+        const { snapshot, etag } = await this.menusService.findWithEtag(shopId, 'tree');
+        if (notModified(res, etag, ifNoneMatch)) return;
+        return snapshot.tree;
     }
 
     @Post()
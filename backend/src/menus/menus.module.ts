@@ -7,5 +7,6 @@ import { PrismaModule } from '../prisma/prisma.module';
     imports: [PrismaModule],
     controllers: [MenusController],
     providers: [MenusService],
+    exports: [MenusService],
 })
 export class MenusModule { }
@@ -1,33 +1,74 @@
-import { Injectable } from '@nestjs/common';
+import { Injectable, NotFoundException } from '@nestjs/common';
+import { Prisma } from '@prisma/client';
 import { PrismaService } from '../prisma/prisma.service';
+import { MenuTreeCacheService } from '../common/cache/menu-tree-cache.service';
+import { buildMenuTree, MenuSnapshot } from './menu-tree';
 
 @Injectable()
 export class MenusService {
-    constructor(private prisma: PrismaService) { }
+    constructor(
+        private prisma: PrismaService,
+        private menuCache: MenuTreeCacheService,
+    ) { }
 
+    /**
+     * 매장 메뉴 스냅샷 (캐시 우선) + ETag. 응답 본문은 rows(평면 목록) 또는 tree.
+     * 같은 버전이면 응답 바이트가 같으므로 버전만으로 강한 ETag 를 만든다 (본문 해시 불필요).
+     */
+    async findWithEtag(shopId: number, view: 'list' | 'tree') {
+        const snapshot = await this.getSnapshot(shopId);
+        return { snapshot, etag: `"${view === 'tree' ? 'menu-tree' : 'menus'}-${shopId}-${snapshot.version}"` };
+    }
+
+    // 응답 변환은 MENU_LIST_RESPONSE (컨트롤러 @Serialize)
     async findAll(shopId: number) {
-        const menus = await this.prisma.mENUS.findMany({
-            where: {
-                shop_id: BigInt(shopId),
-                is_deleted: false,
-            },
-            orderBy: [
-                { sort_order: 'asc' },
-                { price: 'asc' },
-            ],
-        });
+        return (await this.getSnapshot(shopId)).rows;
+    }
 
-        return menus.map(m => ({
-            ...m,
-            menu_id: m.menu_id.toString(),
-            shop_id: m.shop_id.toString(),
-            type: m.type,
-            sort_order: m.sort_order,
-        }));
+    // 매장 메뉴 스냅샷 (캐시 우선). 버전과 메뉴를 한 트랜잭션에서 읽어 버전과 내용이 항상 짝이 맞는다.
+    async getSnapshot(shopId: number): Promise<MenuSnapshot> {
+        const cached = this.menuCache.get(shopId);
+        if (cached) return cached;
+
+        const generation = this.menuCache.generation(shopId);
+        const [shop, rows] = await this.prisma.$transaction([
+            this.prisma.sHOPS.findUnique({
+                where: { shop_id: BigInt(shopId) },
+                select: { menu_version: true },
+            }),
+            this.prisma.mENUS.findMany({
+                where: {
+                    shop_id: BigInt(shopId),
+                    is_deleted: false,
+                },
+                orderBy: [
+                    { sort_order: 'asc' },
+                    { price: 'asc' },
+                ],
+            }),
+        ]);
+        if (!shop) throw new NotFoundException('Shop not found');
+
+        const snapshot: MenuSnapshot = { version: shop.menu_version, rows, tree: buildMenuTree(rows, shop.menu_version) };
+        this.menuCache.set(shopId, snapshot, generation);
+        return snapshot;
+    }
+
+    // 메뉴 변경과 매장 메뉴 버전 증가를 한 트랜잭션으로 묶고, 커밋 후 캐시를 무효화한다
+    private async writeMenu<T>(shopId: number, write: Prisma.PrismaPromise<T>): Promise<T> {
+        const [menu] = await this.prisma.$transaction([
+            write,
+            this.prisma.sHOPS.update({
+                where: { shop_id: BigInt(shopId) },
+                data: { menu_version: { increment: 1 } },
+            }),
+        ]);
+        this.menuCache.invalidateShop(shopId);
+        return menu;
     }
 
     async create(shopId: number, data: any) {
-        const menu = await this.prisma.mENUS.create({
+        const menu = await this.writeMenu(shopId, this.prisma.mENUS.create({
             data: {
                 shop_id: BigInt(shopId),
                 category: data.category || '기타',
@@ -38,7 +79,7 @@ export class MenusService {
                 type: data.type || 'MENU',
                 sort_order: data.sort_order || 0,
             }
-        });
+        }));
         return {
             ...menu,
             menu_id: menu.menu_id.toString(),
@@ -50,13 +91,13 @@ export class MenusService {
 
     async update(shopId: number, menuId: number, data: any) {
         // Verify ownership/shop
-        const menu = await this.prisma.mENUS.update({
+        const menu = await this.writeMenu(shopId, this.prisma.mENUS.update({
             where: {
                 menu_id: BigInt(menuId),
                 shop_id: BigInt(shopId)
             },
             data: data
-        });
+        }));
         return {
             ...menu,
             menu_id: menu.menu_id.toString(),
@@ -67,13 +108,13 @@ export class MenusService {
     }
 
     async remove(shopId: number, menuId: number) {
-        const menu = await this.prisma.mENUS.update({
+        const menu = await this.writeMenu(shopId, this.prisma.mENUS.update({
             where: {
                 menu_id: BigInt(menuId),
                 shop_id: BigInt(shopId)
             },
             data: { is_deleted: true }
-        });
+        }));
         return {
             ...menu,
             menu_id: menu.menu_id.toString(),
@@ -0,0 +1,132 @@
+import { Inject, Injectable, UnauthorizedException } from '@nestjs/common';
+import { createHash, createPublicKey, KeyObject, verify } from 'crypto';
+import * as admin from 'firebase-admin';
+import { LruCache } from '../../common/cache/lru-cache';
+
+const GOOGLE_CERTS_URL = 'https://www.googleapis.com/robot/v1/metadata/x509/securetoken@system.gserviceaccount.com';
+const DEFAULT_CERTS_TTL_MS = 60 * 60 * 1000; // Cache-Control 이 없을 때
+const MAX_VERIFIED_TOKENS = 10000;
+
+export const FIREBASE_KEY_SOURCE = 'FIREBASE_KEY_SOURCE';
+
+export interface FirebaseSigningKeys {
+    keys: Record<string, string>; // kid → PEM (X.509 인증서 또는 공개키)
+    expiresAt: number; // ms
+}
+
+// 서명 키 공급자 (운영: Google 공개 인증서, 테스트/로컬: 직접 생성한 키쌍)
+export interface FirebaseKeySource {
+    fetchKeys(): Promise<FirebaseSigningKeys>;
+}
+
+@Injectable()
+export class GoogleCertKeySource implements FirebaseKeySource {
+    async fetchKeys(): Promise<FirebaseSigningKeys> {
+        const response = await fetch(GOOGLE_CERTS_URL);
+        if (!response.ok) throw new Error(`Failed to fetch Firebase certificates: ${response.status}`);
+
+        const maxAge = /max-age=(\d+)/.exec(response.headers.get('cache-control') || '');
+        return {
+            keys: await response.json() as Record<string, string>,
+            expiresAt: Date.now() + (maxAge ? Number(maxAge[1]) * 1000 : DEFAULT_CERTS_TTL_MS),
+        };
+    }
+}
+
+export class StaticKeySource implements FirebaseKeySource {
+    constructor(private readonly keys: Record<string, string>) { }
+
+    async fetchKeys(): Promise<FirebaseSigningKeys> {
+        return { keys: this.keys, expiresAt: Number.MAX_SAFE_INTEGER };
+    }
+}
+
+/**
+ * Firebase ID 토큰 로컬 검증 (admin.auth().verifyIdToken 과 같은 검사, 폐기 여부 확인 제외).
+ * - 서명 인증서는 Cache-Control 만료까지 보관
+ * - 검증된 토큰은 sha256 해시로 토큰 exp 까지 LRU 에 보관 → 반복 호출은 해시 1회 + Map 조회
+ */
+@Injectable()
+export class FirebaseTokenVerifier {
+    private readonly verified = new LruCache<string, admin.auth.DecodedIdToken>(MAX_VERIFIED_TOKENS, 0);
+    private keys = new Map<string, KeyObject>();
+    private keysExpireAt = 0;
+    private loading: Promise<void> | null = null;
+
+    constructor(@Inject(FIREBASE_KEY_SOURCE) private readonly keySource: FirebaseKeySource) { }
+
+    async verify(token: string, projectId: string = this.projectId()): Promise<admin.auth.DecodedIdToken> {
+        if (!token) throw new UnauthorizedException('Missing Firebase token');
+
+        const cacheKey = createHash('sha256').update(token).digest('base64');
+        const cached = this.verified.get(cacheKey);
+        if (cached) return cached;
+
+        // 프로젝트 ID 를 알 수 없으면 SDK 검증으로 대신한다 (결과는 동일하게 캐시)
+        const decoded = projectId ? await this.verifyLocally(token, projectId) : await admin.auth().verifyIdToken(token);
+        this.verified.set(cacheKey, decoded, decoded.exp * 1000 - Date.now());
+        return decoded;
+    }
+
+    private async verifyLocally(token: string, projectId: string): Promise<admin.auth.DecodedIdToken> {
+        const parts = token.split('.');
+        if (parts.length !== 3) throw new UnauthorizedException('Malformed Firebase token');
+
+        let header: { alg?: string; kid?: string };
+        let payload: Record<string, any>;
+        try {
+            header = JSON.parse(Buffer.from(parts[0], 'base64url').toString('utf8'));
+            payload = JSON.parse(Buffer.from(parts[1], 'base64url').toString('utf8'));
+        } catch (e) {
+            throw new UnauthorizedException('Malformed Firebase token');
+        }
+
+        if (header.alg !== 'RS256' || !header.kid) throw new UnauthorizedException('Invalid Firebase token header');
+        const now = Math.floor(Date.now() / 1000);
+        if (payload.aud !== projectId || payload.iss !== `https://securetoken.google.com/${projectId}`) {
+            throw new UnauthorizedException('Firebase token has incorrect audience or issuer');
+        }
+        if (typeof payload.sub !== 'string' || payload.sub.length === 0 || payload.sub.length > 128) {
+            throw new UnauthorizedException('Firebase token has invalid subject');
+        }
+        if (typeof payload.exp !== 'number' || payload.exp <= now) throw new UnauthorizedException('Firebase token has expired');
+        if (typeof payload.iat !== 'number' || payload.iat > now) throw new UnauthorizedException('Firebase token issued in the future');
+        if (typeof payload.auth_time === 'number' && payload.auth_time > now) {
+            throw new UnauthorizedException('Firebase token has invalid auth_time');
+        }
+
+        const key = await this.getKey(header.kid);
+        const signed = verify('RSA-SHA256', Buffer.from(`${parts[0]}.${parts[1]}`), key, Buffer.from(parts[2], 'base64url'));
+        if (!signed) throw new UnauthorizedException('Invalid Firebase token signature');
+
+        return { ...payload, uid: payload.sub } as admin.auth.DecodedIdToken;
+    }
+
+    private async getKey(kid: string): Promise<KeyObject> {
+        if (Date.now() >= this.keysExpireAt) {
+            // 동시 요청은 같은 조회를 기다린다
+            if (!this.loading) {
+                this.loading = this.loadKeys().finally(() => { this.loading = null; });
+            }
+            await this.loading;
+        }
+        // 만료 전 모르는 kid 는 다시 조회하지 않는다 (Google 은 새 키를 사용 전에 미리 게시한다)
+        const key = this.keys.get(kid);
+        if (!key) throw new UnauthorizedException('Firebase token signed with unknown key');
+        return key;
+    }
+
+    private async loadKeys(): Promise<void> {
+        const { keys, expiresAt } = await this.keySource.fetchKeys();
+        const parsed = new Map<string, KeyObject>();
+        Object.entries(keys).forEach(([kid, pem]) => parsed.set(kid, createPublicKey(pem)));
+        this.keys = parsed;
+        this.keysExpireAt = expiresAt;
+    }
+
+    private projectId(): string | undefined {
+        return process.env.FIREBASE_PROJECT_ID
+            || process.env.GOOGLE_CLOUD_PROJECT
+            || (admin.apps.length ? admin.app().options.projectId : undefined);
+    }
+}
@@ -1,8 +1,10 @@
 import { CanActivate, ExecutionContext, Injectable, UnauthorizedException } from '@nestjs/common';
-import * as admin from 'firebase-admin';
+import { FirebaseTokenVerifier } from '../firebase-token-verifier.service';
 
 @Injectable()
 export class FirebaseAuthGuard implements CanActivate {
+    constructor(private readonly tokenVerifier: FirebaseTokenVerifier) { }
+
     async canActivate(context: ExecutionContext): Promise<boolean> {
         const request = context.switchToHttp().getRequest();
         const authHeader = request.headers.authorization;
@@ -14,8 +16,8 @@ export class FirebaseAuthGuard implements CanActivate {
         const token = authHeader.split(' ')[1];
 
         try {
-            // Decode and verify Firebase Token
-            const decodedToken = await admin.auth().verifyIdToken(token);
+            // Decode and verify Firebase Token (검증된 토큰은 exp 까지 캐시)
+            const decodedToken = await this.tokenVerifier.verify(token);
             request.firebaseUser = decodedToken; // Attach to request
             return true;
         } catch (error) {
@@ -3,20 +3,21 @@ import { AuthService } from '../../auth/auth.service'; // Reuse existing AuthSer
 import { UsersService } from '../../users/users.service';
 import { CreateMobileUserDto } from './dto/create-mobile-user.dto';
 import { FirebaseAuthGuard } from './guards/firebase-auth.guard';
-import * as admin from 'firebase-admin';
+import { FirebaseTokenVerifier } from './firebase-token-verifier.service';
 
 @Controller('auth')
 export class MobileAuthController {
     constructor(
         private authService: AuthService,
-        private usersService: UsersService
+        private usersService: UsersService,
+        private tokenVerifier: FirebaseTokenVerifier
     ) { }
 
     @Post('login/firebase')
     async login(@Body('firebaseToken') token: string) {
         try {
             // 1. Verify Token
-            const decodedToken = await admin.auth().verifyIdToken(token);
+            const decodedToken = await this.tokenVerifier.verify(token);
             const uid = decodedToken.uid;
 
             // 2. Find User by Firebase UID
@@ -52,7 +53,7 @@ export class MobileAuthController {
     @Post('signup/mobile')
     async signup(@Body() dto: CreateMobileUserDto) {
         // 1. Verify Token
-        const decodedToken = await admin.auth().verifyIdToken(dto.firebaseToken);
+        const decodedToken = await this.tokenVerifier.verify(dto.firebaseToken);
         const uid = decodedToken.uid;
         const { phone_number } = decodedToken; // Firebase Phone Auth provides this
 
@@ -9,4 +9,20 @@ export class AppGalleryController {
     async getRecentGallery() {
         return this.visitLogsService.findRecentGalleryItems(10);
     }
+
+    // 최신순 사진 피드 (?shopId=&category=&cursor=&limit=), 응답 { items, nextCursor }
+    @Get('feed')
+    async getFeed(
+        @Query('shopId') shopId?: string,
+        @Query('category') category?: string,
+        @Query('cursor') cursor?: string,
+        @Query('limit') limit?: string
+    ) {
+        return this.visitLogsService.findGalleryFeed({
+            shopId: shopId ? Number(shopId) || undefined : undefined,
+            category: category || undefined,
+            cursor,
+            limit: limit ? Number(limit) || undefined : undefined,
+        });
+    }
 }
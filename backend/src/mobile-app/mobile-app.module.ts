@@ -12,6 +12,8 @@ import { AppShopsController } from './shops/app-shops.controller';
 import { AppReservationsController } from './reservations/app-reservations.controller';
 
 import { AppGalleryController } from './gallery/app-gallery.controller';
+import { FIREBASE_KEY_SOURCE, FirebaseTokenVerifier, GoogleCertKeySource } from './auth/firebase-token-verifier.service';
+import { FirebaseAuthGuard } from './auth/guards/firebase-auth.guard';
 
 @Module({
     imports: [
@@ -29,6 +31,10 @@ import { AppGalleryController } from './gallery/app-gallery.controller';
         AppReservationsController,
         AppGalleryController
     ],
-    providers: [],
+    providers: [
+        FirebaseTokenVerifier,
+        FirebaseAuthGuard,
+        { provide: FIREBASE_KEY_SOURCE, useClass: GoogleCertKeySource },
+    ],
 })
 export class MobileAppModule { }
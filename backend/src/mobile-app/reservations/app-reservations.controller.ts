@@ -1,6 +1,7 @@
 import { Body, Controller, Get, Param, ParseIntPipe, Post, Query, Patch, BadRequestException } from '@nestjs/common';
 import { ReservationsService } from '../../reservations/reservations.service';
 import { CreateReservationDto } from '../../reservations/dto/create-reservation.dto';
+import { MAX_CALENDAR_DAYS } from '../../reservations/availability.service';
 
 @Controller('shops/:shopId/reservations')
 export class AppReservationsController {
@@ -11,16 +12,54 @@ export class AppReservationsController {
         @Param('shopId', ParseIntPipe) shopId: number,
         @Query('date') date: string,
         @Query('duration') duration: number,
-        @Query('designerId') designerId?: string // Can be 'ANY' or number
+        @Query('designerId') designerId?: string, // Can be 'ANY' or number
+        @Query('step') step?: string, // 슬롯 간격(분), 기본 30
+        @Query('detail') detail?: string // 'true' 이면 슬롯별 가능 디자이너 포함
     ) {
         if (!date || !duration) throw new BadRequestException('Date and Duration are required');
+        this.assertDate(date, 'date');
 
         let targetDesignerId: number | undefined;
         if (designerId && designerId !== 'ANY') {
             targetDesignerId = Number(designerId);
         }
 
-        return this.reservationsService.getAvailableSlots(shopId, date, Number(duration), targetDesignerId);
+        const slotStep = this.parseStep(step);
+
+        if (detail === 'true') {
+            return this.reservationsService.getAvailableSlotDetails(shopId, date, Number(duration), targetDesignerId, slotStep);
+        }
+        return this.reservationsService.getAvailableSlots(shopId, date, Number(duration), targetDesignerId, slotStep);
+    }
+
+    @Get('calendar')
+    async getCalendar(
+        @Param('shopId', ParseIntPipe) shopId: number,
+        @Query('from') from: string, // YYYY-MM-DD
+        @Query('days') days?: string, // 기본 14, 최대 31
+        @Query('duration') duration?: string, // 지정 시 일자별 예약 가능 여부 포함
+        @Query('designerId') designerId?: string,
+        @Query('step') step?: string
+    ) {
+        if (!from) throw new BadRequestException('from is required');
+        this.assertDate(from, 'from');
+
+        const dayCount = days ? Number(days) : 14;
+        if (!Number.isInteger(dayCount) || dayCount < 1 || dayCount > MAX_CALENDAR_DAYS) {
+            throw new BadRequestException(`days must be an integer between 1 and ${MAX_CALENDAR_DAYS}`);
+        }
+
+        const targetDesignerId = designerId && designerId !== 'ANY' ? Number(designerId) : undefined;
+        const calendar = await this.reservationsService.getAvailabilityCalendar(
+            shopId,
+            from,
+            dayCount,
+            duration ? Number(duration) : undefined,
+            targetDesignerId,
+            this.parseStep(step)
+        );
+
+        return { from, days: dayCount, calendar };
     }
 
     @Post()
@@ -36,7 +75,8 @@ export class AppReservationsController {
         const reservationData = {
             ...dto,
             shop_id: shopId, // Ensure shopId from param
-            source: 'APP'
+            source: 'APP',
+            force: false, // 고객 앱은 경고(겹침, 휴무 등)를 무시할 수 없다
             // logic to set source requires Repo update (it accepts Partial<RESERVATIONS> or similar).
         };
         return this.reservationsService.create(reservationData as any);
@@ -57,4 +97,23 @@ export class AppReservationsController {
         // I'll call 'cancelReservation' which I will add.
         return this.reservationsService.remove(shopId, id); // Temporary until logic implemented
     }
+
+    // YYYY-MM-DD 형식의 실제 날짜인지 (2026-13-99 등은 가용 캐시 키로 쓰이기 전에 400)
+    private assertDate(value: string, name: string): void {
+        const match = /^(\d{4})-(\d{2})-(\d{2})$/.exec(value);
+        const [year, month, day] = match ? match.slice(1).map(Number) : [];
+        const parsed = match ? new Date(Date.UTC(year, month - 1, day)) : null;
+        if (!parsed || parsed.getUTCFullYear() !== year || parsed.getUTCMonth() !== month - 1 || parsed.getUTCDate() !== day) {
+            throw new BadRequestException(`${name} must be a valid date (YYYY-MM-DD)`);
+        }
+    }
+
+    private parseStep(step?: string): number | undefined {
+        if (!step) return undefined;
+        const slotStep = Number(step);
+        if (!Number.isInteger(slotStep) || slotStep < 5 || slotStep > 240) {
+            throw new BadRequestException('step must be an integer between 5 and 240');
+        }
+        return slotStep;
+    }
 }
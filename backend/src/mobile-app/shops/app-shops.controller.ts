@@ -1,5 +1,8 @@
-import { Controller, Get, Param, ParseIntPipe, Query } from '@nestjs/common';
+import { Controller, Get, Headers, Param, ParseIntPipe, Query, Res } from '@nestjs/common';
+import { Response } from 'express';
 import { ShopsService } from '../../shops/shops.service';
+import { MenusService } from '../../menus/menus.service';
+import { notModified } from '../../common/http/conditional-get';
 import { AppShopResponseDto } from './dto/app-shop-response.dto';
 import { TimeService } from '../../common/time/time.service';
 
@@ -7,6 +10,7 @@ import { TimeService } from '../../common/time/time.service';
 export class AppShopsController {
     constructor(
         private shopsService: ShopsService,
+        private menusService: MenusService,
         private timeService: TimeService
     ) { }
 
@@ -42,6 +46,18 @@ export class AppShopsController {
         return this.toDto(shop);
     }
 
+    // 예약 화면용 CATEGORY → MENU 트리 (읽기 전용, duration 은 슬롯 조회에 사용). ETag 가 같으면 304
+    @Get(':id/menus/tree')
+    async findMenuTree(
+        @Param('id', ParseIntPipe) id: number,
+        @Headers('if-none-match') ifNoneMatch: string | undefined,
+        @Res({ passthrough: true }) res: Response
+    ) {
+        const { snapshot, etag } = await this.menusService.findWithEtag(id, 'tree');
+        if (notModified(res, etag, ifNoneMatch)) return;
+        return snapshot.tree;
+    }
+
     private toDto(shop: any): AppShopResponseDto {
         return {
             shop_id: Number(shop.shop_id),
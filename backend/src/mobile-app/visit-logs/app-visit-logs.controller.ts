@@ -1,6 +1,7 @@
 import { Controller, Get, Param, ParseIntPipe, Query, UseGuards, Request } from '@nestjs/common';
 import { VisitLogsService } from '../../visit-logs/visit-logs.service';
 import { JwtAuthGuard } from '../../auth/guards/jwt-auth.guard';
+import { variantUrl } from '../../config/upload.config';
 
 @Controller('shops/:shopId/visit-logs')
 @UseGuards(JwtAuthGuard)
@@ -29,7 +30,8 @@ export class AppVisitLogsController {
         return logs.data.map(log => ({
             log_id: Number(log.log_id),
             visited_at: log.visited_at,
-            photo_urls: log.photo_urls ? JSON.parse(log.photo_urls) : [],
+            photo_urls: log.photo_urls, // mapToDto 에서 이미 배열로 변환됨
+            thumbnail_urls: log.photo_urls.map((url: string) => variantUrl(url, 'thumb')), // 목록/그리드용
             designer_name: log.DESIGNERS?.USERS?.name,
             menu_name: log.RESERVATIONS?.RESERVATION_ITEMS?.map(i => i.menu_name).join(', ') || '시술',
             // admin_memo is EXCLUDED
@@ -0,0 +1,174 @@
+import { Injectable } from '@nestjs/common';
+import { Prisma } from '@prisma/client';
+import { PrismaService } from '../prisma/prisma.service';
+
+// 한 번에 읽는 만료 lot 수 / 동시에 처리하는 잔액 수
+export const DEFAULT_EXPIRY_CHUNK_SIZE = 500;
+export const DEFAULT_EXPIRY_CONCURRENCY = 4;
+const MAX_EXPIRY_CHUNK_SIZE = 5000;
+
+interface ExpiryLot {
+    transaction_id: bigint;
+    balance_id: bigint;
+    expires_at: Date;
+}
+
+export interface PrepaidExpiryOptions {
+    // 이 시각 이전에 만료된 lot 을 처리 (기본: 현재)
+    now?: Date;
+    chunkSize?: number;
+    concurrency?: number;
+    // 청크마다 누적 결과 (진행률 출력용)
+    onChunk?: (report: PrepaidExpiryReport) => void;
+}
+
+export interface PrepaidExpiryReport {
+    // 처리한(expired_at 을 기록한) 만료 lot 수
+    lots: number;
+    balances: number;
+    // 남은 금액이 있어 EXPIRE 거래를 남긴 lot 수 / 금액
+    expiredLots: number;
+    expiredAmount: number;
+    // 실패한 잔액 수 (해당 lot 은 미처리로 남아 다음 실행에서 다시 시도)
+    failed: number;
+    elapsedMs: number;
+}
+
+export interface ChargeLot {
+    transaction_id: bigint;
+    amount: number;
+    expires_at: Date | null;
+    expired_at: Date | null;
+}
+
+/**
+ * 현재 잔액을 최신 충전부터 lot 에 배정하고, 만료된 미처리 lot 과 그 lot 에 배정된(소멸할) 금액을 구한다.
+ * 이미 만료 처리된 lot 은 남은 금액이 0 이므로 배정에서 제외한다 (유효기간이 다른 선불권이 한 잔액에 섞여 있어
+ * 최신 lot 이 먼저 만료될 수 있다). charges 는 transaction_id 내림차순.
+ * 검증: npm run prepaid:check-expiry (scripts/check_prepaid_expiry.ts)
+ */
+export function assignExpiringCredit(balance: number, charges: ChargeLot[], now: Date): { pending: bigint[]; expiring: number[] } {
+    let unassigned = Math.max(balance, 0);
+    const pending: bigint[] = [];
+    const expiring: number[] = [];
+    for (const charge of charges) {
+        if (charge.expired_at) continue;
+        const assigned = Math.min(unassigned, charge.amount);
+        unassigned -= assigned;
+        if (!charge.expires_at || charge.expires_at > now) continue;
+
+        pending.push(charge.transaction_id);
+        if (assigned > 0) expiring.push(assigned);
+    }
+    return { pending, expiring };
+}
+
+/**
+ * 선불권 유효기간 만료 배치 (전체 매장).
+ *
+ * 충전(CHARGE) 거래 하나가 적립 단위(lot)이고, 사용은 먼저 충전한 것부터 차감된 것으로 본다(선입선출).
+ * 따라서 현재 잔액은 가장 최근 충전분들로 이루어져 있고, 만료된 lot 에 남은 금액은
+ * 최신 충전부터 잔액을 채워 나갈 때 그 lot 에 배정되는 금액이다.
+ *
+ * 만료 대상 lot 은 PREPAID_TRANSACTIONS_expiry_idx 로 (expires_at, transaction_id) keyset 순회하고,
+ * 잔액 하나당 짧은 트랜잭션 하나(잔액 행 잠금 → EXPIRE 거래 기록 → 잔액 차감 → lot 처리 표시)로 처리한다.
+ * 처리한 lot 은 expired_at 이 채워져 대상에서 빠지므로 중간에 멈춰도 다시 실행하면 이어서 처리된다.
+ */
+@Injectable()
+export class PrepaidExpiryService {
+    constructor(private readonly prisma: PrismaService) { }
+
+    async expire(options: PrepaidExpiryOptions = {}): Promise<PrepaidExpiryReport> {
+        const now = options.now ?? new Date();
+        const chunkSize = Math.min(Math.max(options.chunkSize || DEFAULT_EXPIRY_CHUNK_SIZE, 1), MAX_EXPIRY_CHUNK_SIZE);
+        const concurrency = Math.max(options.concurrency || DEFAULT_EXPIRY_CONCURRENCY, 1);
+        const started = Date.now();
+        const report: PrepaidExpiryReport = { lots: 0, balances: 0, expiredLots: 0, expiredAmount: 0, failed: 0, elapsedMs: 0 };
+
+        let after: ExpiryLot | null = null;
+        while (true) {
+            const lots = await this.prisma.$queryRaw<ExpiryLot[]>`
+                SELECT transaction_id, balance_id, expires_at FROM PREPAID_TRANSACTIONS
+                WHERE expired_at IS NULL AND expires_at <= ${now}
+                    ${after ? Prisma.sql`AND expires_at >= ${after.expires_at} AND (expires_at > ${after.expires_at} OR transaction_id > ${after.transaction_id})` : Prisma.empty}
+                ORDER BY expires_at, transaction_id
+                LIMIT ${chunkSize}`;
+            if (lots.length === 0) break;
+
+            // 같은 잔액의 만료 lot 은 한 트랜잭션에서 모두 처리한다
+            const balanceIds = [...new Map(lots.map(lot => [lot.balance_id.toString(), lot.balance_id])).values()];
+            let next = 0;
+            const workers = Array.from({ length: Math.min(concurrency, balanceIds.length) }, async () => {
+                while (next < balanceIds.length) {
+                    const balanceId = balanceIds[next++];
+                    try {
+                        const result = await this.expireBalance(balanceId, now);
+                        report.lots += result.lots;
+                        report.expiredLots += result.expiredLots;
+                        report.expiredAmount += result.expiredAmount;
+                        report.balances++;
+                    } catch (error) {
+                        report.failed++;
+                        console.error(`[PrepaidExpiry] balance ${balanceId} failed:`, error.message);
+                    }
+                }
+            });
+            await Promise.all(workers);
+
+            report.elapsedMs = Date.now() - started;
+            options.onChunk?.(report);
+            if (lots.length < chunkSize) break;
+            after = lots[lots.length - 1];
+        }
+
+        report.elapsedMs = Date.now() - started;
+        return report;
+    }
+
+    private expireBalance(balanceId: bigint, now: Date) {
+        return this.prisma.$transaction(async (tx) => {
+            // 잔액 행만 잠근다 (PK 조회라 다른 잔액/거래 삽입을 막지 않는다)
+            const [balance] = await tx.$queryRaw<{ balance: number }[]>`
+                SELECT balance FROM CUSTOMER_PREPAID_BALANCES WHERE balance_id = ${balanceId} FOR UPDATE`;
+            if (!balance) return { lots: 0, expiredLots: 0, expiredAmount: 0 };
+
+            const charges = await tx.pREPAID_TRANSACTIONS.findMany({
+                where: { balance_id: balanceId, type: 'CHARGE' },
+                select: { transaction_id: true, amount: true, expires_at: true, expired_at: true },
+                orderBy: { transaction_id: 'desc' },
+            });
+
+            const { pending, expiring } = assignExpiringCredit(balance.balance, charges, now);
+            if (pending.length === 0) return { lots: 0, expiredLots: 0, expiredAmount: 0 };
+
+            const expiredAmount = expiring.reduce((sum, amount) => sum + amount, 0);
+            if (expiredAmount > 0) {
+                await tx.cUSTOMER_PREPAID_BALANCES.update({
+                    where: { balance_id: balanceId },
+                    data: { balance: { decrement: expiredAmount } },
+                });
+
+                // 오래된 lot 부터 소멸 기록
+                let balanceAfter = balance.balance;
+                await tx.pREPAID_TRANSACTIONS.createMany({
+                    data: expiring.reverse().map(amount => {
+                        balanceAfter -= amount;
+                        return {
+                            balance_id: balanceId,
+                            type: 'EXPIRE' as const,
+                            amount,
+                            balance_after: balanceAfter,
+                        };
+                    }),
+                });
+            }
+
+            await tx.pREPAID_TRANSACTIONS.updateMany({
+                where: { transaction_id: { in: pending } },
+                data: { expired_at: new Date() },
+            });
+
+            return { lots: pending.length, expiredLots: expiring.length, expiredAmount };
+        });
+    }
+}
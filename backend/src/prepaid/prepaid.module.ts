@@ -1,12 +1,14 @@
 import { Module } from '@nestjs/common';
 import { PrepaidController } from './prepaid.controller';
 import { PrepaidService } from './prepaid.service';
+import { PrepaidExpiryService } from './prepaid-expiry.service';
 import { PrismaModule } from '../prisma/prisma.module';
+import { SalesModule } from '../sales/sales.module';
 
 @Module({
-    imports: [PrismaModule],
+    imports: [PrismaModule, SalesModule],
     controllers: [PrepaidController],
-    providers: [PrepaidService],
+    providers: [PrepaidService, PrepaidExpiryService],
     exports: [PrepaidService],
 })
 export class PrepaidModule { }
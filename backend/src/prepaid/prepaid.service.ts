@@ -1,10 +1,15 @@
 import { Injectable, BadRequestException } from '@nestjs/common';
+import { Prisma } from '@prisma/client';
 import { PrismaService } from '../prisma/prisma.service';
 import { CreateTicketDto, ChargePrepaidDto } from './dto/prepaid.dto';
+import { SalesRollupService } from '../sales/sales-rollup.service';
 
 @Injectable()
 export class PrepaidService {
-    constructor(private prisma: PrismaService) { }
+    constructor(
+        private prisma: PrismaService,
+        private salesRollup: SalesRollupService,
+    ) { }
 
     async createTicket(shopId: number, dto: CreateTicketDto) {
         return this.prisma.pREPAID_TICKETS.create({
@@ -46,6 +51,7 @@ export class PrepaidService {
         let chargeAmount = 0;
         let bonusAmount = 0;
         let totalCredit = 0;
+        let expiresAt: Date | null = null;
 
         if (dto.ticketId) {
             const ticket = await this.prisma.pREPAID_TICKETS.findUnique({
@@ -56,6 +62,10 @@ export class PrepaidService {
             chargeAmount = ticket.price;
             totalCredit = ticket.credit_amount;
             bonusAmount = totalCredit - chargeAmount;
+            // 유효기간이 있는 선불권: 충전 시각부터 validity_days 일 뒤 만료 (PrepaidExpiryService 가 처리)
+            if (ticket.validity_days) {
+                expiresAt = new Date(Date.now() + ticket.validity_days * 24 * 60 * 60 * 1000);
+            }
         } else {
             if (!dto.amount) throw new BadRequestException('Amount is required for manual charge');
             chargeAmount = dto.amount;
@@ -84,17 +94,21 @@ export class PrepaidService {
             });
 
             // 2. Log Transaction
-            await tx.pREPAID_TRANSACTIONS.create({
+            const transaction = await tx.pREPAID_TRANSACTIONS.create({
                 data: {
                     balance_id: balanceRecord.balance_id,
                     type: 'CHARGE',
                     amount: totalCredit,
                     bonus_amount: bonusAmount,
                     balance_after: balanceRecord.balance,
-                    payment_method: dto.paymentMethod || 'CASH'
+                    payment_method: dto.paymentMethod || 'CASH',
+                    expires_at: expiresAt,
                 },
             });
 
+            // 3. 일별 매출 집계 반영
+            await this.salesRollup.applyPrepaidTransaction(tx, transaction.transaction_id);
+
             return {
                 success: true,
                 charged: chargeAmount,
@@ -102,41 +116,55 @@ export class PrepaidService {
             };
         });
     }
-    async usePrepaid(shopId: number, userId: number, amount: number) {
-        return this.prisma.$transaction(async (tx) => {
-            const balanceRecord = await tx.cUSTOMER_PREPAID_BALANCES.findUnique({
-                where: {
-                    user_id_shop_id: {
-                        user_id: BigInt(userId),
-                        shop_id: BigInt(shopId),
-                    },
-                },
-            });
 
-            if (!balanceRecord || balanceRecord.balance < amount) {
-                throw new BadRequestException('잔액이 부족합니다.');
-            }
+    /**
+     * 예약 완료(결제) 트랜잭션 안에서 PREPAID 결제 건들을 한 번에 차감한다.
+     * 결제 건마다 USE 거래를 남기고 ref_payment_id 로 연결한다. 잔액이 부족하면 예외를 던져 결제 전체가 롤백된다.
+     */
+    async usePrepaidForPayments(tx: Prisma.TransactionClient, shopId: number, userId: bigint, payments: { payment_id: bigint; amount: number }[]) {
+        const uses = payments.filter(p => p.amount > 0);
+        if (uses.length === 0) return null;
 
-            // Deduct Balance
-            const updated = await tx.cUSTOMER_PREPAID_BALANCES.update({
-                where: { balance_id: balanceRecord.balance_id },
-                data: {
-                    balance: { decrement: amount },
-                    last_used_at: new Date(),
-                },
-            });
+        const total = uses.reduce((sum, p) => sum + p.amount, 0);
+        const updated = await this.deductBalance(tx, shopId, userId, total);
 
-            // Log Transaction
-            await tx.pREPAID_TRANSACTIONS.create({
-                data: {
-                    balance_id: balanceRecord.balance_id,
-                    type: 'USE', // USE
-                    amount: amount,
-                    balance_after: updated.balance,
-                },
-            });
+        // 거래 후 잔액은 결제 건 순서대로 차감한 값
+        let balanceAfter = updated.balance + total;
+        await tx.pREPAID_TRANSACTIONS.createMany({
+            data: uses.map(p => {
+                balanceAfter -= p.amount;
+                return {
+                    balance_id: updated.balance_id,
+                    type: 'USE' as const,
+                    amount: p.amount,
+                    balance_after: balanceAfter,
+                    ref_payment_id: p.payment_id,
+                };
+            }),
+        });
+
+        await this.salesRollup.applyPrepaidPayments(tx, uses.map(p => p.payment_id));
 
-            return updated;
+        return updated;
+    }
+
+    /**
+     * 조건부 UPDATE 한 번으로 잔액 확인과 차감을 함께 한다 (balance >= amount 인 행만 갱신).
+     * 조회 후 차감하는 방식과 달리 동시 차감이 잔액을 음수로 만들 수 없고, 행 잠금도 UPDATE 시점부터만 잡는다.
+     */
+    private async deductBalance(tx: Prisma.TransactionClient, shopId: number, userId: number | bigint, amount: number) {
+        const key = { user_id: BigInt(userId), shop_id: BigInt(shopId) };
+        const { count } = await tx.cUSTOMER_PREPAID_BALANCES.updateMany({
+            where: { ...key, balance: { gte: amount } },
+            data: {
+                balance: { decrement: amount },
+                last_used_at: new Date(),
+            },
         });
+        if (count === 0) {
+            throw new BadRequestException('잔액이 부족합니다.');
+        }
+
+        return tx.cUSTOMER_PREPAID_BALANCES.findUnique({ where: { user_id_shop_id: key } });
     }
 }
@@ -1,8 +1,26 @@
 import { Injectable, OnModuleInit, OnModuleDestroy } from '@nestjs/common';
 import { PrismaClient } from '@prisma/client';
+import { performance } from 'perf_hooks';
+import { recordQuery } from '../common/metrics/request-context';
+import { workerDatabaseUrl } from '../config/cluster.config';
 
 @Injectable()
 export class PrismaService extends PrismaClient implements OnModuleInit, OnModuleDestroy {
+    constructor() {
+        // 워커 수만큼 풀이 늘어나므로 워커당 커넥션 수를 나눠 MySQL max_connections 를 넘지 않게 한다
+        const url = workerDatabaseUrl(process.env.DATABASE_URL);
+        super(url ? { datasources: { db: { url } } } : undefined);
+        // 쿼리를 호출한 HTTP 요청에 귀속 (middleware 는 호출한 쪽의 async context 에서 실행된다)
+        this.$use(async (params, next) => {
+            const started = performance.now();
+            try {
+                return await next(params);
+            } finally {
+                recordQuery(params.model ? `${params.model}.${params.action}` : params.action, performance.now() - started);
+            }
+        });
+    }
+
     async onModuleInit() {
         try {
             await this.$connect();
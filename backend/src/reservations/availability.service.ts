@@ -0,0 +1,283 @@
+import { Injectable } from '@nestjs/common';
+import { PrismaService } from '../prisma/prisma.service';
+import { TimeService } from '../common/time/time.service';
+import { ReservationsRepository } from './reservations.repository';
+import { AvailabilityCacheService } from '../common/cache/availability-cache.service';
+
+export const DEFAULT_SLOT_STEP = 30; // 분 단위 슬롯 간격
+const MINUTES_PER_DAY = 24 * 60;
+
+// [시작분, 종료분) - 자정(KST) 기준 분 단위 반열림 구간
+export type MinuteInterval = [number, number];
+
+export interface DesignerDaySchedule {
+    designerId: number;
+    workStart: number;
+    workEnd: number;
+    busy: MinuteInterval[]; // 정렬 + 병합된 점유 구간 (점심, 블록, 예약)
+}
+
+export interface DaySchedule {
+    date: string; // YYYY-MM-DD (KST)
+    closed: boolean;
+    designers: DesignerDaySchedule[];
+}
+
+export interface SlotAvailability {
+    time: string; // HH:mm (KST)
+    designerIds: number[];
+}
+
+export interface DesignerFreeRanges {
+    designerId: number;
+    free: MinuteInterval[];
+}
+
+export interface CalendarDay {
+    date: string;
+    closed: boolean;
+    available?: boolean; // duration 지정 시: 예약 가능한 슬롯 존재 여부
+    slotCount?: number;
+    designers: DesignerFreeRanges[];
+}
+
+export const MAX_CALENDAR_DAYS = 31;
+
+@Injectable()
+export class AvailabilityService {
+    constructor(
+        private reservationsRepository: ReservationsRepository,
+        private prisma: PrismaService,
+        private timeService: TimeService,
+        private availabilityCache: AvailabilityCacheService,
+    ) { }
+
+    /**
+     * 여러 일자의 디자이너 스케줄을 한 번에 적재한다. (캐시 미사용)
+     * 일자/디자이너 수와 무관하게 매장·디자이너 조회 + 예약·블록 조회(병렬) 로 끝난다.
+     */
+    async loadSchedules(shopId: number, dates: string[]): Promise<DaySchedule[]> {
+        if (dates.length === 0) return [];
+        const dayStarts = dates
+            .map(date => this.timeService.parse(date).startOf('day'))
+            .sort((a, b) => a.valueOf() - b.valueOf());
+
+        const [shop, designers] = await Promise.all([
+            this.prisma.sHOPS.findUnique({ where: { shop_id: BigInt(shopId) } }),
+            this.prisma.dESIGNERS.findMany({
+                where: { shop_id: BigInt(shopId), is_active: true },
+            }),
+        ]);
+
+        // 근무시간이 없는 디자이너는 제외
+        const working = designers
+            .map(d => ({
+                designer: d,
+                workStart: this.toMinutes(this.timeService.toUtcTimeStr(d.work_start)),
+                workEnd: this.toMinutes(this.timeService.toUtcTimeStr(d.work_end)),
+                lunchStart: this.toMinutes(this.timeService.toUtcTimeStr(d.lunch_start)),
+                lunchEnd: this.toMinutes(this.timeService.toUtcTimeStr(d.lunch_end)),
+            }))
+            .filter(w => w.workStart !== null && w.workEnd !== null);
+
+        let reservations: { designer_id: bigint; start_time: Date; end_time: Date }[] = [];
+        let blocks: { designer_id: bigint; start_time: Date; end_time: Date }[] = [];
+        if (shop && working.length > 0) {
+            const from = dayStarts[0].toDate();
+            const to = dayStarts[dayStarts.length - 1].add(1, 'day').toDate();
+            const designerIds = working.map(w => w.designer.designer_id);
+            [reservations, blocks] = await Promise.all([
+                this.reservationsRepository.getBusyReservations(designerIds, from, to),
+                this.reservationsRepository.getScheduleBlocks(designerIds, from, to),
+            ]);
+        }
+        const busyItems = [...reservations, ...blocks];
+
+        return dayStarts.map(dayStart => {
+            const date = dayStart.format('YYYY-MM-DD');
+            const dayOfWeek = dayStart.format('ddd');
+
+            if (!shop || (shop.closed_days && shop.closed_days.includes(dayOfWeek))) {
+                return { date, closed: true, designers: [] };
+            }
+
+            // 해당 일자에 걸치는 점유 구간을 디자이너별로 수집
+            const dayStartMs = dayStart.valueOf();
+            const dayEndMs = dayStart.add(1, 'day').valueOf();
+            const busyMap = new Map<string, MinuteInterval[]>();
+            for (const item of busyItems) {
+                if (item.start_time.getTime() >= dayEndMs || item.end_time.getTime() <= dayStartMs) continue;
+                const key = item.designer_id.toString();
+                const list = busyMap.get(key) || [];
+                list.push([
+                    this.clampMinute((item.start_time.getTime() - dayStartMs) / 60000),
+                    this.clampMinute((item.end_time.getTime() - dayStartMs) / 60000),
+                ]);
+                busyMap.set(key, list);
+            }
+
+            return {
+                date,
+                closed: false,
+                designers: working
+                    .filter(w => !(w.designer.day_off && w.designer.day_off.includes(dayOfWeek)))
+                    .map(w => {
+                        const busy = [...(busyMap.get(w.designer.designer_id.toString()) || [])];
+                        if (w.lunchStart !== null && w.lunchEnd !== null) {
+                            busy.push([w.lunchStart, w.lunchEnd]);
+                        }
+                        return {
+                            designerId: Number(w.designer.designer_id),
+                            workStart: w.workStart,
+                            workEnd: w.workEnd,
+                            busy: mergeIntervals(busy),
+                        };
+                    }),
+            };
+        });
+    }
+
+    /**
+     * 연속된 일자 범위의 스케줄 (매장/일자 캐시 사용, 미스난 일자만 일괄 적재)
+     */
+    async getSchedules(shopId: number, from: string, days: number): Promise<DaySchedule[]> {
+        const start = this.timeService.parse(from).startOf('day');
+        const dates = Array.from({ length: days }, (_, i) => start.add(i, 'day').format('YYYY-MM-DD'));
+
+        const result = new Map<string, DaySchedule>();
+        const missing: string[] = [];
+        dates.forEach(date => {
+            const cached = this.availabilityCache.get(shopId, date);
+            if (cached) result.set(date, cached);
+            else missing.push(date);
+        });
+
+        if (missing.length > 0) {
+            const generation = this.availabilityCache.generation(shopId);
+            const loaded = await this.loadSchedules(shopId, missing);
+            loaded.forEach(schedule => {
+                this.availabilityCache.set(shopId, schedule, generation);
+                result.set(schedule.date, schedule);
+            });
+        }
+
+        return dates.map(date => result.get(date));
+    }
+
+    async getAvailableSlots(shopId: number, date: string, duration: number, designerId?: number, step: number = DEFAULT_SLOT_STEP): Promise<string[]> {
+        const slots = await this.getSlotDetails(shopId, date, duration, designerId, step);
+        return slots.map(s => s.time);
+    }
+
+    async getSlotDetails(shopId: number, date: string, duration: number, designerId?: number, step: number = DEFAULT_SLOT_STEP): Promise<SlotAvailability[]> {
+        const [schedule] = await this.getSchedules(shopId, date, 1);
+        return sweepSlots(this.filterDesigner(schedule.designers, designerId), duration, step);
+    }
+
+    /**
+     * 다일자 가용 캘린더: 일자/디자이너별 빈 구간(분 단위)
+     */
+    async getCalendar(shopId: number, from: string, days: number, duration?: number, designerId?: number, step: number = DEFAULT_SLOT_STEP): Promise<CalendarDay[]> {
+        const schedules = await this.getSchedules(shopId, from, Math.min(days, MAX_CALENDAR_DAYS));
+
+        return schedules.map(schedule => {
+            const designers = this.filterDesigner(schedule.designers, designerId);
+            const day: CalendarDay = {
+                date: schedule.date,
+                closed: schedule.closed,
+                designers: designers.map(d => ({ designerId: d.designerId, free: freeIntervals(d) })),
+            };
+            if (duration) {
+                const slotCount = sweepSlots(designers, duration, step).length;
+                day.available = slotCount > 0;
+                day.slotCount = slotCount;
+            }
+            return day;
+        });
+    }
+
+    private filterDesigner(designers: DesignerDaySchedule[], designerId?: number): DesignerDaySchedule[] {
+        if (!designerId) return designers;
+        return designers.filter(d => d.designerId === designerId);
+    }
+
+    private toMinutes(timeStr: string | null): number | null {
+        if (!timeStr) return null;
+        const [h, m] = timeStr.split(':').map(Number);
+        return h * 60 + m;
+    }
+
+    private clampMinute(minute: number): number {
+        return Math.min(Math.max(Math.round(minute), 0), MINUTES_PER_DAY);
+    }
+}
+
+/**
+ * 구간 병합: 시작 기준 정렬 후 겹치거나 맞닿은 구간을 합친다.
+ */
+export function mergeIntervals(intervals: MinuteInterval[]): MinuteInterval[] {
+    const sorted = intervals
+        .filter(([start, end]) => end > start)
+        .sort((a, b) => a[0] - b[0]);
+
+    const merged: MinuteInterval[] = [];
+    for (const [start, end] of sorted) {
+        const last = merged[merged.length - 1];
+        if (last && start <= last[1]) {
+            last[1] = Math.max(last[1], end);
+        } else {
+            merged.push([start, end]);
+        }
+    }
+    return merged;
+}
+
+/**
+ * 근무시간 내 빈 구간 (점유 구간의 여집합)
+ */
+export function freeIntervals(schedule: DesignerDaySchedule): MinuteInterval[] {
+    const free: MinuteInterval[] = [];
+    let cursor = schedule.workStart;
+    for (const [start, end] of schedule.busy) {
+        if (end <= cursor) continue;
+        if (start >= schedule.workEnd) break;
+        if (start > cursor) free.push([cursor, start]);
+        cursor = Math.max(cursor, end);
+    }
+    if (cursor < schedule.workEnd) free.push([cursor, schedule.workEnd]);
+    return free;
+}
+
+/**
+ * 인터벌 스윕으로 슬롯 계산.
+ * 슬롯 시작 t 는 단조 증가하므로 점유 구간 포인터도 한 방향으로만 이동한다.
+ * (디자이너당 O(슬롯 수 + 점유 구간 수))
+ */
+export function sweepSlots(schedules: DesignerDaySchedule[], duration: number, step: number = DEFAULT_SLOT_STEP): SlotAvailability[] {
+    const slotMap = new Map<number, number[]>();
+    if (!(duration > 0) || !(step > 0)) return [];
+
+    for (const schedule of schedules) {
+        const { busy } = schedule;
+        let p = 0;
+        for (let t = schedule.workStart; t + duration <= schedule.workEnd; t += step) {
+            // 이미 지나간 점유 구간은 건너뜀
+            while (p < busy.length && busy[p][1] <= t) p++;
+            if (p < busy.length && busy[p][0] < t + duration) continue;
+
+            const ids = slotMap.get(t) || [];
+            ids.push(schedule.designerId);
+            slotMap.set(t, ids);
+        }
+    }
+
+    return Array.from(slotMap.entries())
+        .sort((a, b) => a[0] - b[0])
+        .map(([minute, designerIds]) => ({ time: minutesToTimeStr(minute), designerIds }));
+}
+
+export function minutesToTimeStr(minute: number): string {
+    const h = Math.floor(minute / 60);
+    const m = minute % 60;
+    return `${String(h).padStart(2, '0')}:${String(m).padStart(2, '0')}`;
+}
@@ -0,0 +1,9 @@
+import { IsDateString, IsOptional } from 'class-validator';
+import { GetReservationsDto } from './get-reservations.dto';
+
+export class GetReservationCalendarDto extends GetReservationsDto {
+    // 직전 응답의 cursor. 없으면 구간 전체를 반환한다.
+    @IsOptional()
+    @IsDateString()
+    changedSince?: string;
+}
@@ -0,0 +1,26 @@
+import { IsBoolean, IsEnum, IsIn, IsOptional } from 'class-validator';
+import { Transform } from 'class-transformer';
+import { RESERVATIONS_source } from '@prisma/client';
+import { IMPORT_ENCODINGS, ImportEncoding, ImportFormat } from '../reservation-import.parser';
+
+export class ImportReservationsDto {
+    // 없으면 파일 확장자(.csv / .jsonl, .ndjson)로 판단
+    @IsOptional()
+    @IsIn(['csv', 'jsonl'])
+    format?: ImportFormat;
+
+    @IsOptional()
+    @IsIn(IMPORT_ENCODINGS)
+    encoding?: ImportEncoding;
+
+    // 행에 예약경로(source) 컬럼이 없을 때 사용 (NAVER, KAKAO 등)
+    @IsOptional()
+    @IsEnum(RESERVATIONS_source)
+    source?: RESERVATIONS_source;
+
+    // 검증/중복 확인만 하고 저장하지 않음
+    @IsOptional()
+    @Transform(({ value }) => value === true || value === 'true')
+    @IsBoolean()
+    dryRun?: boolean;
+}
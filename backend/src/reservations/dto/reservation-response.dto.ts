@@ -0,0 +1,71 @@
+import { t } from '../../common/serialization/response-serializer';
+
+const RESERVATION_USER = t.object({ name: t.string, phone: t.string });
+
+const RESERVATION_ITEM = t.object({
+    item_id: t.id,
+    reservation_id: t.id,
+    menu_id: t.id,
+    menu_name: t.string,
+    price: t.number,
+});
+
+// 예약 목록의 디자이너 (DESIGNERS 전체 컬럼, 근무시간은 TIME 컬럼 그대로 ISO 문자열)
+const RESERVATION_DESIGNER = t.object({
+    designer_id: t.id,
+    user_id: t.id,
+    shop_id: t.id,
+    intro_text: t.string,
+    profile_img: t.string,
+    work_start: t.date,
+    work_end: t.date,
+    lunch_start: t.date,
+    lunch_end: t.date,
+    day_off: t.string,
+    is_active: t.boolean,
+    USERS: t.object({ name: t.string }),
+});
+
+// GET /shops/:shopId/reservations
+export const RESERVATION_LIST_RESPONSE = t.array(t.object({
+    reservation_id: t.id,
+    shop_id: t.id,
+    customer_id: t.id,
+    designer_id: t.id,
+    start_time: t.date,
+    end_time: t.date,
+    status: t.string,
+    request_memo: t.string,
+    alarm_enabled: t.boolean,
+    source: t.string,
+    created_at: t.date,
+    updated_at: t.date,
+    USERS: RESERVATION_USER,
+    DESIGNERS: RESERVATION_DESIGNER,
+    RESERVATION_ITEMS: t.array(RESERVATION_ITEM),
+}));
+
+// GET /shops/:shopId/reservations/calendar (CALENDAR_SELECT)
+export const RESERVATION_CALENDAR_RESPONSE = t.object({
+    full: t.boolean,
+    items: t.array(t.object({
+        reservation_id: t.id,
+        customer_id: t.id,
+        designer_id: t.id,
+        start_time: t.date,
+        end_time: t.date,
+        status: t.string,
+        request_memo: t.string,
+        updated_at: t.date,
+        USERS: RESERVATION_USER,
+        DESIGNERS: t.object({ USERS: t.object({ name: t.string }) }),
+        RESERVATION_ITEMS: t.array(t.object({
+            item_id: t.id,
+            menu_id: t.id,
+            menu_name: t.string,
+            price: t.number,
+        })),
+    })),
+    deleted: t.array(t.id),
+    cursor: t.date,
+});
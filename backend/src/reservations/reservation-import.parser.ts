@@ -0,0 +1,238 @@
+/**
+ * 예약 가져오기 파일(CSV / JSONL)의 스트리밍 파서.
+ * 입력 스트림을 청크 단위로 읽어 레코드를 하나씩 내보내므로 파일 크기와 무관하게 레코드 1건 분량의 메모리만 쓴다.
+ * (for await 로 소비하므로 소비 쪽이 배치를 저장하는 동안 파일 읽기도 멈춘다)
+ */
+
+export type ImportFormat = 'csv' | 'jsonl';
+
+// 지원 인코딩 (NAVER/KAKAO 관리자 화면에서 내려받은 엑셀 CSV 는 EUC-KR 인 경우가 많다)
+export const IMPORT_ENCODINGS = ['utf-8', 'euc-kr'] as const;
+export type ImportEncoding = typeof IMPORT_ENCODINGS[number];
+
+// 레코드 1건의 최대 길이 (닫히지 않은 따옴표 등으로 파일 전체가 한 레코드로 읽히는 것을 막는다)
+const MAX_RECORD_CHARS = 64 * 1024;
+
+export interface ImportRecord {
+    // 레코드가 시작하는 파일 줄 번호 (1부터, CSV 헤더 포함)
+    line: number;
+    fields?: Record<string, unknown>;
+    // 레코드 단위 파싱 오류 (해당 행만 실패 처리)
+    error?: string;
+}
+
+// 파일 전체를 더 읽을 수 없는 오류 (헤더 누락, 닫히지 않은 따옴표 등)
+export class ImportFormatError extends Error { }
+
+/**
+ * 표준 컬럼명 → 허용하는 헤더/키 이름.
+ * 헤더는 공백/밑줄을 지우고 소문자로 비교한다.
+ */
+const COLUMN_ALIASES: Record<string, string[]> = {
+    phone: ['phone', 'customer_phone', '전화번호', '연락처', '휴대폰', '휴대폰번호', '예약자연락처'],
+    name: ['name', 'customer_name', '고객명', '이름', '예약자', '예약자명'],
+    gender: ['gender', '성별'],
+    designer_id: ['designer_id'],
+    designer: ['designer', 'designer_name', '디자이너', '담당자', '담당디자이너'],
+    start_time: ['start_time', 'start', '예약일시', '이용일시', '시작시간', '시작일시'],
+    end_time: ['end_time', 'end', '종료시간', '종료일시'],
+    duration: ['duration', '소요시간'],
+    status: ['status', '상태', '예약상태'],
+    source: ['source', '예약경로', '채널'],
+    memo: ['memo', 'request_memo', '요청사항', '메모'],
+    menu: ['menu', 'menu_name', '메뉴', '시술', '시술명', '상품', '상품명'],
+    menu_id: ['menu_id'],
+    price: ['price', '금액', '시술금액'],
+    payment_type: ['payment_type', '결제수단'],
+    payment_amount: ['payment_amount', '결제금액'],
+    paid_at: ['paid_at', '결제일시'],
+    items: ['items'],
+    payments: ['payments'],
+};
+
+const normalizeColumnName = (name: string) => name.trim().toLowerCase().replace(/[\s_]/g, '');
+
+const COLUMN_LOOKUP = new Map<string, string>();
+Object.entries(COLUMN_ALIASES).forEach(([column, aliases]) => {
+    aliases.forEach(alias => COLUMN_LOOKUP.set(normalizeColumnName(alias), column));
+});
+
+// 알 수 없는 컬럼은 null (무시)
+export function canonicalColumn(name: string): string | null {
+    return COLUMN_LOOKUP.get(normalizeColumnName(name)) ?? null;
+}
+
+export function readImportRecords(input: AsyncIterable<Buffer | string>, format: ImportFormat, encoding: ImportEncoding = 'utf-8') {
+    const text = decodeChunks(input, encoding);
+    return format === 'csv' ? readCsvRecords(text) : readJsonlRecords(text);
+}
+
+// 바이트 청크 → 문자열 청크 (멀티바이트 문자가 청크 경계에서 잘려도 안전, 선두 BOM 은 TextDecoder 가 제거)
+async function* decodeChunks(input: AsyncIterable<Buffer | string>, encoding: ImportEncoding): AsyncGenerator<string> {
+    const decoder = new TextDecoder(encoding);
+    for await (const chunk of input) {
+        const text = typeof chunk === 'string' ? chunk : decoder.decode(chunk, { stream: true });
+        if (text) yield text;
+    }
+    const rest = decoder.decode();
+    if (rest) yield rest;
+}
+
+/**
+ * CSV (RFC 4180): 첫 줄은 헤더, 따옴표 안의 쉼표/줄바꿈/"" 이스케이프 지원.
+ */
+async function* readCsvRecords(input: AsyncIterable<string>): AsyncGenerator<ImportRecord> {
+    let columns: (string | null)[] = null;
+
+    for await (const { line, values } of readCsvRows(input)) {
+        if (!columns) {
+            columns = values.map(canonicalColumn);
+            if (!columns.includes('phone') || !columns.includes('start_time')) {
+                throw new ImportFormatError('CSV 헤더에 전화번호(phone)와 예약일시(start_time) 컬럼이 필요합니다.');
+            }
+            continue;
+        }
+        if (values.length === 1 && values[0].trim() === '') continue; // 빈 줄
+
+        const fields: Record<string, unknown> = {};
+        columns.forEach((column, i) => {
+            const value = values[i]?.trim();
+            if (column && value) fields[column] = value;
+        });
+        yield { line, fields };
+    }
+}
+
+async function* readCsvRows(input: AsyncIterable<string>): AsyncGenerator<{ line: number; values: string[] }> {
+    let values: string[] = [];
+    let field = '';
+    let recordChars = 0;
+    let inQuotes = false;
+    // 따옴표 안에서 " 를 만남: 다음 문자가 " 이면 이스케이프, 아니면 따옴표 닫힘
+    let quoteSeen = false;
+    let line = 1;
+    let recordLine = 1;
+    let first = true;
+
+    for await (let text of input) {
+        if (first) {
+            if (text.charCodeAt(0) === 0xfeff) text = text.slice(1);
+            first = false;
+        }
+        for (let i = 0; i < text.length; i++) {
+            const ch = text[i];
+            if (++recordChars > MAX_RECORD_CHARS) {
+                throw new ImportFormatError(`${recordLine}번째 줄의 레코드가 너무 깁니다. (닫히지 않은 따옴표 확인)`);
+            }
+
+            if (inQuotes) {
+                if (quoteSeen) {
+                    quoteSeen = false;
+                    if (ch === '"') {
+                        field += '"';
+                        continue;
+                    }
+                    inQuotes = false; // 닫는 따옴표 다음 문자는 아래에서 일반 문자로 처리
+                } else if (ch === '"') {
+                    quoteSeen = true;
+                    continue;
+                } else {
+                    if (ch === '\n') line++;
+                    field += ch;
+                    continue;
+                }
+            }
+
+            if (ch === '"' && field === '') {
+                inQuotes = true;
+            } else if (ch === ',') {
+                values.push(field);
+                field = '';
+            } else if (ch === '\n') {
+                values.push(field);
+                yield { line: recordLine, values };
+                values = [];
+                field = '';
+                recordChars = 0;
+                recordLine = ++line;
+            } else if (ch !== '\r') {
+                field += ch;
+            }
+        }
+    }
+
+    if (inQuotes && !quoteSeen) {
+        throw new ImportFormatError(`${recordLine}번째 줄의 따옴표가 닫히지 않았습니다.`);
+    }
+    if (field !== '' || values.length > 0) {
+        values.push(field);
+        yield { line: recordLine, values };
+    }
+}
+
+/**
+ * JSONL: 한 줄에 예약 1건(JSON 객체). 키는 CSV 헤더와 같은 이름을 쓰고,
+ * 시술/결제가 여러 건이면 items: [{ menu, menu_id, price }], payments: [{ type, amount, paid_at }] 배열로 넣는다.
+ */
+async function* readJsonlRecords(input: AsyncIterable<string>): AsyncGenerator<ImportRecord> {
+    let pending = '';
+    let line = 0;
+    // 너무 긴 줄은 줄바꿈이 나올 때까지 버린다
+    let skipping = false;
+
+    for await (const text of input) {
+        let start = 0;
+        let newline: number;
+        while ((newline = text.indexOf('\n', start)) >= 0) {
+            const chunk = text.slice(start, newline);
+            start = newline + 1;
+            line++;
+            if (skipping) {
+                skipping = false;
+                yield { line, error: '줄이 너무 깁니다.' };
+                continue;
+            }
+            const record = parseJsonLine(line, pending + chunk);
+            pending = '';
+            if (record) yield record;
+        }
+
+        if (!skipping) {
+            pending += text.slice(start);
+            if (pending.length > MAX_RECORD_CHARS) {
+                pending = '';
+                skipping = true;
+            }
+        }
+    }
+
+    line++;
+    if (skipping) {
+        yield { line, error: '줄이 너무 깁니다.' };
+    } else {
+        const record = parseJsonLine(line, pending);
+        if (record) yield record;
+    }
+}
+
+function parseJsonLine(line: number, text: string): ImportRecord | null {
+    const trimmed = text.trim();
+    if (!trimmed) return null;
+
+    let value: unknown;
+    try {
+        value = JSON.parse(trimmed);
+    } catch (error) {
+        return { line, error: `JSON 형식이 올바르지 않습니다. (${error.message})` };
+    }
+    if (!value || typeof value !== 'object' || Array.isArray(value)) {
+        return { line, error: 'JSON 객체가 아닙니다.' };
+    }
+
+    const fields: Record<string, unknown> = {};
+    Object.entries(value).forEach(([key, fieldValue]) => {
+        const column = canonicalColumn(key);
+        if (column && fieldValue !== null && fieldValue !== undefined && fieldValue !== '') fields[column] = fieldValue;
+    });
+    return { line, fields };
+}
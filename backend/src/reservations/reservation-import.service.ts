@@ -0,0 +1,653 @@
+import { Injectable, BadRequestException } from '@nestjs/common';
+import { createReadStream } from 'fs';
+import { unlink } from 'fs/promises';
+import { extname } from 'path';
+import { PAYMENTS_type, Prisma, RESERVATIONS_source, RESERVATIONS_status, USERS_gender, USERS_role } from '@prisma/client';
+import { PrismaService } from '../prisma/prisma.service';
+import { TimeService } from '../common/time/time.service';
+import { AvailabilityCacheService } from '../common/cache/availability-cache.service';
+import { CustomerStatsService } from '../customers/customer-stats.service';
+import { SalesRollupService } from '../sales/sales-rollup.service';
+import { ReservationsRepository } from './reservations.repository';
+import { ImportEncoding, ImportFormat, ImportFormatError, ImportRecord, readImportRecords } from './reservation-import.parser';
+import { ImportReservationsDto } from './dto/import-reservations.dto';
+
+export const DEFAULT_IMPORT_BATCH_SIZE = 200;
+const MAX_IMPORT_BATCH_SIZE = 1000;
+// 응답에 담는 행 오류 수 (전체 목록은 onError 로 받는다)
+const MAX_REPORTED_ERRORS = 100;
+const BATCH_TIMEOUT_MS = 60000;
+const DEFAULT_DURATION_MINUTES = 60;
+const ROLLUP_CHUNK_DAYS = 31;
+
+// 겹침 검사 대상 (가용 시간 계산과 동일하게 취소/노쇼 제외, 지난 예약은 검사하지 않는다)
+const ACTIVE_STATUSES: RESERVATIONS_status[] = ['PENDING', 'CONFIRMED'];
+
+// 값 비교용 정규화 (대소문자/공백/밑줄/하이픈 무시)
+const normalizeKey = (value: string) => value.toLowerCase().replace(/[\s_-]/g, '');
+
+const aliasMap = <T>(entries: [T, string[]][]) => {
+    const map = new Map<string, T>();
+    entries.forEach(([value, aliases]) => aliases.forEach(alias => map.set(normalizeKey(alias), value)));
+    return map;
+};
+
+const STATUS_ALIASES = aliasMap<RESERVATIONS_status>([
+    ['PENDING', ['pending', '대기', '신청', '예약신청', '확정대기']],
+    ['CONFIRMED', ['confirmed', '확정', '예약확정']],
+    ['COMPLETED', ['completed', '완료', '이용완료', '방문완료', '시술완료']],
+    ['CANCELED', ['canceled', 'cancelled', '취소', '예약취소', '고객취소', '매장취소']],
+    ['NOSHOW', ['noshow', 'no_show', '노쇼', '미방문']],
+]);
+
+const PAYMENT_TYPE_ALIASES = aliasMap<PAYMENTS_type>([
+    ['SITE_CARD', ['site_card', 'card', '카드', '신용카드', '체크카드']],
+    ['SITE_CASH', ['site_cash', 'cash', '현금', '계좌이체', '이체']],
+    ['APP_DEPOSIT', ['app_deposit', 'deposit', '예약금', '앱결제']],
+    ['PREPAID', ['prepaid', '선불권', '정액권']],
+]);
+
+const SOURCE_ALIASES = aliasMap<RESERVATIONS_source>([
+    ['NAVER', ['naver', '네이버', '네이버예약']],
+    ['KAKAO', ['kakao', '카카오', '카카오예약', '카카오헤어샵']],
+    ['ADMIN', ['admin', '관리자', '직접']],
+    ['APP', ['app', '앱']],
+]);
+
+const GENDER_ALIASES = aliasMap<USERS_gender>([
+    ['MALE', ['male', 'm', '남', '남성', '남자']],
+    ['FEMALE', ['female', 'f', '여', '여성', '여자']],
+]);
+
+// 2024-05-01 14:00, 2024.05.01 14:00:00, 2024. 5. 1. (수) 오후 2:00 등 (KST 로 해석)
+const LOCAL_TIME_PATTERN = /^(\d{4})\s*[-./]\s*(\d{1,2})\s*[-./]\s*(\d{1,2})\.?\s*(?:\([^)]*\))?\s*T?\s*(오전|오후)?\s*(\d{1,2}):(\d{2})(?::(\d{2}))?$/;
+// 오프셋이 있는 ISO 8601 (2024-05-01T05:00:00Z, 2024-05-01T14:00:00+09:00)
+const ISO_TIME_PATTERN = /^\d{4}-\d{2}-\d{2}T\d{2}:\d{2}(:\d{2}(\.\d+)?)?(Z|[+-]\d{2}:?\d{2})$/i;
+
+export interface ImportOptions {
+    format: ImportFormat;
+    encoding?: ImportEncoding;
+    // 행에 source(예약경로) 컬럼이 없을 때 사용 (기본 ADMIN)
+    source?: RESERVATIONS_source;
+    batchSize?: number;
+    // 검증/중복 확인만 하고 저장하지 않는다
+    dryRun?: boolean;
+    // 모든 행 오류를 받는다 (응답의 errors 는 앞쪽 MAX_REPORTED_ERRORS 건만)
+    onError?: (error: ImportRowError) => void;
+}
+
+export interface ImportRowError {
+    line: number;
+    message: string;
+}
+
+export interface ImportReport {
+    dryRun: boolean;
+    total: number;
+    imported: number;
+    // 같은 디자이너/시작 시각/고객 예약이 이미 있어 건너뛴 행 (같은 파일을 다시 올려도 중복 생성되지 않는다)
+    duplicates: number;
+    failed: number;
+    customersCreated: number;
+    // 가져온 예약의 KST 일자 범위
+    from: string | null;
+    to: string | null;
+    errors: ImportRowError[];
+    // 파일 형식 오류로 중단된 경우 (그 전까지 저장한 배치는 유지)
+    aborted: string | null;
+    elapsedMs: number;
+}
+
+interface ImportRow {
+    line: number;
+    phone: string;
+    name: string;
+    gender: USERS_gender | null;
+    designerId: bigint;
+    start: Date;
+    end: Date;
+    status: RESERVATIONS_status;
+    source: RESERVATIONS_source;
+    memo: string | null;
+    items: { menu_id: bigint | null; menu_name: string; price: number }[];
+    payments: { type: PAYMENTS_type; amount: number; paid_at: Date }[];
+}
+
+interface ShopMenu {
+    menu_id: bigint;
+    name: string;
+    price: number;
+    duration: number;
+}
+
+interface ShopContext {
+    designerIds: Set<string>;
+    // 이름 → designer_id (동명이인이면 null)
+    designersByName: Map<string, bigint | null>;
+    // 활성 디자이너가 한 명뿐인 매장은 디자이너 컬럼 생략 가능
+    defaultDesignerId: bigint | null;
+    menusById: Map<string, ShopMenu>;
+    menusByName: Map<string, ShopMenu>;
+}
+
+interface ImportRun {
+    shop: bigint;
+    options: ImportOptions;
+    context: ShopContext;
+    report: ImportReport;
+    now: Date;
+    // 저장한 예약/결제 시각 범위 (집계 재계산 구간)
+    first: Date | null;
+    last: Date | null;
+}
+
+// 행 단위 검증 실패 (해당 행만 실패 처리)
+class ImportRowException extends Error { }
+
+const text = (value: unknown) => (value === null || value === undefined ? '' : String(value).trim());
+
+/**
+ * NAVER/KAKAO 등에서 내보낸 예약 이력 가져오기 (CSV / JSONL 스트리밍).
+ *
+ * - 파일을 레코드 단위로 읽어 batchSize 건씩 저장하므로 메모리 사용량은 파일 크기와 무관하다
+ * - 고객은 전화번호로 찾고 없으면 생성한다 (UsersService 와 같은 정규화, role CUSTOMER / grade NEW)
+ * - 배치마다 한 트랜잭션으로 고객 / 예약 / 시술 항목 / 결제를 저장하고,
+ *   배치가 실패하면 행 단위로 다시 저장해 실패한 행만 오류로 보고한다
+ * - 고객 통계 / 매출 집계는 행마다 갱신하지 않고 끝난 뒤 한 번에 재계산한다 (매출은 가져온 기간만)
+ */
+@Injectable()
+export class ReservationImportService {
+    constructor(
+        private readonly prisma: PrismaService,
+        private readonly timeService: TimeService,
+        private readonly reservationsRepository: ReservationsRepository,
+        private readonly customerStats: CustomerStatsService,
+        private readonly salesRollup: SalesRollupService,
+        private readonly availabilityCache: AvailabilityCacheService,
+    ) { }
+
+    // 업로드된 임시 파일에서 가져온 뒤 파일을 지운다
+    async importFile(shopId: number, file: Express.Multer.File, query: ImportReservationsDto): Promise<ImportReport> {
+        try {
+            const format = query.format || this.formatFromFileName(file.originalname);
+            if (!format) {
+                throw new BadRequestException('format(csv | jsonl)을 지정하거나 .csv / .jsonl 파일을 올려주세요.');
+            }
+            return await this.import(shopId, createReadStream(file.path), {
+                format,
+                encoding: query.encoding,
+                source: query.source,
+                dryRun: query.dryRun,
+            });
+        } finally {
+            await unlink(file.path).catch(() => undefined);
+        }
+    }
+
+    async import(shopId: number, input: AsyncIterable<Buffer | string>, options: ImportOptions): Promise<ImportReport> {
+        const started = Date.now();
+        const batchSize = Math.min(MAX_IMPORT_BATCH_SIZE, Math.max(1, options.batchSize || DEFAULT_IMPORT_BATCH_SIZE));
+        const run: ImportRun = {
+            shop: BigInt(shopId),
+            options,
+            context: await this.loadShopContext(BigInt(shopId)),
+            report: {
+                dryRun: !!options.dryRun,
+                total: 0, imported: 0, duplicates: 0, failed: 0, customersCreated: 0,
+                from: null, to: null, errors: [], aborted: null, elapsedMs: 0,
+            },
+            now: new Date(),
+            first: null,
+            last: null,
+        };
+
+        let batch: ImportRow[] = [];
+        try {
+            for await (const record of readImportRecords(input, options.format, options.encoding)) {
+                run.report.total++;
+                const row = this.toRow(run, record);
+                if (row) batch.push(row);
+                if (batch.length >= batchSize) {
+                    await this.saveBatch(run, batch);
+                    batch = [];
+                }
+            }
+            await this.saveBatch(run, batch);
+        } catch (error) {
+            if (!(error instanceof ImportFormatError)) throw error;
+            // 오류 직전까지 읽은 행은 저장한다
+            run.report.aborted = error.message;
+            await this.saveBatch(run, batch);
+        }
+
+        if (run.first) {
+            run.report.from = this.timeService.format(run.first, 'YYYY-MM-DD');
+            run.report.to = this.timeService.format(run.last, 'YYYY-MM-DD');
+            if (!options.dryRun) await this.refreshDerived(run);
+        }
+        run.report.elapsedMs = Date.now() - started;
+        return run.report;
+    }
+
+    private formatFromFileName(name: string): ImportFormat | null {
+        const extension = extname(name || '').toLowerCase();
+        if (extension === '.csv') return 'csv';
+        if (extension === '.jsonl' || extension === '.ndjson') return 'jsonl';
+        return null;
+    }
+
+    private async loadShopContext(shop: bigint): Promise<ShopContext> {
+        const [designers, menus] = await Promise.all([
+            this.prisma.dESIGNERS.findMany({
+                where: { shop_id: shop },
+                select: { designer_id: true, is_active: true, USERS: { select: { name: true } } },
+            }),
+            this.prisma.mENUS.findMany({
+                where: { shop_id: shop, type: 'MENU' },
+                select: { menu_id: true, name: true, price: true, duration: true, is_deleted: true },
+            }),
+        ]);
+
+        const designersByName = new Map<string, bigint | null>();
+        designers.forEach(designer => {
+            const key = normalizeKey(designer.USERS.name);
+            designersByName.set(key, designersByName.has(key) ? null : designer.designer_id);
+        });
+        const active = designers.filter(designer => designer.is_active !== false);
+
+        // 이름이 같은 메뉴는 삭제되지 않은 메뉴 우선 (지난 예약은 삭제된 메뉴를 가리킬 수 있다)
+        const menusByName = new Map<string, ShopMenu>();
+        menus.forEach(menu => {
+            const key = normalizeKey(menu.name);
+            if (!menusByName.has(key) || !menu.is_deleted) menusByName.set(key, menu);
+        });
+
+        return {
+            designerIds: new Set(designers.map(designer => designer.designer_id.toString())),
+            designersByName,
+            defaultDesignerId: active.length === 1 ? active[0].designer_id : null,
+            menusById: new Map(menus.map(menu => [menu.menu_id.toString(), menu])),
+            menusByName,
+        };
+    }
+
+    // 레코드 → 저장할 행 (검증 실패 시 오류를 기록하고 null)
+    private toRow(run: ImportRun, record: ImportRecord): ImportRow | null {
+        if (record.error) {
+            this.fail(run, record.line, record.error);
+            return null;
+        }
+        try {
+            return this.normalize(run, record.line, record.fields);
+        } catch (error) {
+            if (!(error instanceof ImportRowException)) throw error;
+            this.fail(run, record.line, error.message);
+            return null;
+        }
+    }
+
+    private normalize(run: ImportRun, line: number, fields: Record<string, unknown>): ImportRow {
+        // UsersService / CreateUserDto 와 같이 숫자만 저장
+        const phone = text(fields.phone).replace(/[^0-9]/g, '');
+        if (!/^\d{9,15}$/.test(phone)) {
+            throw new ImportRowException(`전화번호가 없거나 형식이 올바르지 않습니다. (${text(fields.phone)})`);
+        }
+
+        const start = this.parseTime(fields.start_time, 'start_time');
+        const { items, duration } = this.parseItems(run.context, fields);
+        let end: Date;
+        if (fields.end_time) {
+            end = this.parseTime(fields.end_time, 'end_time');
+        } else {
+            const minutes = fields.duration ? this.parseAmount(fields.duration, 'duration') : duration || DEFAULT_DURATION_MINUTES;
+            end = new Date(start.getTime() + minutes * 60 * 1000);
+        }
+        if (end <= start) {
+            throw new ImportRowException('종료 시각이 시작 시각보다 늦어야 합니다.');
+        }
+
+        const status = fields.status
+            ? this.lookup(STATUS_ALIASES, fields.status, 'status')
+            : (end <= run.now ? 'COMPLETED' : 'CONFIRMED');
+        const source = fields.source
+            ? this.lookup(SOURCE_ALIASES, fields.source, 'source')
+            : (run.options.source || 'ADMIN');
+
+        return {
+            line,
+            phone,
+            name: (text(fields.name) || `고객${phone.slice(-4)}`).slice(0, 50),
+            gender: GENDER_ALIASES.get(normalizeKey(text(fields.gender))) ?? null,
+            designerId: this.resolveDesigner(run.context, fields),
+            start,
+            end,
+            status,
+            source,
+            memo: text(fields.memo) || null,
+            items,
+            payments: this.parsePayments(fields, start, items.reduce((sum, item) => sum + item.price, 0)),
+        };
+    }
+
+    private resolveDesigner(context: ShopContext, fields: Record<string, unknown>): bigint {
+        if (fields.designer_id) {
+            const id = text(fields.designer_id);
+            if (!context.designerIds.has(id)) {
+                throw new ImportRowException(`매장에 없는 디자이너입니다. (designer_id=${id})`);
+            }
+            return BigInt(id);
+        }
+        if (fields.designer) {
+            const name = text(fields.designer);
+            const id = context.designersByName.get(normalizeKey(name));
+            if (id === undefined) throw new ImportRowException(`등록되지 않은 디자이너입니다. (${name})`);
+            if (id === null) throw new ImportRowException(`이름이 같은 디자이너가 여러 명입니다. designer_id 로 지정해주세요. (${name})`);
+            return id;
+        }
+        if (context.defaultDesignerId === null) {
+            throw new ImportRowException('디자이너(designer 또는 designer_id) 컬럼이 필요합니다.');
+        }
+        return context.defaultDesignerId;
+    }
+
+    /**
+     * 시술 항목: JSONL 은 items 배열, CSV 는 menu / menu_id / price 를 '|' 로 나눠 여러 건.
+     * 매장 메뉴와 이름(또는 menu_id)이 맞으면 연결하고 금액/소요시간 기본값으로 쓴다.
+     * 등록되지 않은 메뉴는 이름과 금액만 남긴다 (menu_id 없음).
+     */
+    private parseItems(context: ShopContext, fields: Record<string, unknown>) {
+        let specs: { menu: string; menuId: string; price: string }[];
+        if (Array.isArray(fields.items)) {
+            specs = fields.items.map(item => ({
+                menu: text(item?.menu ?? item?.menu_name),
+                menuId: text(item?.menu_id),
+                price: text(item?.price),
+            }));
+        } else {
+            const menus = text(fields.menu).split('|');
+            const menuIds = text(fields.menu_id).split('|');
+            const prices = text(fields.price).split('|');
+            const count = Math.max(menus.length, menuIds.length, prices.length);
+            specs = Array.from({ length: count }, (_, i) => ({
+                menu: (menus[i] || '').trim(),
+                menuId: (menuIds[i] || '').trim(),
+                price: (prices[i] || '').trim(),
+            })).filter(spec => spec.menu || spec.menuId || spec.price);
+        }
+
+        let duration = 0;
+        const items = specs.map(spec => {
+            let menu: ShopMenu | undefined;
+            if (spec.menuId) {
+                menu = context.menusById.get(spec.menuId);
+                if (!menu) throw new ImportRowException(`매장에 없는 메뉴입니다. (menu_id=${spec.menuId})`);
+            } else if (spec.menu) {
+                menu = context.menusByName.get(normalizeKey(spec.menu));
+            }
+            if (!spec.price && !menu) {
+                throw new ImportRowException(`등록되지 않은 메뉴는 금액(price)이 필요합니다. (${spec.menu || '메뉴 없음'})`);
+            }
+            duration += menu ? menu.duration : 0;
+            return {
+                menu_id: menu ? menu.menu_id : null,
+                menu_name: (spec.menu || (menu ? menu.name : '기타')).slice(0, 100),
+                price: spec.price ? this.parseAmount(spec.price, 'price') : menu.price,
+            };
+        });
+        return { items, duration };
+    }
+
+    // 결제: JSONL 은 payments 배열, CSV 는 payment_type / payment_amount(기본 시술 금액 합) / paid_at(기본 시작 시각) 1건
+    private parsePayments(fields: Record<string, unknown>, start: Date, itemTotal: number) {
+        let specs: { type: unknown; amount: unknown; paidAt: unknown }[] = [];
+        if (Array.isArray(fields.payments)) {
+            specs = fields.payments.map(payment => ({ type: payment?.type, amount: payment?.amount, paidAt: payment?.paid_at }));
+        } else if (fields.payment_type) {
+            specs = [{ type: fields.payment_type, amount: fields.payment_amount ?? itemTotal, paidAt: fields.paid_at }];
+        }
+
+        return specs.map(spec => {
+            const type = this.lookup(PAYMENT_TYPE_ALIASES, spec.type, 'payment_type');
+            if (type === 'PREPAID') {
+                // 선불권 결제는 잔액 차감 이력(PREPAID_TRANSACTIONS)과 함께여야 하므로 가져오지 않는다
+                throw new ImportRowException('선불권(PREPAID) 결제는 가져올 수 없습니다.');
+            }
+            const amount = this.parseAmount(spec.amount, 'payment_amount');
+            if (amount <= 0) throw new ImportRowException('결제 금액은 0보다 커야 합니다.');
+            return { type, amount, paid_at: text(spec.paidAt) ? this.parseTime(spec.paidAt, 'paid_at') : start };
+        });
+    }
+
+    private parseTime(value: unknown, column: string): Date {
+        const raw = text(value);
+        if (ISO_TIME_PATTERN.test(raw)) {
+            const date = new Date(raw);
+            if (!isNaN(date.getTime())) return date;
+        }
+
+        const match = LOCAL_TIME_PATTERN.exec(raw);
+        if (match) {
+            const [, year, month, day, meridiem, hourText, minute, second] = match;
+            let hour = Number(hourText);
+            if (meridiem === '오후' && hour < 12) hour += 12;
+            if (meridiem === '오전' && hour === 12) hour = 0;
+
+            const pad = (n: string | number) => String(n).padStart(2, '0');
+            const date = `${year}-${pad(month)}-${pad(day)}`;
+            const parsed = this.timeService.parse(`${date} ${pad(hour)}:${minute}:${pad(second || 0)}`);
+            // dayjs 는 2월 30일 등을 다음 달로 넘기므로 일자가 그대로인지 확인
+            if (parsed.isValid() && hour < 24 && parsed.format('YYYY-MM-DD') === date) return parsed.toDate();
+        }
+        throw new ImportRowException(`${column} 형식이 올바르지 않습니다. (${raw})`);
+    }
+
+    // 35,000 / 35000원 → 35000
+    private parseAmount(value: unknown, column: string): number {
+        const raw = text(value).replace(/[,\s원]/g, '');
+        if (!/^\d{1,9}$/.test(raw)) {
+            throw new ImportRowException(`${column} 값이 올바르지 않습니다. (${text(value)})`);
+        }
+        return Number(raw);
+    }
+
+    private lookup<T>(aliases: Map<string, T>, value: unknown, column: string): T {
+        const resolved = aliases.get(normalizeKey(text(value)));
+        if (resolved === undefined) {
+            throw new ImportRowException(`${column} 값을 알 수 없습니다. (${text(value)})`);
+        }
+        return resolved;
+    }
+
+    private async saveBatch(run: ImportRun, batch: ImportRow[]) {
+        let rows = await this.dropDuplicates(run, batch);
+        rows = await this.dropOverlaps(run, rows);
+        if (rows.length === 0) return;
+
+        if (run.options.dryRun) {
+            const phones = [...new Set(rows.map(row => row.phone))];
+            const existing = await this.prisma.uSERS.count({ where: { phone: { in: phones } } });
+            this.accept(run, rows, phones.length - existing);
+            return;
+        }
+
+        try {
+            const created = await this.prisma.$transaction((tx) => this.writeRows(tx, run.shop, rows), { timeout: BATCH_TIMEOUT_MS });
+            this.accept(run, rows, created);
+        } catch (error) {
+            if (rows.length === 1) {
+                this.fail(run, rows[0].line, error.message);
+                return;
+            }
+            // 어느 행이 실패했는지 알 수 없으므로 행 단위 트랜잭션으로 다시 저장
+            for (const row of rows) {
+                try {
+                    const created = await this.prisma.$transaction((tx) => this.writeRows(tx, run.shop, [row]));
+                    this.accept(run, [row], created);
+                } catch (rowError) {
+                    this.fail(run, row.line, rowError.message);
+                }
+            }
+        }
+    }
+
+    /**
+     * 같은 디자이너 / 시작 시각 / 고객 전화번호의 예약이 이미 있으면 건너뛴다.
+     * 앞 배치는 이미 커밋됐으므로 파일 안의 중복도 함께 걸러진다.
+     */
+    private async dropDuplicates(run: ImportRun, rows: ImportRow[]): Promise<ImportRow[]> {
+        if (rows.length === 0) return rows;
+        const key = (designerId: bigint, start: Date, phone: string) => `${designerId}:${start.getTime()}:${phone}`;
+
+        const existing = await this.prisma.rESERVATIONS.findMany({
+            where: {
+                shop_id: run.shop,
+                designer_id: { in: [...new Set(rows.map(row => row.designerId))] },
+                start_time: { in: [...new Set(rows.map(row => row.start.getTime()))].map(time => new Date(time)) },
+            },
+            select: { designer_id: true, start_time: true, USERS: { select: { phone: true } } },
+        });
+        const seen = new Set(existing.map(row => key(row.designer_id, row.start_time, row.USERS.phone)));
+
+        return rows.filter(row => {
+            const rowKey = key(row.designerId, row.start, row.phone);
+            if (seen.has(rowKey)) {
+                run.report.duplicates++;
+                return false;
+            }
+            seen.add(rowKey);
+            return true;
+        });
+    }
+
+    /**
+     * 앞으로 남은 활성 예약(PENDING/CONFIRMED)만 같은 디자이너의 기존 예약/같은 배치의 앞선 행과 겹치는지 검사한다.
+     * 지난 예약은 실제로 있었던 이력이므로 검사하지 않는다.
+     * (디자이너 행 잠금 없이 읽으므로 가져오는 도중 들어온 예약과의 겹침까지 막지는 않는다)
+     */
+    private async dropOverlaps(run: ImportRun, rows: ImportRow[]): Promise<ImportRow[]> {
+        const active = rows.filter(row => ACTIVE_STATUSES.includes(row.status) && row.end > run.now);
+        if (active.length === 0) return rows;
+
+        const from = new Date(Math.min(...active.map(row => row.start.getTime())));
+        const to = new Date(Math.max(...active.map(row => row.end.getTime())));
+        const busy = await this.reservationsRepository.getBusyReservations(
+            [...new Set(active.map(row => row.designerId))], from, to,
+        );
+
+        const intervals = new Map<string, { start: Date; end: Date }[]>();
+        busy.forEach(reservation => {
+            const list = intervals.get(reservation.designer_id.toString()) || [];
+            list.push({ start: reservation.start_time, end: reservation.end_time });
+            intervals.set(reservation.designer_id.toString(), list);
+        });
+
+        const rejected = new Set<ImportRow>();
+        for (const row of active) {
+            const list = intervals.get(row.designerId.toString()) || [];
+            if (list.some(interval => interval.start < row.end && interval.end > row.start)) {
+                rejected.add(row);
+                this.fail(run, row.line, '같은 디자이너의 다른 예약과 시간이 겹칩니다.');
+                continue;
+            }
+            list.push({ start: row.start, end: row.end });
+            intervals.set(row.designerId.toString(), list);
+        }
+        return rejected.size > 0 ? rows.filter(row => !rejected.has(row)) : rows;
+    }
+
+    // 고객 upsert 후 예약을 만들고 시술 항목/결제는 배치 전체를 한 번에 넣는다. 생성한 고객 수를 반환
+    private async writeRows(tx: Prisma.TransactionClient, shop: bigint, rows: ImportRow[]): Promise<number> {
+        const { customerIds, created } = await this.upsertCustomers(tx, rows);
+
+        const items: Prisma.RESERVATION_ITEMSCreateManyInput[] = [];
+        const payments: Prisma.PAYMENTSCreateManyInput[] = [];
+        for (const row of rows) {
+            const { reservation_id } = await tx.rESERVATIONS.create({
+                data: {
+                    shop_id: shop,
+                    customer_id: customerIds.get(row.phone),
+                    designer_id: row.designerId,
+                    start_time: row.start,
+                    end_time: row.end,
+                    status: row.status,
+                    source: row.source,
+                    request_memo: row.memo,
+                },
+                select: { reservation_id: true },
+            });
+            row.items.forEach(item => items.push({ reservation_id, ...item }));
+            row.payments.forEach(payment => payments.push({ reservation_id, ...payment, status: 'PAID' }));
+        }
+
+        if (items.length > 0) await tx.rESERVATION_ITEMS.createMany({ data: items });
+        if (payments.length > 0) await tx.pAYMENTS.createMany({ data: payments });
+        return created;
+    }
+
+    // 전화번호로 고객을 찾고 없으면 생성 (UsersService.create 와 같은 기본값)
+    private async upsertCustomers(tx: Prisma.TransactionClient, rows: ImportRow[]) {
+        const phones = [...new Set(rows.map(row => row.phone))];
+        const existing = await tx.uSERS.findMany({
+            where: { phone: { in: phones } },
+            select: { user_id: true, phone: true },
+        });
+        const customerIds = new Map(existing.map(user => [user.phone, user.user_id]));
+
+        const missing = new Map<string, ImportRow>();
+        rows.forEach(row => {
+            if (!customerIds.has(row.phone) && !missing.has(row.phone)) missing.set(row.phone, row);
+        });
+        if (missing.size > 0) {
+            await tx.uSERS.createMany({
+                data: [...missing.values()].map(row => ({
+                    phone: row.phone,
+                    name: row.name,
+                    gender: row.gender,
+                    role: USERS_role.CUSTOMER,
+                    grade: 'NEW' as const,
+                })),
+                // 동시에 같은 번호로 가입한 고객이 있으면 그 계정을 쓴다
+                skipDuplicates: true,
+            });
+            const inserted = await tx.uSERS.findMany({
+                where: { phone: { in: [...missing.keys()] } },
+                select: { user_id: true, phone: true },
+            });
+            inserted.forEach(user => customerIds.set(user.phone, user.user_id));
+        }
+        return { customerIds, created: missing.size };
+    }
+
+    private accept(run: ImportRun, rows: ImportRow[], customersCreated: number) {
+        run.report.imported += rows.length;
+        run.report.customersCreated += customersCreated;
+        rows.forEach(row => {
+            [row.start, ...row.payments.map(payment => payment.paid_at)].forEach(time => {
+                if (!run.first || time < run.first) run.first = time;
+                if (!run.last || time > run.last) run.last = time;
+            });
+        });
+    }
+
+    private fail(run: ImportRun, line: number, message: string) {
+        const error = { line, message };
+        run.report.failed++;
+        if (run.report.errors.length < MAX_REPORTED_ERRORS) run.report.errors.push(error);
+        run.options.onError?.(error);
+    }
+
+    // 예약 쓰기 경로를 거치지 않았으므로 고객 통계 / 가져온 구간의 매출 집계를 다시 만들고 가용 캐시를 비운다
+    private async refreshDerived(run: ImportRun) {
+        await this.prisma.$transaction((tx) => this.customerStats.refreshShop(tx, run.shop), { timeout: BATCH_TIMEOUT_MS });
+
+        const last = this.timeService.parse(run.last).startOf('day');
+        for (let day = this.timeService.parse(run.first).startOf('day'); !day.isAfter(last); day = day.add(ROLLUP_CHUNK_DAYS, 'day')) {
+            const chunkEnd = day.add(ROLLUP_CHUNK_DAYS - 1, 'day');
+            const from = day.format('YYYY-MM-DD');
+            const to = (chunkEnd.isAfter(last) ? last : chunkEnd).format('YYYY-MM-DD');
+            await this.prisma.$transaction((tx) => this.salesRollup.refreshRange(tx, run.shop, from, to), { timeout: BATCH_TIMEOUT_MS });
+        }
+
+        this.availabilityCache.invalidateShop(run.shop);
+    }
+}
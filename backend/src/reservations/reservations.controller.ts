@@ -1,9 +1,19 @@
-import { Controller, Get, Post, Body, Patch, Param, Delete, Query, ParseIntPipe, UseGuards } from '@nestjs/common';
+import { Controller, Get, Post, Body, Patch, Param, Delete, Query, ParseIntPipe, UseGuards, Headers, Res, HttpStatus, UseInterceptors, UploadedFile, BadRequestException } from '@nestjs/common';
+import { FileInterceptor } from '@nestjs/platform-express';
+import { Response } from 'express';
+import { diskStorage } from 'multer';
+import { randomBytes } from 'crypto';
 import { ReservationsService } from './reservations.service';
+import { ReservationImportService } from './reservation-import.service';
 import { GetReservationsDto } from './dto/get-reservations.dto';
+import { GetReservationCalendarDto } from './dto/get-reservation-calendar.dto';
 import { CreateReservationDto } from './dto/create-reservation.dto';
 import { UpdateReservationDto } from './dto/update-reservation.dto';
 import { CompleteReservationDto } from './dto/complete-reservation.dto';
+import { ImportReservationsDto } from './dto/import-reservations.dto';
+import { RESERVATION_CALENDAR_RESPONSE, RESERVATION_LIST_RESPONSE } from './dto/reservation-response.dto';
+import { Serialize } from '../common/serialization/serialize.decorator';
+import { UPLOAD_TMP_DIR } from '../config/upload.config';
 
 import { JwtAuthGuard } from '../auth/guards/jwt-auth.guard';
 import { ShopAuthGuard } from '../common/guards/shop-auth.guard';
@@ -11,9 +21,13 @@ import { ShopAuthGuard } from '../common/guards/shop-auth.guard';
 @Controller('shops/:shopId/reservations')
 @UseGuards(JwtAuthGuard, ShopAuthGuard)
 export class ReservationsController {
-    constructor(private readonly reservationsService: ReservationsService) { }
+    constructor(
+        private readonly reservationsService: ReservationsService,
+        private readonly reservationImportService: ReservationImportService
+    ) { }
 
     @Get()
+    @Serialize(RESERVATION_LIST_RESPONSE)
     async findAll(
         @Param('shopId', ParseIntPipe) shopId: number,
         @Query() query: GetReservationsDto
@@ -21,6 +35,26 @@ export class ReservationsController {
         return this.reservationsService.findAll(shopId, query);
     }
 
+    // 캘린더용 slim 조회 + changedSince delta 동기화. ETag 가 같으면 본문 조회 없이 304
+    @Get('calendar')
+    @Serialize(RESERVATION_CALENDAR_RESPONSE)
+    async getCalendar(
+        @Param('shopId', ParseIntPipe) shopId: number,
+        @Query() query: GetReservationCalendarDto,
+        @Headers('if-none-match') ifNoneMatch: string | undefined,
+        @Res({ passthrough: true }) res: Response
+    ) {
+        const etag = await this.reservationsService.getCalendarEtag(shopId, query);
+        res.setHeader('ETag', etag);
+        res.setHeader('Cache-Control', 'private, no-cache');
+
+        if (ifNoneMatch && ifNoneMatch.split(',').some(tag => tag.trim() === etag)) {
+            res.status(HttpStatus.NOT_MODIFIED);
+            return;
+        }
+        return this.reservationsService.getCalendar(shopId, query);
+    }
+
     @Get(':id')
     async findOne(
         @Param('shopId', ParseIntPipe) shopId: number,
@@ -38,6 +72,29 @@ export class ReservationsController {
         return this.reservationsService.create(createReservationDto);
     }
 
+    // NAVER/KAKAO 등에서 내보낸 예약 이력 가져오기 (CSV / JSONL, multipart 'file')
+    @Post('import')
+    @UseInterceptors(FileInterceptor('file', {
+        // 메모리에 버퍼링하지 않고 임시 파일로 받은 뒤 스트리밍으로 읽는다
+        storage: diskStorage({
+            destination: UPLOAD_TMP_DIR,
+            filename: (req, file, cb) => cb(null, randomBytes(16).toString('hex')),
+        }),
+        limits: {
+            fileSize: 200 * 1024 * 1024
+        }
+    }))
+    async importReservations(
+        @Param('shopId', ParseIntPipe) shopId: number,
+        @Query() query: ImportReservationsDto,
+        @UploadedFile() file: Express.Multer.File
+    ) {
+        if (!file) {
+            throw new BadRequestException('File is required');
+        }
+        return this.reservationImportService.importFile(shopId, file, query);
+    }
+
     @Patch(':id')
     async update(
         @Param('shopId', ParseIntPipe) shopId: number,
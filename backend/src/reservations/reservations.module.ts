@@ -3,13 +3,17 @@ import { ReservationsService } from './reservations.service';
 import { ReservationsController } from './reservations.controller';
 import { PrismaService } from '../prisma/prisma.service';
 import { ReservationsRepository } from './reservations.repository';
+import { AvailabilityService } from './availability.service';
+import { ReservationImportService } from './reservation-import.service';
 
 import { PrepaidModule } from '../prepaid/prepaid.module';
+import { SalesModule } from '../sales/sales.module';
+import { CustomersModule } from '../customers/customers.module';
 
 @Module({
-    imports: [PrepaidModule],
+    imports: [PrepaidModule, SalesModule, CustomersModule],
     controllers: [ReservationsController],
-    providers: [ReservationsService, PrismaService, ReservationsRepository],
+    providers: [ReservationsService, PrismaService, ReservationsRepository, AvailabilityService, ReservationImportService],
     exports: [ReservationsService]
 })
 export class ReservationsModule { }
@@ -1,11 +1,63 @@
-import { Injectable } from '@nestjs/common';
+import { BadRequestException, Injectable } from '@nestjs/common';
 import { PrismaService } from '../prisma/prisma.service';
 import { CreateReservationDto } from './dto/create-reservation.dto';
-import { RESERVATIONS_status } from '@prisma/client';
+import { CompleteReservationDto } from './dto/complete-reservation.dto';
+import { Prisma, RESERVATIONS_status } from '@prisma/client';
+import { SalesRollupService, ROLLED_UP_STATUSES } from '../sales/sales-rollup.service';
+import { CustomerStatsService } from '../customers/customer-stats.service';
+import { PrepaidService } from '../prepaid/prepaid.service';
+
+// 매출 집계 / 고객 통계 재계산에 필요한 변경 전 정보
+const ROLLUP_SNAPSHOT_SELECT = {
+    status: true,
+    start_time: true,
+    customer_id: true,
+    PAYMENTS: { select: { paid_at: true } },
+} as const;
+
+// 삭제 기록 보관 기간: 이보다 오래된 cursor 는 전체 재동기화
+export const TOMBSTONE_RETENTION_MS = 30 * 24 * 60 * 60 * 1000;
+
+// 캘린더 표시용 최소 컬럼 (상세 정보는 getReservationById 로 조회)
+const CALENDAR_SELECT = {
+    reservation_id: true,
+    customer_id: true,
+    designer_id: true,
+    start_time: true,
+    end_time: true,
+    status: true,
+    request_memo: true,
+    updated_at: true,
+    USERS: { select: { name: true, phone: true } },
+    DESIGNERS: { select: { USERS: { select: { name: true } } } },
+    RESERVATION_ITEMS: { select: { item_id: true, menu_id: true, menu_name: true, price: true } },
+} as const;
+
+// 겹침 검사에서 제외하는 상태 (가용 시간 계산과 동일)
+const INACTIVE_STATUSES: RESERVATIONS_status[] = ['CANCELED', 'NOSHOW'];
+
+// 같은 디자이너의 시간이 겹치는 예약이 이미 있을 때 (트랜잭션은 롤백된다)
+export class ReservationOverlapError extends Error {
+    constructor(public readonly overlapping: { reservation_id: bigint; start_time: Date; end_time: Date }) {
+        super('RESERVATION_OVERLAP');
+    }
+}
+
+export interface CalendarFingerprint {
+    count: bigint;
+    lastUpdatedAt: Date | null;
+    deletedCount: bigint;
+    lastDeletedAt: Date | null;
+}
 
 @Injectable()
 export class ReservationsRepository {
-    constructor(private prisma: PrismaService) { }
+    constructor(
+        private prisma: PrismaService,
+        private salesRollup: SalesRollupService,
+        private customerStats: CustomerStatsService,
+        private prepaidService: PrepaidService,
+    ) { }
 
     async getReservations(shopId: number, startDate: string, endDate: string) {
         return this.prisma.rESERVATIONS.findMany({
@@ -40,32 +92,167 @@ export class ReservationsRepository {
         });
     }
 
+    // 캘린더 구간 조회 (slim projection)
+    async getCalendarReservations(shopId: number, from: Date, to: Date) {
+        return this.prisma.rESERVATIONS.findMany({
+            where: {
+                shop_id: BigInt(shopId),
+                start_time: { gte: from, lte: to },
+            },
+            select: CALENDAR_SELECT,
+            orderBy: { start_time: 'asc' },
+        });
+    }
+
+    // since 이후 생성/수정된 예약 (구간 밖으로 옮겨진 예약도 포함해야 하므로 구간 조건 없음)
+    async getChangedReservations(shopId: number, since: Date) {
+        return this.prisma.rESERVATIONS.findMany({
+            where: {
+                shop_id: BigInt(shopId),
+                updated_at: { gt: since },
+            },
+            select: CALENDAR_SELECT,
+            orderBy: { updated_at: 'asc' },
+        });
+    }
+
+    async getDeletedReservationIds(shopId: number, since: Date) {
+        const rows = await this.prisma.rESERVATION_TOMBSTONES.findMany({
+            where: {
+                shop_id: BigInt(shopId),
+                deleted_at: { gt: since },
+            },
+            select: { reservation_id: true },
+        });
+        return rows.map(row => row.reservation_id);
+    }
+
+    /**
+     * ETag 계산용 집계. since 가 없으면 구간(start_time) 기준, 있으면 변경분 기준.
+     * 행을 읽지 않고 인덱스 범위만 집계한다.
+     */
+    async getCalendarFingerprint(shopId: number, from: Date, to: Date, since?: Date): Promise<CalendarFingerprint> {
+        const shop = BigInt(shopId);
+        const scope = since
+            ? Prisma.sql`updated_at > ${since}`
+            : Prisma.sql`start_time >= ${from} AND start_time <= ${to}`;
+        const [rows, tombstones] = await Promise.all([
+            this.prisma.$queryRaw<{ count: bigint; last_updated_at: Date | null }[]>`
+                SELECT COUNT(*) AS count, MAX(updated_at) AS last_updated_at
+                FROM RESERVATIONS
+                WHERE shop_id = ${shop} AND ${scope}`,
+            since
+                ? this.prisma.$queryRaw<{ count: bigint; last_deleted_at: Date | null }[]>`
+                    SELECT COUNT(*) AS count, MAX(deleted_at) AS last_deleted_at
+                    FROM RESERVATION_TOMBSTONES
+                    WHERE shop_id = ${shop} AND deleted_at > ${since}`
+                : Promise.resolve([{ count: BigInt(0), last_deleted_at: null }]),
+        ]);
+        return {
+            count: BigInt(rows[0].count),
+            lastUpdatedAt: rows[0].last_updated_at,
+            deletedCount: BigInt(tombstones[0].count),
+            lastDeletedAt: tombstones[0].last_deleted_at,
+        };
+    }
+
+    // 가용 시간 계산용: 여러 디자이너의 하루치 예약을 한 번에 조회
+    async getBusyReservations(designerIds: bigint[], from: Date, to: Date) {
+        return this.prisma.rESERVATIONS.findMany({
+            where: {
+                designer_id: { in: designerIds },
+                status: { notIn: ['CANCELED', 'NOSHOW'] },
+                start_time: { lt: to },
+                end_time: { gt: from },
+            },
+            select: {
+                designer_id: true,
+                start_time: true,
+                end_time: true,
+            },
+        });
+    }
+
+    async getScheduleBlocks(designerIds: bigint[], from: Date, to: Date) {
+        return this.prisma.sCHEDULE_BLOCKS.findMany({
+            where: {
+                designer_id: { in: designerIds },
+                start_time: { lt: to },
+                end_time: { gt: from },
+            },
+            select: {
+                designer_id: true,
+                start_time: true,
+                end_time: true,
+            },
+        });
+    }
+
     async createReservation(data: CreateReservationDto & { menu?: { name: string, price: number } }) {
         const { treatment_id, menu, ...rest } = data;
 
-        return this.prisma.rESERVATIONS.create({
-            data: {
-                shop_id: rest.shop_id,
-                customer_id: rest.customer_id,
-                designer_id: rest.designer_id,
-                start_time: new Date(rest.start_time),
-                end_time: new Date(rest.end_time),
-                status: rest.status as RESERVATIONS_status,
-                request_memo: rest.request_memo,
-                alarm_enabled: rest.alarm_enabled,
-                ...(menu && {
-                    RESERVATION_ITEMS: {
-                        create: {
-                            menu_id: treatment_id,
-                            menu_name: menu.name,
-                            price: menu.price,
+        return this.prisma.$transaction(async (tx) => {
+            const startTime = new Date(rest.start_time);
+            const endTime = new Date(rest.end_time);
+            if (!INACTIVE_STATUSES.includes(rest.status as RESERVATIONS_status) && !rest.force) {
+                await this.lockDesignerAndCheckOverlap(tx, BigInt(rest.designer_id), startTime, endTime);
+            }
+
+            const reservation = await tx.rESERVATIONS.create({
+                data: {
+                    shop_id: rest.shop_id,
+                    customer_id: rest.customer_id,
+                    designer_id: rest.designer_id,
+                    start_time: startTime,
+                    end_time: endTime,
+                    status: rest.status as RESERVATIONS_status,
+                    request_memo: rest.request_memo,
+                    alarm_enabled: rest.alarm_enabled,
+                    ...(menu && {
+                        RESERVATION_ITEMS: {
+                            create: {
+                                menu_id: treatment_id,
+                                menu_name: menu.name,
+                                price: menu.price,
+                            }
                         }
-                    }
-                })
+                    })
+                }
+            });
+
+            await this.customerStats.applyReservationCreated(tx, reservation.reservation_id);
+            // 완료/노쇼 상태로 바로 등록된 예약은 통계 재계산
+            if (ROLLED_UP_STATUSES.includes(reservation.status)) {
+                await this.customerStats.refreshCustomer(tx, reservation.shop_id, reservation.customer_id);
+                await this.salesRollup.refreshDays(tx, reservation.shop_id, [reservation.start_time]);
             }
+
+            return reservation;
         });
     }
 
+    /**
+     * 디자이너 행을 잠근 뒤(SELECT ... FOR UPDATE) 겹치는 예약을 검사한다.
+     * 같은 디자이너의 예약 쓰기만 직렬화되고 다른 디자이너는 병렬로 진행된다.
+     * 겹침 검사는 잠금 읽기로 수행해 트랜잭션 스냅샷과 무관하게 직전에 커밋된 예약까지 본다.
+     */
+    private async lockDesignerAndCheckOverlap(tx: Prisma.TransactionClient, designerId: bigint, start: Date, end: Date, excludeId?: bigint) {
+        await tx.$queryRaw`SELECT designer_id FROM DESIGNERS WHERE designer_id = ${designerId} FOR UPDATE`;
+
+        const overlapping = await tx.$queryRaw<{ reservation_id: bigint; start_time: Date; end_time: Date }[]>`
+            SELECT reservation_id, start_time, end_time
+            FROM RESERVATIONS
+            WHERE designer_id = ${designerId}
+                AND status NOT IN (${Prisma.join(INACTIVE_STATUSES)})
+                AND start_time < ${end} AND end_time > ${start}
+                ${excludeId ? Prisma.sql`AND reservation_id <> ${excludeId}` : Prisma.empty}
+            LIMIT 1
+            LOCK IN SHARE MODE`;
+        if (overlapping.length > 0) {
+            throw new ReservationOverlapError(overlapping[0]);
+        }
+    }
+
     async getReservationById(shopId: number, id: number) {
         return this.prisma.rESERVATIONS.findFirst({
             where: {
@@ -100,55 +287,114 @@ export class ReservationsRepository {
         // 1. Update Reservation Basic Info
         const { designer_id, force, ...updateRest } = rest;
 
-        const updatedReservation = await this.prisma.rESERVATIONS.update({
-            where: {
-                reservation_id: id,
-                shop_id: BigInt(shopId),
-            },
-            data: {
-                ...updateRest,
-                ...(designer_id && {
-                    DESIGNERS: {
-                        connect: { designer_id: BigInt(designer_id) }
-                    }
-                }),
-                start_time: updateRest.start_time ? new Date(updateRest.start_time) : undefined,
-                end_time: updateRest.end_time ? new Date(updateRest.end_time) : undefined,
+        return this.prisma.$transaction(async (tx) => {
+            // 집계용 변경 전 정보 + 겹침 검사에 쓰는 현재 디자이너/종료 시각
+            const before = await tx.rESERVATIONS.findFirst({
+                where: { reservation_id: id, shop_id: BigInt(shopId) },
+                select: { ...ROLLUP_SNAPSHOT_SELECT, designer_id: true, end_time: true },
+            });
+
+            // 디자이너/시간/상태가 바뀌면 변경 후 일정으로 겹침 검사
+            if (before && !force && (designer_id || updateRest.start_time || updateRest.end_time || updateRest.status)) {
+                const status = (updateRest.status || before.status) as RESERVATIONS_status;
+                if (!INACTIVE_STATUSES.includes(status)) {
+                    await this.lockDesignerAndCheckOverlap(
+                        tx,
+                        designer_id ? BigInt(designer_id) : before.designer_id,
+                        updateRest.start_time ? new Date(updateRest.start_time) : before.start_time,
+                        updateRest.end_time ? new Date(updateRest.end_time) : before.end_time,
+                        BigInt(id),
+                    );
+                }
             }
-        });
 
-        // 2. Update Reservation Items (Price or Menu change)
-        if (treatment_id !== undefined || price !== undefined) {
-            // Find existing item
-            const existingItem = await this.prisma.rESERVATION_ITEMS.findFirst({
-                where: { reservation_id: id }
+            const updatedReservation = await tx.rESERVATIONS.update({
+                where: {
+                    reservation_id: id,
+                    shop_id: BigInt(shopId),
+                },
+                data: {
+                    ...updateRest,
+                    ...(designer_id && {
+                        DESIGNERS: {
+                            connect: { designer_id: BigInt(designer_id) }
+                        }
+                    }),
+                    start_time: updateRest.start_time ? new Date(updateRest.start_time) : undefined,
+                    end_time: updateRest.end_time ? new Date(updateRest.end_time) : undefined,
+                }
             });
 
-            if (existingItem) {
-                await this.prisma.rESERVATION_ITEMS.update({
-                    where: { item_id: existingItem.item_id },
-                    data: {
-                        ...(treatment_id && { menu_id: treatment_id }),
-                        ...(price !== undefined && { price: price }),
-                        // If menu name needs update, we might need to fetch menu details again, 
-                        // but usually name follows ID unless strictly decoupled. 
-                        // For now we assume price/ID update is sufficient or name is not critical to sync immediately here without menu lookup.
-                        // Ideally we should lookup menu name if ID changes.
-                    }
+            // 2. Update Reservation Items (Price or Menu change)
+            if (treatment_id !== undefined || price !== undefined) {
+                // Find existing item
+                const existingItem = await tx.rESERVATION_ITEMS.findFirst({
+                    where: { reservation_id: id }
                 });
-            } else if (treatment_id) {
-                // Should create if not exists? (Edge case)
-                // For now skip complexity.
+
+                if (existingItem) {
+                    await tx.rESERVATION_ITEMS.update({
+                        where: { item_id: existingItem.item_id },
+                        data: {
+                            ...(treatment_id && { menu_id: treatment_id }),
+                            ...(price !== undefined && { price: price }),
+                            // If menu name needs update, we might need to fetch menu details again, 
+                            // but usually name follows ID unless strictly decoupled. 
+                            // For now we assume price/ID update is sufficient or name is not critical to sync immediately here without menu lookup.
+                            // Ideally we should lookup menu name if ID changes.
+                        }
+                    });
+                } else if (treatment_id) {
+                    // Should create if not exists? (Edge case)
+                    // For now skip complexity.
+                }
             }
-        }
 
-        return updatedReservation;
+            // 3. 집계에 반영된(또는 반영될) 예약이면 변경 전/후 일자 재계산
+            if (before && (ROLLED_UP_STATUSES.includes(before.status) || ROLLED_UP_STATUSES.includes(updatedReservation.status))) {
+                await this.salesRollup.refreshDays(tx, shopId, [
+                    before.start_time,
+                    updatedReservation.start_time,
+                    ...before.PAYMENTS.map(p => p.paid_at),
+                ]);
+            }
+
+            // 4. 고객 통계: 상태/금액/고객 변경, 완료 예약의 시간 변경 시 재계산
+            const statsChanged = before && (
+                before.status !== updatedReservation.status ||
+                before.customer_id !== updatedReservation.customer_id ||
+                price !== undefined || treatment_id !== undefined ||
+                (updatedReservation.status === 'COMPLETED' && before.start_time.getTime() !== updatedReservation.start_time.getTime())
+            );
+            if (statsChanged) {
+                await this.customerStats.refreshCustomer(tx, shopId, updatedReservation.customer_id);
+                if (before.customer_id !== updatedReservation.customer_id) {
+                    await this.customerStats.refreshCustomer(tx, shopId, before.customer_id);
+                }
+            }
+
+            return updatedReservation;
+        });
     }
 
-    async completeReservation(shopId: number, id: number, data: any) {
-        const { totalPrice, payments, paymentMemo } = data;
+    /**
+     * 예약 완료(결제): 상태 변경, 결제 일괄 저장, 선불권 차감, 집계 반영을 한 트랜잭션에서 처리한다.
+     * 잔액 부족 등으로 실패하면 전부 롤백되므로 차감만 되고 결제가 남지 않는 경우가 없다.
+     */
+    async completeReservation(shopId: number, id: number, data: CompleteReservationDto) {
+        const { payments, paymentMemo } = data;
 
         return this.prisma.$transaction(async (tx) => {
+            // 이번에 저장할 결제를 구분하기 위해 기존 마지막 결제 ID 도 함께 조회
+            const before = await tx.rESERVATIONS.findFirst({
+                where: { reservation_id: id, shop_id: BigInt(shopId) },
+                select: {
+                    status: true,
+                    PAYMENTS: { select: { payment_id: true }, orderBy: { payment_id: 'desc' }, take: 1 },
+                },
+            });
+            if (!before) throw new BadRequestException('Reservation not found');
+
             // 1. Update Reservation Status
             const updatedReservation = await tx.rESERVATIONS.update({
                 where: {
@@ -161,33 +407,71 @@ export class ReservationsRepository {
                 }
             });
 
-            // 2. Create Payment Records
-            // payments is array of { paymentType, amount }
-            if (payments && Array.isArray(payments)) {
-                for (const p of payments) {
-                    await tx.pAYMENTS.create({
-                        data: {
-                            reservation_id: id,
-                            type: p.paymentType,
-                            amount: p.amount,
-                            status: 'PAID',
-                        }
-                    });
-                }
-            } else {
-                // Fallback for legacy calls? (Shouldn't happen with DTO valid)
+            // 2. 결제 일괄 저장
+            if (payments && payments.length > 0) {
+                await tx.pAYMENTS.createMany({
+                    data: payments.map(p => ({
+                        reservation_id: id,
+                        type: p.paymentType,
+                        amount: p.amount,
+                        status: 'PAID' as const,
+                    })),
+                });
             }
 
+            // 3. 선불권 차감 (createMany 는 ID 를 돌려주지 않으므로 방금 저장한 PREPAID 결제를 다시 읽어 거래와 연결)
+            if (payments?.some(p => p.paymentType === 'PREPAID' && p.amount > 0)) {
+                const prepaidPayments = await tx.pAYMENTS.findMany({
+                    where: {
+                        reservation_id: id,
+                        type: 'PREPAID',
+                        payment_id: { gt: before.PAYMENTS[0]?.payment_id ?? BigInt(0) },
+                    },
+                    select: { payment_id: true, amount: true },
+                    orderBy: { payment_id: 'asc' },
+                });
+                await this.prepaidService.usePrepaidForPayments(tx, shopId, updatedReservation.customer_id, prepaidPayments);
+            }
+
+            // 4. 일별 매출 집계 / 고객 통계 반영
+            await this.salesRollup.applyCompletion(tx, shopId, updatedReservation.reservation_id, before.status);
+            await this.customerStats.applyCompletion(tx, shopId, updatedReservation.customer_id, updatedReservation.reservation_id, before.status);
+
             return updatedReservation;
         });
     }
 
     async deleteReservation(shopId: number, id: number) {
-        return this.prisma.rESERVATIONS.delete({
-            where: {
-                reservation_id: id,
-                shop_id: BigInt(shopId),
+        return this.prisma.$transaction(async (tx) => {
+            const before = await tx.rESERVATIONS.findFirst({
+                where: { reservation_id: id, shop_id: BigInt(shopId) },
+                select: ROLLUP_SNAPSHOT_SELECT,
+            });
+
+            const deleted = await tx.rESERVATIONS.delete({
+                where: {
+                    reservation_id: id,
+                    shop_id: BigInt(shopId),
+                }
+            });
+
+            if (before && ROLLED_UP_STATUSES.includes(before.status)) {
+                await this.salesRollup.refreshDays(tx, shopId, [before.start_time, ...before.PAYMENTS.map(p => p.paid_at)]);
             }
+            await this.customerStats.refreshCustomer(tx, shopId, deleted.customer_id);
+
+            // 캘린더 delta 동기화용 삭제 기록 (보관 기간이 지난 기록은 함께 정리)
+            await tx.rESERVATION_TOMBSTONES.create({
+                data: { reservation_id: deleted.reservation_id, shop_id: deleted.shop_id },
+            });
+            await tx.rESERVATION_TOMBSTONES.deleteMany({
+                where: {
+                    shop_id: deleted.shop_id,
+                    deleted_at: { lt: new Date(Date.now() - TOMBSTONE_RETENTION_MS) },
+                },
+            });
+
+            return deleted;
         });
     }
 }
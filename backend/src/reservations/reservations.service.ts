@@ -1,6 +1,8 @@
 import { Injectable, BadRequestException } from '@nestjs/common';
+import { createHash } from 'crypto';
 import { GetReservationsDto } from './dto/get-reservations.dto';
-import { ReservationsRepository } from './reservations.repository';
+import { GetReservationCalendarDto } from './dto/get-reservation-calendar.dto';
+import { ReservationsRepository, ReservationOverlapError, TOMBSTONE_RETENTION_MS } from './reservations.repository';
 import { CompleteReservationDto } from './dto/complete-reservation.dto';
 
 import { CreateReservationDto } from './dto/create-reservation.dto';
@@ -8,7 +10,11 @@ import { UpdateReservationDto } from './dto/update-reservation.dto';
 import { PrismaService } from '../prisma/prisma.service';
 import { TimeService } from '../common/time/time.service';
 
-import { PrepaidService } from '../prepaid/prepaid.service';
+import { AvailabilityService } from './availability.service';
+import { AvailabilityCacheService } from '../common/cache/availability-cache.service';
+
+// cursor 직전에 시작해 늦게 커밋된 트랜잭션의 변경을 놓치지 않도록 다음 동기화 구간을 겹친다
+const SYNC_OVERLAP_MS = 5000;
 
 @Injectable()
 export class ReservationsService {
@@ -16,136 +22,87 @@ export class ReservationsService {
         private reservationsRepository: ReservationsRepository,
         private prisma: PrismaService,
         private timeService: TimeService,
-        private prepaidService: PrepaidService
+        private availabilityService: AvailabilityService,
+        private availabilityCache: AvailabilityCacheService
     ) { }
 
-    async getAvailableSlots(shopId: number, date: string, duration: number, designerId?: number) {
-        // 1. Target Designers
-        let designers = [];
-        if (designerId && !isNaN(designerId)) {
-            const d = await this.prisma.dESIGNERS.findUnique({ where: { designer_id: BigInt(designerId) } });
-            if (d && d.is_active) designers.push(d);
-        } else {
-            // ANY or Not provided -> Fetch All Active
-            designers = await this.prisma.dESIGNERS.findMany({
-                where: { shop_id: BigInt(shopId), is_active: true }
-            });
-        }
-
-        const dateObj = this.timeService.parse(date); // Start of day 00:00 (KST probably)
-        const dayOfWeek = dateObj.format('ddd');
+    async getAvailableSlots(shopId: number, date: string, duration: number, designerId?: number, step?: number) {
+        return this.availabilityService.getAvailableSlots(shopId, date, duration, designerId, step);
+    }
 
-        // Shop info for Closed Days
-        const shop = await this.prisma.sHOPS.findUnique({ where: { shop_id: BigInt(shopId) } });
-        if (!shop || (shop.closed_days && shop.closed_days.includes(dayOfWeek))) {
-            return []; // Shop closed
-        }
+    // 슬롯별 예약 가능한 디자이너 목록까지 반환
+    async getAvailableSlotDetails(shopId: number, date: string, duration: number, designerId?: number, step?: number) {
+        return this.availabilityService.getSlotDetails(shopId, date, duration, designerId, step);
+    }
 
-        const allSlots = new Set<string>();
-
-        // 2. Loop Designers
-        for (const designer of designers) {
-            // Check Day Off
-            if (designer.day_off && designer.day_off.includes(dayOfWeek)) continue;
-
-            const workStartStr = this.timeService.toUtcTimeStr(designer.work_start as any); // HH:mm
-            const workEndStr = this.timeService.toUtcTimeStr(designer.work_end as any);   // HH:mm
-
-            if (!workStartStr || !workEndStr) continue;
-
-            // Define Search Range (Shop Open vs Designer Work - Intersection)
-            // But usually Designer Work is within Shop Open. Layout uses Designer Work.
-            let startT = this.timeService.parse(`${date} ${workStartStr}`);
-            let endT = this.timeService.parse(`${date} ${workEndStr}`);
-
-            // Generate Slots (e.g. 30 min interval)
-            // Implementation: Loop from workStart to workEnd - duration
-            let current = startT;
-            while (current.add(duration, 'minute').isSame(endT) || current.add(duration, 'minute').isBefore(endT)) {
-                const slotTimeStr = current.format('HH:mm');
-                const slotEndStr = current.add(duration, 'minute').format('HH:mm');
-
-                // Check Conflicts
-                // 1. Lunch
-                const lunchStart = this.timeService.toUtcTimeStr(designer.lunch_start as any);
-                const lunchEnd = this.timeService.toUtcTimeStr(designer.lunch_end as any);
-                let isLunch = false;
-                if (lunchStart && lunchEnd) {
-                    // Simple String Compare for HH:mm works
-                    // Overlap Check: Not (End <= LunchStart OR Start >= LunchEnd)
-                    if (!(slotEndStr <= lunchStart || slotTimeStr >= lunchEnd)) {
-                        isLunch = true;
-                    }
-                }
+    // 다일자 가용 캘린더 (일자/디자이너별 빈 구간)
+    async getAvailabilityCalendar(shopId: number, from: string, days: number, duration?: number, designerId?: number, step?: number) {
+        return this.availabilityService.getCalendar(shopId, from, days, duration, designerId, step);
+    }
 
-                // 2. Reservations/Blocks (Need to fetch)
-                // Optimally, we fetch all reservations for this designer on this date ONCE outside loop or cached.
-                // For MVP, fetch here is okay (or fetch all for detailed check).
-                // Better: Fetch all res/blocks for this Date/Designer at loop start.
-
-                // Let's optimize: Fetch once per designer.
-
-                if (!isLunch) {
-                    // Check Reservations collision
-                    // Using validateAvailability or just raw check? 
-                    // validateAvailability throws Exception. We need boolean.
-                    // Let's implement lightweight check here or separate helper.
-                    // Re-use logic: "validateAvailability" is too heavy (DB calls).
-                    // We need "checkCollision(designerId, start, end)".
-                    const hasConflict = await this.checkCollision(Number(designer.designer_id), current, current.add(duration, 'minute'));
-                    if (!hasConflict) {
-                        allSlots.add(slotTimeStr);
-                    }
-                }
+    // 응답 변환은 RESERVATION_LIST_RESPONSE (컨트롤러 @Serialize)
+    async findAll(shopId: number, query: GetReservationsDto) {
+        const { startDate, endDate } = query;
+        return this.reservationsRepository.getReservations(shopId, startDate, endDate);
+    }
 
-                current = current.add(30, 'minute'); // Fixed Interval?? Or based on Duration?
-                // Usually defined by 'TimeGrid'. Let's assume 30min interval step.
-            }
+    /**
+     * 캘린더 동기화.
+     * - changedSince 없음(또는 삭제 기록 보관 기간보다 오래됨): 구간 전체 (full = true)
+     * - changedSince 있음: 그 이후 생성/수정된 예약과 삭제된 예약 ID만 반환 (구간 밖으로 옮겨진 예약 포함)
+     * 응답의 cursor 를 다음 요청의 changedSince 로 사용한다. (응답 변환은 RESERVATION_CALENDAR_RESPONSE)
+     */
+    async getCalendar(shopId: number, query: GetReservationCalendarDto) {
+        const { from, to, since } = this.parseCalendarQuery(query);
+        const syncedAt = new Date(Date.now() - SYNC_OVERLAP_MS);
+
+        let reservations: Awaited<ReturnType<ReservationsRepository['getCalendarReservations']>>;
+        let deleted: bigint[] = [];
+        if (since) {
+            [reservations, deleted] = await Promise.all([
+                this.reservationsRepository.getChangedReservations(shopId, since),
+                this.reservationsRepository.getDeletedReservationIds(shopId, since),
+            ]);
+        } else {
+            reservations = await this.reservationsRepository.getCalendarReservations(shopId, from, to);
         }
 
-        // Sort results
-        return Array.from(allSlots).sort();
-    }
+        // 변경이 없으면 cursor 를 그대로 두어 다음 요청 URL 이 같아지게 한다 (브라우저 조건부 요청 → 304)
+        const unchanged = since && reservations.length === 0 && deleted.length === 0;
 
-    // Lightweight collision check without Exceptions
-    private async checkCollision(designerId: number, start: any, end: any): Promise<boolean> {
-        // Blocks
-        const block = await this.prisma.sCHEDULE_BLOCKS.findFirst({
-            where: {
-                designer_id: BigInt(designerId),
-                OR: [
-                    { start_time: { lt: end.toDate() }, end_time: { gt: start.toDate() } }
-                ]
-            }
-        });
-        if (block) return true;
-
-        // Reservations
-        const res = await this.prisma.rESERVATIONS.findFirst({
-            where: {
-                designer_id: BigInt(designerId),
-                status: { notIn: ['CANCELED', 'NOSHOW'] },
-                OR: [
-                    { start_time: { lt: end.toDate() }, end_time: { gt: start.toDate() } }
-                ]
-            }
-        });
-        if (res) return true;
-
-        return false;
+        return {
+            full: !since,
+            items: reservations,
+            deleted,
+            cursor: unchanged ? since : syncedAt,
+        };
     }
 
+    // 응답 본문을 만들지 않고 구간/변경분 집계만으로 계산하는 ETag
+    async getCalendarEtag(shopId: number, query: GetReservationCalendarDto) {
+        const { from, to, since } = this.parseCalendarQuery(query);
+        const fingerprint = await this.reservationsRepository.getCalendarFingerprint(shopId, from, to, since);
+
+        const key = [
+            shopId, from.getTime(), to.getTime(), since ? since.getTime() : '',
+            fingerprint.count, fingerprint.lastUpdatedAt ? fingerprint.lastUpdatedAt.getTime() : '',
+            fingerprint.deletedCount, fingerprint.lastDeletedAt ? fingerprint.lastDeletedAt.getTime() : '',
+        ].join(':');
+        return `W/"${createHash('sha1').update(key).digest('base64url')}"`;
+    }
 
-    async findAll(shopId: number, query: GetReservationsDto) {
-        const { startDate, endDate } = query;
-
-        const reservations = await this.reservationsRepository.getReservations(shopId, startDate, endDate);
+    private parseCalendarQuery(query: GetReservationCalendarDto) {
+        const from = new Date(query.startDate);
+        const to = new Date(query.endDate);
+        if (isNaN(from.getTime()) || isNaN(to.getTime())) {
+            throw new BadRequestException('startDate, endDate 형식이 올바르지 않습니다.');
+        }
 
-        return reservations.map(reservation => ({
-            ...reservation,
-            start_time: reservation.start_time.toISOString(),
-            end_time: reservation.end_time.toISOString(),
-        }));
+        let since = query.changedSince ? new Date(query.changedSince) : null;
+        if (since && since.getTime() < Date.now() - TOMBSTONE_RETENTION_MS) {
+            since = null; // 삭제 기록이 정리된 구간 → 전체 재동기화
+        }
+        return { from, to, since };
     }
 
     async findOne(shopId: number, id: number) {
@@ -183,15 +140,25 @@ export class ReservationsService {
             }
         }
 
-        return this.reservationsRepository.createReservation({
-            ...createReservationDto,
-            menu: menuData
-        });
+        let reservation: Awaited<ReturnType<ReservationsRepository['createReservation']>>;
+        try {
+            reservation = await this.reservationsRepository.createReservation({
+                ...createReservationDto,
+                menu: menuData
+            });
+        } catch (error) {
+            if (error instanceof ReservationOverlapError) return this.overlapConflict(error);
+            throw error;
+        }
+        this.availabilityCache.invalidateRange(reservation.shop_id, reservation.start_time, reservation.end_time);
+
+        return reservation;
     }
 
     async update(shopId: number, id: number, updateReservationDto: UpdateReservationDto) {
+        let currentReservation = null;
         if (updateReservationDto.start_time || updateReservationDto.end_time || updateReservationDto.designer_id) {
-            const currentReservation = await this.findOne(shopId, id);
+            currentReservation = await this.findOne(shopId, id);
             if (!currentReservation) throw new BadRequestException('Reservation not found');
 
             // shopId is already validated by guard/controller param
@@ -207,40 +174,49 @@ export class ReservationsService {
         }
 
         try {
-            return await this.reservationsRepository.updateReservation(shopId, id, updateReservationDto);
+            const updated = await this.reservationsRepository.updateReservation(shopId, id, updateReservationDto);
+
+            // 이동 전/후 일자 모두 무효화
+            this.availabilityCache.invalidateRange(shopId, updated.start_time, updated.end_time);
+            if (currentReservation) {
+                this.availabilityCache.invalidateRange(shopId, new Date(currentReservation.start_time), new Date(currentReservation.end_time));
+            }
+            return updated;
         } catch (error) {
+            if (error instanceof ReservationOverlapError) return this.overlapConflict(error);
             console.error('[ReservationsService.update] Error:', error);
             throw error;
         }
     }
 
     async complete(shopId: number, id: number, completeReservationDto: CompleteReservationDto) {
-        const { payments, totalPrice } = completeReservationDto;
+        // 상태 변경 / 결제 저장 / 선불권 차감은 리포지토리의 한 트랜잭션에서 처리 (잔액 부족 시 BadRequest, 전체 롤백)
+        const completed = await this.reservationsRepository.completeReservation(shopId, id, completeReservationDto);
+        this.availabilityCache.invalidateRange(shopId, completed.start_time, completed.end_time);
 
-        const reservation = await this.reservationsRepository.getReservationById(shopId, id);
-        if (!reservation) throw new BadRequestException('Reservation not found');
-
-        // Calculate sum of payments
-        const paymentSum = payments.reduce((sum, p) => sum + p.amount, 0);
-        if (paymentSum !== totalPrice) {
-            // Note: exact match required? Yes for now.
-            // throw new BadRequestException(`결제 금액 합계(${paymentSum})가 총 시술 금액(${totalPrice})과 일치하지 않습니다.`);
-            // User might pay less (partial?) No requirements yet. Assume full payment.
-        }
+        return completed;
+    }
 
-        // Handle Prepaid Deductions
-        for (const payment of payments) {
-            if (payment.paymentType === 'PREPAID') {
-                // Deduct balance (Throws error if insufficient)
-                await this.prepaidService.usePrepaid(shopId, Number(reservation.customer_id), payment.amount);
-            }
-        }
+    async remove(shopId: number, id: number) {
+        const deleted = await this.reservationsRepository.deleteReservation(shopId, id);
+        this.availabilityCache.invalidateRange(shopId, deleted.start_time, deleted.end_time);
 
-        return this.reservationsRepository.completeReservation(shopId, id, completeReservationDto);
+        return deleted;
     }
 
-    async remove(shopId: number, id: number) {
-        return this.reservationsRepository.deleteReservation(shopId, id);
+    // 동시 예약 등으로 트랜잭션 안에서 겹침이 발견된 경우 (force 로 무시 가능)
+    private overlapConflict(error: ReservationOverlapError) {
+        return {
+            status: 'CONFLICT',
+            code: 'RESERVATION_OVERLAP',
+            message: '해당 시간에 담당 디자이너의 다른 예약이 있습니다. 계속 진행하시겠습니까?',
+            details: {
+                type: 'RESERVATION',
+                reservation_id: error.overlapping.reservation_id,
+                start: error.overlapping.start_time.toISOString(),
+                end: error.overlapping.end_time.toISOString(),
+            }
+        };
     }
 
     private async validateAvailability(shopId: number, designerId: number, start: string, end: string, force: boolean = false) {
@@ -0,0 +1,189 @@
+import { Injectable } from '@nestjs/common';
+import { PAYMENTS_type, Prisma, RESERVATIONS_status } from '@prisma/client';
+import { PrismaService } from '../prisma/prisma.service';
+import { TimeService } from '../common/time/time.service';
+
+// PrismaService 또는 인터랙티브 트랜잭션 클라이언트
+export type RollupClient = PrismaService | Prisma.TransactionClient;
+
+type RollupMode = 'replace' | 'increment';
+
+// DATETIME 컬럼은 UTC 로 저장되므로 KST 일자는 +9시간 후 DATE()
+const KST = Prisma.raw('INTERVAL 9 HOUR');
+
+// 이미 집계에 반영된 예약 상태
+export const ROLLED_UP_STATUSES: RESERVATIONS_status[] = ['COMPLETED', 'CANCELED', 'NOSHOW'];
+
+// 현금 흐름(실제 입금)에 잡는 결제 수단. 앱 예약금/선불권 사용은 매출(revenue)에만 잡힌다.
+export const CASH_FLOW_PAYMENT_TYPES: PAYMENTS_type[] = ['SITE_CARD', 'SITE_CASH'];
+
+const RESERVATION_COLUMNS = [
+    'completed_count', 'cancel_count', 'noshow_count', 'new_customer_count', 'week_new_customer_count',
+    'revenue_total', 'revenue_card', 'revenue_cash', 'revenue_prepaid', 'revenue_app',
+];
+const CATEGORY_COLUMNS = ['item_sales', 'item_count'];
+const SITE_PAYMENT_COLUMNS = ['cash_site_card', 'cash_site_cash'];
+const PREPAID_COLUMNS = ['prepaid_charge_card', 'prepaid_charge_cash', 'prepaid_used'];
+
+/**
+ * 일별 매출 집계 테이블(SALES_DAILY_ROLLUPS) 유지.
+ *
+ * - 예약 완료 / 선불권 충전·사용: 같은 트랜잭션 안에서 해당 건만 집계해 가산 (increment)
+ * - 예약 수정·삭제 등 이미 반영된 값이 바뀌는 경우: 영향받는 일자를 원천 테이블에서 재계산 (replace)
+ *
+ * 두 경로 모두 같은 INSERT ... SELECT 문을 WHERE 조건만 바꿔 사용하므로 집계 기준이 항상 같다.
+ */
+@Injectable()
+export class SalesRollupService {
+    constructor(
+        private readonly prisma: PrismaService,
+        private readonly timeService: TimeService,
+    ) { }
+
+    async findRows(shopId: number, fromDate: string, toDate: string) {
+        return this.prisma.sALES_DAILY_ROLLUPS.findMany({
+            where: {
+                shop_id: BigInt(shopId),
+                sales_date: { gte: new Date(fromDate), lte: new Date(toDate) },
+            },
+        });
+    }
+
+    /**
+     * 예약 완료 반영. previousStatus 가 이미 집계된 상태였다면 가산 대신 일자 재계산.
+     */
+    async applyCompletion(db: RollupClient, shopId: number, reservationId: bigint, previousStatus?: RESERVATIONS_status) {
+        if (previousStatus && ROLLED_UP_STATUSES.includes(previousStatus)) {
+            const reservation = await db.rESERVATIONS.findUnique({
+                where: { reservation_id: reservationId },
+                select: { start_time: true, PAYMENTS: { select: { paid_at: true } } },
+            });
+            if (!reservation) return;
+            await this.refreshDays(db, shopId, [reservation.start_time, ...reservation.PAYMENTS.map(p => p.paid_at)]);
+            return;
+        }
+
+        const byReservation = Prisma.sql`r.reservation_id = ${reservationId}`;
+        await db.$executeRaw(this.reservationRowsSql(byReservation, 'increment'));
+        await db.$executeRaw(this.categoryRowsSql(byReservation, 'increment'));
+        await db.$executeRaw(this.sitePaymentRowsSql(Prisma.sql`p.reservation_id = ${reservationId}`, 'increment'));
+    }
+
+    // 선불권 충전/사용 1건 반영
+    async applyPrepaidTransaction(db: RollupClient, transactionId: bigint) {
+        await db.$executeRaw(this.prepaidRowsSql(Prisma.sql`t.transaction_id = ${transactionId}`, 'increment'));
+    }
+
+    // 결제(PREPAID)에 연결된 선불권 사용 거래 반영
+    async applyPrepaidPayments(db: RollupClient, paymentIds: bigint[]) {
+        if (paymentIds.length === 0) return;
+        await db.$executeRaw(this.prepaidRowsSql(Prisma.sql`t.ref_payment_id IN (${Prisma.join(paymentIds)})`, 'increment'));
+    }
+
+    /**
+     * 주어진 시각들이 속한 KST 일자를 각각 재계산
+     */
+    async refreshDays(db: RollupClient, shopId: number | bigint, dates: (Date | null)[]) {
+        const days = new Set<string>();
+        dates.forEach(date => {
+            if (date) days.add(this.timeService.format(date, 'YYYY-MM-DD'));
+        });
+        for (const day of days) {
+            await this.refreshRange(db, shopId, day, day);
+        }
+    }
+
+    /**
+     * [fromDate, toDate] (KST, 양끝 포함) 구간의 집계 행을 원천 테이블에서 다시 만든다.
+     */
+    async refreshRange(db: RollupClient, shopId: number | bigint, fromDate: string, toDate: string) {
+        const shop = BigInt(shopId);
+        const from = this.timeService.parse(fromDate).startOf('day').toDate();
+        const to = this.timeService.parse(toDate).startOf('day').add(1, 'day').toDate();
+
+        await db.$executeRaw`
+            DELETE FROM SALES_DAILY_ROLLUPS
+            WHERE shop_id = ${shop} AND sales_date BETWEEN ${fromDate} AND ${toDate}`;
+
+        const byStartTime = Prisma.sql`r.shop_id = ${shop} AND r.start_time >= ${from} AND r.start_time < ${to}`;
+        await db.$executeRaw(this.reservationRowsSql(byStartTime, 'replace'));
+        await db.$executeRaw(this.categoryRowsSql(byStartTime, 'replace'));
+        await db.$executeRaw(this.sitePaymentRowsSql(
+            Prisma.sql`r.shop_id = ${shop} AND p.paid_at >= ${from} AND p.paid_at < ${to}`, 'replace'));
+        await db.$executeRaw(this.prepaidRowsSql(
+            Prisma.sql`b.shop_id = ${shop} AND t.created_at >= ${from} AND t.created_at < ${to}`, 'replace'));
+    }
+
+    // 예약 단위 행 (예약 시작일 기준, category = '')
+    private reservationRowsSql(where: Prisma.Sql, mode: RollupMode): Prisma.Sql {
+        return Prisma.sql`
+            INSERT INTO SALES_DAILY_ROLLUPS (shop_id, sales_date, designer_id, category, ${Prisma.raw(RESERVATION_COLUMNS.join(', '))})
+            SELECT r.shop_id, DATE(r.start_time + ${KST}), r.designer_id, '',
+                COUNT(DISTINCT IF(r.status = 'COMPLETED', r.reservation_id, NULL)),
+                COUNT(DISTINCT IF(r.status = 'CANCELED', r.reservation_id, NULL)),
+                COUNT(DISTINCT IF(r.status = 'NOSHOW', r.reservation_id, NULL)),
+                COUNT(DISTINCT IF(r.status = 'COMPLETED' AND DATE(u.created_at + ${KST}) = DATE(r.start_time + ${KST}), r.reservation_id, NULL)),
+                COUNT(DISTINCT IF(r.status = 'COMPLETED' AND YEARWEEK(u.created_at + ${KST}, 3) = YEARWEEK(r.start_time + ${KST}, 3), r.reservation_id, NULL)),
+                COALESCE(SUM(IF(r.status = 'COMPLETED', p.amount, 0)), 0),
+                COALESCE(SUM(IF(r.status = 'COMPLETED' AND p.type = 'SITE_CARD', p.amount, 0)), 0),
+                COALESCE(SUM(IF(r.status = 'COMPLETED' AND p.type = 'SITE_CASH', p.amount, 0)), 0),
+                COALESCE(SUM(IF(r.status = 'COMPLETED' AND p.type = 'PREPAID', p.amount, 0)), 0),
+                COALESCE(SUM(IF(r.status = 'COMPLETED' AND p.type = 'APP_DEPOSIT', p.amount, 0)), 0)
+            FROM RESERVATIONS r
+            JOIN USERS u ON u.user_id = r.customer_id
+            LEFT JOIN PAYMENTS p ON p.reservation_id = r.reservation_id
+            WHERE ${where} AND r.status IN ('COMPLETED', 'CANCELED', 'NOSHOW')
+            GROUP BY r.shop_id, DATE(r.start_time + ${KST}), r.designer_id
+            ${this.onDuplicate(RESERVATION_COLUMNS, mode)}`;
+    }
+
+    // 카테고리 행 (완료 예약의 시술 항목, 상위 카테고리명 > 메뉴 카테고리 > '기타')
+    private categoryRowsSql(where: Prisma.Sql, mode: RollupMode): Prisma.Sql {
+        const category = Prisma.raw(`COALESCE(NULLIF(pm.name, ''), NULLIF(m.category, ''), '기타')`);
+        return Prisma.sql`
+            INSERT INTO SALES_DAILY_ROLLUPS (shop_id, sales_date, designer_id, category, ${Prisma.raw(CATEGORY_COLUMNS.join(', '))})
+            SELECT r.shop_id, DATE(r.start_time + ${KST}), r.designer_id, ${category},
+                SUM(i.price), COUNT(*)
+            FROM RESERVATIONS r
+            JOIN RESERVATION_ITEMS i ON i.reservation_id = r.reservation_id
+            LEFT JOIN MENUS m ON m.menu_id = i.menu_id
+            LEFT JOIN MENUS pm ON pm.menu_id = m.category_id
+            WHERE ${where} AND r.status = 'COMPLETED'
+            GROUP BY r.shop_id, DATE(r.start_time + ${KST}), r.designer_id, ${category}
+            ${this.onDuplicate(CATEGORY_COLUMNS, mode)}`;
+    }
+
+    // 현장 결제 현금 흐름 (결제일 기준, 예약 디자이너 행에 합산)
+    private sitePaymentRowsSql(where: Prisma.Sql, mode: RollupMode): Prisma.Sql {
+        return Prisma.sql`
+            INSERT INTO SALES_DAILY_ROLLUPS (shop_id, sales_date, designer_id, category, ${Prisma.raw(SITE_PAYMENT_COLUMNS.join(', '))})
+            SELECT r.shop_id, DATE(p.paid_at + ${KST}), r.designer_id, '',
+                SUM(IF(p.type = 'SITE_CARD', p.amount, 0)),
+                SUM(IF(p.type = 'SITE_CASH', p.amount, 0))
+            FROM PAYMENTS p
+            JOIN RESERVATIONS r ON r.reservation_id = p.reservation_id
+            WHERE ${where} AND p.type IN (${Prisma.join(CASH_FLOW_PAYMENT_TYPES)}) AND p.paid_at IS NOT NULL
+            GROUP BY r.shop_id, DATE(p.paid_at + ${KST}), r.designer_id
+            ${this.onDuplicate(SITE_PAYMENT_COLUMNS, mode)}`;
+    }
+
+    // 선불권 충전/사용 (거래일 기준, 매장 단위 행 designer_id = 0)
+    private prepaidRowsSql(where: Prisma.Sql, mode: RollupMode): Prisma.Sql {
+        return Prisma.sql`
+            INSERT INTO SALES_DAILY_ROLLUPS (shop_id, sales_date, designer_id, category, ${Prisma.raw(PREPAID_COLUMNS.join(', '))})
+            SELECT b.shop_id, DATE(t.created_at + ${KST}), 0, '',
+                SUM(IF(t.type = 'CHARGE' AND t.payment_method = 'CARD', t.amount, 0)),
+                SUM(IF(t.type = 'CHARGE' AND COALESCE(t.payment_method, 'CASH') <> 'CARD', t.amount, 0)),
+                SUM(IF(t.type = 'USE', t.amount, 0))
+            FROM PREPAID_TRANSACTIONS t
+            JOIN CUSTOMER_PREPAID_BALANCES b ON b.balance_id = t.balance_id
+            WHERE ${where} AND t.type IN ('CHARGE', 'USE') AND t.created_at IS NOT NULL
+            GROUP BY b.shop_id, DATE(t.created_at + ${KST})
+            ${this.onDuplicate(PREPAID_COLUMNS, mode)}`;
+    }
+
+    private onDuplicate(columns: string[], mode: RollupMode): Prisma.Sql {
+        const assignments = columns.map(c => mode === 'increment' ? `${c} = ${c} + VALUES(${c})` : `${c} = VALUES(${c})`);
+        return Prisma.raw(`ON DUPLICATE KEY UPDATE ${assignments.join(', ')}`);
+    }
+}
@@ -1,5 +1,5 @@
-import { Controller, Get, Param, ParseIntPipe, Query, UseGuards } from '@nestjs/common';
-import { SalesService } from './sales.service';
+import { BadRequestException, Controller, Get, Param, ParseIntPipe, Query, UseGuards } from '@nestjs/common';
+import { SalesService, SalesGroupBy } from './sales.service';
 import { JwtAuthGuard } from '../auth/guards/jwt-auth.guard';
 import { ShopAuthGuard } from '../common/guards/shop-auth.guard';
 
@@ -26,4 +26,17 @@ export class SalesController {
         const targetDate = date || new Date().toISOString().split('T')[0];
         return this.salesService.getWeeklySales(shopId, targetDate);
     }
+
+    @Get('range')
+    getRangeSales(
+        @Param('shopId', ParseIntPipe) shopId: number,
+        @Query('from') from: string,
+        @Query('to') to: string,
+        @Query('groupBy') groupBy: string
+    ) {
+        if (!from || !to) {
+            throw new BadRequestException('from, to 는 필수입니다. (YYYY-MM-DD)');
+        }
+        return this.salesService.getRangeSales(shopId, from, to, (groupBy || 'day') as SalesGroupBy);
+    }
 }
@@ -1,63 +1,71 @@
-import { Injectable, InternalServerErrorException } from '@nestjs/common';
+import { BadRequestException, Injectable, InternalServerErrorException } from '@nestjs/common';
+import { Prisma } from '@prisma/client';
+import * as dayjs from 'dayjs';
 import { PrismaService } from '../prisma/prisma.service';
 import { TimeService } from '../common/time/time.service';
+import { SalesRollupService } from './sales-rollup.service';
+
+export const SALES_GROUP_BYS = ['day', 'week', 'month', 'designer', 'category', 'paymentType'] as const;
+export type SalesGroupBy = typeof SALES_GROUP_BYS[number];
+
+export const MAX_SALES_RANGE_DAYS = 366;
+
+// 기간 집계에 쓰는 SALES_DAILY_ROLLUPS 컬럼 (예약 단위 행 기준)
+const RANGE_MEASURES = [
+    'completed_count', 'cancel_count', 'noshow_count',
+    'revenue_total', 'revenue_card', 'revenue_cash', 'revenue_prepaid', 'revenue_app',
+    'cash_site_card', 'cash_site_cash', 'prepaid_charge_card', 'prepaid_charge_cash', 'prepaid_used',
+];
+const RANGE_MEASURE_SQL = Prisma.raw(RANGE_MEASURES.map(c => `CAST(SUM(${c}) AS SIGNED) AS ${c}`).join(', '));
+
+// groupBy 별 버킷 식 (화이트리스트; 사용자 입력을 SQL 에 직접 넣지 않는다)
+// sales_date 는 이미 KST 일자이므로 주/월 버킷도 KST 기준이다.
+const BUCKET_SQL: Partial<Record<SalesGroupBy, Prisma.Sql>> = {
+    day: Prisma.raw(`DATE_FORMAT(sales_date, '%Y-%m-%d')`),
+    week: Prisma.raw(`DATE_FORMAT(DATE_SUB(sales_date, INTERVAL WEEKDAY(sales_date) DAY), '%Y-%m-%d')`), // ISO 주 (월요일)
+    month: Prisma.raw(`DATE_FORMAT(sales_date, '%Y-%m')`),
+    designer: Prisma.raw('designer_id'), // 0 = 매장 단위 (선불권 충전/사용)
+};
+
+type RangeMeasureRow = Record<string, bigint | string | null>;
 
 @Injectable()
 export class SalesService {
     constructor(
         private readonly prisma: PrismaService,
-        private readonly timeService: TimeService
+        private readonly timeService: TimeService,
+        private readonly salesRollup: SalesRollupService,
     ) { }
 
     async getDailySales(shopId: number, date: string) {
         try {
-            const startOfDay = this.timeService.parse(date).startOf('day').toDate();
-            const endOfDay = this.timeService.parse(date).endOf('day').toDate();
-
-            // 1. Fetch Reservations (For Service Revenue & Stats)
-            const reservations = await this.prisma.rESERVATIONS.findMany({
-                where: {
-                    start_time: { gte: startOfDay, lte: endOfDay },
-                    status: { in: ['COMPLETED', 'CANCELED', 'NOSHOW'] },
-                    shop_id: BigInt(shopId)
-                },
-                include: {
-                    USERS: true,
-                    DESIGNERS: { include: { USERS: true } },
-                    RESERVATION_ITEMS: {
-                        include: {
-                            MENUS: { include: { parent: true } }
-                        }
+            const day = this.timeService.parse(date).startOf('day');
+            const salesDate = day.format('YYYY-MM-DD');
+            const startOfDay = day.toDate();
+            const endOfDay = day.endOf('day').toDate();
+
+            // 1. 집계 행 (SALES_DAILY_ROLLUPS) + 화면 표시용 당일 예약 목록 (필요한 컬럼만)
+            const [rows, reservations] = await Promise.all([
+                this.salesRollup.findRows(shopId, salesDate, salesDate),
+                this.prisma.rESERVATIONS.findMany({
+                    where: {
+                        start_time: { gte: startOfDay, lte: endOfDay },
+                        status: { in: ['COMPLETED', 'CANCELED', 'NOSHOW'] },
+                        shop_id: BigInt(shopId)
                     },
-                    PAYMENTS: true
-                },
-                orderBy: { start_time: 'desc' }
-            });
-
-            // 2. Fetch Direct Payments (For Cash Flow - Site Sales)
-            const directPayments = await this.prisma.pAYMENTS.findMany({
-                where: {
-                    reservation_id: { in: reservations.map(r => r.reservation_id) }, // Link to fetched reservations for consistency, or use paid_at for strict cash flow?
-                    // User said "Card/Cash" (Site). 
-                    // To be safe and aligned with "Revenue", let's use the Payments FROM the reservations we just fetched.
-                    // But wait, "Cash Flow" means "Money In". 
-                    // If I use reservations, I get "Revenue".
-                    // The plan said: "Data Source 1 (Direct Payments): Payments table query".
-                    // Let's query PAYMENTS by date for Strict Cash Flow.
-                    paid_at: { gte: startOfDay, lte: endOfDay },
-                    type: { in: ['SITE_CARD', 'SITE_CASH'] }
-                }
-            });
-
-            // 3. Fetch Prepaid Charges (For Cash Flow - Prepaid Sales)
-            const prepaidCharges = await this.prisma.pREPAID_TRANSACTIONS.findMany({
-                where: {
-                    created_at: { gte: startOfDay, lte: endOfDay },
-                    type: 'CHARGE',
-                    CUSTOMER_PREPAID_BALANCES: { shop_id: BigInt(shopId) } // Ensure shop scope
-                }
-            });
-
+                    select: {
+                        reservation_id: true,
+                        start_time: true,
+                        status: true,
+                        designer_id: true,
+                        USERS: { select: { user_id: true, name: true } },
+                        DESIGNERS: { select: { USERS: { select: { name: true } } } },
+                        RESERVATION_ITEMS: { select: { menu_name: true } },
+                        PAYMENTS: { select: { type: true, amount: true } },
+                    },
+                    orderBy: { start_time: 'desc' }
+                }),
+            ]);
 
             // --- Aggregation Core ---
 
@@ -78,58 +86,63 @@ export class SalesService {
                 }
             };
 
-            // Calculate Revenue & Stats
             let completedCount = 0;
             let cancelCount = 0;
             let noshowCount = 0;
             let newCustomerCount = 0;
-            let returningCustomerCount = 0;
+
+            const designerNames = new Map<string, string>();
+            reservations.forEach(r => designerNames.set(r.designer_id.toString(), r.DESIGNERS?.USERS?.name || 'Unknown'));
 
             const designerMap = new Map<string, { name: string, totalSales: number, count: number, avgTicket: number }>();
             const categoryMap = new Map<string, { name: string, totalSales: number, count: number }>();
 
-            // Process Reservations
-            const reservationList = reservations.map((r: any) => {
-                const isCompleted = r.status === 'COMPLETED';
-                const payments = r.PAYMENTS || [];
-                const reservationTotal = payments.reduce((sum: number, p: any) => sum + p.amount, 0);
-
-                if (r.status === 'CANCELED') cancelCount++;
-                else if (r.status === 'NOSHOW') noshowCount++;
-                else if (isCompleted) {
-                    completedCount++;
-                    // Revenue Calculation (Accrual Basis)
-                    revenue.total += reservationTotal;
-
-                    payments.forEach((p: any) => {
-                        if (p.type === 'SITE_CARD') revenue.breakdown.card += p.amount;
-                        else if (p.type === 'SITE_CASH') revenue.breakdown.cash += p.amount;
-                        else if (p.type === 'PREPAID') revenue.breakdown.prepaid += p.amount;
-                        else if (p.type === 'APP_DEPOSIT') revenue.breakdown.app += p.amount;
-                    });
+            rows.forEach(row => {
+                // Category Stats
+                if (row.category !== '') {
+                    const cStats = categoryMap.get(row.category) || { name: row.category, totalSales: 0, count: 0 };
+                    cStats.totalSales += row.item_sales;
+                    cStats.count += row.item_count;
+                    categoryMap.set(row.category, cStats);
+                    return;
+                }
 
-                    // Stats
-                    const userCreatedAt = new Date(r.USERS.created_at);
-                    if (userCreatedAt >= startOfDay && userCreatedAt <= endOfDay) newCustomerCount++;
-                    else returningCustomerCount++;
+                revenue.total += row.revenue_total;
+                revenue.breakdown.card += row.revenue_card;
+                revenue.breakdown.cash += row.revenue_cash;
+                revenue.breakdown.prepaid += row.revenue_prepaid;
+                revenue.breakdown.app += row.revenue_app;
+
+                cashFlow.breakdown.site_card += row.cash_site_card;
+                cashFlow.breakdown.site_cash += row.cash_site_cash;
+                cashFlow.breakdown.prepaid_charge_card += row.prepaid_charge_card;
+                cashFlow.breakdown.prepaid_charge_cash += row.prepaid_charge_cash;
+
+                completedCount += row.completed_count;
+                cancelCount += row.cancel_count;
+                noshowCount += row.noshow_count;
+                newCustomerCount += row.new_customer_count;
+
+                // Designer Stats
+                if (row.completed_count > 0) {
+                    const key = row.designer_id.toString();
+                    const dStats = designerMap.get(key) || { name: designerNames.get(key) || 'Unknown', totalSales: 0, count: 0, avgTicket: 0 };
+                    dStats.totalSales += row.revenue_total;
+                    dStats.count += row.completed_count;
+                    designerMap.set(key, dStats);
+                }
+            });
 
-                    // Designer Stats
-                    const designerName = r.DESIGNERS?.USERS?.name || 'Unknown';
-                    const dStats = designerMap.get(designerName) || { name: designerName, totalSales: 0, count: 0, avgTicket: 0 };
-                    dStats.totalSales += reservationTotal;
-                    dStats.count += 1;
-                    designerMap.set(designerName, dStats);
+            const returningCustomerCount = completedCount - newCustomerCount;
 
-                    // Category Stats
-                    (r.RESERVATION_ITEMS || []).forEach((item: any) => {
-                        let categoryName = item.MENUS?.parent?.name || item.MENUS?.category || '기타';
-                        const cStats = categoryMap.get(categoryName) || { name: categoryName, totalSales: 0, count: 0 };
-                        cStats.totalSales += item.price;
-                        cStats.count += 1;
-                        categoryMap.set(categoryName, cStats);
-                    });
-                }
+            cashFlow.total =
+                cashFlow.breakdown.site_card +
+                cashFlow.breakdown.site_cash +
+                cashFlow.breakdown.prepaid_charge_card +
+                cashFlow.breakdown.prepaid_charge_cash;
 
+            const reservationList = reservations.map(r => {
+                const payments = r.PAYMENTS || [];
                 return {
                     id: r.reservation_id,
                     time: r.start_time,
@@ -137,32 +150,13 @@ export class SalesService {
                     customer: r.USERS?.name || 'Unknown',
                     customerId: r.USERS?.user_id || 0,
                     designer: r.DESIGNERS?.USERS?.name || 'Unknown',
-                    menus: r.RESERVATION_ITEMS?.map((i: any) => i.menu_name).join(', ') || '',
-                    totalPrice: reservationTotal,
-                    paymentType: payments.map((p: any) => p.type).join(', '),
-                    payments: payments.map((p: any) => ({ type: p.type, amount: p.amount })),
+                    menus: r.RESERVATION_ITEMS?.map(i => i.menu_name).join(', ') || '',
+                    totalPrice: payments.reduce((sum, p) => sum + p.amount, 0),
+                    paymentType: payments.map(p => p.type).join(', '),
+                    payments: payments.map(p => ({ type: p.type, amount: p.amount })),
                 };
             });
 
-            // Calculate Cash Flow
-            // 1. Site Payments
-            directPayments.forEach((p: any) => {
-                if (p.type === 'SITE_CARD') cashFlow.breakdown.site_card += p.amount;
-                else if (p.type === 'SITE_CASH') cashFlow.breakdown.site_cash += p.amount;
-            });
-            // 2. Prepaid Charges
-            prepaidCharges.forEach((p: any) => {
-                const method = p.payment_method || 'CASH'; // Default to CASH
-                if (method === 'CARD') cashFlow.breakdown.prepaid_charge_card += p.amount;
-                else cashFlow.breakdown.prepaid_charge_cash += p.amount; // CASH or Default
-            });
-
-            cashFlow.total =
-                cashFlow.breakdown.site_card +
-                cashFlow.breakdown.site_cash +
-                cashFlow.breakdown.prepaid_charge_card +
-                cashFlow.breakdown.prepaid_charge_cash;
-
             // Final Stats Formatting
             const avgTicket = completedCount > 0 ? Math.round(revenue.total / completedCount) : 0;
             const designerStats = Array.from(designerMap.values()).map(d => ({ ...d, avgTicket: d.count > 0 ? Math.round(d.totalSales / d.count) : 0 }));
@@ -195,6 +189,143 @@ export class SalesService {
         }
     }
 
+    /**
+     * 임의 기간 매출 분석. 집계는 모두 MySQL 에서 끝나고 버킷 단위 행만 가져온다.
+     * revenue(완료 예약 기준) / cashFlow(실제 입금 기준) 구분은 getDailySales 와 같다.
+     */
+    async getRangeSales(shopId: number, from: string, to: string, groupBy: SalesGroupBy) {
+        const datePattern = /^\d{4}-\d{2}-\d{2}$/;
+        if (!datePattern.test(from) || !datePattern.test(to)) {
+            throw new BadRequestException('from/to 는 YYYY-MM-DD 형식이어야 합니다.');
+        }
+        const start = this.timeService.parse(from).startOf('day');
+        const end = this.timeService.parse(to).startOf('day');
+        if (!start.isValid() || !end.isValid() || end.isBefore(start)) {
+            throw new BadRequestException('from/to 는 YYYY-MM-DD 형식이며 from <= to 여야 합니다.');
+        }
+        if (end.diff(start, 'day') + 1 > MAX_SALES_RANGE_DAYS) {
+            throw new BadRequestException(`조회 기간은 최대 ${MAX_SALES_RANGE_DAYS}일입니다.`);
+        }
+        if (!SALES_GROUP_BYS.includes(groupBy)) {
+            throw new BadRequestException(`groupBy 는 ${SALES_GROUP_BYS.join('|')} 중 하나여야 합니다.`);
+        }
+
+        try {
+            const shop = BigInt(shopId);
+            const fromDate = start.format('YYYY-MM-DD');
+            const toDate = end.format('YYYY-MM-DD');
+            const rangeWhere = Prisma.sql`shop_id = ${shop} AND sales_date BETWEEN ${fromDate} AND ${toDate}`;
+
+            const [totalsRow] = await this.prisma.$queryRaw<RangeMeasureRow[]>`
+                SELECT ${RANGE_MEASURE_SQL}
+                FROM SALES_DAILY_ROLLUPS
+                WHERE ${rangeWhere} AND category = ''`;
+            const totals = this.toRangeSummary(totalsRow);
+
+            let rows: any[];
+            if (groupBy === 'category') {
+                const categories = await this.prisma.$queryRaw<RangeMeasureRow[]>`
+                    SELECT category, CAST(SUM(item_sales) AS SIGNED) AS item_sales, CAST(SUM(item_count) AS SIGNED) AS item_count
+                    FROM SALES_DAILY_ROLLUPS
+                    WHERE ${rangeWhere} AND category <> ''
+                    GROUP BY category
+                    ORDER BY item_sales DESC`;
+                rows = categories.map(c => ({
+                    key: c.category,
+                    name: c.category,
+                    value: Number(c.item_sales || 0),
+                    count: Number(c.item_count || 0),
+                }));
+            } else if (groupBy === 'paymentType') {
+                // 기간 합계 한 행을 결제 수단별로 펼친다
+                rows = [
+                    { key: 'SITE_CARD', revenue: totals.revenue.breakdown.card, cashFlow: totals.cashFlow.breakdown.site_card },
+                    { key: 'SITE_CASH', revenue: totals.revenue.breakdown.cash, cashFlow: totals.cashFlow.breakdown.site_cash },
+                    { key: 'PREPAID', revenue: totals.revenue.breakdown.prepaid, cashFlow: 0 },
+                    { key: 'APP_DEPOSIT', revenue: totals.revenue.breakdown.app, cashFlow: 0 },
+                    { key: 'PREPAID_CHARGE_CARD', revenue: 0, cashFlow: totals.cashFlow.breakdown.prepaid_charge_card },
+                    { key: 'PREPAID_CHARGE_CASH', revenue: 0, cashFlow: totals.cashFlow.breakdown.prepaid_charge_cash },
+                ];
+            } else {
+                const bucket = BUCKET_SQL[groupBy];
+                const buckets = await this.prisma.$queryRaw<RangeMeasureRow[]>`
+                    SELECT ${bucket} AS bucket, ${RANGE_MEASURE_SQL}
+                    FROM SALES_DAILY_ROLLUPS
+                    WHERE ${rangeWhere} AND category = ''
+                    GROUP BY bucket
+                    ORDER BY bucket`;
+
+                if (groupBy === 'designer') {
+                    const designers = await this.prisma.dESIGNERS.findMany({
+                        where: { designer_id: { in: buckets.map(b => BigInt(b.bucket as bigint)) } },
+                        select: { designer_id: true, USERS: { select: { name: true } } },
+                    });
+                    const names = new Map(designers.map(d => [d.designer_id.toString(), d.USERS?.name || 'Unknown']));
+                    rows = buckets
+                        .map(b => ({
+                            key: Number(b.bucket),
+                            name: Number(b.bucket) === 0 ? '매장' : (names.get(String(b.bucket)) || 'Unknown'),
+                            ...this.toRangeSummary(b),
+                        }))
+                        .sort((a, b) => b.revenue.total - a.revenue.total);
+                } else {
+                    // 매출이 없는 구간도 0 으로 채워 차트가 끊기지 않게 한다
+                    const byKey = new Map(buckets.map(b => [String(b.bucket), b]));
+                    rows = this.timeBuckets(start, end, groupBy).map(key => ({
+                        key,
+                        ...this.toRangeSummary(byKey.get(key)),
+                    }));
+                }
+            }
+
+            return { from: fromDate, to: toDate, groupBy, totals, rows };
+        } catch (error) {
+            console.error('getRangeSales Error:', error);
+            throw new InternalServerErrorException(`Failed to get range sales: ${error.message}`);
+        }
+    }
+
+    private toRangeSummary(row?: RangeMeasureRow) {
+        const v = (column: string) => Number((row && row[column]) || 0);
+        const revenue = {
+            total: v('revenue_total'),
+            breakdown: { card: v('revenue_card'), cash: v('revenue_cash'), prepaid: v('revenue_prepaid'), app: v('revenue_app') },
+        };
+        const cashFlowBreakdown = {
+            site_card: v('cash_site_card'),
+            site_cash: v('cash_site_cash'),
+            prepaid_charge_card: v('prepaid_charge_card'),
+            prepaid_charge_cash: v('prepaid_charge_cash'),
+        };
+        const count = v('completed_count');
+        return {
+            revenue,
+            cashFlow: {
+                total: cashFlowBreakdown.site_card + cashFlowBreakdown.site_cash + cashFlowBreakdown.prepaid_charge_card + cashFlowBreakdown.prepaid_charge_cash,
+                breakdown: cashFlowBreakdown,
+            },
+            prepaidUsed: v('prepaid_used'),
+            count,
+            cancelCount: v('cancel_count'),
+            noshowCount: v('noshow_count'),
+            avgTicket: count > 0 ? Math.round(revenue.total / count) : 0,
+        };
+    }
+
+    // BUCKET_SQL 과 같은 형식의 버킷 키 목록
+    private timeBuckets(start: dayjs.Dayjs, end: dayjs.Dayjs, groupBy: SalesGroupBy): string[] {
+        const unit = groupBy === 'day' ? 'day' : groupBy === 'week' ? 'week' : 'month';
+        const format = groupBy === 'month' ? 'YYYY-MM' : 'YYYY-MM-DD';
+        let current = groupBy === 'week' ? start.startOf('isoWeek') : start.startOf(unit);
+
+        const keys: string[] = [];
+        while (!current.isAfter(end)) {
+            keys.push(current.format(format));
+            current = current.add(1, unit);
+        }
+        return keys;
+    }
+
     async getWeeklySales(shopId: number, date: string) {
         try {
             const today = this.timeService.parse(date);
@@ -205,34 +336,20 @@ export class SalesService {
             const startOfLastWeek = today.subtract(1, 'week').startOf('isoWeek').startOf('day').toDate();
             const endOfLastWeek = today.subtract(1, 'week').endOf('isoWeek').endOf('day').toDate();
 
-            // Fetch Reservations for both weeks
-            const reservations = await this.prisma.rESERVATIONS.findMany({
-                where: {
-                    start_time: { gte: startOfLastWeek, lte: endOfWeek },
-                    status: 'COMPLETED',
-                    shop_id: BigInt(shopId)
-                },
-                include: {
-                    USERS: true,
-                    DESIGNERS: { include: { USERS: true } },
-                    RESERVATION_ITEMS: {
-                        include: {
-                            MENUS: { include: { parent: true } }
-                        }
-                    },
-                    PAYMENTS: true
-                },
-                orderBy: { start_time: 'asc' }
-            });
+            // 두 주치 집계 행 (일자 x 디자이너 x 카테고리)
+            const rows = await this.salesRollup.findRows(
+                shopId,
+                this.timeService.format(startOfLastWeek, 'YYYY-MM-DD'),
+                this.timeService.format(endOfWeek, 'YYYY-MM-DD'),
+            );
 
             // Helper to aggregate data
             const aggregate = (start: Date, end: Date) => {
                 let totalSales = 0;
                 let count = 0;
-                let appSales = 0; // For verification if needed, or just total
 
                 // For Stats
-                const designerMap = new Map<string, { id: number, name: string, totalSales: number, count: number }>();
+                const designerMap = new Map<string, { id: number, totalSales: number, count: number }>();
                 const categoryMap = new Map<string, { name: string, totalSales: number, count: number }>();
                 const customerMap = { new: 0, returning: 0 };
                 const dailySales = new Map<string, number>();
@@ -245,46 +362,37 @@ export class SalesService {
                     current = current.add(1, 'day');
                 }
 
-                reservations.forEach(r => {
-                    const rTime = new Date(r.start_time);
-                    if (rTime >= start && rTime <= end) {
-                        const payments = r.PAYMENTS || [];
-                        const reservationTotal = payments.reduce((sum, p) => sum + p.amount, 0);
-
-                        totalSales += reservationTotal;
-                        count++;
-
-                        // Daily Trend
-                        const dayKey = this.timeService.format(rTime, 'YYYY-MM-DD');
-                        dailySales.set(dayKey, (dailySales.get(dayKey) || 0) + reservationTotal);
-
-                        // Designer Stats
-                        const dName = r.DESIGNERS?.USERS?.name || 'Unknown';
-                        const dId = Number(r.designer_id);
-                        const dStats = designerMap.get(dName) || { id: dId, name: dName, totalSales: 0, count: 0 };
-                        dStats.totalSales += reservationTotal;
-                        dStats.count++;
-                        designerMap.set(dName, dStats);
-
-                        // Category Stats
-                        (r.RESERVATION_ITEMS || []).forEach((item: any) => {
-                            let categoryName = item.MENUS?.parent?.name || item.MENUS?.category || '기타';
-                            const cStats = categoryMap.get(categoryName) || { name: categoryName, totalSales: 0, count: 0 };
-                            cStats.totalSales += item.price;
-                            cStats.count++;
-                            categoryMap.set(categoryName, cStats);
-                        });
-
-                        // Customer Stats
-                        if (r.USERS) {
-                            const userCreatedAt = new Date(r.USERS.created_at);
-                            if (userCreatedAt >= start && userCreatedAt <= end) {
-                                customerMap.new++;
-                            } else {
-                                customerMap.returning++;
-                            }
-                        }
+                rows.forEach(row => {
+                    // sales_date(DATE) 는 UTC 자정의 Date 로 매핑된다
+                    const dayKey = row.sales_date.toISOString().slice(0, 10);
+                    if (!dailySales.has(dayKey)) return;
+
+                    // Category Stats
+                    if (row.category !== '') {
+                        const cStats = categoryMap.get(row.category) || { name: row.category, totalSales: 0, count: 0 };
+                        cStats.totalSales += row.item_sales;
+                        cStats.count += row.item_count;
+                        categoryMap.set(row.category, cStats);
+                        return;
                     }
+                    if (row.completed_count === 0) return;
+
+                    totalSales += row.revenue_total;
+                    count += row.completed_count;
+
+                    // Daily Trend
+                    dailySales.set(dayKey, dailySales.get(dayKey) + row.revenue_total);
+
+                    // Designer Stats
+                    const key = row.designer_id.toString();
+                    const dStats = designerMap.get(key) || { id: Number(row.designer_id), totalSales: 0, count: 0 };
+                    dStats.totalSales += row.revenue_total;
+                    dStats.count += row.completed_count;
+                    designerMap.set(key, dStats);
+
+                    // Customer Stats (가입 주차 = 방문 주차이면 신규)
+                    customerMap.new += row.week_new_customer_count;
+                    customerMap.returning += row.completed_count - row.week_new_customer_count;
                 });
 
                 return {
@@ -329,8 +437,19 @@ export class SalesService {
             }));
 
             // Format Designer Stats
-            const designerStats = Array.from(thisWeek.designerMap.values())
-                .map(d => ({ ...d, avgTicket: d.count > 0 ? Math.round(d.totalSales / d.count) : 0 }))
+            const designers = await this.prisma.dESIGNERS.findMany({
+                where: { designer_id: { in: Array.from(thisWeek.designerMap.values()).map(d => BigInt(d.id)) } },
+                select: { designer_id: true, USERS: { select: { name: true } } },
+            });
+            const designerNames = new Map(designers.map(d => [d.designer_id.toString(), d.USERS?.name || 'Unknown']));
+            const designerStats = Array.from(thisWeek.designerMap.entries())
+                .map(([key, d]) => ({
+                    id: d.id,
+                    name: designerNames.get(key) || 'Unknown',
+                    totalSales: d.totalSales,
+                    count: d.count,
+                    avgTicket: d.count > 0 ? Math.round(d.totalSales / d.count) : 0,
+                }))
                 .sort((a, b) => b.totalSales - a.totalSales);
 
             // Format Category Stats
@@ -0,0 +1,93 @@
+/**
+ * POST /auth/refresh 처리량 벤치마크 (실행 중인 서버 대상)
+ *
+ * 사용법:
+ *   npx ts-node src/scripts/bench_auth_refresh.ts <baseUrl> <email> <password> [devices=8] [seconds=10]
+ *   예) npx ts-node src/scripts/bench_auth_refresh.ts http://localhost:3000 owner@test.com 1234 8 10
+ *
+ * 기기(devices) 수만큼 로그인해 토큰 family 를 만든 뒤, 각 기기가 받은 새 토큰으로 계속 재발급을 이어간다.
+ * 재발급이 한 번이라도 실패하면(토큰 체인 끊김) 그 기기는 중단하고 실패로 집계한다.
+ */
+
+interface DeviceResult {
+    requests: number;
+    failures: number;
+    latencies: number[];
+}
+
+function refreshCookie(response: Response): string | null {
+    const headers = response.headers as Headers & { getSetCookie?: () => string[] };
+    const cookies = headers.getSetCookie ? headers.getSetCookie() : [headers.get('set-cookie') || ''];
+    for (const cookie of cookies) {
+        const match = /refresh_token=([^;]*)/.exec(cookie);
+        if (match && match[1]) return match[1];
+    }
+    return null;
+}
+
+async function login(baseUrl: string, email: string, password: string): Promise<string> {
+    const response = await fetch(`${baseUrl}/auth/login`, {
+        method: 'POST',
+        headers: { 'Content-Type': 'application/json' },
+        body: JSON.stringify({ email, password }),
+    });
+    const token = response.ok ? refreshCookie(response) : null;
+    if (!token) throw new Error(`login failed: ${response.status}`);
+    return token;
+}
+
+async function runDevice(baseUrl: string, token: string, deadline: number): Promise<DeviceResult> {
+    const result: DeviceResult = { requests: 0, failures: 0, latencies: [] };
+    let current = token;
+
+    while (Date.now() < deadline) {
+        const started = process.hrtime.bigint();
+        const response = await fetch(`${baseUrl}/auth/refresh`, {
+            method: 'POST',
+            headers: { Cookie: `refresh_token=${current}` },
+        });
+        const body = await response.json();
+        result.latencies.push(Number(process.hrtime.bigint() - started) / 1e6);
+        result.requests++;
+
+        const next = refreshCookie(response);
+        if (!response.ok || !body.accessToken || !next) {
+            result.failures++;
+            break;
+        }
+        current = next;
+    }
+    return result;
+}
+
+async function main() {
+    const [baseUrl, email, password, devicesArg, secondsArg] = process.argv.slice(2);
+    if (!baseUrl || !email || !password) {
+        console.error('Usage: bench_auth_refresh.ts <baseUrl> <email> <password> [devices] [seconds]');
+        process.exit(1);
+    }
+    const devices = Number(devicesArg || 8);
+    const seconds = Number(secondsArg || 10);
+
+    const tokens: string[] = [];
+    for (let i = 0; i < devices; i++) tokens.push(await login(baseUrl, email, password));
+
+    const deadline = Date.now() + seconds * 1000;
+    const results = await Promise.all(tokens.map(token => runDevice(baseUrl, token, deadline)));
+
+    const latencies = results.flatMap(r => r.latencies).sort((a, b) => a - b);
+    const requests = results.reduce((sum, r) => sum + r.requests, 0);
+    const failures = results.reduce((sum, r) => sum + r.failures, 0);
+    const pick = (q: number) => latencies[Math.min(latencies.length - 1, Math.floor(q * latencies.length))] || 0;
+
+    console.log(
+        `devices=${devices} requests=${requests} failures=${failures} ` +
+        `rps=${(requests / seconds).toFixed(1)} p50=${pick(0.5).toFixed(1)}ms p95=${pick(0.95).toFixed(1)}ms p99=${pick(0.99).toFixed(1)}ms`
+    );
+    if (failures > 0) process.exitCode = 1;
+}
+
+main().catch((e) => {
+    console.error(e);
+    process.exit(1);
+});
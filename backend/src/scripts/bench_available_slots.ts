@@ -0,0 +1,144 @@
+import { PrismaClient } from '@prisma/client';
+import { TimeService } from '../common/time/time.service';
+import { PrismaService } from '../prisma/prisma.service';
+import { ReservationsRepository } from '../reservations/reservations.repository';
+import { AvailabilityService, sweepSlots } from '../reservations/availability.service';
+import { AvailabilityCacheService } from '../common/cache/availability-cache.service';
+import { CacheInvalidationBus } from '../common/cache/cache-invalidation-bus.service';
+import { SalesRollupService } from '../sales/sales-rollup.service';
+import { CustomerStatsService } from '../customers/customer-stats.service';
+import { CustomerSearchIndexService } from '../users/customer-search-index.service';
+import { PrepaidService } from '../prepaid/prepaid.service';
+
+/**
+ * 예약 가능 슬롯 조회 벤치마크 (기존 슬롯별 충돌 조회 vs 인터벌 스윕 엔진)
+ *
+ * 사용법:
+ *   npx ts-node src/scripts/bench_available_slots.ts <shopId> <YYYY-MM-DD> [duration=60] [iterations=20]
+ */
+
+const prisma = new PrismaClient({
+    log: [{ emit: 'event', level: 'query' }],
+});
+
+let queryCount = 0;
+prisma.$on('query', () => {
+    queryCount++;
+});
+
+const timeService = new TimeService();
+
+// 기존 구현: 디자이너/슬롯마다 SCHEDULE_BLOCKS + RESERVATIONS 를 각각 조회
+async function legacySlots(shopId: number, date: string, duration: number): Promise<string[]> {
+    const designers = await prisma.dESIGNERS.findMany({ where: { shop_id: BigInt(shopId), is_active: true } });
+    const dayOfWeek = timeService.parse(date).format('ddd');
+    const shop = await prisma.sHOPS.findUnique({ where: { shop_id: BigInt(shopId) } });
+    if (!shop || (shop.closed_days && shop.closed_days.includes(dayOfWeek))) return [];
+
+    const allSlots = new Set<string>();
+    for (const designer of designers) {
+        if (designer.day_off && designer.day_off.includes(dayOfWeek)) continue;
+        const workStartStr = timeService.toUtcTimeStr(designer.work_start);
+        const workEndStr = timeService.toUtcTimeStr(designer.work_end);
+        if (!workStartStr || !workEndStr) continue;
+
+        const endT = timeService.parse(`${date} ${workEndStr}`);
+        let current = timeService.parse(`${date} ${workStartStr}`);
+        while (!current.add(duration, 'minute').isAfter(endT)) {
+            const slotTimeStr = current.format('HH:mm');
+            const slotEndStr = current.add(duration, 'minute').format('HH:mm');
+            const lunchStart = timeService.toUtcTimeStr(designer.lunch_start);
+            const lunchEnd = timeService.toUtcTimeStr(designer.lunch_end);
+            const isLunch = lunchStart && lunchEnd && !(slotEndStr <= lunchStart || slotTimeStr >= lunchEnd);
+
+            if (!isLunch) {
+                const start = current.toDate();
+                const end = current.add(duration, 'minute').toDate();
+                const block = await prisma.sCHEDULE_BLOCKS.findFirst({
+                    where: { designer_id: designer.designer_id, start_time: { lt: end }, end_time: { gt: start } },
+                });
+                const res = block ? null : await prisma.rESERVATIONS.findFirst({
+                    where: {
+                        designer_id: designer.designer_id,
+                        status: { notIn: ['CANCELED', 'NOSHOW'] },
+                        start_time: { lt: end },
+                        end_time: { gt: start },
+                    },
+                });
+                if (!block && !res) allSlots.add(slotTimeStr);
+            }
+            current = current.add(30, 'minute');
+        }
+    }
+    return Array.from(allSlots).sort();
+}
+
+async function measure(label: string, iterations: number, fn: () => Promise<string[]>) {
+    const latencies: number[] = [];
+    let queries = 0;
+    let result: string[] = [];
+
+    for (let i = 0; i < iterations; i++) {
+        const before = queryCount;
+        const started = process.hrtime.bigint();
+        result = await fn();
+        latencies.push(Number(process.hrtime.bigint() - started) / 1e6);
+        queries += queryCount - before;
+    }
+
+    latencies.sort((a, b) => a - b);
+    const pick = (q: number) => latencies[Math.min(latencies.length - 1, Math.floor(q * latencies.length))];
+    console.log(
+        `${label.padEnd(8)} queries/call=${(queries / iterations).toFixed(1)} ` +
+        `p50=${pick(0.5).toFixed(1)}ms p95=${pick(0.95).toFixed(1)}ms slots=${result.length}`
+    );
+    return result;
+}
+
+async function main() {
+    const [shopArg, dateArg, durationArg, iterationsArg] = process.argv.slice(2);
+    if (!shopArg || !dateArg) {
+        console.error('Usage: bench_available_slots.ts <shopId> <YYYY-MM-DD> [duration] [iterations]');
+        process.exit(1);
+    }
+    const shopId = Number(shopArg);
+    const duration = Number(durationArg || 60);
+    const iterations = Number(iterationsArg || 20);
+
+    const salesRollup = new SalesRollupService(prisma as unknown as PrismaService, timeService);
+    const service = new AvailabilityService(
+        new ReservationsRepository(
+            prisma as unknown as PrismaService,
+            salesRollup,
+            new CustomerStatsService(new CustomerSearchIndexService(prisma as unknown as PrismaService)),
+            new PrepaidService(prisma as unknown as PrismaService, salesRollup),
+        ),
+        prisma as unknown as PrismaService,
+        timeService,
+        new AvailabilityCacheService(timeService, new CacheInvalidationBus(prisma as unknown as PrismaService)),
+    );
+
+    // 캐시를 거치지 않는 엔진 경로만 측정 (캐시 적중 시 쿼리 0회)
+    const sweep = async () => {
+        const [schedule] = await service.loadSchedules(shopId, [dateArg]);
+        return sweepSlots(schedule.designers, duration).map(s => s.time);
+    };
+
+    // 워밍업 (커넥션 풀 확보)
+    await prisma.$queryRaw`SELECT 1`;
+
+    const before = await measure('legacy', iterations, () => legacySlots(shopId, dateArg, duration));
+    const after = await measure('sweep', iterations, sweep);
+
+    const same = before.length === after.length && before.every((s, i) => s === after[i]);
+    console.log(`results identical: ${same}`);
+}
+
+main()
+    .catch((e) => {
+        console.error(e);
+        process.exit(1);
+    })
+    .finally(async () => {
+        await prisma.$disconnect();
+    });
@@ -0,0 +1,189 @@
+import { writeFileSync } from 'fs';
+import { PrismaClient } from '@prisma/client';
+import { TimeService } from '../common/time/time.service';
+import { PrismaService } from '../prisma/prisma.service';
+import { AvailabilityCacheService } from '../common/cache/availability-cache.service';
+import { CacheInvalidationBus } from '../common/cache/cache-invalidation-bus.service';
+import { ReservationsRepository } from '../reservations/reservations.repository';
+import { ReservationsService } from '../reservations/reservations.service';
+import { AvailabilityService } from '../reservations/availability.service';
+import { SalesRollupService } from '../sales/sales-rollup.service';
+import { SalesService } from '../sales/sales.service';
+import { CustomerStatsService } from '../customers/customer-stats.service';
+import { CustomerSearchIndexService } from '../users/customer-search-index.service';
+import { CustomersService } from '../customers/customers.service';
+import { PrepaidService } from '../prepaid/prepaid.service';
+
+/**
+ * 주요 조회 API 벤치마크 (서비스 계층 직접 호출, 호출당 지연 시간 / 쿼리 수)
+ *
+ * 사용법:
+ *   npm run bench:endpoints -- [--shops 5] [--iterations 20] [--date YYYY-MM-DD] [--only slots,sales.daily] [--json out.json]
+ *
+ * 예약이 많은 매장부터 --shops 개를 골라 매장을 돌아가며 호출한다.
+ * 슬롯 조회는 매 호출 전에 가용성 캐시를 비워 DB 경로를 잰다.
+ * generate_dataset.ts 로 만든 데이터에서 실행하는 것을 전제로 한다.
+ */
+
+const prisma = new PrismaClient({
+    log: [{ emit: 'event', level: 'query' }],
+});
+
+let queryCount = 0;
+prisma.$on('query', () => {
+    queryCount++;
+});
+
+const db = prisma as unknown as PrismaService;
+const timeService = new TimeService();
+const availabilityCache = new AvailabilityCacheService(timeService, new CacheInvalidationBus(db));
+const salesRollup = new SalesRollupService(db, timeService);
+const searchIndex = new CustomerSearchIndexService(db);
+const repository = new ReservationsRepository(db, salesRollup, new CustomerStatsService(searchIndex), new PrepaidService(db, salesRollup));
+const availability = new AvailabilityService(repository, db, timeService, availabilityCache);
+const reservations = new ReservationsService(
+    repository, db, timeService, availability, availabilityCache,
+);
+const sales = new SalesService(db, timeService, salesRollup);
+const customers = new CustomersService(db, timeService);
+
+interface ShopFixture {
+    shopId: number;
+    topCustomerId: number;
+    searchTerm: string;
+    searchPhone: string;
+}
+
+interface Case {
+    name: string;
+    run: (shop: ShopFixture) => Promise<unknown>;
+}
+
+function parseArgs() {
+    const args = process.argv.slice(2);
+    const get = (name: string) => {
+        const index = args.indexOf(`--${name}`);
+        return index >= 0 ? args[index + 1] : undefined;
+    };
+    return {
+        shops: Number(get('shops') || 5),
+        iterations: Number(get('iterations') || 20),
+        date: get('date') || timeService.now().format('YYYY-MM-DD'),
+        only: get('only') ? get('only').split(',') : null,
+        json: get('json'),
+    };
+}
+
+async function loadFixtures(count: number): Promise<ShopFixture[]> {
+    const busiest = await prisma.$queryRaw<{ shop_id: bigint }[]>`
+        SELECT shop_id FROM RESERVATIONS GROUP BY shop_id ORDER BY COUNT(*) DESC LIMIT ${count}`;
+
+    const fixtures: ShopFixture[] = [];
+    for (const { shop_id } of busiest) {
+        const top = await prisma.cUSTOMER_SHOP_STATS.findFirst({
+            where: { shop_id },
+            orderBy: [{ visit_count: 'desc' }, { user_id: 'desc' }],
+            select: { user_id: true, USERS: { select: { name: true, phone: true } } },
+        });
+        if (!top) continue;
+        fixtures.push({ shopId: Number(shop_id), topCustomerId: Number(top.user_id), searchTerm: top.USERS.name.slice(0, 1), searchPhone: top.USERS.phone.slice(-4) });
+    }
+    return fixtures;
+}
+
+function buildCases(date: string): Case[] {
+    const day = timeService.parse(date);
+    const weekStart = day.startOf('week').format('YYYY-MM-DD');
+    const weekEnd = day.endOf('week').format('YYYY-MM-DD');
+    const monthStart = day.startOf('month').format('YYYY-MM-DD');
+    const monthEnd = day.endOf('month').format('YYYY-MM-DD');
+
+    return [
+        {
+            name: 'slots',
+            run: (shop) => {
+                availabilityCache.invalidateShop(shop.shopId);
+                return reservations.getAvailableSlots(shop.shopId, date, 60);
+            },
+        },
+        { name: 'reservations.week', run: (shop) => reservations.findAll(shop.shopId, { startDate: weekStart, endDate: weekEnd }) },
+        { name: 'reservations.month', run: (shop) => reservations.findAll(shop.shopId, { startDate: monthStart, endDate: monthEnd }) },
+        { name: 'sales.daily', run: (shop) => sales.getDailySales(shop.shopId, date) },
+        { name: 'sales.weekly', run: (shop) => sales.getWeeklySales(shop.shopId, date) },
+        { name: 'customers.list', run: (shop) => customers.findAll(shop.shopId, { sort: 'lastVisit', limit: 20 }) },
+        { name: 'customers.search', run: (shop) => customers.findAll(shop.shopId, { search: shop.searchTerm, limit: 20 }) },
+        { name: 'customers.typeahead', run: (shop) => searchIndex.search(shop.shopId, shop.searchTerm) },
+        { name: 'customers.typeahead.phone', run: (shop) => searchIndex.search(shop.shopId, shop.searchPhone) },
+        { name: 'customers.detail', run: (shop) => customers.findOne(shop.shopId, shop.topCustomerId) },
+        { name: 'customers.summary', run: (shop) => customers.findSummary(shop.shopId, shop.topCustomerId) },
+    ];
+}
+
+async function measure(benchCase: Case, fixtures: ShopFixture[], iterations: number) {
+    const latencies: number[] = [];
+    let queries = 0;
+
+    await benchCase.run(fixtures[0]); // 워밍업
+    for (let i = 0; i < iterations; i++) {
+        const shop = fixtures[i % fixtures.length];
+        const before = queryCount;
+        const started = process.hrtime.bigint();
+        await benchCase.run(shop);
+        latencies.push(Number(process.hrtime.bigint() - started) / 1e6);
+        queries += queryCount - before;
+    }
+
+    latencies.sort((a, b) => a - b);
+    const pick = (q: number) => latencies[Math.min(latencies.length - 1, Math.floor(q * latencies.length))];
+    const result = {
+        name: benchCase.name,
+        iterations,
+        queriesPerCall: queries / iterations,
+        p50: pick(0.5),
+        p95: pick(0.95),
+        p99: pick(0.99),
+        max: latencies[latencies.length - 1],
+    };
+    console.log(
+        `${result.name.padEnd(20)} queries/call=${result.queriesPerCall.toFixed(1).padStart(6)} ` +
+        `p50=${result.p50.toFixed(1)}ms p95=${result.p95.toFixed(1)}ms p99=${result.p99.toFixed(1)}ms max=${result.max.toFixed(1)}ms`
+    );
+    return result;
+}
+
+async function main() {
+    const options = parseArgs();
+    await prisma.$queryRaw`SELECT 1`;
+
+    const fixtures = await loadFixtures(options.shops);
+    if (fixtures.length === 0) {
+        console.error('No shop with reservations and customer stats found (run generate_dataset.ts first)');
+        process.exit(1);
+    }
+    const [{ total }] = await prisma.$queryRaw<{ total: bigint }[]>`SELECT COUNT(*) AS total FROM RESERVATIONS`;
+    console.log(`reservations=${total} shops=${fixtures.map(f => f.shopId).join(',')} date=${options.date} iterations=${options.iterations}`);
+
+    const cases = buildCases(options.date).filter(c => !options.only || options.only.includes(c.name));
+    const results = [];
+    for (const benchCase of cases) {
+        results.push(await measure(benchCase, fixtures, options.iterations));
+    }
+
+    if (options.json) {
+        writeFileSync(options.json, JSON.stringify({
+            date: options.date,
+            reservations: Number(total),
+            shops: fixtures.map(f => f.shopId),
+            results,
+        }, null, 2));
+    }
+}
+
+main()
+    .catch((e) => {
+        console.error(e);
+        process.exit(1);
+    })
+    .finally(async () => {
+        await prisma.$disconnect();
+    });
@@ -0,0 +1,77 @@
+import { generateKeyPairSync, sign } from 'crypto';
+import { FirebaseTokenVerifier, StaticKeySource } from '../mobile-app/auth/firebase-token-verifier.service';
+
+/**
+ * Firebase ID 토큰 검증 벤치마크 (로컬 키쌍, 네트워크 불필요)
+ *
+ * 사용법:
+ *   npx ts-node src/scripts/bench_firebase_verify.ts [iterations=10000] [tokens=100]
+ *
+ * 최초 검증(서명 검사)과 반복 검증(캐시 적중) 지연 시간을 비교하고,
+ * 변조/만료/다른 프로젝트 토큰이 거부되는지 확인한다.
+ */
+
+const PROJECT_ID = 'bench-project';
+const KID = 'local-key';
+
+const { privateKey, publicKey } = generateKeyPairSync('rsa', { modulusLength: 2048 });
+const verifier = new FirebaseTokenVerifier(
+    new StaticKeySource({ [KID]: publicKey.export({ type: 'spki', format: 'pem' }).toString() }),
+);
+
+function issue(uid: string, overrides: Record<string, unknown> = {}): string {
+    const now = Math.floor(Date.now() / 1000);
+    const header = { alg: 'RS256', kid: KID, typ: 'JWT' };
+    const payload = {
+        iss: `https://securetoken.google.com/${PROJECT_ID}`,
+        aud: PROJECT_ID,
+        auth_time: now,
+        sub: uid,
+        iat: now,
+        exp: now + 3600,
+        ...overrides,
+    };
+    const input = `${Buffer.from(JSON.stringify(header)).toString('base64url')}.${Buffer.from(JSON.stringify(payload)).toString('base64url')}`;
+    return `${input}.${sign('RSA-SHA256', Buffer.from(input), privateKey).toString('base64url')}`;
+}
+
+async function expectRejected(label: string, token: string) {
+    try {
+        await verifier.verify(token, PROJECT_ID);
+        console.log(`${label.padEnd(16)} accepted (UNEXPECTED)`);
+        process.exitCode = 1;
+    } catch (e) {
+        console.log(`${label.padEnd(16)} rejected: ${e.message}`);
+    }
+}
+
+async function measure(label: string, tokens: string[], iterations: number) {
+    const latencies: number[] = [];
+    for (let i = 0; i < iterations; i++) {
+        const started = process.hrtime.bigint();
+        await verifier.verify(tokens[i % tokens.length], PROJECT_ID);
+        latencies.push(Number(process.hrtime.bigint() - started) / 1e3);
+    }
+    latencies.sort((a, b) => a - b);
+    const pick = (q: number) => latencies[Math.min(latencies.length - 1, Math.floor(q * latencies.length))];
+    console.log(`${label.padEnd(8)} n=${iterations} p50=${pick(0.5).toFixed(1)}us p95=${pick(0.95).toFixed(1)}us`);
+}
+
+async function main() {
+    const iterations = Number(process.argv[2] || 10000);
+    const tokenCount = Number(process.argv[3] || 100);
+    const tokens = Array.from({ length: tokenCount }, (_, i) => issue(`user-${i}`));
+
+    await measure('cold', tokens, tokens.length); // 토큰마다 서명 검사
+    await measure('cached', tokens, iterations);
+
+    const valid = issue('user-x');
+    await expectRejected('tampered', `${valid.slice(0, -4)}AAAA`);
+    await expectRejected('expired', issue('user-y', { iat: 1000, exp: 2000 }));
+    await expectRejected('wrong project', issue('user-z', { aud: 'other-project' }));
+}
+
+main().catch((e) => {
+    console.error(e);
+    process.exit(1);
+});
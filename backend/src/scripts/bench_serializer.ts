@@ -0,0 +1,208 @@
+import { isDeepStrictEqual } from 'util';
+import { PrismaClient } from '@prisma/client';
+import { TimeService } from '../common/time/time.service';
+import { PrismaService } from '../prisma/prisma.service';
+import { ReservationsRepository } from '../reservations/reservations.repository';
+import { SalesRollupService } from '../sales/sales-rollup.service';
+import { CustomerStatsService } from '../customers/customer-stats.service';
+import { CustomerSearchIndexService } from '../users/customer-search-index.service';
+import { PrepaidService } from '../prepaid/prepaid.service';
+import { compileSerializer } from '../common/serialization/response-serializer';
+import { RESERVATION_LIST_RESPONSE } from '../reservations/dto/reservation-response.dto';
+import { CUSTOMER_LIST_RESPONSE } from '../customers/dto/customer-response.dto';
+import { DESIGNER_LIST_RESPONSE } from '../designers/dto/designer-response.dto';
+import { MENU_LIST_RESPONSE } from '../menus/dto/menu-response.dto';
+
+/**
+ * 응답 직렬화 벤치마크: 기존 경로(스프레드 매핑 + BigInt.prototype.toJSON + JSON.stringify) vs 컴파일된 스키마 직렬화
+ *
+ * 사용법:
+ *   npm run bench:serializer -- [--shop <shopId>] [--days 31] [--customers 2000] [--iterations 30]
+ *
+ * DB 에서 한 번 읽은 행으로 직렬화만 잰다. 두 경로의 결과(JSON.parse 후)가 다르면 실패한다.
+ * generate_dataset.ts 로 만든 데이터에서 실행하는 것을 전제로 한다.
+ */
+
+// main.ts 와 같은 전역 패치 (기존 경로)
+(BigInt.prototype as any).toJSON = function () {
+    return Number(this);
+};
+
+const prisma = new PrismaClient();
+const db = prisma as unknown as PrismaService;
+const timeService = new TimeService();
+
+interface Case {
+    name: string;
+    rows: number;
+    legacy: () => string;
+    compiled: () => string;
+}
+
+function parseArgs() {
+    const args = process.argv.slice(2);
+    const get = (name: string) => {
+        const index = args.indexOf(`--${name}`);
+        return index >= 0 ? args[index + 1] : undefined;
+    };
+    return {
+        shop: get('shop') ? Number(get('shop')) : undefined,
+        days: Number(get('days') || 31),
+        customers: Number(get('customers') || 2000),
+        iterations: Number(get('iterations') || 30),
+    };
+}
+
+async function buildCases(shopId: number, days: number, customerLimit: number): Promise<Case[]> {
+    const salesRollup = new SalesRollupService(db, timeService);
+    const repository = new ReservationsRepository(db, salesRollup, new CustomerStatsService(new CustomerSearchIndexService(db)), new PrepaidService(db, salesRollup));
+    const from = timeService.now().startOf('day').subtract(days, 'day');
+    const reservations = await repository.getReservations(
+        shopId, from.toISOString(), from.add(days, 'day').toISOString(),
+    );
+
+    const stats = await prisma.cUSTOMER_SHOP_STATS.findMany({
+        where: { shop_id: BigInt(shopId) },
+        orderBy: [{ last_visit_at: 'desc' }, { user_id: 'desc' }],
+        take: customerLimit,
+        include: { USERS: { select: { name: true, phone: true, gender: true, created_at: true } } },
+    });
+    const customers = stats.map(row => Object.assign(row, { memo: Number(row.user_id) % 3 === 0 ? '메모' : '' }));
+
+    const designers = await prisma.dESIGNERS.findMany({
+        where: { shop_id: BigInt(shopId) },
+        include: { USERS: { select: { name: true, phone: true } } },
+    });
+    const menus = await prisma.mENUS.findMany({ where: { shop_id: BigInt(shopId), is_deleted: false } });
+
+    const reservationList = compileSerializer(RESERVATION_LIST_RESPONSE);
+    const customerList = compileSerializer(CUSTOMER_LIST_RESPONSE);
+    const designerList = compileSerializer(DESIGNER_LIST_RESPONSE);
+    const menuList = compileSerializer(MENU_LIST_RESPONSE);
+
+    // 아래 legacy 매핑은 서비스에 있던 변환을 그대로 옮긴 것
+    return [
+        {
+            name: 'reservations.list',
+            rows: reservations.length,
+            legacy: () => JSON.stringify(reservations.map(reservation => ({
+                ...reservation,
+                start_time: reservation.start_time.toISOString(),
+                end_time: reservation.end_time.toISOString(),
+            }))),
+            compiled: () => reservationList(reservations),
+        },
+        {
+            name: 'customers.list',
+            rows: customers.length,
+            legacy: () => JSON.stringify({
+                items: customers.map(row => ({
+                    id: Number(row.user_id),
+                    name: row.USERS.name,
+                    phone: row.USERS.phone,
+                    gender: row.USERS.gender,
+                    grade: row.grade,
+                    created_at: row.USERS.created_at ? row.USERS.created_at.toISOString() : null,
+                    visit_count: row.visit_count,
+                    last_visit: row.last_visit_at ? row.last_visit_at.toISOString() : null,
+                    total_pay: row.total_pay,
+                    memo: row.memo,
+                })),
+                nextCursor: null,
+            }),
+            compiled: () => customerList({ items: customers, nextCursor: null }),
+        },
+        {
+            name: 'designers.list',
+            rows: designers.length,
+            legacy: () => JSON.stringify(designers.map(d => ({
+                ...d,
+                designer_id: d.designer_id.toString(),
+                user_id: d.user_id.toString(),
+                shop_id: d.shop_id.toString(),
+                work_start: timeService.toUtcTimeStr(d.work_start),
+                work_end: timeService.toUtcTimeStr(d.work_end),
+                lunch_start: timeService.toUtcTimeStr(d.lunch_start),
+                lunch_end: timeService.toUtcTimeStr(d.lunch_end),
+                userName: d.USERS?.name,
+                userPhone: d.USERS?.phone,
+            }))),
+            compiled: () => designerList(designers),
+        },
+        {
+            name: 'menus.list',
+            rows: menus.length,
+            legacy: () => JSON.stringify(menus.map(m => ({
+                ...m,
+                menu_id: m.menu_id.toString(),
+                shop_id: m.shop_id.toString(),
+                type: m.type,
+                sort_order: m.sort_order,
+            }))),
+            compiled: () => menuList(menus),
+        },
+    ];
+}
+
+function measure(run: () => string, iterations: number) {
+    for (let i = 0; i < 5; i++) run(); // 워밍업 (JIT)
+    const latencies: number[] = [];
+    for (let i = 0; i < iterations; i++) {
+        const started = process.hrtime.bigint();
+        run();
+        latencies.push(Number(process.hrtime.bigint() - started) / 1e6);
+    }
+    latencies.sort((a, b) => a - b);
+    const pick = (q: number) => latencies[Math.min(latencies.length - 1, Math.floor(q * latencies.length))];
+    return { p50: pick(0.5), p95: pick(0.95) };
+}
+
+async function main() {
+    const options = parseArgs();
+    await prisma.$queryRaw`SELECT 1`;
+
+    let shopId = options.shop;
+    if (!shopId) {
+        const [busiest] = await prisma.$queryRaw<{ shop_id: bigint }[]>`
+            SELECT shop_id FROM RESERVATIONS GROUP BY shop_id ORDER BY COUNT(*) DESC LIMIT 1`;
+        if (!busiest) {
+            console.error('No reservations found (run generate_dataset.ts first)');
+            process.exit(1);
+        }
+        shopId = Number(busiest.shop_id);
+    }
+
+    const cases = await buildCases(shopId, options.days, options.customers);
+    console.log(`shop=${shopId} days=${options.days} iterations=${options.iterations}`);
+
+    let mismatches = 0;
+    for (const benchCase of cases) {
+        const legacyJson = benchCase.legacy();
+        const compiledJson = benchCase.compiled();
+        if (!isDeepStrictEqual(JSON.parse(legacyJson), JSON.parse(compiledJson))) {
+            mismatches++;
+            console.error(`${benchCase.name}: compiled output differs from the legacy response`);
+            continue;
+        }
+
+        const legacy = measure(benchCase.legacy, options.iterations);
+        const compiled = measure(benchCase.compiled, options.iterations);
+        console.log(
+            `${benchCase.name.padEnd(18)} rows=${String(benchCase.rows).padStart(6)} bytes=${String(compiledJson.length).padStart(9)} ` +
+            `legacy p50=${legacy.p50.toFixed(2)}ms p95=${legacy.p95.toFixed(2)}ms ` +
+            `compiled p50=${compiled.p50.toFixed(2)}ms p95=${compiled.p95.toFixed(2)}ms ` +
+            `speedup=${(legacy.p50 / compiled.p50).toFixed(2)}x`
+        );
+    }
+
+    if (mismatches > 0) process.exitCode = 1;
+}
+
+main()
+    .catch((e) => {
+        console.error(e);
+        process.exit(1);
+    })
+    .finally(async () => {
+        await prisma.$disconnect();
+    });
@@ -0,0 +1,108 @@
+import { assignExpiringCredit, ChargeLot } from '../prepaid/prepaid-expiry.service';
+
+/**
+ * 선불권 만료 배정 검사 (DB 불필요)
+ *
+ * 사용법:
+ *   npm run prepaid:check-expiry
+ *
+ * 잔액/충전 lot 시나리오마다 만료 배치를 날짜 순으로 흉내 내어(처리한 lot 은 expired_at 표시, 잔액 차감)
+ * 날짜별 소멸 금액과 최종 잔액을 기대값과 비교한다. 하나라도 다르면 종료 코드 1.
+ * assignExpiringCredit 을 고치면 여기 시나리오도 함께 고친다.
+ */
+
+const day = (n: number) => new Date(Date.UTC(2026, 0, 1 + n));
+
+interface Scenario {
+    name: string;
+    balance: number;
+    // 충전 순서대로 (transaction_id 는 1부터)
+    charges: { amount: number; expiresDay: number | null }[];
+    // 배치를 실행하는 날과 그날 소멸해야 하는 금액
+    runs: { day: number; expired: number }[];
+    finalBalance: number;
+}
+
+const SCENARIOS: Scenario[] = [
+    {
+        name: 'single lot, unused',
+        balance: 100,
+        charges: [{ amount: 100, expiresDay: 5 }],
+        runs: [{ day: 4, expired: 0 }, { day: 5, expired: 100 }, { day: 6, expired: 0 }],
+        finalBalance: 0,
+    },
+    {
+        name: 'single lot, partly used',
+        balance: 40,
+        charges: [{ amount: 100, expiresDay: 5 }],
+        runs: [{ day: 5, expired: 40 }],
+        finalBalance: 0,
+    },
+    {
+        name: 'older lot used up first (FIFO)',
+        balance: 100,
+        charges: [{ amount: 100, expiresDay: 5 }, { amount: 100, expiresDay: null }],
+        runs: [{ day: 5, expired: 0 }],
+        finalBalance: 100,
+    },
+    {
+        // 유효기간이 다른 선불권: 최신 lot 이 먼저 만료되고, 이미 처리한 lot 은 남은 잔액을 다시 가져가지 않는다
+        name: 'mixed validity, newer lot expires first',
+        balance: 200,
+        charges: [{ amount: 100, expiresDay: 10 }, { amount: 100, expiresDay: 5 }],
+        runs: [{ day: 5, expired: 100 }, { day: 10, expired: 100 }],
+        finalBalance: 0,
+    },
+    {
+        name: 'mixed validity, partly used',
+        balance: 150,
+        charges: [{ amount: 100, expiresDay: 10 }, { amount: 100, expiresDay: 5 }],
+        runs: [{ day: 5, expired: 100 }, { day: 10, expired: 50 }],
+        finalBalance: 0,
+    },
+    {
+        name: 'mixed validity, both due in one run',
+        balance: 150,
+        charges: [{ amount: 100, expiresDay: 10 }, { amount: 100, expiresDay: 5 }, { amount: 50, expiresDay: null }],
+        runs: [{ day: 10, expired: 100 }],
+        finalBalance: 50,
+    },
+];
+
+function run(scenario: Scenario): string[] {
+    const problems: string[] = [];
+    let balance = scenario.balance;
+    const lots: ChargeLot[] = scenario.charges.map((charge, i) => ({
+        transaction_id: BigInt(i + 1),
+        amount: charge.amount,
+        expires_at: charge.expiresDay === null ? null : day(charge.expiresDay),
+        expired_at: null,
+    }));
+
+    for (const step of scenario.runs) {
+        const now = day(step.day);
+        const charges = [...lots].sort((a, b) => Number(b.transaction_id - a.transaction_id));
+        const { pending, expiring } = assignExpiringCredit(balance, charges, now);
+        const expired = expiring.reduce((sum, amount) => sum + amount, 0);
+
+        balance -= expired;
+        lots.filter(lot => pending.includes(lot.transaction_id)).forEach(lot => { lot.expired_at = now; });
+        if (expired !== step.expired) problems.push(`day ${step.day}: expired ${expired}, expected ${step.expired}`);
+    }
+    if (balance !== scenario.finalBalance) problems.push(`final balance ${balance}, expected ${scenario.finalBalance}`);
+    return problems;
+}
+
+function main() {
+    let failed = 0;
+    for (const scenario of SCENARIOS) {
+        const problems = run(scenario);
+        if (problems.length > 0) failed++;
+        console.log(`${problems.length ? 'FAIL' : 'ok  '} ${scenario.name}`);
+        problems.forEach(problem => console.log(`       ${problem}`));
+    }
+    console.log(`${SCENARIOS.length - failed}/${SCENARIOS.length} scenarios passed`);
+    if (failed > 0) process.exitCode = 1;
+}
+
+main();
@@ -0,0 +1,400 @@
+import { Prisma, PrismaClient } from '@prisma/client';
+import { TimeService } from '../common/time/time.service';
+
+/**
+ * 주요 조회 경로의 실행 계획 검사 (EXPLAIN)
+ *
+ * 사용법:
+ *   npm run db:check-plans -- [--date YYYY-MM-DD] [--no-analyze] [--verbose]
+ *
+ * 리포지토리/서비스가 실행하는 쿼리와 같은 조건·정렬의 SELECT 를 EXPLAIN 해서
+ *  - 검사 대상 테이블이 풀 스캔(type = ALL) 또는 인덱스 전체 스캔(type = index)이거나
+ *  - 기대한 인덱스를 쓰지 않거나
+ *  - 정렬이 필요 없어야 하는 쿼리에 Using filesort 가 붙으면
+ * 실패로 보고 종료 코드 1 을 반환한다.
+ *
+ * 옵티마이저는 행 수가 적으면 인덱스를 건너뛰므로 generate_dataset.ts 로 만든 데이터에서 실행한다.
+ * 쿼리 조건을 바꾸면 여기 목록도 함께 고친다.
+ */
+
+const prisma = new PrismaClient();
+const timeService = new TimeService();
+
+const INACTIVE_STATUSES = ['CANCELED', 'NOSHOW'];
+const KST = Prisma.raw('INTERVAL 9 HOUR');
+
+interface Fixture {
+    shopId: bigint;
+    designerIds: bigint[];
+    customerId: bigint;
+}
+
+interface PlanCheck {
+    name: string;
+    source: string;
+    sql: Prisma.Sql;
+    // 검사 대상 테이블 (EXPLAIN 의 table 컬럼, 별칭 포함)
+    tables: string[];
+    // 지정하면 해당 테이블이 이 인덱스 중 하나를 써야 한다
+    expectKeys?: Record<string, string[]>;
+    // GROUP BY 집계처럼 정렬이 불가피한 쿼리
+    allowFilesort?: boolean;
+}
+
+interface ExplainRow {
+    id: bigint | number;
+    select_type: string;
+    table: string;
+    type: string | null;
+    possible_keys: string | null;
+    key: string | null;
+    rows: bigint | number | null;
+    Extra: string | null;
+}
+
+function parseArgs() {
+    const args = process.argv.slice(2);
+    const get = (name: string) => {
+        const index = args.indexOf(`--${name}`);
+        return index >= 0 ? args[index + 1] : undefined;
+    };
+    return {
+        date: get('date') || timeService.now().format('YYYY-MM-DD'),
+        analyze: !args.includes('--no-analyze'),
+        verbose: args.includes('--verbose'),
+    };
+}
+
+async function loadFixture(): Promise<Fixture> {
+    const [busiest] = await prisma.$queryRaw<{ shop_id: bigint }[]>`
+        SELECT shop_id FROM RESERVATIONS GROUP BY shop_id ORDER BY COUNT(*) DESC LIMIT 1`;
+    if (!busiest) return null;
+
+    const designers = await prisma.dESIGNERS.findMany({
+        where: { shop_id: busiest.shop_id },
+        select: { designer_id: true },
+    });
+    const [customer] = await prisma.$queryRaw<{ customer_id: bigint }[]>`
+        SELECT customer_id FROM RESERVATIONS WHERE shop_id = ${busiest.shop_id}
+        GROUP BY customer_id ORDER BY COUNT(*) DESC LIMIT 1`;
+
+    return {
+        shopId: busiest.shop_id,
+        designerIds: designers.map(d => d.designer_id),
+        customerId: customer.customer_id,
+    };
+}
+
+function buildChecks(fixture: Fixture, date: string): PlanCheck[] {
+    const { shopId, designerIds, customerId } = fixture;
+    const day = timeService.parse(date).startOf('day');
+    const dayStart = day.toDate();
+    const dayEnd = day.endOf('day').toDate();
+    const monthStart = day.startOf('month').toDate();
+    const monthEnd = day.endOf('month').toDate();
+    const since = day.subtract(1, 'day').toDate();
+    const slotStart = day.hour(10).toDate();
+    const slotEnd = day.hour(11).toDate();
+
+    return [
+        {
+            name: 'calendar.range',
+            source: 'ReservationsRepository.getCalendarReservations',
+            sql: Prisma.sql`
+                SELECT reservation_id, start_time FROM RESERVATIONS
+                WHERE shop_id = ${shopId} AND start_time >= ${monthStart} AND start_time <= ${monthEnd}
+                ORDER BY start_time ASC`,
+            tables: ['RESERVATIONS'],
+            expectKeys: { RESERVATIONS: ['RESERVATIONS_shop_start_idx'] },
+        },
+        {
+            name: 'calendar.changed',
+            source: 'ReservationsRepository.getChangedReservations',
+            sql: Prisma.sql`
+                SELECT reservation_id, updated_at FROM RESERVATIONS
+                WHERE shop_id = ${shopId} AND updated_at > ${since}
+                ORDER BY updated_at ASC`,
+            tables: ['RESERVATIONS'],
+            expectKeys: { RESERVATIONS: ['RESERVATIONS_shop_updated_idx'] },
+        },
+        {
+            name: 'sales.daily',
+            source: 'SalesService.getDailySales',
+            sql: Prisma.sql`
+                SELECT reservation_id, start_time, status FROM RESERVATIONS
+                WHERE start_time >= ${dayStart} AND start_time <= ${dayEnd}
+                    AND status IN ('COMPLETED', 'CANCELED', 'NOSHOW') AND shop_id = ${shopId}
+                ORDER BY start_time DESC`,
+            tables: ['RESERVATIONS'],
+            expectKeys: { RESERVATIONS: ['RESERVATIONS_shop_start_idx'] },
+        },
+        {
+            name: 'availability.busy',
+            source: 'ReservationsRepository.getBusyReservations',
+            sql: Prisma.sql`
+                SELECT designer_id, start_time, end_time FROM RESERVATIONS
+                WHERE designer_id IN (${Prisma.join(designerIds)})
+                    AND status NOT IN (${Prisma.join(INACTIVE_STATUSES)})
+                    AND start_time < ${dayEnd} AND end_time > ${dayStart}`,
+            tables: ['RESERVATIONS'],
+            expectKeys: { RESERVATIONS: ['RESERVATIONS_designer_time_idx'] },
+        },
+        {
+            name: 'reservation.overlap',
+            source: 'ReservationsRepository.lockDesignerAndCheckOverlap',
+            sql: Prisma.sql`
+                SELECT reservation_id, start_time, end_time FROM RESERVATIONS
+                WHERE designer_id = ${designerIds[0]}
+                    AND status NOT IN (${Prisma.join(INACTIVE_STATUSES)})
+                    AND start_time < ${slotEnd} AND end_time > ${slotStart}
+                LIMIT 1`,
+            tables: ['RESERVATIONS'],
+            expectKeys: { RESERVATIONS: ['RESERVATIONS_designer_time_idx'] },
+        },
+        {
+            name: 'customers.history',
+            source: 'CustomersService.findHistory',
+            sql: Prisma.sql`
+                SELECT reservation_id, start_time, status FROM RESERVATIONS
+                WHERE customer_id = ${customerId} AND shop_id = ${shopId}
+                ORDER BY start_time DESC, reservation_id DESC
+                LIMIT 21`,
+            tables: ['RESERVATIONS'],
+            expectKeys: { RESERVATIONS: ['RESERVATIONS_customer_shop_idx'] },
+        },
+        {
+            name: 'customers.timeline-memos',
+            source: 'CustomersService.findTimeline',
+            sql: Prisma.sql`
+                SELECT memo_id, content, created_at FROM CUSTOMER_MEMOS
+                WHERE user_id = ${customerId} AND shop_id = ${shopId} AND created_at IS NOT NULL
+                ORDER BY created_at DESC, memo_id DESC
+                LIMIT 21`,
+            tables: ['CUSTOMER_MEMOS'],
+            expectKeys: { CUSTOMER_MEMOS: ['CUSTOMER_MEMOS_user_shop_created_idx'] },
+        },
+        {
+            name: 'customers.list',
+            source: 'CustomersService.findAll',
+            sql: Prisma.sql`
+                SELECT user_id, last_visit_at FROM CUSTOMER_SHOP_STATS
+                WHERE shop_id = ${shopId}
+                ORDER BY last_visit_at DESC, user_id DESC
+                LIMIT 21`,
+            tables: ['CUSTOMER_SHOP_STATS'],
+            expectKeys: { CUSTOMER_SHOP_STATS: ['CUSTOMER_SHOP_STATS_last_visit_idx'] },
+        },
+        {
+            name: 'customers.typeahead',
+            source: 'CustomerSearchIndexService.search',
+            sql: Prisma.sql`
+                SELECT DISTINCT user_id FROM CUSTOMER_SEARCH_TERMS
+                WHERE shop_id = ${shopId} AND term LIKE 'n:김%'
+                LIMIT 300`,
+            tables: ['CUSTOMER_SEARCH_TERMS'],
+            expectKeys: { CUSTOMER_SEARCH_TERMS: ['PRIMARY'] },
+        },
+        {
+            name: 'customer-stats.refresh',
+            source: 'CustomerStatsService.refreshCustomer',
+            sql: Prisma.sql`
+                SELECT r.customer_id, COUNT(*), MAX(r.start_time) FROM RESERVATIONS r
+                WHERE r.shop_id = ${shopId} AND r.customer_id = ${customerId}
+                GROUP BY r.shop_id, r.customer_id`,
+            tables: ['r'],
+            expectKeys: { r: ['RESERVATIONS_customer_shop_idx'] },
+        },
+        {
+            name: 'visit-logs.customer',
+            source: 'VisitLogsService.findByCustomer',
+            sql: Prisma.sql`
+                SELECT v.log_id, v.visited_at FROM VISIT_LOGS v
+                WHERE v.customer_id = ${customerId}
+                    AND v.reservation_id IN (SELECT r.reservation_id FROM RESERVATIONS r WHERE r.shop_id = ${shopId})
+                ORDER BY v.visited_at DESC
+                LIMIT 9`,
+            tables: ['v'],
+            expectKeys: { v: ['VISIT_LOGS_customer_visited_idx'] },
+        },
+        {
+            name: 'rollup.reservations',
+            source: 'SalesRollupService.reservationRowsSql',
+            sql: Prisma.sql`
+                SELECT r.shop_id, DATE(r.start_time + ${KST}), r.designer_id, COUNT(*)
+                FROM RESERVATIONS r
+                JOIN USERS u ON u.user_id = r.customer_id
+                LEFT JOIN PAYMENTS p ON p.reservation_id = r.reservation_id
+                WHERE r.shop_id = ${shopId} AND r.start_time >= ${monthStart} AND r.start_time < ${monthEnd}
+                    AND r.status IN ('COMPLETED', 'CANCELED', 'NOSHOW')
+                GROUP BY r.shop_id, DATE(r.start_time + ${KST}), r.designer_id`,
+            tables: ['r', 'u', 'p'],
+            expectKeys: { r: ['RESERVATIONS_shop_start_idx'] },
+            allowFilesort: true,
+        },
+        {
+            name: 'rollup.site-payments',
+            source: 'SalesRollupService.sitePaymentRowsSql',
+            sql: Prisma.sql`
+                SELECT r.shop_id, DATE(p.paid_at + ${KST}), r.designer_id, SUM(p.amount)
+                FROM PAYMENTS p
+                JOIN RESERVATIONS r ON r.reservation_id = p.reservation_id
+                WHERE r.shop_id = ${shopId} AND p.paid_at >= ${monthStart} AND p.paid_at < ${monthEnd}
+                    AND p.type IN ('SITE_CARD', 'SITE_CASH') AND p.paid_at IS NOT NULL
+                GROUP BY r.shop_id, DATE(p.paid_at + ${KST}), r.designer_id`,
+            tables: ['p', 'r'],
+            allowFilesort: true,
+        },
+        {
+            name: 'rollup.prepaid',
+            source: 'SalesRollupService.prepaidRowsSql',
+            sql: Prisma.sql`
+                SELECT b.shop_id, DATE(t.created_at + ${KST}), SUM(t.amount)
+                FROM PREPAID_TRANSACTIONS t
+                JOIN CUSTOMER_PREPAID_BALANCES b ON b.balance_id = t.balance_id
+                WHERE b.shop_id = ${shopId} AND t.created_at >= ${monthStart} AND t.created_at < ${monthEnd}
+                    AND t.type IN ('CHARGE', 'USE') AND t.created_at IS NOT NULL
+                GROUP BY b.shop_id, DATE(t.created_at + ${KST})`,
+            tables: ['t', 'b'],
+            allowFilesort: true,
+        },
+        {
+            name: 'sales.range',
+            source: 'SalesService.getRangeSales',
+            sql: Prisma.sql`
+                SELECT designer_id, SUM(revenue_total) FROM SALES_DAILY_ROLLUPS
+                WHERE shop_id = ${shopId}
+                    AND sales_date BETWEEN ${day.startOf('month').format('YYYY-MM-DD')} AND ${day.format('YYYY-MM-DD')}
+                    AND category = ''
+                GROUP BY designer_id`,
+            tables: ['SALES_DAILY_ROLLUPS'],
+            allowFilesort: true,
+        },
+        {
+            name: 'exports.reservations',
+            source: 'ExportsService.reservations',
+            sql: Prisma.sql`
+                SELECT reservation_id, start_time FROM RESERVATIONS
+                WHERE shop_id = ${shopId} AND start_time >= ${monthStart} AND start_time < ${monthEnd}
+                    AND (start_time > ${monthStart} OR reservation_id > 0)
+                ORDER BY start_time, reservation_id
+                LIMIT 1000`,
+            tables: ['RESERVATIONS'],
+            expectKeys: { RESERVATIONS: ['RESERVATIONS_shop_start_idx'] },
+        },
+        {
+            name: 'exports.payments',
+            source: 'ExportsService.payments',
+            sql: Prisma.sql`
+                SELECT p.payment_id, p.paid_at FROM PAYMENTS p
+                JOIN RESERVATIONS r ON r.reservation_id = p.reservation_id
+                WHERE r.shop_id = ${shopId} AND p.paid_at >= ${monthStart} AND p.paid_at < ${monthEnd}
+                    AND (p.paid_at > ${monthStart} OR p.payment_id > 0)
+                ORDER BY p.paid_at, p.payment_id
+                LIMIT 1000`,
+            tables: ['p', 'r'],
+            expectKeys: { p: ['PAYMENTS_paid_at_idx'] },
+        },
+        {
+            name: 'exports.prepaid-ledger',
+            source: 'ExportsService.prepaidLedger',
+            sql: Prisma.sql`
+                SELECT t.transaction_id, t.created_at FROM PREPAID_TRANSACTIONS t
+                JOIN CUSTOMER_PREPAID_BALANCES b ON b.balance_id = t.balance_id
+                WHERE b.shop_id = ${shopId} AND t.created_at >= ${monthStart} AND t.created_at < ${monthEnd}
+                    AND (t.created_at > ${monthStart} OR t.transaction_id > 0)
+                ORDER BY t.created_at, t.transaction_id
+                LIMIT 1000`,
+            tables: ['t', 'b'],
+            expectKeys: { t: ['PREPAID_TRANSACTIONS_created_at_idx'] },
+        },
+        {
+            name: 'prepaid-expiry.lots',
+            source: 'PrepaidExpiryService.expire',
+            sql: Prisma.sql`
+                SELECT transaction_id, balance_id, expires_at FROM PREPAID_TRANSACTIONS
+                WHERE expired_at IS NULL AND expires_at <= ${dayEnd}
+                ORDER BY expires_at, transaction_id
+                LIMIT 500`,
+            tables: ['PREPAID_TRANSACTIONS'],
+            expectKeys: { PREPAID_TRANSACTIONS: ['PREPAID_TRANSACTIONS_expiry_idx'] },
+        },
+    ];
+}
+
+function evaluate(check: PlanCheck, plan: ExplainRow[]): string[] {
+    const problems: string[] = [];
+    for (const row of plan) {
+        if (!check.tables.includes(row.table)) continue;
+        const extra = row.Extra || '';
+
+        if (row.type === 'ALL') {
+            problems.push(`${row.table}: full table scan (rows=${row.rows})`);
+        } else if (row.type === 'index') {
+            problems.push(`${row.table}: full index scan on ${row.key} (rows=${row.rows})`);
+        }
+        const expected = check.expectKeys?.[row.table];
+        if (expected && !expected.includes(row.key)) {
+            problems.push(`${row.table}: uses ${row.key || 'no index'}, expected ${expected.join(' | ')}`);
+        }
+        if (!check.allowFilesort && extra.includes('Using filesort')) {
+            problems.push(`${row.table}: Using filesort`);
+        }
+    }
+    return problems;
+}
+
+async function main() {
+    const options = parseArgs();
+    await prisma.$queryRaw`SELECT 1`;
+
+    const fixture = await loadFixture();
+    if (!fixture || fixture.designerIds.length === 0) {
+        console.error('No shop with reservations and designers found (run generate_dataset.ts first)');
+        process.exit(1);
+    }
+
+    if (options.analyze) {
+        // 통계가 오래되면 옵티마이저가 인덱스를 건너뛸 수 있다
+        await prisma.$queryRawUnsafe(
+            'ANALYZE TABLE RESERVATIONS, PAYMENTS, PREPAID_TRANSACTIONS, CUSTOMER_PREPAID_BALANCES, VISIT_LOGS, CUSTOMER_SHOP_STATS, CUSTOMER_SEARCH_TERMS, CUSTOMER_MEMOS, SALES_DAILY_ROLLUPS',
+        );
+    }
+
+    const [{ total }] = await prisma.$queryRaw<{ total: bigint }[]>`SELECT COUNT(*) AS total FROM RESERVATIONS`;
+    console.log(`reservations=${total} shop=${fixture.shopId} designers=${fixture.designerIds.length} customer=${fixture.customerId} date=${options.date}`);
+
+    let failed = 0;
+    for (const check of buildChecks(fixture, options.date)) {
+        const plan = await prisma.$queryRaw<ExplainRow[]>(Prisma.sql`EXPLAIN ${check.sql}`);
+        const problems = evaluate(check, plan);
+        if (problems.length > 0) failed++;
+
+        const keys = plan
+            .filter(row => check.tables.includes(row.table))
+            .map(row => `${row.table}:${row.type}/${row.key || '-'}`)
+            .join(' ');
+        console.log(`${problems.length ? 'FAIL' : 'ok  '} ${check.name.padEnd(24)} ${keys}`);
+        for (const problem of problems) {
+            console.log(`       ${problem}  [${check.source}]`);
+        }
+        if (options.verbose || problems.length > 0) {
+            for (const row of plan) {
+                console.log(`       | ${row.table} type=${row.type} key=${row.key} rows=${row.rows} extra=${row.Extra || ''}`);
+            }
+        }
+    }
+
+    if (failed > 0) {
+        console.error(`${failed} query plan check(s) failed`);
+        process.exitCode = 1;
+    }
+}
+
+main()
+    .catch((e) => {
+        console.error(e);
+        process.exit(1);
+    })
+    .finally(async () => {
+        await prisma.$disconnect();
+    });
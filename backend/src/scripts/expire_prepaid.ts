@@ -0,0 +1,69 @@
+import { PrismaClient } from '@prisma/client';
+import { TimeService } from '../common/time/time.service';
+import { PrismaService } from '../prisma/prisma.service';
+import { DEFAULT_EXPIRY_CHUNK_SIZE, DEFAULT_EXPIRY_CONCURRENCY, PrepaidExpiryService } from '../prepaid/prepaid-expiry.service';
+
+/**
+ * 선불권 유효기간 만료 배치 (전체 매장)
+ *
+ * 사용법:
+ *   npm run prepaid:expire -- [--now "YYYY-MM-DD HH:mm"] [--chunk 500] [--concurrency 4]
+ *
+ * 운영에서는 ecosystem.config.js 의 salon-prepaid-expiry 앱이 매일 새벽 실행한다.
+ * 잔액 단위로 커밋하므로 중간에 멈춰도 다시 실행하면 남은 것부터 처리한다.
+ */
+
+const prisma = new PrismaClient();
+const timeService = new TimeService();
+
+function parseArgs() {
+    const args = process.argv.slice(2);
+    const get = (name: string) => {
+        const index = args.indexOf(`--${name}`);
+        return index >= 0 ? args[index + 1] : undefined;
+    };
+    const now = get('now');
+    return {
+        now: now ? timeService.parse(now) : timeService.now(),
+        chunk: Number(get('chunk') || DEFAULT_EXPIRY_CHUNK_SIZE),
+        concurrency: Number(get('concurrency') || DEFAULT_EXPIRY_CONCURRENCY),
+    };
+}
+
+async function main() {
+    const options = parseArgs();
+    if (!options.now.isValid() || !options.chunk || !options.concurrency) {
+        console.error('Usage: expire_prepaid.ts [--now "YYYY-MM-DD HH:mm"] [--chunk <lots>] [--concurrency <n>]');
+        process.exit(1);
+    }
+
+    const expiry = new PrepaidExpiryService(prisma as unknown as PrismaService);
+    const rate = (count: number, ms: number) => (count / Math.max(ms / 1000, 0.001)).toFixed(0);
+
+    console.log(`expiring prepaid credit before ${options.now.format('YYYY-MM-DD HH:mm:ss')} (chunk=${options.chunk}, concurrency=${options.concurrency})`);
+    const report = await expiry.expire({
+        now: options.now.toDate(),
+        chunkSize: options.chunk,
+        concurrency: options.concurrency,
+        onChunk: (progress) => console.log(
+            `  lots=${progress.lots} balances=${progress.balances} expired=${progress.expiredAmount} ` +
+            `failed=${progress.failed} (${rate(progress.lots, progress.elapsedMs)} lots/s)`
+        ),
+    });
+
+    console.log(
+        `done: lots=${report.lots} balances=${report.balances} expiredLots=${report.expiredLots} ` +
+        `expiredAmount=${report.expiredAmount} failed=${report.failed} elapsed=${(report.elapsedMs / 1000).toFixed(1)}s ` +
+        `(${rate(report.lots, report.elapsedMs)} lots/s, ${rate(report.balances, report.elapsedMs)} balances/s)`
+    );
+    if (report.failed > 0) process.exitCode = 1;
+}
+
+main()
+    .catch((e) => {
+        console.error(e);
+        process.exit(1);
+    })
+    .finally(async () => {
+        await prisma.$disconnect();
+    });
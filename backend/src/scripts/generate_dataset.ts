@@ -0,0 +1,429 @@
+import { Prisma, PrismaClient } from '@prisma/client';
+import * as bcrypt from 'bcrypt';
+import { TimeService } from '../common/time/time.service';
+import { PrismaService } from '../prisma/prisma.service';
+import { SalesRollupService } from '../sales/sales-rollup.service';
+import { CustomerStatsService } from '../customers/customer-stats.service';
+import { CustomerSearchIndexService } from '../users/customer-search-index.service';
+
+/**
+ * 대용량 합성 데이터 생성기 (벤치마크/부하 테스트용, 같은 seed 와 --end 면 같은 데이터)
+ *
+ * 사용법:
+ *   npm run data:generate -- --shops 200 --days 365 [--designers 4] [--customers 2000] [--per-day 8]
+ *                            [--future 14] [--end YYYY-MM-DD] [--seed 42] [--batch 2000]
+ *   예) 200 매장 x 디자이너 4명 x 365일 x 하루 약 7건 ≈ 예약 200만 건
+ *
+ * - 기존 데이터는 지우지 않고 현재 최대 ID 뒤에 이어서 넣는다 (매장명은 "[GEN]" 으로 시작)
+ * - ID 를 미리 정해 여러 행 INSERT 로 적재하므로 부모/자식 관계에 조회가 필요 없다
+ * - 적재 후 CUSTOMER_SHOP_STATS, SALES_DAILY_ROLLUPS 를 원천 테이블에서 다시 계산한다
+ * - 모든 매장 원장 계정의 비밀번호는 password123
+ */
+
+const DAY_MS = 24 * 60 * 60 * 1000;
+const KST_OFFSET_MS = 9 * 60 * 60 * 1000;
+const MAX_PLACEHOLDERS = 60000; // MySQL prepared statement 한도(65535) 이하
+const ROLLUP_CHUNK_DAYS = 31;
+const WEEKDAYS = ['Sun', 'Mon', 'Tue', 'Wed', 'Thu', 'Fri', 'Sat'];
+
+const SURNAMES = ['김', '이', '박', '최', '정', '강', '조', '윤', '장', '임', '한', '오', '서', '신', '권', '황', '안', '송'];
+const GIVEN = ['민준', '서연', '도윤', '하은', '지호', '수아', '예준', '지민', '현우', '채원', '지훈', '유진', '건우', '소윤', '우진', '다은'];
+const DISTRICTS = ['강남구', '서초구', '마포구', '송파구', '성동구', '용산구', '영등포구', '해운대구', '수성구', '분당구'];
+
+// 대표 카테고리 / 메뉴 (이름, 가격, 소요 시간(분), 선택 가중치)
+const MENU_CATALOG: { category: string; menus: [string, number, number, number][] }[] = [
+    { category: '컷', menus: [['남성컷', 18000, 30, 30], ['여성컷', 25000, 60, 20], ['앞머리컷', 5000, 30, 4]] },
+    { category: '펌', menus: [['다운펌', 30000, 60, 8], ['볼륨매직', 150000, 150, 4], ['디지털펌', 180000, 180, 3]] },
+    { category: '염색', menus: [['뿌리염색', 60000, 90, 8], ['전체염색', 90000, 120, 5], ['탈색', 120000, 150, 2]] },
+    { category: '클리닉', menus: [['두피스케일링', 40000, 30, 4], ['영양클리닉', 50000, 30, 4]] },
+];
+
+const TICKETS: [string, number, number][] = [
+    ['선불권 10만원', 100000, 110000],
+    ['선불권 30만원', 300000, 350000],
+];
+
+interface Options {
+    shops: number;
+    designers: number;
+    customers: number;
+    perDay: number;
+    days: number;
+    future: number;
+    end: string | undefined;
+    seed: number;
+    batch: number;
+}
+
+function parseArgs(): Options {
+    const args = process.argv.slice(2);
+    const get = (name: string) => {
+        const index = args.indexOf(`--${name}`);
+        return index >= 0 ? args[index + 1] : undefined;
+    };
+    const num = (name: string, fallback: number) => (get(name) !== undefined ? Number(get(name)) : fallback);
+    return {
+        shops: num('shops', 200),
+        designers: num('designers', 4),
+        customers: num('customers', 2000),
+        perDay: num('per-day', 8),
+        days: num('days', 365),
+        future: num('future', 14),
+        end: get('end'),
+        seed: num('seed', 42),
+        batch: num('batch', 2000),
+    };
+}
+
+// mulberry32: seed 고정 재현용 PRNG
+function createRng(seed: number) {
+    let state = seed >>> 0;
+    const next = () => {
+        state = (state + 0x6d2b79f5) >>> 0;
+        let t = state;
+        t = Math.imul(t ^ (t >>> 15), t | 1);
+        t ^= t + Math.imul(t ^ (t >>> 7), t | 61);
+        return ((t ^ (t >>> 14)) >>> 0) / 4294967296;
+    };
+    return {
+        next,
+        int: (min: number, max: number) => min + Math.floor(next() * (max - min + 1)),
+        pick: <T>(items: T[]) => items[Math.floor(next() * items.length)],
+        weighted: <T>(items: T[], weight: (item: T) => number) => {
+            const total = items.reduce((sum, item) => sum + weight(item), 0);
+            let r = next() * total;
+            for (const item of items) {
+                r -= weight(item);
+                if (r < 0) return item;
+            }
+            return items[items.length - 1];
+        },
+        hex: (length: number) => Array.from({ length }, () => Math.floor(next() * 16).toString(16)).join(''),
+    };
+}
+
+const prisma = new PrismaClient();
+const timeService = new TimeService();
+const rollup = new SalesRollupService(prisma as unknown as PrismaService, timeService);
+const customerStats = new CustomerStatsService(new CustomerSearchIndexService(prisma as unknown as PrismaService));
+
+/**
+ * 테이블별 적재 버퍼. batch 행이 모이면 여러 행 INSERT 1회로 적재하고,
+ * 그 전에 부모 테이블 버퍼를 먼저 비워 FK 순서를 지킨다.
+ */
+class BulkInserter {
+    private rows: unknown[][] = [];
+    private readonly maxRows: number;
+    inserted = 0;
+
+    constructor(
+        readonly table: string,
+        private readonly columns: string[],
+        batch: number,
+        private readonly parents: BulkInserter[] = [],
+        private readonly suffix = '',
+    ) {
+        this.maxRows = Math.max(1, Math.min(batch, Math.floor(MAX_PLACEHOLDERS / columns.length)));
+    }
+
+    async push(row: unknown[]) {
+        this.rows.push(row);
+        if (this.rows.length >= this.maxRows) await this.flush();
+    }
+
+    async flush() {
+        for (const parent of this.parents) await parent.flush();
+        if (this.rows.length === 0) return;
+
+        const rows = this.rows;
+        this.rows = [];
+        await prisma.$executeRaw`
+            INSERT INTO ${Prisma.raw(this.table)} (${Prisma.raw(this.columns.join(', '))})
+            VALUES ${Prisma.join(rows.map(row => Prisma.sql`(${Prisma.join(row)})`))}
+            ${Prisma.raw(this.suffix)}`;
+        this.inserted += rows.length;
+    }
+}
+
+// 테이블별 다음 ID (현재 최대값 + 1 부터 순서대로 할당)
+async function nextIds() {
+    const tables: [string, string][] = [
+        ['USERS', 'user_id'], ['SHOPS', 'shop_id'], ['DESIGNERS', 'designer_id'], ['MENUS', 'menu_id'],
+        ['PREPAID_TICKETS', 'ticket_id'], ['RESERVATIONS', 'reservation_id'], ['RESERVATION_ITEMS', 'item_id'],
+        ['PAYMENTS', 'payment_id'], ['CUSTOMER_PREPAID_BALANCES', 'balance_id'], ['PREPAID_TRANSACTIONS', 'transaction_id'],
+        ['VISIT_LOGS', 'log_id'], ['VISIT_LOG_PHOTOS', 'photo_id'],
+    ];
+    const ids: Record<string, number> = {};
+    for (const [table, column] of tables) {
+        const [row] = await prisma.$queryRaw<{ max_id: bigint | null }[]>`
+            SELECT MAX(${Prisma.raw(column)}) AS max_id FROM ${Prisma.raw(table)}`;
+        ids[table] = Number(row.max_id || 0);
+    }
+    return (table: string) => ++ids[table];
+}
+
+interface Menu {
+    id: number;
+    name: string;
+    category: string;
+    price: number;
+    duration: number;
+    weight: number;
+}
+
+interface Balance {
+    id: number;
+    amount: number;
+    lastUsedAt: Date | null;
+    createdAt: Date;
+}
+
+async function main() {
+    const options = parseArgs();
+    const rng = createRng(options.seed);
+    const nextId = await nextIds();
+    const password = await bcrypt.hash('password123', 10);
+
+    // 기준일(KST) 자정의 UTC 시각. day = 0 이 기준일, 음수는 과거
+    const endDay = options.end ? timeService.parse(options.end) : timeService.now();
+    const baseMs = endDay.startOf('day').valueOf();
+    const dayStart = (day: number) => baseMs + day * DAY_MS;
+    const at = (day: number, minute: number) => new Date(dayStart(day) + minute * 60 * 1000);
+    const weekday = (day: number) => WEEKDAYS[new Date(dayStart(day) + KST_OFFSET_MS).getUTCDay()];
+    const dateStr = (day: number) => new Date(dayStart(day) + KST_OFFSET_MS).toISOString().slice(0, 10);
+    const firstDay = -options.days;
+    const lastDay = options.future;
+
+    const users = new BulkInserter('USERS',
+        ['user_id', 'phone', 'email', 'password', 'name', 'role', 'gender', 'birthdate', 'is_app_user', 'grade', 'created_at'], options.batch);
+    const shops = new BulkInserter('SHOPS',
+        ['shop_id', 'owner_id', 'name', 'tel', 'address', 'open_time', 'close_time', 'closed_days', 'created_at'], options.batch, [users]);
+    const designers = new BulkInserter('DESIGNERS',
+        ['designer_id', 'user_id', 'shop_id', 'work_start', 'work_end', 'lunch_start', 'lunch_end', 'day_off', 'is_active'], options.batch, [shops]);
+    const menus = new BulkInserter('MENUS',
+        ['menu_id', 'shop_id', 'category', 'category_id', 'name', 'price', 'duration', 'type', 'sort_order'], options.batch, [shops]);
+    const tickets = new BulkInserter('PREPAID_TICKETS',
+        ['ticket_id', 'shop_id', 'name', 'price', 'credit_amount', 'validity_days'], options.batch, [shops]);
+    const reservations = new BulkInserter('RESERVATIONS',
+        ['reservation_id', 'shop_id', 'customer_id', 'designer_id', 'start_time', 'end_time', 'status', 'source', 'created_at', 'updated_at'],
+        options.batch, [designers]);
+    const items = new BulkInserter('RESERVATION_ITEMS',
+        ['item_id', 'reservation_id', 'menu_id', 'menu_name', 'price'], options.batch, [reservations, menus]);
+    const payments = new BulkInserter('PAYMENTS',
+        ['payment_id', 'reservation_id', 'type', 'amount', 'status', 'paid_at'], options.batch, [reservations]);
+    const balances = new BulkInserter('CUSTOMER_PREPAID_BALANCES',
+        ['balance_id', 'user_id', 'shop_id', 'balance', 'last_used_at', 'created_at'], options.batch, [shops],
+        'ON DUPLICATE KEY UPDATE balance = VALUES(balance), last_used_at = VALUES(last_used_at)');
+    const transactions = new BulkInserter('PREPAID_TRANSACTIONS',
+        ['transaction_id', 'balance_id', 'type', 'amount', 'bonus_amount', 'balance_after', 'ref_payment_id', 'created_at', 'payment_method'],
+        options.batch, [balances, payments]);
+    const visitLogs = new BulkInserter('VISIT_LOGS',
+        ['log_id', 'customer_id', 'reservation_id', 'designer_id', 'admin_memo', 'photo_urls', 'visited_at'], options.batch, [reservations]);
+    const photos = new BulkInserter('VISIT_LOG_PHOTOS',
+        ['photo_id', 'log_id', 'shop_id', 'category', 'menu_name', 'url', 'sort_order', 'visited_at'], options.batch, [visitLogs]);
+    const all = [users, shops, designers, menus, tickets, reservations, items, payments, balances, transactions, visitLogs, photos];
+
+    const personName = () => `${rng.pick(SURNAMES)}${rng.pick(GIVEN)}`;
+    const pushUser = async (role: string, createdAt: Date, email: string | null) => {
+        const id = nextId('USERS');
+        await users.push([
+            id, `09${String(id).padStart(9, '0')}`, email, email ? password : null, personName(), role,
+            rng.next() < 0.7 ? 'FEMALE' : 'MALE', `19${rng.int(60, 99)}${String(rng.int(1, 12)).padStart(2, '0')}${String(rng.int(1, 28)).padStart(2, '0')}`,
+            rng.next() < 0.4, 'NEW', createdAt,
+        ]);
+        return id;
+    };
+
+    const started = Date.now();
+    const shopIds: number[] = [];
+    let firstOwnerEmail: string | null = null;
+
+    for (let s = 0; s < options.shops; s++) {
+        const openedAt = at(firstDay - rng.int(30, 700), 0);
+        const ownerId = nextId('USERS');
+        const ownerEmail = `gen-owner-${ownerId}@example.com`;
+        firstOwnerEmail = firstOwnerEmail || ownerEmail;
+        await users.push([ownerId, `09${String(ownerId).padStart(9, '0')}`, ownerEmail, password, personName(), 'OWNER', 'FEMALE', '19800101', false, 'NEW', openedAt]);
+
+        const shopId = nextId('SHOPS');
+        shopIds.push(shopId);
+        const openMinute = rng.pick([600, 600, 630, 660]);
+        const closeMinute = openMinute + rng.pick([600, 600, 660]);
+        const closedDay = rng.next() < 0.6 ? rng.pick(['Mon', 'Tue']) : null;
+        const hhmm = (minute: number) => `${String(Math.floor(minute / 60) % 24).padStart(2, '0')}:${String(minute % 60).padStart(2, '0')}:00`;
+        await shops.push([
+            shopId, ownerId, `[GEN] 헤어살롱 ${s + 1}호점`, `02${String(shopId).padStart(8, '0')}`,
+            `서울시 ${rng.pick(DISTRICTS)} ${rng.int(1, 300)}`, hhmm(openMinute), hhmm(closeMinute), closedDay, openedAt,
+        ]);
+
+        // 디자이너
+        const lunchStart = 13 * 60;
+        const lunchEnd = 14 * 60;
+        const shopDesigners: { id: number; dayOff: string | null }[] = [];
+        const designerCount = Math.max(1, options.designers + rng.int(-1, 1));
+        for (let d = 0; d < designerCount; d++) {
+            const userId = await pushUser('DESIGNER', openedAt, null);
+            const id = nextId('DESIGNERS');
+            const dayOff = rng.pick(['Mon', 'Tue', 'Wed', 'Thu', 'Fri', 'Sat', 'Sun'].filter(day => day !== closedDay));
+            await designers.push([id, userId, shopId, hhmm(openMinute), hhmm(closeMinute), hhmm(lunchStart), hhmm(lunchEnd), dayOff, true]);
+            shopDesigners.push({ id, dayOff });
+        }
+
+        // 메뉴 (카테고리 행 → 하위 메뉴)
+        const shopMenus: Menu[] = [];
+        let sort = 0;
+        for (const { category, menus: catalog } of MENU_CATALOG) {
+            const categoryId = nextId('MENUS');
+            await menus.push([categoryId, shopId, category, null, category, 0, 0, 'CATEGORY', sort++]);
+            for (const [name, price, duration, weight] of catalog) {
+                const id = nextId('MENUS');
+                const shopPrice = Math.round(price * (0.8 + rng.next() * 0.4) / 1000) * 1000;
+                await menus.push([id, shopId, category, categoryId, name, shopPrice, duration, 'MENU', sort++]);
+                shopMenus.push({ id, name, category, price: shopPrice, duration, weight });
+            }
+        }
+        const clinics = shopMenus.filter(m => m.category === '클리닉');
+
+        for (const [name, price, credit] of TICKETS) {
+            await tickets.push([nextId('PREPAID_TICKETS'), shopId, name, price, credit, 365]);
+        }
+
+        // 고객 (앞쪽 고객일수록 자주 방문하도록 rng^2 로 고른다)
+        const customerCount = Math.max(1, Math.round(options.customers * (0.5 + rng.next())));
+        const customers: number[] = [];
+        for (let c = 0; c < customerCount; c++) {
+            customers.push(await pushUser('CUSTOMER', at(firstDay - rng.int(0, 60) + Math.floor(rng.next() * options.days), 0), null));
+        }
+        const pickCustomer = () => customers[Math.floor(customers.length * rng.next() * rng.next())];
+
+        const shopBalances = new Map<number, Balance>();
+        const charge = async (customerId: number, when: Date) => {
+            let balance = shopBalances.get(customerId);
+            if (!balance) {
+                balance = { id: nextId('CUSTOMER_PREPAID_BALANCES'), amount: 0, lastUsedAt: null, createdAt: when };
+                shopBalances.set(customerId, balance);
+                await balances.push([balance.id, customerId, shopId, 0, null, when]);
+            }
+            const [, price, credit] = rng.pick(TICKETS);
+            balance.amount += credit;
+            await transactions.push([
+                nextId('PREPAID_TRANSACTIONS'), balance.id, 'CHARGE', credit, credit - price, balance.amount, null, when,
+                rng.next() < 0.7 ? 'CARD' : 'CASH',
+            ]);
+        };
+
+        // 예약 (일자 → 디자이너 순으로 만들어 선불권 잔액이 시간 순서대로 움직이게 한다)
+        for (let day = firstDay; day <= lastDay; day++) {
+            const dow = weekday(day);
+            if (dow === closedDay) continue;
+
+            for (const designer of shopDesigners) {
+                if (designer.dayOff === dow) continue;
+
+                const target = Math.round(options.perDay * (0.5 + rng.next()));
+                let minute = openMinute;
+                let placed = 0;
+                while (placed < target) {
+                    if (rng.next() < 0.25) minute += 30; // 빈 슬롯
+                    const menu = rng.weighted(shopMenus, m => m.weight);
+                    const addOn = clinics.length > 0 && rng.next() < 0.15 ? rng.pick(clinics) : null;
+                    const duration = menu.duration + (addOn ? addOn.duration : 0);
+                    if (minute < lunchEnd && minute + duration > lunchStart) minute = lunchEnd;
+                    if (minute + duration > closeMinute) break;
+
+                    const start = at(day, minute);
+                    const end = at(day, minute + duration);
+                    minute += duration;
+                    placed++;
+
+                    const customerId = pickCustomer();
+                    const past = day < 0;
+                    const roll = rng.next();
+                    const status = past
+                        ? (roll < 0.88 ? 'COMPLETED' : roll < 0.96 ? 'CANCELED' : 'NOSHOW')
+                        : (roll < 0.85 ? 'CONFIRMED' : 'PENDING');
+                    const createdAt = new Date(start.getTime() - rng.int(1, 14 * 24 * 60) * 60 * 1000);
+                    const reservationId = nextId('RESERVATIONS');
+                    await reservations.push([
+                        reservationId, shopId, customerId, designer.id, start, end, status,
+                        rng.weighted(['ADMIN', 'APP', 'NAVER', 'KAKAO'], source => (source === 'ADMIN' ? 5 : source === 'APP' ? 3 : 1)),
+                        createdAt, past ? end : createdAt,
+                    ]);
+
+                    let total = 0;
+                    for (const item of addOn ? [menu, addOn] : [menu]) {
+                        await items.push([nextId('RESERVATION_ITEMS'), reservationId, item.id, item.name, item.price]);
+                        total += item.price;
+                    }
+                    if (status !== 'COMPLETED') continue;
+
+                    // 결제: 선불권 잔액이 있으면 주로 선불권, 가끔 방문 시 선불권 구매
+                    let balance = shopBalances.get(customerId);
+                    if ((!balance || balance.amount < total) && rng.next() < 0.04) {
+                        await charge(customerId, start);
+                        balance = shopBalances.get(customerId);
+                    }
+                    const paymentId = nextId('PAYMENTS');
+                    if (balance && balance.amount >= total && rng.next() < 0.8) {
+                        await payments.push([paymentId, reservationId, 'PREPAID', total, 'PAID', end]);
+                        balance.amount -= total;
+                        balance.lastUsedAt = end;
+                        await transactions.push([nextId('PREPAID_TRANSACTIONS'), balance.id, 'USE', total, 0, balance.amount, paymentId, end, 'CASH']);
+                    } else {
+                        const type = rng.weighted(['SITE_CARD', 'SITE_CASH', 'APP_DEPOSIT'], t => (t === 'SITE_CARD' ? 14 : t === 'SITE_CASH' ? 5 : 1));
+                        await payments.push([paymentId, reservationId, type, total, 'PAID', end]);
+                    }
+
+                    // 시술 기록 (일부만 사진 포함)
+                    if (rng.next() < 0.3) {
+                        const logId = nextId('VISIT_LOGS');
+                        const urls = rng.next() < 0.6
+                            ? Array.from({ length: rng.int(1, 3) }, () => `/uploads/${rng.hex(32)}_large.jpg`)
+                            : [];
+                        await visitLogs.push([logId, customerId, reservationId, designer.id, `${menu.name} 시술`, JSON.stringify(urls), start]);
+                        for (let i = 0; i < urls.length; i++) {
+                            await photos.push([nextId('VISIT_LOG_PHOTOS'), logId, shopId, menu.category, menu.name, urls[i], i, start]);
+                        }
+                    }
+                }
+            }
+        }
+
+        // 최종 선불권 잔액 (ON DUPLICATE KEY UPDATE)
+        for (const [customerId, balance] of shopBalances) {
+            await balances.push([balance.id, customerId, shopId, balance.amount, balance.lastUsedAt, balance.createdAt]);
+        }
+
+        if ((s + 1) % 10 === 0 || s + 1 === options.shops) {
+            const elapsed = (Date.now() - started) / 1000;
+            console.log(`shops ${s + 1}/${options.shops} reservations=${reservations.inserted} elapsed=${elapsed.toFixed(0)}s`);
+        }
+    }
+    for (const inserter of all) await inserter.flush();
+
+    const loadSeconds = (Date.now() - started) / 1000;
+    const totalRows = all.reduce((sum, inserter) => sum + inserter.inserted, 0);
+    console.log(`loaded ${totalRows} rows in ${loadSeconds.toFixed(1)}s (${(totalRows / loadSeconds).toFixed(0)} rows/s)`);
+    all.forEach(inserter => console.log(`  ${inserter.table.padEnd(26)} ${inserter.inserted}`));
+
+    // 파생 테이블 재계산 (예약 쓰기 경로를 거치지 않았으므로)
+    const derivedStarted = Date.now();
+    for (const shopId of shopIds) {
+        await customerStats.refreshShop(prisma as unknown as PrismaService, shopId);
+        for (let day = firstDay; day <= lastDay; day += ROLLUP_CHUNK_DAYS) {
+            const to = Math.min(lastDay, day + ROLLUP_CHUNK_DAYS - 1);
+            await prisma.$transaction((tx) => rollup.refreshRange(tx, shopId, dateStr(day), dateStr(to)), { timeout: 60000 });
+        }
+    }
+    console.log(`customer stats / sales rollups rebuilt in ${((Date.now() - derivedStarted) / 1000).toFixed(1)}s`);
+    console.log(`login: ${firstOwnerEmail} / password123 (shops ${shopIds[0]}..${shopIds[shopIds.length - 1]})`);
+}
+
+main()
+    .catch((e) => {
+        console.error(e);
+        process.exit(1);
+    })
+    .finally(async () => {
+        await prisma.$disconnect();
+    });
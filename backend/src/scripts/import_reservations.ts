@@ -0,0 +1,110 @@
+import { createReadStream, createWriteStream } from 'fs';
+import { extname } from 'path';
+import { PrismaClient, RESERVATIONS_source } from '@prisma/client';
+import { TimeService } from '../common/time/time.service';
+import { PrismaService } from '../prisma/prisma.service';
+import { CacheInvalidationBus } from '../common/cache/cache-invalidation-bus.service';
+import { AvailabilityCacheService } from '../common/cache/availability-cache.service';
+import { SalesRollupService } from '../sales/sales-rollup.service';
+import { CustomerStatsService } from '../customers/customer-stats.service';
+import { CustomerSearchIndexService } from '../users/customer-search-index.service';
+import { PrepaidService } from '../prepaid/prepaid.service';
+import { ReservationsRepository } from '../reservations/reservations.repository';
+import { ReservationImportService, DEFAULT_IMPORT_BATCH_SIZE } from '../reservations/reservation-import.service';
+import { IMPORT_ENCODINGS, ImportEncoding, ImportFormat } from '../reservations/reservation-import.parser';
+
+/**
+ * 예약 이력 가져오기 (POST /shops/:shopId/reservations/import 와 같은 처리)
+ *
+ * 사용법:
+ *   npm run data:import-reservations -- --shop <shopId> --file naver.csv
+ *     [--format csv|jsonl] [--encoding utf-8|euc-kr] [--source NAVER|KAKAO]
+ *     [--batch 200] [--dry-run] [--errors errors.jsonl]
+ *
+ * --errors 를 주면 실패한 행 전체를 JSONL({ line, message })로 남긴다.
+ * 실행 중인 API 워커의 가용 시간 캐시는 TTL(5분) 안에 갱신된다.
+ */
+
+const prisma = new PrismaClient();
+const db = prisma as unknown as PrismaService;
+const timeService = new TimeService();
+
+function parseArgs() {
+    const args = process.argv.slice(2);
+    const get = (name: string) => {
+        const index = args.indexOf(`--${name}`);
+        return index >= 0 ? args[index + 1] : undefined;
+    };
+    const file = get('file');
+    const extension = extname(file || '').toLowerCase();
+    return {
+        shop: Number(get('shop')),
+        file,
+        format: (get('format') || (extension === '.csv' ? 'csv' : 'jsonl')) as ImportFormat,
+        encoding: (get('encoding') || 'utf-8') as ImportEncoding,
+        source: get('source') as RESERVATIONS_source | undefined,
+        batch: Number(get('batch') || DEFAULT_IMPORT_BATCH_SIZE),
+        dryRun: args.includes('--dry-run'),
+        errors: get('errors'),
+    };
+}
+
+async function main() {
+    const options = parseArgs();
+    if (!options.shop || !options.file) {
+        console.error('Usage: import_reservations.ts --shop <shopId> --file <path> [--format csv|jsonl] [--source NAVER|KAKAO] [--dry-run]');
+        process.exit(1);
+    }
+    if (!['csv', 'jsonl'].includes(options.format) || !IMPORT_ENCODINGS.includes(options.encoding)) {
+        console.error(`Unsupported format/encoding: ${options.format} / ${options.encoding}`);
+        process.exit(1);
+    }
+    if (options.source && !Object.values(RESERVATIONS_source).includes(options.source)) {
+        console.error(`Unknown source: ${options.source}`);
+        process.exit(1);
+    }
+
+    const salesRollup = new SalesRollupService(db, timeService);
+    const customerStats = new CustomerStatsService(new CustomerSearchIndexService(db));
+    const importer = new ReservationImportService(
+        db,
+        timeService,
+        new ReservationsRepository(db, salesRollup, customerStats, new PrepaidService(db, salesRollup)),
+        customerStats,
+        salesRollup,
+        new AvailabilityCacheService(timeService, new CacheInvalidationBus(db)),
+    );
+
+    const errorLog = options.errors ? createWriteStream(options.errors) : null;
+    const report = await importer.import(options.shop, createReadStream(options.file), {
+        format: options.format,
+        encoding: options.encoding,
+        source: options.source,
+        batchSize: options.batch,
+        dryRun: options.dryRun,
+        onError: (error) => errorLog?.write(`${JSON.stringify(error)}\n`),
+    });
+    if (errorLog) await new Promise((resolve) => errorLog.end(resolve));
+
+    const seconds = report.elapsedMs / 1000;
+    console.log(
+        `${report.dryRun ? '[dry-run] ' : ''}shop=${options.shop} rows=${report.total} imported=${report.imported} ` +
+        `duplicates=${report.duplicates} failed=${report.failed} customersCreated=${report.customersCreated} ` +
+        `range=${report.from ?? '-'}..${report.to ?? '-'} elapsed=${seconds.toFixed(1)}s (${(report.total / Math.max(seconds, 0.001)).toFixed(0)} rows/s)`
+    );
+    report.errors.slice(0, 20).forEach(error => console.log(`  line ${error.line}: ${error.message}`));
+    if (report.failed > 20) console.log(`  ... ${report.failed - 20} more${options.errors ? ` (see ${options.errors})` : ''}`);
+    if (report.aborted) {
+        console.error(`aborted: ${report.aborted}`);
+        process.exitCode = 1;
+    }
+}
+
+main()
+    .catch((e) => {
+        console.error(e);
+        process.exit(1);
+    })
+    .finally(async () => {
+        await prisma.$disconnect();
+    });
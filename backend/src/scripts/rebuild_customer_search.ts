@@ -0,0 +1,63 @@
+import { PrismaClient } from '@prisma/client';
+import { PrismaService } from '../prisma/prisma.service';
+import { CustomerSearchIndexService } from '../users/customer-search-index.service';
+
+/**
+ * 고객 검색 색인(CUSTOMER_SEARCH_TERMS) 재작성 / 백필
+ *
+ * 사용법:
+ *   npm run customers:rebuild-search -- [--shop 1] [--missing-only]
+ *
+ * 매장 고객(CUSTOMER_SHOP_STATS, CUSTOMER_MEMOS)을 CHUNK_SIZE 명씩 트랜잭션으로 나눠 다시 색인한다.
+ * 중간에 멈추면 --missing-only 로 다시 실행해 빠진 고객만 채운다.
+ */
+
+const CHUNK_SIZE = 500;
+
+const prisma = new PrismaClient();
+const searchIndex = new CustomerSearchIndexService(prisma as unknown as PrismaService);
+
+function parseArgs() {
+    const args = process.argv.slice(2);
+    const index = args.indexOf('--shop');
+    return {
+        shop: index >= 0 ? args[index + 1] : undefined,
+        missingOnly: args.includes('--missing-only'),
+    };
+}
+
+async function main() {
+    const { shop, missingOnly } = parseArgs();
+    const shops = shop
+        ? [{ shop_id: BigInt(shop) }]
+        : await prisma.sHOPS.findMany({ select: { shop_id: true }, orderBy: { shop_id: 'asc' } });
+
+    for (const { shop_id } of shops) {
+        const started = Date.now();
+        if (missingOnly) {
+            await prisma.$transaction((tx) => searchIndex.indexMissing(tx, shop_id), { timeout: 60000 });
+            console.log(`shop ${shop_id}: missing customers indexed in ${Date.now() - started}ms`);
+            continue;
+        }
+
+        const members = await prisma.$queryRaw<{ user_id: bigint }[]>`
+            SELECT user_id FROM CUSTOMER_SHOP_STATS WHERE shop_id = ${shop_id}
+            UNION SELECT user_id FROM CUSTOMER_MEMOS WHERE shop_id = ${shop_id}`;
+        for (let i = 0; i < members.length; i += CHUNK_SIZE) {
+            const userIds = members.slice(i, i + CHUNK_SIZE).map(m => m.user_id);
+            await prisma.$transaction((tx) => searchIndex.indexCustomers(tx, shop_id, userIds), { timeout: 60000 });
+        }
+
+        const elapsed = Date.now() - started;
+        console.log(`shop ${shop_id}: ${members.length} customers indexed in ${elapsed}ms (${(members.length / Math.max(elapsed / 1000, 0.001)).toFixed(0)}/s)`);
+    }
+}
+
+main()
+    .catch((e) => {
+        console.error(e);
+        process.exit(1);
+    })
+    .finally(async () => {
+        await prisma.$disconnect();
+    });
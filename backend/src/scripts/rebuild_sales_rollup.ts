@@ -0,0 +1,74 @@
+import { PrismaClient } from '@prisma/client';
+import { TimeService } from '../common/time/time.service';
+import { PrismaService } from '../prisma/prisma.service';
+import { SalesRollupService } from '../sales/sales-rollup.service';
+
+/**
+ * 일별 매출 집계(SALES_DAILY_ROLLUPS) 재계산 / 백필
+ *
+ * 사용법:
+ *   npm run sales:rebuild-rollup -- --from 2025-01-01 --to 2025-12-31 [--shop 1]
+ *
+ * 원천 테이블(RESERVATIONS, PAYMENTS, PREPAID_TRANSACTIONS)에서 구간을 다시 계산한다.
+ * 매장별로 CHUNK_DAYS 일씩 트랜잭션을 나눠 실행하므로 중간에 멈춰도 다시 실행하면 된다.
+ */
+
+const CHUNK_DAYS = 31;
+
+const prisma = new PrismaClient();
+const timeService = new TimeService();
+const rollup = new SalesRollupService(prisma as unknown as PrismaService, timeService);
+
+function parseArgs() {
+    const args = process.argv.slice(2);
+    const get = (name: string) => {
+        const index = args.indexOf(`--${name}`);
+        return index >= 0 ? args[index + 1] : undefined;
+    };
+    return { from: get('from'), to: get('to'), shop: get('shop') };
+}
+
+async function main() {
+    const { from, to, shop } = parseArgs();
+    if (!from || !to || !/^\d{4}-\d{2}-\d{2}$/.test(from) || !/^\d{4}-\d{2}-\d{2}$/.test(to)) {
+        console.error('Usage: rebuild_sales_rollup.ts --from YYYY-MM-DD --to YYYY-MM-DD [--shop <shopId>]');
+        process.exit(1);
+    }
+
+    const shops = shop
+        ? [{ shop_id: BigInt(shop) }]
+        : await prisma.sHOPS.findMany({ select: { shop_id: true }, orderBy: { shop_id: 'asc' } });
+
+    const last = timeService.parse(to).startOf('day');
+    for (const { shop_id } of shops) {
+        let chunkStart = timeService.parse(from).startOf('day');
+        let days = 0;
+        const started = Date.now();
+
+        while (!chunkStart.isAfter(last)) {
+            let chunkEnd = chunkStart.add(CHUNK_DAYS - 1, 'day');
+            if (chunkEnd.isAfter(last)) chunkEnd = last;
+
+            const fromDate = chunkStart.format('YYYY-MM-DD');
+            const toDate = chunkEnd.format('YYYY-MM-DD');
+            await prisma.$transaction(
+                (tx) => rollup.refreshRange(tx, shop_id, fromDate, toDate),
+                { timeout: 60000 },
+            );
+
+            days += chunkEnd.diff(chunkStart, 'day') + 1;
+            chunkStart = chunkEnd.add(1, 'day');
+        }
+
+        console.log(`shop ${shop_id}: ${days} days rebuilt in ${Date.now() - started}ms`);
+    }
+}
+
+main()
+    .catch((e) => {
+        console.error(e);
+        process.exit(1);
+    })
+    .finally(async () => {
+        await prisma.$disconnect();
+    });
@@ -0,0 +1,148 @@
+import { PrismaClient } from '@prisma/client';
+import { TimeService } from '../common/time/time.service';
+import { PrismaService } from '../prisma/prisma.service';
+import { ReservationsRepository, ReservationOverlapError } from '../reservations/reservations.repository';
+import { SalesRollupService } from '../sales/sales-rollup.service';
+import { CustomerStatsService } from '../customers/customer-stats.service';
+import { CustomerSearchIndexService } from '../users/customer-search-index.service';
+import { PrepaidService } from '../prepaid/prepaid.service';
+
+/**
+ * 동시 예약 스트레스 테스트 (로컬 MySQL 용, 실제로 예약을 만들고 끝나면 삭제한다)
+ *
+ * 사용법:
+ *   npx ts-node src/scripts/stress_concurrent_booking.ts <shopId> <customerId> "<YYYY-MM-DD HH:mm>" [concurrency=20] [duration=60]
+ *
+ * 1) 같은 디자이너 / 같은 슬롯에 concurrency 건을 동시에 요청 → 정확히 1건만 성공해야 한다.
+ * 2) 매장의 디자이너마다 같은 슬롯을 동시에 요청 → 모두 성공해야 한다 (디자이너 간 병렬성).
+ *
+ * 커넥션 풀이 concurrency 보다 작으면 풀 대기로 직렬화되므로 DATABASE_URL 에 connection_limit 을 충분히 준다.
+ */
+
+const prisma = new PrismaClient();
+const timeService = new TimeService();
+const salesRollup = new SalesRollupService(prisma as unknown as PrismaService, timeService);
+const repository = new ReservationsRepository(
+    prisma as unknown as PrismaService,
+    salesRollup,
+    new CustomerStatsService(new CustomerSearchIndexService(prisma as unknown as PrismaService)),
+    new PrepaidService(prisma as unknown as PrismaService, salesRollup),
+);
+
+interface Outcome {
+    created: bigint[];
+    conflicts: number;
+    errors: number;
+    elapsedMs: number;
+}
+
+async function book(requests: { designerId: bigint; start: Date; end: Date }[], shopId: number, customerId: number): Promise<Outcome> {
+    const outcome: Outcome = { created: [], conflicts: 0, errors: 0, elapsedMs: 0 };
+    const started = process.hrtime.bigint();
+
+    await Promise.all(requests.map(async ({ designerId, start, end }) => {
+        try {
+            const reservation = await repository.createReservation({
+                shop_id: shopId,
+                customer_id: customerId,
+                designer_id: Number(designerId),
+                start_time: start.toISOString(),
+                end_time: end.toISOString(),
+                status: 'CONFIRMED',
+                request_memo: 'stress_concurrent_booking',
+            });
+            outcome.created.push(reservation.reservation_id);
+        } catch (e) {
+            if (e instanceof ReservationOverlapError) outcome.conflicts++;
+            else {
+                outcome.errors++;
+                console.error(e);
+            }
+        }
+    }));
+
+    outcome.elapsedMs = Number(process.hrtime.bigint() - started) / 1e6;
+    return outcome;
+}
+
+async function countActive(designerId: bigint, start: Date, end: Date) {
+    return prisma.rESERVATIONS.count({
+        where: {
+            designer_id: designerId,
+            status: { notIn: ['CANCELED', 'NOSHOW'] },
+            start_time: { lt: end },
+            end_time: { gt: start },
+        },
+    });
+}
+
+async function main() {
+    const [shopArg, customerArg, startArg, concurrencyArg, durationArg] = process.argv.slice(2);
+    if (!shopArg || !customerArg || !startArg) {
+        console.error('Usage: stress_concurrent_booking.ts <shopId> <customerId> "<YYYY-MM-DD HH:mm>" [concurrency] [duration]');
+        process.exit(1);
+    }
+    const shopId = Number(shopArg);
+    const customerId = Number(customerArg);
+    const concurrency = Number(concurrencyArg || 20);
+    const duration = Number(durationArg || 60);
+    const start = timeService.parse(startArg).toDate();
+    const end = timeService.parse(startArg).add(duration, 'minute').toDate();
+
+    const designers = await prisma.dESIGNERS.findMany({
+        where: { shop_id: BigInt(shopId), is_active: true },
+        select: { designer_id: true },
+        orderBy: { designer_id: 'asc' },
+    });
+    const free: bigint[] = [];
+    for (const { designer_id } of designers) {
+        if (await countActive(designer_id, start, end) === 0) free.push(designer_id);
+    }
+    if (free.length === 0) {
+        console.error('No designer has a free slot at the given time');
+        process.exit(1);
+    }
+
+    const created: bigint[] = [];
+    let failed = false;
+    try {
+        // 1) 같은 디자이너, 같은 슬롯
+        const target = free[0];
+        const same = await book(Array.from({ length: concurrency }, () => ({ designerId: target, start, end })), shopId, customerId);
+        created.push(...same.created);
+        const active = await countActive(target, start, end);
+        console.log(
+            `same designer  requests=${concurrency} created=${same.created.length} conflicts=${same.conflicts} ` +
+            `errors=${same.errors} active=${active} elapsed=${same.elapsedMs.toFixed(1)}ms`
+        );
+        if (same.created.length !== 1 || active !== 1) failed = true;
+
+        // 2) 디자이너별 같은 슬롯 (첫 번째 디자이너는 이미 예약됨)
+        const others = free.slice(1);
+        if (others.length > 0) {
+            const parallel = await book(others.map(designerId => ({ designerId, start, end })), shopId, customerId);
+            created.push(...parallel.created);
+            console.log(
+                `per designer   requests=${others.length} created=${parallel.created.length} conflicts=${parallel.conflicts} ` +
+                `errors=${parallel.errors} elapsed=${parallel.elapsedMs.toFixed(1)}ms`
+            );
+            if (parallel.created.length !== others.length) failed = true;
+        }
+    } finally {
+        for (const id of created) {
+            await repository.deleteReservation(shopId, Number(id));
+        }
+    }
+
+    console.log(failed ? 'FAIL' : 'PASS');
+    if (failed) process.exitCode = 1;
+}
+
+main()
+    .catch((e) => {
+        console.error(e);
+        process.exit(1);
+    })
+    .finally(async () => {
+        await prisma.$disconnect();
+    });
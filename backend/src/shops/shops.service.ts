@@ -1,12 +1,16 @@
 import { Injectable } from '@nestjs/common';
 import { PrismaService } from '../prisma/prisma.service';
 import { TimeService } from '../common/time/time.service';
+import { AvailabilityCacheService } from '../common/cache/availability-cache.service';
+import { ShopOwnershipCacheService } from '../common/cache/shop-ownership-cache.service';
 
 @Injectable()
 export class ShopsService {
     constructor(
         private prisma: PrismaService,
-        private timeService: TimeService
+        private timeService: TimeService,
+        private availabilityCache: AvailabilityCacheService,
+        private ownershipCache: ShopOwnershipCacheService
     ) { }
 
     async findAll() {
@@ -63,6 +67,15 @@ export class ShopsService {
             data: updateData,
         });
 
+        // 영업시간/정기휴무 변경 → 매장 전체 일자 무효화
+        if (data.open_time || data.close_time || data.closed_days !== undefined) {
+            this.availabilityCache.invalidateShop(id);
+        }
+        // 소유자 변경(양도) → ShopAuthGuard 캐시 무효화 (다른 워커는 CacheInvalidationBus)
+        if (data.owner_id !== undefined) {
+            this.ownershipCache.invalidateShop(id);
+        }
+
         return {
             ...shop,
             shop_id: shop.shop_id.toString(),
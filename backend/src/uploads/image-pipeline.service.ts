@@ -0,0 +1,90 @@
+import { Injectable, ServiceUnavailableException } from '@nestjs/common';
+import * as sharp from 'sharp';
+import { cpus } from 'os';
+import { join } from 'path';
+import { writeFile } from 'fs/promises';
+import { IMAGE_VARIANTS, ImageFormat, ImageVariantName } from '../config/upload.config';
+import { API_INSTANCES } from '../config/cluster.config';
+
+// sharp 는 libuv 스레드풀에서 디코드/인코딩하므로 이벤트 루프는 막지 않는다.
+// 동시에 처리하는 이미지 수와 대기열 길이만 제한해 메모리/CPU 폭주를 막는다.
+// cluster 모드에서는 워커들이 코어를 나눠 쓰므로 워커당 동시 처리 수도 나눈다.
+const MAX_CONCURRENT_JOBS = Math.max(1, Math.min(4, Math.floor((cpus().length - 1) / API_INSTANCES)));
+const MAX_QUEUED_JOBS = 32;
+
+const JPEG_OPTIONS: sharp.JpegOptions = { quality: 80, mozjpeg: true };
+const WEBP_OPTIONS: sharp.WebpOptions = { quality: 75 };
+
+export type ImageVariantFiles = Record<ImageVariantName, { width: number; height: number; files: Record<ImageFormat, string> }>;
+
+/**
+ * 업로드 이미지 변형 생성 (thumb / medium / large x JPEG / WebP).
+ * 원본은 한 번만 디코드(EXIF 회전 + 최대 너비 축소)하고, 나머지 변형은 그 픽셀에서 만든다.
+ */
+@Injectable()
+export class ImagePipelineService {
+    private active = 0;
+    private readonly waiting: (() => void)[] = [];
+
+    async process(sourcePath: string, targetDir: string, baseName: string): Promise<ImageVariantFiles> {
+        if (this.active >= MAX_CONCURRENT_JOBS && this.waiting.length >= MAX_QUEUED_JOBS) {
+            throw new ServiceUnavailableException('이미지 처리 요청이 많습니다. 잠시 후 다시 시도해주세요.');
+        }
+
+        await this.acquire();
+        try {
+            return await this.render(sourcePath, targetDir, baseName);
+        } finally {
+            this.release();
+        }
+    }
+
+    stats() {
+        return { active: this.active, queued: this.waiting.length, maxConcurrent: MAX_CONCURRENT_JOBS, maxQueued: MAX_QUEUED_JOBS };
+    }
+
+    private async render(sourcePath: string, targetDir: string, baseName: string): Promise<ImageVariantFiles> {
+        const largest = IMAGE_VARIANTS[IMAGE_VARIANTS.length - 1];
+        const { data, info } = await sharp(sourcePath)
+            .rotate() // Handle Exif orientation
+            .resize(largest.width, null, { withoutEnlargement: true })
+            .flatten({ background: '#ffffff' }) // JPEG 는 투명도를 지원하지 않음
+            .raw()
+            .toBuffer({ resolveWithObject: true });
+        const raw = { width: info.width, height: info.height, channels: info.channels };
+
+        const result = {} as ImageVariantFiles;
+        for (const variant of IMAGE_VARIANTS) {
+            const base = sharp(data, { raw });
+            const resized = variant.width < info.width ? base.resize(variant.width) : base;
+
+            const [jpg, webp] = await Promise.all([
+                resized.clone().jpeg(JPEG_OPTIONS).toBuffer({ resolveWithObject: true }),
+                resized.clone().webp(WEBP_OPTIONS).toBuffer({ resolveWithObject: true }),
+            ]);
+
+            const files = { jpg: `${baseName}_${variant.name}.jpg`, webp: `${baseName}_${variant.name}.webp` };
+            await Promise.all([
+                writeFile(join(targetDir, files.jpg), jpg.data),
+                writeFile(join(targetDir, files.webp), webp.data),
+            ]);
+            result[variant.name] = { width: jpg.info.width, height: jpg.info.height, files };
+        }
+        return result;
+    }
+
+    private acquire(): Promise<void> {
+        if (this.active < MAX_CONCURRENT_JOBS) {
+            this.active++;
+            return Promise.resolve();
+        }
+        return new Promise(resolve => this.waiting.push(resolve));
+    }
+
+    // 대기 중인 작업이 있으면 슬롯을 그대로 넘긴다
+    private release(): void {
+        const next = this.waiting.shift();
+        if (next) next();
+        else this.active--;
+    }
+}
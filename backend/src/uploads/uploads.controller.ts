@@ -1,7 +1,9 @@
 import { Controller, Post, Param, UseInterceptors, UploadedFile, BadRequestException } from '@nestjs/common';
 import { FileInterceptor } from '@nestjs/platform-express';
-import { memoryStorage } from 'multer';
+import { diskStorage } from 'multer';
+import { randomBytes } from 'crypto';
 import { UploadsService } from './uploads.service';
+import { UPLOAD_TMP_DIR } from '../config/upload.config';
 
 @Controller('uploads')
 export class UploadsController {
@@ -9,7 +11,11 @@ export class UploadsController {
 
     @Post(':category')
     @UseInterceptors(FileInterceptor('file', {
-        storage: memoryStorage(), // Use memory storage to get buffer
+        // 요청 메모리에 버퍼링하지 않고 임시 파일로 받은 뒤 이미지 파이프라인에서 처리
+        storage: diskStorage({
+            destination: UPLOAD_TMP_DIR,
+            filename: (req, file, cb) => cb(null, randomBytes(16).toString('hex')),
+        }),
         fileFilter: (req, file, cb) => {
             if (!file.originalname.match(/\.(jpg|jpeg|png|gif|webp)$/i)) {
                 return cb(new BadRequestException('Only image files are allowed!'), false);
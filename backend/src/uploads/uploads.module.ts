@@ -1,9 +1,11 @@
 import { Module } from '@nestjs/common';
 import { UploadsController } from './uploads.controller';
 import { UploadsService } from './uploads.service';
+import { ImagePipelineService } from './image-pipeline.service';
 
 @Module({
   controllers: [UploadsController],
-  providers: [UploadsService]
+  providers: [UploadsService, ImagePipelineService],
+  exports: [ImagePipelineService]
 })
 export class UploadsModule {}
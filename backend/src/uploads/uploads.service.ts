@@ -1,53 +1,58 @@
-import { Injectable, BadRequestException } from '@nestjs/common';
-import * as sharp from 'sharp';
-import { extname, join } from 'path';
-import { existsSync, mkdirSync, writeFile } from 'fs';
-import { promisify } from 'util';
-import { UPLOAD_ROOT, UPLOAD_CATEGORIES } from '../config/upload.config';
+import { Injectable, BadRequestException, HttpException } from '@nestjs/common';
+import { join } from 'path';
+import { mkdir, unlink } from 'fs/promises';
+import { randomBytes } from 'crypto';
+import { UPLOAD_ROOT, UPLOAD_CATEGORIES, IMAGE_VARIANTS, ImageFormat, ImageVariantName } from '../config/upload.config';
+import { ImagePipelineService } from './image-pipeline.service';
 
-const writeFileAsync = promisify(writeFile);
+export interface UploadedImage {
+    url: string; // large JPEG (기존 응답 호환)
+    originalName: string;
+    variants: Record<ImageVariantName, { width: number; height: number } & Record<ImageFormat, string>>;
+}
 
 @Injectable()
 export class UploadsService {
-    async compressAndSaveImage(category: string, file: Express.Multer.File): Promise<{ url: string; originalName: string }> {
-        if (!UPLOAD_CATEGORIES.includes(category)) {
-            throw new BadRequestException('Invalid category');
-        }
+    constructor(private readonly imagePipeline: ImagePipelineService) { }
 
-        const uploadPath = join(UPLOAD_ROOT, category);
-        if (!existsSync(uploadPath)) {
-            mkdirSync(uploadPath, { recursive: true });
-        }
+    /**
+     * 임시 파일로 받은 업로드를 변형별 JPEG/WebP 로 저장하고 URL 목록(manifest)을 반환한다.
+     * 임시 파일은 성공/실패와 관계없이 삭제한다.
+     */
+    async compressAndSaveImage(category: string, file: Express.Multer.File): Promise<UploadedImage> {
+        try {
+            if (!UPLOAD_CATEGORIES.includes(category)) {
+                throw new BadRequestException('Invalid category');
+            }
 
-        // Generate random filename
-        const randomName = Array(32).fill(null).map(() => (Math.round(Math.random() * 16)).toString(16)).join('');
-        // Force jpg extension for consistency after compression, or keep original if needed.
-        // Let's us .jpg (or .webp) for the compressed file.
-        const extension = '.jpg';
-        const filename = `${randomName}${extension}`;
-        const filePath = join(uploadPath, filename);
+            const uploadPath = join(UPLOAD_ROOT, category);
+            await mkdir(uploadPath, { recursive: true });
 
-        try {
-            // Process image with sharp
-            // 1. Resize to max width 1920px (preserving aspect ratio)
-            // 2. Auto-rotate based on EXIF
-            // 3. Compress to JPEG with 80% quality
-            const buffer = await sharp(file.buffer)
-                .rotate() // Handle Exif orientation
-                .resize(1920, null, { withoutEnlargement: true }) // Max width 1920
-                .jpeg({ quality: 80 }) // Compress as JPEG
-                .toBuffer();
+            const baseName = randomBytes(16).toString('hex');
+            const rendered = await this.imagePipeline.process(file.path, uploadPath, baseName);
 
-            // Save to disk
-            await writeFileAsync(filePath, buffer);
+            const variants = {} as UploadedImage['variants'];
+            for (const { name } of IMAGE_VARIANTS) {
+                const { width, height, files } = rendered[name];
+                variants[name] = {
+                    width,
+                    height,
+                    jpg: `/uploads/${category}/${files.jpg}`,
+                    webp: `/uploads/${category}/${files.webp}`,
+                };
+            }
 
             return {
-                url: `/uploads/${category}/${filename}`,
+                url: variants.large.jpg,
                 originalName: file.originalname,
+                variants,
             };
         } catch (error) {
+            if (error instanceof HttpException) throw error;
             console.error('Image compression failed:', error);
             throw new BadRequestException('Failed to process image');
+        } finally {
+            await unlink(file.path).catch(() => undefined);
         }
     }
 }
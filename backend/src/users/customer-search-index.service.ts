@@ -0,0 +1,174 @@
+import { Injectable } from '@nestjs/common';
+import { Prisma } from '@prisma/client';
+import { PrismaService } from '../prisma/prisma.service';
+import type { RollupClient } from '../sales/sales-rollup.service';
+
+export const DEFAULT_SEARCH_LIMIT = 10;
+export const MAX_SEARCH_LIMIT = 30;
+// 접두 범위에서 먼저 모으는 후보 수 (정렬은 이 안에서, 한 글자 검색도 일정한 비용)
+const CANDIDATE_LIMIT = 300;
+// 전화번호는 4자리 이상 조각만 색인 (뒷자리 4자리 검색)
+const MIN_PHONE_TERM = 4;
+// term 컬럼 VARCHAR(64) - 접두어 'x:'
+const MAX_TERM_CHARS = 62;
+const INDEX_CHUNK_SIZE = 500;
+
+const CHOSEONG = ['ㄱ', 'ㄲ', 'ㄴ', 'ㄷ', 'ㄸ', 'ㄹ', 'ㅁ', 'ㅂ', 'ㅃ', 'ㅅ', 'ㅆ', 'ㅇ', 'ㅈ', 'ㅉ', 'ㅊ', 'ㅋ', 'ㅌ', 'ㅍ', 'ㅎ'];
+const HANGUL_SYLLABLE = /[가-힣]/;
+// 호환 자모 자음 (ㄱ ~ ㅎ): 초성 검색 또는 입력 중인 글자
+const HANGUL_CONSONANT = /[ㄱ-ㅎ]/;
+
+export interface CustomerSearchResult {
+    user_id: bigint;
+    name: string;
+    phone: string;
+    grade: string | null;
+    visit_count: number | null;
+    last_visit_at: Date | null;
+}
+
+// 완성형 한글은 초성으로, 나머지 문자는 그대로 (김민수 → ㄱㅁㅅ)
+export function toChoseong(text: string): string {
+    let out = '';
+    for (const ch of text) {
+        out += HANGUL_SYLLABLE.test(ch) ? CHOSEONG[Math.floor((ch.charCodeAt(0) - 0xac00) / 588)] : ch;
+    }
+    return out;
+}
+
+const normalizeName = (name: string) => Array.from((name || '').toLowerCase().replace(/\s+/g, '')).slice(0, MAX_TERM_CHARS);
+
+// 문자 배열의 접미들 (minLength 보다 짧으면 전체 하나)
+function suffixes(chars: string[], minLength = 1): string[] {
+    if (chars.length <= minLength) return chars.length > 0 ? [chars.join('')] : [];
+    const out: string[] = [];
+    for (let i = 0; i + minLength <= chars.length; i++) out.push(chars.slice(i).join(''));
+    return out;
+}
+
+/**
+ * 고객 1명의 검색 조각.
+ * 모든 접미를 저장하므로 '조각%' 접두 검색이 부분 일치가 된다 (뒷자리 5678, 이름 민수, 초성 ㅁㅅ 모두 찾는다).
+ */
+export function termsFor(user: { name: string; phone: string }): string[] {
+    const terms = new Set<string>();
+    const phone = Array.from((user.phone || '').replace(/\D/g, '')).slice(0, MAX_TERM_CHARS);
+    suffixes(phone, MIN_PHONE_TERM).forEach(term => terms.add(`p:${term}`));
+
+    const name = normalizeName(user.name);
+    suffixes(name).forEach(term => terms.add(`n:${term}`));
+    if (name.some(ch => HANGUL_SYLLABLE.test(ch))) {
+        suffixes(Array.from(toChoseong(name.join('')))).forEach(term => terms.add(`c:${term}`));
+    }
+    return [...terms];
+}
+
+/**
+ * 검색어 → 조회할 term 접두.
+ * 숫자(하이픈 허용)는 전화번호, 자음이 섞여 있으면 초성(입력 중인 '김ㅁ' 도 ㄱㅁ 으로), 그 외는 이름.
+ */
+export function searchPrefix(query: string): string | null {
+    const q = normalizeName(query).join('');
+    if (!q) return null;
+
+    const digits = q.replace(/-/g, '');
+    if (/^\d+$/.test(digits)) return `p:${digits}`;
+    if (HANGUL_CONSONANT.test(q)) return `c:${toChoseong(q)}`;
+    return `n:${q}`;
+}
+
+const likePrefix = (prefix: string) => `${prefix.replace(/[\\%_]/g, '\\$&')}%`;
+
+/**
+ * 고객 검색(typeahead) 색인 CUSTOMER_SEARCH_TERMS 관리 및 조회.
+ * 매장의 고객(CUSTOMER_SHOP_STATS 또는 CUSTOMER_MEMOS 가 있는 고객, 관리자가 매장에서 등록한 고객)을 매장별로 색인하며,
+ * 조회는 (shop_id, term) 기본키 범위 스캔 한 번이다.
+ */
+@Injectable()
+export class CustomerSearchIndexService {
+    constructor(private readonly prisma: PrismaService) { }
+
+    /**
+     * 매장 고객 검색. 최근 방문 고객 순, 전체 전화번호(10자리 이상)로 찾으면 아직 이 매장 고객이 아닌 회원도 맨 앞에 포함한다.
+     */
+    async search(shopId: number, query: string, limit?: number): Promise<CustomerSearchResult[]> {
+        const prefix = searchPrefix(query || '');
+        if (!prefix) return [];
+
+        const take = Math.min(Math.max(limit || DEFAULT_SEARCH_LIMIT, 1), MAX_SEARCH_LIMIT);
+        const shop = BigInt(shopId);
+        const rows = await this.prisma.$queryRaw<CustomerSearchResult[]>`
+            SELECT u.user_id, u.name, u.phone, s.grade, s.visit_count, s.last_visit_at
+            FROM (
+                SELECT DISTINCT user_id FROM CUSTOMER_SEARCH_TERMS
+                WHERE shop_id = ${shop} AND term LIKE ${likePrefix(prefix)}
+                LIMIT ${CANDIDATE_LIMIT}
+            ) m
+            JOIN USERS u ON u.user_id = m.user_id
+            LEFT JOIN CUSTOMER_SHOP_STATS s ON s.shop_id = ${shop} AND s.user_id = m.user_id
+            ORDER BY s.last_visit_at DESC, u.user_id DESC
+            LIMIT ${take}`;
+
+        const digits = prefix.startsWith('p:') ? prefix.slice(2) : '';
+        if (digits.length < 10) return rows;
+
+        const exact = await this.prisma.uSERS.findUnique({
+            where: { phone: digits },
+            select: { user_id: true, name: true, phone: true, role: true },
+        });
+        if (!exact || exact.role !== 'CUSTOMER') return rows;
+        const member = rows.find(row => row.user_id === exact.user_id);
+        return [
+            member || { user_id: exact.user_id, name: exact.name, phone: exact.phone, grade: null, visit_count: null, last_visit_at: null },
+            ...rows.filter(row => row.user_id !== exact.user_id),
+        ].slice(0, take);
+    }
+
+    // 매장 고객 색인 재작성 (이름/전화번호 변경 반영)
+    async indexCustomers(db: RollupClient, shopId: number | bigint, userIds: bigint[]) {
+        if (userIds.length === 0) return;
+        const shop = BigInt(shopId);
+
+        const users = await db.uSERS.findMany({
+            where: { user_id: { in: userIds }, role: 'CUSTOMER' },
+            select: { user_id: true, name: true, phone: true },
+        });
+        await db.cUSTOMER_SEARCH_TERMS.deleteMany({ where: { shop_id: shop, user_id: { in: userIds } } });
+
+        const data = users.flatMap(user => termsFor(user).map(term => ({ shop_id: shop, term, user_id: user.user_id })));
+        if (data.length > 0) {
+            await db.cUSTOMER_SEARCH_TERMS.createMany({ data, skipDuplicates: true });
+        }
+    }
+
+    /**
+     * 아직 색인되지 않은 매장 고객만 색인 (새로 매장 고객이 된 경우).
+     * userIds 를 생략하면 매장 전체 고객 중 빠진 고객 (대량 적재/백필 후).
+     */
+    async indexMissing(db: RollupClient, shopId: number | bigint, userIds?: bigint[]) {
+        const shop = BigInt(shopId);
+        if (userIds && userIds.length === 0) return;
+
+        const candidates = userIds
+            ? Prisma.sql`SELECT user_id FROM USERS WHERE user_id IN (${Prisma.join(userIds)})`
+            : Prisma.sql`SELECT user_id FROM CUSTOMER_SHOP_STATS WHERE shop_id = ${shop}
+                UNION SELECT user_id FROM CUSTOMER_MEMOS WHERE shop_id = ${shop}`;
+        const missing = await db.$queryRaw<{ user_id: bigint }[]>`
+            SELECT m.user_id FROM (${candidates}) m
+            WHERE NOT EXISTS (SELECT 1 FROM CUSTOMER_SEARCH_TERMS t WHERE t.user_id = m.user_id AND t.shop_id = ${shop})`;
+
+        for (let i = 0; i < missing.length; i += INDEX_CHUNK_SIZE) {
+            await this.indexCustomers(db, shop, missing.slice(i, i + INDEX_CHUNK_SIZE).map(row => row.user_id));
+        }
+    }
+
+    // 고객이 속한 모든 매장의 색인 재작성 (계정 병합 등)
+    async reindexUser(db: RollupClient, userId: bigint) {
+        const shops = await db.$queryRaw<{ shop_id: bigint }[]>`
+            SELECT shop_id FROM CUSTOMER_SHOP_STATS WHERE user_id = ${userId}
+            UNION SELECT shop_id FROM CUSTOMER_SEARCH_TERMS WHERE user_id = ${userId}`;
+        for (const { shop_id } of shops) {
+            await this.indexCustomers(db, shop_id, [userId]);
+        }
+    }
+}
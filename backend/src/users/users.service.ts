@@ -3,10 +3,14 @@ import { CreateMobileUserDto } from '../mobile-app/auth/dto/create-mobile-user.d
 import { PrismaService } from '../prisma/prisma.service';
 import { USERS_role, USERS } from '@prisma/client';
 import * as bcrypt from 'bcrypt';
+import { CustomerSearchIndexService } from './customer-search-index.service';
 
 @Injectable()
 export class UsersService {
-    constructor(private prisma: PrismaService) { }
+    constructor(
+        private prisma: PrismaService,
+        private searchIndex: CustomerSearchIndexService,
+    ) { }
 
     async create(data: any, shopId?: number, writerId?: number) {
         const { memo, ...userData } = data;
@@ -26,7 +30,12 @@ export class UsersService {
             },
         });
 
-        // 2. 메모가 있다면 메모 생성
+        // 2. 매장에서 등록한 고객은 바로 검색되도록 색인
+        if (shopId && newUser.role === USERS_role.CUSTOMER) {
+            await this.searchIndex.indexCustomers(this.prisma, shopId, [newUser.user_id]);
+        }
+
+        // 3. 메모가 있다면 메모 생성
         if (memo) {
             // Default to 1 if not provided (for backward compatibility)
             const resolvedShopId = shopId ? BigInt(shopId) : BigInt(1);
@@ -84,44 +93,6 @@ export class UsersService {
         });
     }
 
-    async setCurrentRefreshToken(refreshToken: string, userId: number) {
-        const currentHashedRefreshToken = await bcrypt.hash(refreshToken, 10);
-        await this.prisma.uSERS.update({
-            where: { user_id: BigInt(userId) },
-            data: {
-                current_hashed_refresh_token: currentHashedRefreshToken,
-            },
-        });
-    }
-
-    async getUserIfRefreshTokenMatching(refreshToken: string, userId: number): Promise<USERS | null> {
-        // Force fresh read using Raw Query to bypass any potential Prisma caching/stale connection state
-        // Force fresh read using Locking Query (FOR SHARE) to bypass any MySQL MVCC snapshot
-        // This ensures we read the latest committed data even in REPEATABLE READ isolation
-        const users = await this.prisma.$queryRaw<USERS[]>`SELECT * FROM USERS WHERE user_id = ${userId} LOCK IN SHARE MODE`;
-        const user = users[0];
-
-        if (!user) return null;
-        if (!user.current_hashed_refresh_token) return null;
-
-        const isMatching = await bcrypt.compare(refreshToken, user.current_hashed_refresh_token);
-
-        if (isMatching) {
-            return user;
-        }
-
-        return null;
-    }
-
-    async removeRefreshToken(userId: number) {
-        return this.prisma.uSERS.update({
-            where: { user_id: BigInt(userId) },
-            data: {
-                current_hashed_refresh_token: null,
-            },
-        });
-    }
-
     async findByFirebaseUid(uid: string): Promise<USERS | undefined> {
         return this.prisma.uSERS.findFirst({
             where: { firebase_uid: uid },
@@ -147,7 +118,7 @@ export class UsersService {
             // Assumption: Just update/overwrite for now or throw if different?
             // "Account Merge" usually implies binding.
 
-            return this.prisma.uSERS.update({
+            const merged = await this.prisma.uSERS.update({
                 where: { user_id: existingUser.user_id },
                 data: {
                     firebase_uid: uid,
@@ -157,9 +128,13 @@ export class UsersService {
                     // Let's stick to spec: "update firebase_uid".
                 }
             });
+            // 병합된 고객이 속한 매장들의 검색 색인을 현재 이름/전화번호로 갱신
+            await this.searchIndex.reindexUser(this.prisma, merged.user_id);
+            return merged;
         }
 
         // [Case B] New User
+        // 아직 매장 고객이 아니므로 색인하지 않는다 (첫 예약 때 CustomerStatsService 가 색인, 그 전에는 전체 전화번호로 검색된다)
         return this.prisma.uSERS.create({
             data: {
                 firebase_uid: uid,
@@ -1,31 +1,117 @@
-import { Injectable } from '@nestjs/common';
+import { BadRequestException, Injectable, NotFoundException } from '@nestjs/common';
+import { Prisma } from '@prisma/client';
 import { PrismaService } from '../prisma/prisma.service';
 import { CreateVisitLogDto } from './dto/create-visit-log.dto';
+import { variantUrl } from '../config/upload.config';
+import { GalleryFeedCacheService } from '../common/cache/gallery-feed-cache.service';
+
+export const DEFAULT_GALLERY_PAGE_SIZE = 20;
+export const MAX_GALLERY_PAGE_SIZE = 50;
+
+export interface GalleryFeedQuery {
+    shopId?: number;
+    category?: string;
+    cursor?: string;
+    limit?: number;
+}
+
+export interface GalleryFeedPage {
+    items: {
+        id: number; // photo_id
+        log_id: number;
+        shop_id: number;
+        shop: string;
+        title: string;
+        category: string | null;
+        image: string; // thumb
+        image_medium: string;
+        visited_at: string;
+    }[];
+    nextCursor: string | null;
+}
 
 @Injectable()
 export class VisitLogsService {
-    constructor(private prisma: PrismaService) { }
+    constructor(
+        private prisma: PrismaService,
+        private galleryFeedCache: GalleryFeedCacheService
+    ) { }
 
+    // 예약당 시술 기록은 1건이므로 다시 저장하면 메모/사진을 갱신한다
     async create(shopId: number, createVisitLogDto: CreateVisitLogDto) {
+        const reservation = await this.prisma.rESERVATIONS.findFirst({
+            where: { reservation_id: BigInt(createVisitLogDto.reservation_id), shop_id: BigInt(shopId) },
+            select: { reservation_id: true },
+        });
+        if (!reservation) throw new NotFoundException('Reservation not found');
+
+        const photoUrls = createVisitLogDto.photo_urls || [];
         // Convert string[] to JSON string for DB storage
-        const photoUrlsJson = createVisitLogDto.photo_urls
-            ? JSON.stringify(createVisitLogDto.photo_urls)
-            : '[]';
-
-        const log = await this.prisma.vISIT_LOGS.create({
-            data: {
-                customer_id: BigInt(createVisitLogDto.customer_id),
-                reservation_id: BigInt(createVisitLogDto.reservation_id),
-                designer_id: BigInt(createVisitLogDto.designer_id),
-                admin_memo: createVisitLogDto.admin_memo,
-                photo_urls: photoUrlsJson,
-                visited_at: new Date(),
-            },
+        const photoUrlsJson = JSON.stringify(photoUrls);
+
+        const log = await this.prisma.$transaction(async (tx) => {
+            const saved = await tx.vISIT_LOGS.upsert({
+                where: { reservation_id: reservation.reservation_id },
+                create: {
+                    customer_id: BigInt(createVisitLogDto.customer_id),
+                    reservation_id: reservation.reservation_id,
+                    designer_id: BigInt(createVisitLogDto.designer_id),
+                    admin_memo: createVisitLogDto.admin_memo,
+                    photo_urls: photoUrlsJson,
+                    visited_at: new Date(),
+                },
+                update: {
+                    designer_id: BigInt(createVisitLogDto.designer_id),
+                    admin_memo: createVisitLogDto.admin_memo,
+                    photo_urls: photoUrlsJson,
+                },
+            });
+            await this.replacePhotos(tx, saved.log_id, photoUrls);
+            return saved;
         });
+        this.galleryFeedCache.invalidateShop(shopId);
 
         return this.mapToDto(log);
     }
 
+    // VISIT_LOG_PHOTOS 를 photo_urls 와 같게 맞춘다 (대표 시술 = 첫 번째 예약 항목)
+    private async replacePhotos(tx: Prisma.TransactionClient, logId: bigint, urls: string[]) {
+        await tx.vISIT_LOG_PHOTOS.deleteMany({ where: { log_id: logId } });
+        if (urls.length === 0) return;
+
+        const log = await tx.vISIT_LOGS.findUnique({
+            where: { log_id: logId },
+            select: {
+                visited_at: true,
+                RESERVATIONS: {
+                    select: {
+                        shop_id: true,
+                        start_time: true,
+                        RESERVATION_ITEMS: {
+                            select: { menu_name: true, MENUS: { select: { category: true, parent: { select: { name: true } } } } },
+                            orderBy: { item_id: 'asc' },
+                            take: 1,
+                        },
+                    },
+                },
+            },
+        });
+        const item = log.RESERVATIONS.RESERVATION_ITEMS[0];
+        const category = item?.MENUS?.parent?.name || item?.MENUS?.category || null;
+
+        await tx.vISIT_LOG_PHOTOS.createMany({
+            data: urls.filter(Boolean).map((url, index) => ({
+                log_id: logId,
+                shop_id: log.RESERVATIONS.shop_id,
+                category,
+                menu_name: item?.menu_name || null,
+                url,
+                sort_order: index,
+                visited_at: log.visited_at || log.RESERVATIONS.start_time,
+            })),
+        });
+    }
+
     async findByReservation(shopId: number, reservationId: number) {
         const log = await this.prisma.vISIT_LOGS.findFirst({
             where: {
@@ -86,40 +172,87 @@ export class VisitLogsService {
     }
 
     async findRecentGalleryItems(limit: number = 10) {
-        const logs = await this.prisma.vISIT_LOGS.findMany({
-            where: {
-                photo_urls: {
-                    not: '[]' // Ensure photos exist
-                }
-            },
-            take: limit,
-            orderBy: { visited_at: 'desc' },
-            include: {
-                RESERVATIONS: {
-                    include: {
-                        SHOPS: true,
-                        RESERVATION_ITEMS: {
-                            include: { MENUS: true }
-                        }
-                    }
-                }
-            }
-        });
+        const { items } = await this.findGalleryFeed({ limit });
+        return items.map(item => ({
+            id: item.id,
+            title: item.title,
+            shop: item.shop,
+            image: item.image,
+        }));
+    }
 
-        return logs.map(log => {
-            let images = [];
-            try {
-                images = JSON.parse(log.photo_urls as string);
-            } catch (e) {
-                images = [];
-            }
-            return {
-                id: Number(log.log_id),
-                title: log.RESERVATIONS?.RESERVATION_ITEMS?.[0]?.menu_name || '시술',
-                shop: log.RESERVATIONS?.SHOPS?.name || 'Unknown Log',
-                image: images[0] || 'https://via.placeholder.com/300'
-            };
+    /**
+     * 갤러리 피드 (VISIT_LOG_PHOTOS, 최신순 keyset 페이지네이션)
+     * 첫 페이지는 인메모리 캐시에서 응답하고, 시술 기록 저장 시 무효화된다.
+     */
+    async findGalleryFeed(query: GalleryFeedQuery): Promise<GalleryFeedPage> {
+        const limit = Math.min(Math.max(query.limit || DEFAULT_GALLERY_PAGE_SIZE, 1), MAX_GALLERY_PAGE_SIZE);
+
+        if (query.cursor) {
+            return this.loadGalleryFeed(query, limit);
+        }
+
+        const key = this.galleryFeedCache.key(query.shopId, query.category, limit);
+        const cached = this.galleryFeedCache.get<GalleryFeedPage>(key);
+        if (cached) return cached;
+
+        const generation = this.galleryFeedCache.currentGeneration();
+        const page = await this.loadGalleryFeed(query, limit);
+        this.galleryFeedCache.set(key, page, generation);
+        return page;
+    }
+
+    private async loadGalleryFeed(query: GalleryFeedQuery, limit: number): Promise<GalleryFeedPage> {
+        const where: Prisma.VISIT_LOG_PHOTOSWhereInput = {};
+        if (query.shopId) where.shop_id = BigInt(query.shopId);
+        if (query.category) where.category = query.category;
+        if (query.cursor) {
+            const cursor = this.decodeCursor(query.cursor);
+            where.OR = [
+                { visited_at: { lt: cursor.visitedAt } },
+                { visited_at: cursor.visitedAt, photo_id: { lt: cursor.photoId } },
+            ];
+        }
+
+        const rows = await this.prisma.vISIT_LOG_PHOTOS.findMany({
+            where,
+            orderBy: [{ visited_at: 'desc' }, { photo_id: 'desc' }],
+            take: limit + 1,
+            include: { SHOPS: { select: { name: true } } },
         });
+
+        const page = rows.slice(0, limit);
+        const last = page[page.length - 1];
+        return {
+            items: page.map(row => ({
+                id: Number(row.photo_id),
+                log_id: Number(row.log_id),
+                shop_id: Number(row.shop_id),
+                shop: row.SHOPS.name,
+                title: row.menu_name || '시술',
+                category: row.category,
+                image: variantUrl(row.url, 'thumb'),
+                image_medium: variantUrl(row.url, 'medium'),
+                visited_at: row.visited_at.toISOString(),
+            })),
+            nextCursor: rows.length > limit && last ? this.encodeCursor(last.visited_at, last.photo_id) : null,
+        };
+    }
+
+    // 커서: base64url(JSON [visited_at, photo_id])
+    private encodeCursor(visitedAt: Date, photoId: bigint): string {
+        return Buffer.from(JSON.stringify([visitedAt.toISOString(), photoId.toString()])).toString('base64url');
+    }
+
+    private decodeCursor(cursor: string): { visitedAt: Date; photoId: bigint } {
+        try {
+            const [v, id] = JSON.parse(Buffer.from(cursor, 'base64url').toString('utf8'));
+            const visitedAt = new Date(v);
+            if (isNaN(visitedAt.getTime())) throw new Error('invalid value');
+            return { visitedAt, photoId: BigInt(id) };
+        } catch (e) {
+            throw new BadRequestException('잘못된 cursor 입니다.');
+        }
     }
 
     private mapToDto(log: any) {
@@ -14,29 +14,62 @@ export interface CustomerStats {
     memo: string;
 }
 
-export const getCustomers = async (shopId: number, search?: string): Promise<CustomerStats[]> => {
+export type CustomerSort = 'lastVisit' | 'totalPay' | 'visitCount';
+
+export interface CustomerPage {
+    items: CustomerStats[];
+    nextCursor: string | null;
+}
+
+export interface CustomerListParams {
+    search?: string;
+    sort?: CustomerSort;
+    cursor?: string | null;
+    limit?: number;
+}
+
+export const getCustomers = async (shopId: number, params: CustomerListParams = {}): Promise<CustomerPage> => {
     const response = await api.get(`/shops/${shopId}/customers`, {
-        params: { search }
+        params: {
+            search: params.search || undefined,
+            sort: params.sort,
+            cursor: params.cursor || undefined,
+            limit: params.limit,
+        }
     });
     return response.data;
 };
 
-export interface CustomerDetail extends CustomerStats {
-    history: {
-        id: number;
-        date: string;
-        status: string;
-        menus: string;
-        price: number;
-        designer: string;
-    }[];
-    memos: {
-        id: number;
-        content: string;
-        created_at: string;
-        type: 'RESERVATION' | 'GENERAL';
-        source_id: number | null;
-    }[];
+export interface CustomerHistoryItem {
+    id: number;
+    date: string;
+    status: string;
+    menus: string;
+    price: number;
+    designer: string;
+}
+
+export interface CustomerMemoItem {
+    id: number;
+    content: string;
+    created_at: string;
+    type: 'RESERVATION' | 'GENERAL';
+    source_id: number | null;
+}
+
+export interface CustomerDetail extends Omit<CustomerStats, 'memo'> {
+    noshow_count: number;
+    reservation_count: number;
+    // 첫 페이지 (다음 페이지는 getCustomerHistory / getCustomerTimeline)
+    history: CustomerHistoryItem[];
+    nextHistoryCursor: string | null;
+    memos: CustomerMemoItem[];
+    nextMemoCursor: string | null;
+}
+
+export interface CustomerTimelinePage<T> {
+    items: T[];
+    nextCursor: string | null;
 }
 
 export const getCustomer = async (shopId: number, id: number): Promise<CustomerDetail> => {
@@ -44,6 +77,16 @@ export const getCustomer = async (shopId: number, id: number): Promise<CustomerD
     return response.data;
 };
 
+export const getCustomerHistory = async (shopId: number, id: number, cursor: string, limit?: number): Promise<CustomerTimelinePage<CustomerHistoryItem>> => {
+    const response = await api.get(`/shops/${shopId}/customers/${id}/history`, { params: { cursor, limit } });
+    return response.data;
+};
+
+export const getCustomerTimeline = async (shopId: number, id: number, cursor: string, limit?: number): Promise<CustomerTimelinePage<CustomerMemoItem>> => {
+    const response = await api.get(`/shops/${shopId}/customers/${id}/timeline`, { params: { cursor, limit } });
+    return response.data;
+};
+
 export const createMemo = async (shopId: number, id: number, content: string): Promise<void> => {
     await api.post(`/shops/${shopId}/customers/${id}/memos`, { content });
 };
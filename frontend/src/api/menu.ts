@@ -18,6 +18,37 @@ export const getMenus = async (shopId: number): Promise<MenuDTO[]> => {
     return response.data;
 };
 
+export interface MenuTreeItem {
+    menu_id: string;
+    name: string;
+    price: number;
+    duration: number;
+    description: string | null;
+    thumbnail_url: string | null;
+    sort_order: number;
+}
+
+export interface MenuTreeCategory {
+    menu_id: string;
+    name: string;
+    description: string | null;
+    thumbnail_url: string | null;
+    sort_order: number;
+    menus: MenuTreeItem[];
+}
+
+export interface MenuTree {
+    version: number;
+    categories: MenuTreeCategory[];
+    uncategorized: MenuTreeItem[];
+}
+
+// 서버가 만든 카테고리 트리 (ETag 로 재조회 시 304, 브라우저 캐시 사용)
+export const getMenuTree = async (shopId: number): Promise<MenuTree> => {
+    const response = await api.get(`/shops/${shopId}/menus/tree`);
+    return response.data;
+};
+
 export const createMenu = async (shopId: number, data: Partial<MenuDTO>): Promise<MenuDTO> => {
     const response = await api.post(`/shops/${shopId}/menus`, data);
     return response.data;
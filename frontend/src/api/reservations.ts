@@ -1,5 +1,5 @@
 import { api } from './client';
-import { ReservationDTO, GetReservationsParams, CreateReservationDTO } from '../types/reservation';
+import { ReservationDTO, GetReservationsParams, GetReservationCalendarParams, ReservationCalendarResponse, CreateReservationDTO } from '../types/reservation';
 
 // Base URL is handled by api client instance
 
@@ -10,6 +10,13 @@ export const getReservations = async (shopId: number, params: GetReservationsPar
     return response.data;
 };
 
+export const getReservationCalendar = async (shopId: number, params: GetReservationCalendarParams): Promise<ReservationCalendarResponse> => {
+    const response = await api.get(`/shops/${shopId}/reservations/calendar`, {
+        params,
+    });
+    return response.data;
+};
+
 export const createReservation = async (shopId: number, data: CreateReservationDTO): Promise<any> => {
     const response = await api.post(`/shops/${shopId}/reservations`, data);
     return response.data;
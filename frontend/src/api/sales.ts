@@ -105,3 +105,33 @@ export const getWeeklySales = async (shopId: number, date: string): Promise<Week
     });
     return response.data;
 };
+
+export type SalesGroupBy = 'day' | 'week' | 'month' | 'designer' | 'category' | 'paymentType';
+
+export interface RangeSalesSummary {
+    revenue: RevenueData;
+    cashFlow: CashFlowData;
+    prepaidUsed: number;
+    count: number;
+    cancelCount: number;
+    noshowCount: number;
+    avgTicket: number;
+}
+
+// groupBy 에 따라 행 형태가 다름
+// day/week/month: { key, ...summary }, designer: { key, name, ...summary }
+// category: { key, name, value, count }, paymentType: { key, revenue, cashFlow }
+export interface RangeSalesData {
+    from: string;
+    to: string;
+    groupBy: SalesGroupBy;
+    totals: RangeSalesSummary;
+    rows: any[];
+}
+
+export const getRangeSales = async (shopId: number, from: string, to: string, groupBy: SalesGroupBy = 'day'): Promise<RangeSalesData> => {
+    const response = await api.get(`/shops/${shopId}/sales/range`, {
+        params: { from, to, groupBy }
+    });
+    return response.data;
+};
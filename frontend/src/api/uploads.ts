@@ -1,8 +1,16 @@
 import { api } from './client';
 
+export interface ImageVariant {
+    width: number;
+    height: number;
+    jpg: string;
+    webp: string;
+}
+
 export interface UploadResponse {
-    url: string;
+    url: string; // large JPEG
     originalName: string;
+    variants: Record<'thumb' | 'medium' | 'large', ImageVariant>;
 }
 
 export const uploadImage = async (file: File, category: string): Promise<string> => {
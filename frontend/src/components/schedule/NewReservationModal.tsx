@@ -6,7 +6,7 @@ import { CreateReservationDTO, ReservationStatus } from '../../types/reservation
 import { STRINGS } from '../../constants/strings';
 import { searchUsers, UserDTO } from '../../api/user';
 import { getDesigners, DesignerDTO } from '../../api/designer';
-import { getMenus, MenuDTO } from '../../api/menu';
+import { getMenuTree, MenuTree } from '../../api/menu';
 import { createReservation } from '../../api/reservations';
 import { getShop, ShopDTO } from '../../api/shops';
 import { debounce } from 'lodash';
@@ -34,7 +34,7 @@ const NewReservationModal: React.FC<NewReservationModalProps> = ({ isOpen, onClo
 
     // 데이터 상태
     const [designers, setDesigners] = useState<DesignerDTO[]>([]);
-    const [menus, setMenus] = useState<MenuDTO[]>([]);
+    const [menuTree, setMenuTree] = useState<MenuTree | null>(null);
     const [shop, setShop] = useState<ShopDTO | null>(null);
 
     // 초기 데이터 로드 & Form Init
@@ -45,11 +45,11 @@ const NewReservationModal: React.FC<NewReservationModalProps> = ({ isOpen, onClo
                 try {
                     const [loadedDesigners, loadedMenus, loadedShop] = await Promise.all([
                         getDesigners(shopId),
-                        getMenus(shopId),
+                        getMenuTree(shopId),
                         getShop(shopId)
                     ]);
                     setDesigners(loadedDesigners);
-                    setMenus(loadedMenus);
+                    setMenuTree(loadedMenus);
                     setShop(loadedShop);
                 } catch (error) {
                     console.error('Failed to load initial data:', error);
@@ -173,7 +173,8 @@ const NewReservationModal: React.FC<NewReservationModalProps> = ({ isOpen, onClo
             // Calculate end_time based on selected menu duration
             let duration = 60; // Default 1 hour
             if (values.treatmentId) {
-                const selectedMenu = menus.find(m => m.menu_id === values.treatmentId);
+                const selectedMenu = menuTree && [...menuTree.categories.flatMap(c => c.menus), ...menuTree.uncategorized]
+                    .find(m => m.menu_id === values.treatmentId);
                 if (selectedMenu && selectedMenu.duration) {
                     duration = selectedMenu.duration;
                 }
@@ -334,13 +335,20 @@ const NewReservationModal: React.FC<NewReservationModalProps> = ({ isOpen, onClo
                             style={{ width: 220 }}
                         >
                             <Select placeholder="시술 선택">
-                                {menus
-                                    .filter(m => m.type !== 'CATEGORY')
-                                    .map(menu => (
-                                        <Option key={menu.menu_id} value={menu.menu_id}>
-                                            {menu.name} ({menu.price.toLocaleString()}원)
-                                        </Option>
-                                    ))}
+                                {menuTree?.categories.filter(category => category.menus.length > 0).map(category => (
+                                    <Select.OptGroup key={category.menu_id} label={category.name}>
+                                        {category.menus.map(menu => (
+                                            <Option key={menu.menu_id} value={menu.menu_id}>
+                                                {menu.name} ({menu.price.toLocaleString()}원)
+                                            </Option>
+                                        ))}
+                                    </Select.OptGroup>
+                                ))}
+                                {menuTree?.uncategorized.map(menu => (
+                                    <Option key={menu.menu_id} value={menu.menu_id}>
+                                        {menu.name} ({menu.price.toLocaleString()}원)
+                                    </Option>
+                                ))}
                             </Select>
                         </Form.Item>
 
@@ -1,11 +1,55 @@
+import { useRef } from 'react';
 import { useQuery } from '@tanstack/react-query';
-import { getReservations } from '../api/reservations';
-import { GetReservationsParams } from '../types/reservation';
+import { getReservationCalendar } from '../api/reservations';
+import { CalendarReservationDTO, GetReservationsParams } from '../types/reservation';
 
+const MAX_WINDOWS = 20;
+
+interface CalendarWindow {
+    cursor: string;
+    items: Map<number, CalendarReservationDTO>;
+}
+
+/**
+ * 캘린더 예약 조회.
+ * 구간(매장 + 시작/종료)별로 마지막 동기화 cursor 를 기억해 두고, 이후 조회는 변경분(changedSince)만 받아 병합한다.
+ * 변경이 없으면 cursor 가 유지되어 같은 URL 을 다시 요청하게 되고, 서버가 ETag 로 304 를 돌려주면
+ * 브라우저 캐시의 이전 응답이 그대로 사용된다.
+ */
 export const useReservations = (shopId: number | null, params: GetReservationsParams) => {
+    const windows = useRef(new Map<string, CalendarWindow>());
+
     return useQuery({
         queryKey: ['reservations', shopId, params],
-        queryFn: () => shopId ? getReservations(shopId, params) : Promise.resolve([]),
+        queryFn: async (): Promise<CalendarReservationDTO[]> => {
+            if (!shopId) return [];
+
+            const key = `${shopId}:${params.startDate}:${params.endDate}`;
+            const synced = windows.current.get(key);
+            const response = await getReservationCalendar(shopId, {
+                ...params,
+                ...(synced && { changedSince: synced.cursor }),
+            });
+
+            const start = new Date(params.startDate).getTime();
+            const end = new Date(params.endDate).getTime();
+            const items = synced && !response.full ? synced.items : new Map<number, CalendarReservationDTO>();
+            response.items.forEach(item => {
+                // 변경분에는 구간 밖으로 옮겨진 예약도 포함된다
+                const time = new Date(item.start_time).getTime();
+                if (time >= start && time <= end) items.set(item.reservation_id, item);
+                else items.delete(item.reservation_id);
+            });
+            response.deleted.forEach(id => items.delete(id));
+
+            windows.current.delete(key);
+            windows.current.set(key, { cursor: response.cursor, items });
+            if (windows.current.size > MAX_WINDOWS) {
+                windows.current.delete(windows.current.keys().next().value as string);
+            }
+
+            return Array.from(items.values()).sort((a, b) => a.start_time.localeCompare(b.start_time));
+        },
         enabled: !!shopId,
         // Keep data fresh for 1 minute
         staleTime: 60 * 1000,
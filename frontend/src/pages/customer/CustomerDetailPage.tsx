@@ -2,7 +2,7 @@ import React, { useEffect, useState } from 'react';
 import { useParams, useNavigate } from 'react-router-dom';
 import { Layout, Typography, Card, Descriptions, Tag, Table, List, Flex, Skeleton, Button, message, Modal, Input, Space, Row, Col } from 'antd';
 import { ArrowLeftOutlined, PlusOutlined } from '@ant-design/icons';
-import { getCustomer, createMemo, CustomerDetail } from '../../api/customers';
+import { getCustomer, getCustomerHistory, getCustomerTimeline, createMemo, CustomerDetail } from '../../api/customers';
 import { formatPhoneNumber, formatDateTime, formatDate } from '../../utils/format';
 import ReservationDetailModal from '../../components/schedule/ReservationDetailModal';
 import CustomerGallery from './components/CustomerGallery';
@@ -21,6 +21,7 @@ const CustomerDetailPage: React.FC = () => {
     const [isMemoModalOpen, setIsMemoModalOpen] = useState(false);
     const [memoContent, setMemoContent] = useState('');
     const [isMemoSubmitting, setIsMemoSubmitting] = useState(false);
+    const [isMoreLoading, setIsMoreLoading] = useState(false);
 
     useEffect(() => {
         if (id && shopId) {
@@ -42,6 +43,35 @@ const CustomerDetailPage: React.FC = () => {
         }
     };
 
+    // 시술 이력 / 메모 다음 페이지 (커서 기반)
+    const loadMoreHistory = async () => {
+        if (!shopId || !id || !customer?.nextHistoryCursor) return;
+        setIsMoreLoading(true);
+        try {
+            const page = await getCustomerHistory(Number(shopId), parseInt(id), customer.nextHistoryCursor);
+            setCustomer(prev => prev && { ...prev, history: [...prev.history, ...page.items], nextHistoryCursor: page.nextCursor });
+        } catch (error) {
+            console.error('Failed to fetch history:', error);
+            message.error('시술 이력을 불러오는데 실패했습니다.');
+        } finally {
+            setIsMoreLoading(false);
+        }
+    };
+
+    const loadMoreMemos = async () => {
+        if (!shopId || !id || !customer?.nextMemoCursor) return;
+        setIsMoreLoading(true);
+        try {
+            const page = await getCustomerTimeline(Number(shopId), parseInt(id), customer.nextMemoCursor);
+            setCustomer(prev => prev && { ...prev, memos: [...prev.memos, ...page.items], nextMemoCursor: page.nextCursor });
+        } catch (error) {
+            console.error('Failed to fetch memos:', error);
+            message.error('메모를 불러오는데 실패했습니다.');
+        } finally {
+            setIsMoreLoading(false);
+        }
+    };
+
     const handleCreateMemo = async () => {
         if (!memoContent.trim()) {
             message.warning('메모 내용을 입력해주세요.');
@@ -172,6 +202,11 @@ const CustomerDetailPage: React.FC = () => {
                                     style: { cursor: 'pointer' }
                                 })}
                             />
+                            {customer.nextHistoryCursor && (
+                                <Flex justify="center">
+                                    <Button size="small" loading={isMoreLoading} onClick={loadMoreHistory}>이전 이력 더 보기</Button>
+                                </Flex>
+                            )}
                         </Card>
 
                         {/* Memos */}
@@ -199,6 +234,11 @@ const CustomerDetailPage: React.FC = () => {
                                     </List.Item>
                                 )}
                                 locale={{ emptyText: '등록된 메모가 없습니다.' }}
+                                loadMore={customer.nextMemoCursor && (
+                                    <Flex justify="center" style={{ marginTop: 8 }}>
+                                        <Button size="small" loading={isMoreLoading} onClick={loadMoreMemos}>이전 메모 더 보기</Button>
+                                    </Flex>
+                                )}
                                 style={{ maxHeight: 400, overflowY: 'auto' }}
                             />
                         </Card>
@@ -1,15 +1,23 @@
 import React, { useEffect, useState } from 'react';
-import { Table, Input, Button, Layout, theme, Typography, Tag, Space } from 'antd';
+import { Table, Input, Button, Layout, theme, Typography, Tag, Space, Select } from 'antd';
 import type { ColumnsType } from 'antd/es/table';
 import { PlusOutlined } from '@ant-design/icons';
 import { useNavigate, useParams } from 'react-router-dom';
 import { formatPhoneNumber, formatDate } from '../../utils/format';
-import { getCustomers, CustomerStats } from '../../api/customers';
+import { getCustomers, CustomerStats, CustomerSort } from '../../api/customers';
 import NewCustomerModal from '../../components/common/NewCustomerModal';
 
 const { Content } = Layout;
 const { Title } = Typography;
 
+const PAGE_SIZE = 50;
+
+const SORT_OPTIONS: { value: CustomerSort; label: string }[] = [
+    { value: 'lastVisit', label: '최근 방문순' },
+    { value: 'totalPay', label: '결제금액순' },
+    { value: 'visitCount', label: '방문횟수순' },
+];
+
 const CustomerPage: React.FC = () => {
     const { shopId } = useParams<{ shopId: string }>();
     const navigate = useNavigate();
@@ -18,16 +26,20 @@ const CustomerPage: React.FC = () => {
     } = theme.useToken();
 
     const [customers, setCustomers] = useState<CustomerStats[]>([]);
+    const [nextCursor, setNextCursor] = useState<string | null>(null);
     const [loading, setLoading] = useState(false);
     const [searchText, setSearchText] = useState('');
+    const [sort, setSort] = useState<CustomerSort>('lastVisit');
     const [isNewCustomerModalOpen, setIsNewCustomerModalOpen] = useState(false);
 
-    const fetchCustomers = async (search?: string) => {
+    // cursor 가 없으면 첫 페이지부터 다시 조회, 있으면 이어서 붙인다
+    const fetchCustomers = async (search?: string, sortBy: CustomerSort = sort, cursor?: string | null) => {
         if (!shopId) return;
         setLoading(true);
         try {
-            const data = await getCustomers(Number(shopId), search);
-            setCustomers(data);
+            const page = await getCustomers(Number(shopId), { search, sort: sortBy, cursor, limit: PAGE_SIZE });
+            setCustomers(prev => (cursor ? [...prev, ...page.items] : page.items));
+            setNextCursor(page.nextCursor);
         } catch (error) {
             console.error('Failed to fetch customers:', error);
         } finally {
@@ -44,6 +56,11 @@ const CustomerPage: React.FC = () => {
         fetchCustomers(value);
     };
 
+    const handleSortChange = (value: CustomerSort) => {
+        setSort(value);
+        fetchCustomers(searchText, value);
+    };
+
     const columns: ColumnsType<CustomerStats> = [
         {
             title: '고객명',
@@ -91,25 +108,18 @@ const CustomerPage: React.FC = () => {
             title: '방문횟수',
             dataIndex: 'visit_count',
             key: 'visit_count',
-            sorter: (a, b) => a.visit_count - b.visit_count,
             render: (count) => `${count}회`,
         },
         {
             title: '최근 방문일',
             dataIndex: 'last_visit',
             key: 'last_visit',
-            sorter: (a, b) => {
-                const dateA = a.last_visit ? new Date(a.last_visit).getTime() : 0;
-                const dateB = b.last_visit ? new Date(b.last_visit).getTime() : 0;
-                return dateA - dateB;
-            },
             render: (date: string) => formatDate(date),
         },
         {
             title: '총 결제금액',
             dataIndex: 'total_pay',
             key: 'total_pay',
-            sorter: (a, b) => a.total_pay - b.total_pay,
             render: (price) => `${(price || 0).toLocaleString()}원`,
         },
         {
@@ -142,6 +152,12 @@ const CustomerPage: React.FC = () => {
                 <div style={{ display: 'flex', justifyContent: 'space-between', marginBottom: 16 }}>
                     <Title level={4} style={{ margin: 0 }}>고객 관리</Title>
                     <Space>
+                        <Select
+                            value={sort}
+                            options={SORT_OPTIONS}
+                            onChange={handleSortChange}
+                            style={{ width: 130 }}
+                        />
                         <Space.Compact style={{ width: 250 }}>
                             <Input
                                 placeholder="이름 또는 전화번호 검색"
@@ -170,8 +186,15 @@ const CustomerPage: React.FC = () => {
                     dataSource={customers}
                     rowKey="id"
                     loading={loading}
-                    pagination={{ pageSize: 10 }}
+                    pagination={false}
                 />
+                {nextCursor && (
+                    <div style={{ textAlign: 'center', marginTop: 16 }}>
+                        <Button loading={loading} onClick={() => fetchCustomers(searchText, sort, nextCursor)}>
+                            더 보기
+                        </Button>
+                    </div>
+                )}
 
                 <NewCustomerModal
                     isOpen={isNewCustomerModalOpen}
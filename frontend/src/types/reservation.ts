@@ -31,6 +31,24 @@ export interface GetReservationsParams {
     endDate: string;
 }
 
+// 캘린더용 slim projection (상세는 getReservation 으로 조회)
+export type CalendarReservationDTO = Pick<ReservationDTO,
+    'reservation_id' | 'customer_id' | 'designer_id' | 'start_time' | 'end_time' | 'status' | 'request_memo' |
+    'USERS' | 'DESIGNERS' | 'RESERVATION_ITEMS'> & {
+        updated_at: string;
+    };
+
+export interface GetReservationCalendarParams extends GetReservationsParams {
+    changedSince?: string;
+}
+
+export interface ReservationCalendarResponse {
+    full: boolean; // true 면 구간 전체, false 면 changedSince 이후 변경분
+    items: CalendarReservationDTO[];
+    deleted: number[];
+    cursor: string; // 다음 요청의 changedSince
+}
+
 export type ReservationStatus = 'PENDING' | 'CONFIRMED' | 'COMPLETED' | 'CANCELED' | 'NOSHOW';
 
 export interface CreateReservationDTO {